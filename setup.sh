@@ -21,14 +21,33 @@ declare -a files=(
     "${script_dir}/fixups/default.conf:${target_config_dir}/default.conf:root:root:0644"
     "${script_dir}/fixups/${service_name}:/etc/systemd/system/${service_name}:root:root:0644"
     "${script_dir}/src/slow-movie-player-service/configuration.py:${target_main_dir}/configuration.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/directorywatcher.py:${target_main_dir}/directorywatcher.py:root:root:0600"
     "${script_dir}/src/slow-movie-player-service/display.py:${target_main_dir}/display.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/displayconnection.py:${target_main_dir}/displayconnection.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/ditheringengine.py:${target_main_dir}/ditheringengine.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/ditheringmethod.py:${target_main_dir}/ditheringmethod.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/ffmpegvideo.py:${target_main_dir}/ffmpegvideo.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/framebuffer.py:${target_main_dir}/framebuffer.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/grayscaleconverter.py:${target_main_dir}/grayscaleconverter.py:root:root:0600"
     "${script_dir}/src/slow-movie-player-service/grayscalemethod.py:${target_main_dir}/grayscalemethod.py:root:root:0600"
     "${script_dir}/src/slow-movie-player-service/image.py:${target_main_dir}/image.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/imagebufferpool.py:${target_main_dir}/imagebufferpool.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/partialrefresh.py:${target_main_dir}/partialrefresh.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/playbackjournal.py:${target_main_dir}/playbackjournal.py:root:root:0600"
     "${script_dir}/src/slow-movie-player-service/processinfo.py:${target_main_dir}/processinfo.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/randomframesampling.py:${target_main_dir}/randomframesampling.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/shownframes.py:${target_main_dir}/shownframes.py:root:root:0600"
     "${script_dir}/src/slow-movie-player-service/skip.py:${target_main_dir}/skip.py:root:root:0600"
     "${script_dir}/src/slow-movie-player-service/slowmovieplayer.py:${target_main_dir}/slowmovieplayer.py:root:root:0700"
     "${script_dir}/src/slow-movie-player-service/video.py:${target_main_dir}/video.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/videobackend.py:${target_main_dir}/videobackend.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/videodatabase.py:${target_main_dir}/videodatabase.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/videoindex.py:${target_main_dir}/videoindex.py:root:root:0600"
     "${script_dir}/src/slow-movie-player-service/videolibrary.py:${target_main_dir}/videolibrary.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/videolibrarybackend.py:${target_main_dir}/videolibrarybackend.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/videopool.py:${target_main_dir}/videopool.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/waveformmode.py:${target_main_dir}/waveformmode.py:root:root:0600"
+    "${script_dir}/src/slow-movie-player-service/waveformselector.py:${target_main_dir}/waveformselector.py:root:root:0600"
 )
 
 declare -a pycache_directories=()
@@ -1,5 +1,10 @@
 from skip import FrameSkip, TimeSkip
 from grayscalemethod import GrayscaleMethod
+from ditheringengine import DitheringEngine
+from ditheringmethod import DitheringMethod
+from videobackend import VideoBackend
+from videolibrarybackend import VideoLibraryBackend
+from randomframesampling import RandomFrameSampling
 
 from typing import Union
 import configparser
@@ -17,9 +22,15 @@ class Configuration:
         self.screen_width: int = 0
         self.screen_height: int = 0
         self.refresh_timeout: float = 0.0
+        self.full_refresh_interval: int = 1
+        self.adaptive_waveform: bool = False
         self.video_directory: str = ''
         self.skip: Union[FrameSkip, TimeSkip] = FrameSkip(1)
         self.random_frame: bool = False
+        self.random_frame_no_repeat: bool = False
+        self.grayscale_before_resize: bool = False
+        self.keyframe_tolerance: float = 0.0
+        self.watch_video_directory: bool = False
 
         config_path = self.__get_first_config_file_path_from_directory(config_directory)
 
@@ -48,6 +59,7 @@ class Configuration:
         self.screen_height = int(match[2])
 
         self.refresh_timeout = parser.getfloat(self.__class__.SECTION_NAME, 'refresh_timeout')
+        self.full_refresh_interval = parser.getint(self.__class__.SECTION_NAME, 'full_refresh_interval', fallback=1)
 
         self.video_directory = self.__strip_enclosing_quotes(
             parser.get(self.__class__.SECTION_NAME, 'video_directory')
@@ -67,15 +79,85 @@ class Configuration:
             )
         )
 
+        self.dithering_method = DitheringMethod(
+            self.__strip_enclosing_quotes(
+                parser.get(self.__class__.SECTION_NAME, 'dithering_method', fallback='')
+            )
+        )
+
+        self.dithering_engine = DitheringEngine(
+            self.__strip_enclosing_quotes(
+                parser.get(self.__class__.SECTION_NAME, 'dithering_engine', fallback='')
+            )
+        )
+
+        self.video_backend = VideoBackend(
+            self.__strip_enclosing_quotes(
+                parser.get(self.__class__.SECTION_NAME, 'video_backend', fallback='')
+            )
+        )
+
+        self.video_library_backend = VideoLibraryBackend(
+            self.__strip_enclosing_quotes(
+                parser.get(self.__class__.SECTION_NAME, 'video_library_backend', fallback='')
+            )
+        )
+
+        self.keyframe_tolerance = parser.getfloat(self.__class__.SECTION_NAME, 'keyframe_tolerance', fallback=0.0)
+
         try:
             self.random_frame = parser.getboolean(self.__class__.SECTION_NAME, 'random_frame', fallback=False)
         except ValueError:
             pass
 
+        self.random_frame_sampling = RandomFrameSampling(
+            self.__strip_enclosing_quotes(
+                parser.get(self.__class__.SECTION_NAME, 'random_frame_sampling', fallback='')
+            )
+        )
+
+        try:
+            self.random_frame_no_repeat = parser.getboolean(
+                self.__class__.SECTION_NAME,
+                'random_frame_no_repeat',
+                fallback=False
+            )
+        except ValueError:
+            pass
+
+        try:
+            self.grayscale_before_resize = parser.getboolean(
+                self.__class__.SECTION_NAME,
+                'grayscale_before_resize',
+                fallback=False
+            )
+        except ValueError:
+            pass
+
+        try:
+            self.watch_video_directory = parser.getboolean(
+                self.__class__.SECTION_NAME,
+                'watch_video_directory',
+                fallback=False
+            )
+        except ValueError:
+            pass
+
+        try:
+            self.adaptive_waveform = parser.getboolean(
+                self.__class__.SECTION_NAME,
+                'adaptive_waveform',
+                fallback=False
+            )
+        except ValueError:
+            pass
+
         if (math.isinf(self.vcom)
                 or self.screen_width <= 0
                 or self.screen_height <= 0
                 or self.refresh_timeout < 0.0
+                or self.full_refresh_interval < 1
+                or self.keyframe_tolerance < 0.0
                 or not self.video_directory):
             raise ValueError('Configuration value out of permitted range.')
 
@@ -0,0 +1,175 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+from typing import Optional
+
+
+class DirectoryWatcher:
+    """
+    Watcher of a directory tree using the inotify API of the Linux kernel
+
+    Every directory of the tree is watched (directories created or moved into
+    the tree later are watched as well). Events are collected by the kernel
+    while nobody is waiting for them, so the watcher does not need a thread:
+    get_changed_paths can be called whenever it is convenient (e.g. between
+    two frames), and it returns without blocking.
+
+    A file is reported when it was closed after writing, moved into, moved
+    out of, or deleted from the tree, so a file being copied is not reported
+    until copying is finished. A directory is reported when it was created,
+    moved or deleted, in that case any file in (or formerly in) the reported
+    directory may have changed.
+    """
+
+    IN_CLOEXEC = 0o2000000
+    IN_NONBLOCK = 0o4000
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+    # struct inotify_event: int wd, uint32_t mask, uint32_t cookie,
+    # uint32_t len, followed by a null-padded name of 'len' bytes
+    EVENT_HEADER = struct.Struct('iIII')
+    READ_BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, directory_path: str) -> None:
+        self.__file_descriptor: int = -1
+        # Watched directories by watch descriptor
+        self.__directory_paths: dict[int, str] = {}
+
+        self.__libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.__file_descriptor = self.__libc.inotify_init1(self.__class__.IN_NONBLOCK | self.__class__.IN_CLOEXEC)
+
+        if self.__file_descriptor < 0:
+            self.__raise_os_error('Unable to initialize inotify.')
+
+        try:
+            self.__add_watches(directory_path)
+        except OSError:
+            self.close()
+
+            raise
+
+    def __del__(self) -> None:
+        self.close()
+
+    def __enter__(self) -> 'DirectoryWatcher':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.__file_descriptor >= 0:
+            os.close(self.__file_descriptor)
+            self.__file_descriptor = -1
+            self.__directory_paths.clear()
+
+    def get_changed_paths(self) -> Optional[set[str]]:
+        """
+        Return the paths of the files and directories changed since the
+        previous call, or None if the kernel had to drop events (because too
+        many of them were waiting to be read), in which case any file in the
+        tree may have changed.
+        """
+
+        changed_paths: set[str] = set()
+        events_lost = False
+
+        while True:
+            try:
+                events = os.read(self.__file_descriptor, self.__class__.READ_BUFFER_SIZE)
+            except BlockingIOError:
+                break
+
+            offset = 0
+
+            while offset < len(events):
+                watch_descriptor, mask, _, name_length = self.__class__.EVENT_HEADER.unpack_from(events, offset)
+                offset += self.__class__.EVENT_HEADER.size
+                name = os.fsdecode(events[offset:offset + name_length].rstrip(b'\x00'))
+                offset += name_length
+
+                if mask & self.__class__.IN_Q_OVERFLOW:
+                    events_lost = True
+
+                    continue
+
+                if mask & self.__class__.IN_IGNORED:
+                    self.__directory_paths.pop(watch_descriptor, None)
+
+                    continue
+
+                directory_path = self.__directory_paths.get(watch_descriptor)
+
+                if directory_path is None or not name:
+                    continue
+
+                path = os.path.join(directory_path, name)
+
+                if not mask & self.__class__.IN_ISDIR:
+                    # Files are reported once they are closed after writing
+                    if not mask & self.__class__.IN_CREATE:
+                        changed_paths.add(path)
+
+                    continue
+
+                if mask & (self.__class__.IN_MOVED_FROM | self.__class__.IN_DELETE):
+                    self.__remove_watches(path)
+                else:
+                    try:
+                        self.__add_watches(path)
+                    except OSError:
+                        # The directory was removed (or moved out) in the meantime
+                        pass
+
+                changed_paths.add(path)
+
+        return None if events_lost else changed_paths
+
+    def __add_watches(self, directory_path: str) -> None:
+        directory_paths = [directory_path]
+
+        while directory_paths:
+            directory_path = directory_paths.pop()
+            watch_descriptor = self.__libc.inotify_add_watch(
+                self.__file_descriptor,
+                os.fsencode(directory_path),
+                self.__class__.WATCH_MASK
+            )
+
+            if watch_descriptor < 0:
+                self.__raise_os_error("Unable to watch directory '{}'.".format(directory_path))
+
+            self.__directory_paths[watch_descriptor] = directory_path
+
+            with os.scandir(directory_path) as directory_entries:
+                for directory_entry in directory_entries:
+                    if directory_entry.is_dir(follow_symlinks=False):
+                        directory_paths.append(directory_entry.path)
+
+    def __remove_watches(self, directory_path: str) -> None:
+        directory_path_prefix = os.path.join(directory_path, '')
+
+        for watch_descriptor, watched_directory_path in list(self.__directory_paths.items()):
+            if watched_directory_path == directory_path or watched_directory_path.startswith(directory_path_prefix):
+                # Fails harmlessly if the kernel has already removed the watch
+                # (e.g. because the directory was deleted)
+                self.__libc.inotify_rm_watch(self.__file_descriptor, watch_descriptor)
+                del self.__directory_paths[watch_descriptor]
+
+    @staticmethod
+    def __raise_os_error(message: str) -> None:
+        error_number = ctypes.get_errno()
+
+        raise OSError(error_number, '{} {}'.format(message, os.strerror(error_number)))
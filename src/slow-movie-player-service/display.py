@@ -1,18 +1,53 @@
 from __future__ import annotations
 from processinfo import ProcessInfo
+from partialrefresh import PartialRefresh
+from framebuffer import FrameBuffer
+from displayconnection import DisplayConnection, PanelInfo, UpdateResult
+from waveformmode import WaveformMode
+from waveformselector import WaveformSelector
 import subprocess
 import signal
-from typing import Any, Optional
+import socket
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar('T')
 
 
 class Display:
     TIMEOUT = 30.0
     UPDATE_DISPLAY_PATH = '/opt/slow-movie-player/update-display'
+    RECTANGLES_FILE_EXTENSION = '.rectangles'
 
-    def __init__(self, vcom: float, file_path: str) -> None:
+    def __init__(
+        self,
+        vcom: float,
+        file_path: str,
+        full_refresh_interval: int = 1,
+        adaptive_waveform: bool = False
+    ) -> None:
         self.__vcom = vcom
         self.__file_path = file_path
+        self.__rectangles_file_path = '{}{}'.format(file_path, self.__class__.RECTANGLES_FILE_EXTENSION)
+        # Frames are handed over to update-display in shared memory instead
+        # of image files
+        self.__is_frame_buffer = file_path.endswith(FrameBuffer.FILE_EXTENSION)
+        self.__frame_buffer: Optional[FrameBuffer] = None
+        self.__waveform_selector: Optional[WaveformSelector] = WaveformSelector() if adaptive_waveform else None
+        # Only custom 4bpp images can be refreshed partially
+        self.__partial_refresh: Optional[PartialRefresh] = (
+            PartialRefresh(full_refresh_interval, self.__waveform_selector)
+            if full_refresh_interval > 1 and (file_path.endswith('.4bpp') or self.__is_frame_buffer) else None
+        )
         self.__update_process: Optional[subprocess.Popen] = None
+        self.__connection: Optional[DisplayConnection] = None
+        self.__panel_info: Optional[PanelInfo] = None
+        self.__last_update_result: Optional[UpdateResult] = None
+        self.__request_id = 0
+        # Id and waveform mode (of partial refreshes) of the update request
+        # update-display is still working on
+        self.__pending_request: Optional[tuple[int, Optional[WaveformMode]]] = None
+        # Waveform mode of the partial refresh of the frame loaded last
+        self.__loaded_waveform_mode: Optional[WaveformMode] = None
         self.__original_sigterm_handler = signal.getsignal(signal.SIGTERM)
 
     def __enter__(self) -> Display:
@@ -21,39 +56,84 @@ class Display:
     def __exit__(self, *_: Any) -> None:
         self.__stop()
 
+        if self.__frame_buffer is not None:
+            self.__frame_buffer.close()
+            self.__frame_buffer = None
+
     def __start(self) -> None:
         signal.signal(signal.SIGTERM, self.__sigterm_handler)
-        signal.signal(signal.SIGUSR1, self.__noop_signal_handler)
 
-        self.__update_process = subprocess.Popen(
-            [
-                self.__class__.UPDATE_DISPLAY_PATH,
-                '-d',
-                '-v',
-                str(self.__vcom),
-                '-f',
-                self.__file_path
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True
-        )
+        connection_socket, update_display_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+
+        command = [
+            self.__class__.UPDATE_DISPLAY_PATH,
+            '-v',
+            str(self.__vcom),
+            '-f',
+            self.__file_path,
+            '-s',
+            str(update_display_socket.fileno())
+        ]
+
+        if self.__partial_refresh is not None and not self.__is_frame_buffer:
+            command.extend(['-r', self.__rectangles_file_path])
 
         try:
-            signal.sigtimedwait([signal.SIGUSR1], self.__class__.TIMEOUT)
-        except InterruptedError as error:
-            self.__stop()
+            self.__update_process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                pass_fds=(update_display_socket.fileno(),)
+            )
+        except Exception as error:
+            connection_socket.close()
 
             raise error
+        finally:
+            update_display_socket.close()
+
+        self.__connection = DisplayConnection(connection_socket, self.__class__.TIMEOUT)
+        self.__panel_info = self.__communicate(self.__connection.receive_panel_info)
 
     def __stop(self) -> None:
         if self.__update_process is None:
             return
 
-        self.__update_process.send_signal(signal.SIGTERM)
-        self.__handle_process_shutdown(self.__update_process, self.__class__.TIMEOUT)
-
+        update_process = self.__update_process
         self.__update_process = None
+        self.__pending_request = None
+        self.__loaded_waveform_mode = None
+
+        try:
+            update_process.send_signal(signal.SIGTERM)
+            self.__handle_process_shutdown(update_process, self.__class__.TIMEOUT)
+        finally:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+    def __communicate(self, function: Callable[..., T], *args: Any) -> T:
+        """
+        Call 'function' of the connection to update-display, stopping
+        update-display if it does not respond in time or the connection
+        breaks.
+        """
+
+        try:
+            return function(*args)
+        except socket.timeout:
+            process_info = ProcessInfo.get_process_info(self.__update_process)
+
+            self.__stop()
+
+            raise RuntimeError('Timeout during updating display.\nProcess info:\n{}'.format(process_info))
+        except OSError as error:
+            # The exit status and the output of update-display tell more
+            # about the failure if it exited with an error
+            self.__stop()
+
+            raise RuntimeError('Lost connection to update-display: {}'.format(error)) from error
 
     @staticmethod
     def __handle_process_shutdown(process: subprocess.Popen, timeout: float) -> None:
@@ -85,22 +165,146 @@ class Display:
         signal.signal(signal.SIGTERM, self.__original_sigterm_handler)
         signal.raise_signal(signal.SIGTERM)
 
-    @staticmethod
-    def __noop_signal_handler(*_: Any) -> None:
-        pass
+    def __prepare(self) -> Optional[WaveformMode]:
+        """
+        Start update-display if needed, and hand the next frame over to it.
+        Return the waveform mode of the partial refresh of the frame (None
+        for full refreshes).
+        """
+
+        if self.__is_frame_buffer and self.__frame_buffer is None:
+            raise RuntimeError('Cannot update display before getting the frame buffer.')
 
-    def update(self) -> None:
         if self.__update_process is None:
             self.__start()
 
-        self.__update_process.send_signal(signal.SIGUSR1)
+        # The buffer of the previous frame is swapped in (or the image file
+        # is overwritten) only after update-display is done with it
+        self.wait()
 
-        try:
-            signal.sigtimedwait([signal.SIGUSR1], self.__class__.TIMEOUT)
-        except InterruptedError as error:
+        waveform_mode = None
+
+        if self.__frame_buffer is not None:
+            rectangles, waveform_mode = (
+                (None, WaveformMode.GC16) if self.__partial_refresh is None
+                else self.__partial_refresh.get_refresh(self.__frame_buffer.get_back_buffer())
+            )
+            self.__frame_buffer.swap(rectangles, waveform_mode)
+
+            if rectangles is None:
+                waveform_mode = None
+        elif self.__partial_refresh is not None:
+            waveform_mode = self.__partial_refresh.save_rectangles(self.__file_path, self.__rectangles_file_path)
+
+        return waveform_mode
+
+    def __send(self, send_function: Callable[[int], None], waveform_mode: Optional[WaveformMode]) -> None:
+        """
+        Send a request with 'send_function' of the connection to
+        update-display, waiting for its result unless a frame buffer is used.
+        """
+
+        self.__request_id += 1
+        self.__communicate(send_function, self.__request_id)
+        self.__pending_request = (self.__request_id, waveform_mode)
+
+        if not self.__is_frame_buffer:
+            self.wait()
+
+    def get_frame_buffer(self, width: int, height: int) -> FrameBuffer:
+        """
+        Return the frame buffer (of the given resolution) shared with
+        update-display, the next frame has to be saved into its back buffer
+        before calling update. Only available if the file path of the display
+        ends in FrameBuffer.FILE_EXTENSION.
+        """
+
+        if not self.__is_frame_buffer:
+            raise RuntimeError("File path '{}' is not a frame buffer.".format(self.__file_path))
+
+        if self.__frame_buffer is not None and self.__frame_buffer.get_size() != (width, height):
+            # update-display maps the frame buffer only once
             self.__stop()
+            self.__frame_buffer.close()
+            self.__frame_buffer = None
 
-            raise error
+        if self.__frame_buffer is None:
+            self.__frame_buffer = FrameBuffer(self.__file_path, width, height)
+
+        return self.__frame_buffer
+
+    def get_panel_info(self) -> Optional[PanelInfo]:
+        """
+        Return the info update-display reported about the panel, None until
+        the display has been updated first.
+        """
+
+        return self.__panel_info
+
+    def get_last_update_result(self) -> Optional[UpdateResult]:
+        return self.__last_update_result
+
+    def update(self) -> None:
+        """
+        Send an update request to update-display. Frames of the frame buffer
+        are drawn in the background, so the next frame can be saved into the
+        back buffer while the display is refreshed. Image files are drawn
+        before returning, as they are overwritten by the next frame.
+        """
+
+        waveform_mode = self.__prepare()
+        self.__send(self.__connection.send_update, waveform_mode)
+
+    def load(self) -> None:
+        """
+        Send a load request to update-display, which transfers the next frame
+        into the memory of the display controller without showing it. The
+        display keeps showing the previous frame until show is called, which
+        only has to refresh the display. Only custom 4bpp images and frame
+        buffers can be loaded in advance.
+        """
+
+        self.__loaded_waveform_mode = self.__prepare()
+        self.__send(self.__connection.send_load, None)
+
+    def show(self) -> None:
+        """
+        Send a show request to update-display, which displays the frame
+        loaded last.
+        """
+
+        if self.__update_process is None:
+            raise RuntimeError('Cannot show frame before loading it.')
+
+        # Wait for the frame to be loaded
+        self.wait()
+
+        waveform_mode = self.__loaded_waveform_mode
+        self.__loaded_waveform_mode = None
+
+        self.__send(self.__connection.send_show, waveform_mode)
+
+    def wait(self) -> None:
+        """
+        Wait for update-display to finish the last update request.
+        """
+
+        if self.__pending_request is None:
+            return
+
+        request_id, waveform_mode = self.__pending_request
+        self.__pending_request = None
+
+        update_result = self.__communicate(self.__connection.receive_update_result, request_id)
+        self.__last_update_result = update_result
+
+        if update_result.status != 0:
+            raise RuntimeError(
+                "Error during updating display ({}): '{}'.".format(update_result.status, update_result.error_message)
+            )
+
+        if waveform_mode is not None and self.__waveform_selector is not None:
+            self.__waveform_selector.record_refresh_time(waveform_mode, update_result.refresh_time)
 
     @classmethod
     def clear(cls, vcom: float) -> None:
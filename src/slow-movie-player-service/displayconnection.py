@@ -0,0 +1,147 @@
+from __future__ import annotations
+import dataclasses
+import socket
+import struct
+from typing import Any
+
+
+@dataclasses.dataclass(frozen=True)
+class PanelInfo:
+    width: int
+    height: int
+    memory_address: int
+    lut_version: str
+
+
+@dataclasses.dataclass(frozen=True)
+class UpdateResult:
+    request_id: int
+    # 0 on success, otherwise the exit status update-display would exit with
+    status: int
+    # Getting the image data ready for the controller, in seconds
+    transfer_time: float
+    # Handing the image data over to the controller and refreshing the
+    # display, in seconds
+    refresh_time: float
+    error_message: str
+
+
+class DisplayConnection:
+    """
+    Request/response protocol spoken with 'update-display' (started with
+    '-s') over a Unix socket
+
+    Every message is a single SOCK_SEQPACKET packet, starting with a header
+    followed by the payload:
+
+        +-------------------------------------------------------------+
+        | 2 bytes message type                                        |
+        +-------------------------------------------------------------+
+        | 2 bytes (signed) status, 0 on success                       |
+        +-------------------------------------------------------------+
+        | 4 bytes request id                                          |
+        +-------------------------------------------------------------+
+        | 4 bytes payload size                                        |
+        +-------------------------------------------------------------+
+
+    Every value is little endian. Once started, 'update-display' sends a
+    ready message with the panel info (width, height, memory address and
+    LUT version of the panel). Then it responds to every request with an
+    update message carrying the same request id, the status of the request,
+    the transfer and refresh times in microseconds, and the error message if
+    the request failed. Requests are served in order, so further requests can
+    be sent before the response of the previous one arrives.
+
+    Besides update requests (drawing the image), the image can be loaded
+    into the memory of the display controller in advance with a load
+    request, then displayed with a show request, which only refreshes the
+    display.
+    """
+
+    MESSAGE_HEADER = struct.Struct('<HhII')
+    PANEL_INFO = struct.Struct('<HHI16s')
+    UPDATE_TIMES = struct.Struct('<II')
+    MAX_MESSAGE_SIZE = 1024
+    READY_MESSAGE = 1
+    UPDATE_MESSAGE = 2
+    LOAD_MESSAGE = 3
+    SHOW_MESSAGE = 4
+
+    def __init__(self, connection_socket: socket.socket, timeout: float) -> None:
+        self.__socket = connection_socket
+        self.__socket.settimeout(timeout)
+
+    def __enter__(self) -> DisplayConnection:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__socket.close()
+
+    def receive_panel_info(self) -> PanelInfo:
+        _, _, payload = self.__receive(self.__class__.READY_MESSAGE)
+
+        if len(payload) != self.__class__.PANEL_INFO.size:
+            raise ConnectionError('Invalid ready message received from update-display.')
+
+        width, height, memory_address, lut_version = self.__class__.PANEL_INFO.unpack(payload)
+
+        return PanelInfo(width, height, memory_address, lut_version.split(b'\0', 1)[0].decode(errors='replace'))
+
+    def send_update(self, request_id: int) -> None:
+        self.__send_request(self.__class__.UPDATE_MESSAGE, request_id)
+
+    def send_load(self, request_id: int) -> None:
+        self.__send_request(self.__class__.LOAD_MESSAGE, request_id)
+
+    def send_show(self, request_id: int) -> None:
+        self.__send_request(self.__class__.SHOW_MESSAGE, request_id)
+
+    def receive_update_result(self, request_id: int) -> UpdateResult:
+        status, received_request_id, payload = self.__receive(self.__class__.UPDATE_MESSAGE)
+
+        if received_request_id != request_id or len(payload) < self.__class__.UPDATE_TIMES.size:
+            raise ConnectionError(
+                'Invalid response received from update-display (request {} instead of {}).'.format(
+                    received_request_id,
+                    request_id
+                )
+            )
+
+        transfer_time, refresh_time = self.__class__.UPDATE_TIMES.unpack_from(payload)
+
+        return UpdateResult(
+            request_id,
+            status,
+            transfer_time / 1_000_000,
+            refresh_time / 1_000_000,
+            payload[self.__class__.UPDATE_TIMES.size:].decode(errors='replace')
+        )
+
+    def __send_request(self, message_type: int, request_id: int) -> None:
+        self.__socket.send(self.__class__.MESSAGE_HEADER.pack(message_type, 0, request_id, 0))
+
+    def __receive(self, message_type: int) -> tuple[int, int, bytes]:
+        """
+        Return the status, the request id and the payload of the next
+        message, which has to be of 'message_type'.
+        """
+
+        message = self.__socket.recv(self.__class__.MAX_MESSAGE_SIZE)
+
+        if not message:
+            raise ConnectionError('Connection closed by update-display.')
+
+        if len(message) < self.__class__.MESSAGE_HEADER.size:
+            raise ConnectionError('Invalid message received from update-display.')
+
+        received_message_type, status, request_id, payload_size = self.__class__.MESSAGE_HEADER.unpack_from(message)
+
+        if received_message_type != message_type or len(message) != self.__class__.MESSAGE_HEADER.size + payload_size:
+            raise ConnectionError(
+                'Unexpected message received from update-display ({}).'.format(received_message_type)
+            )
+
+        return status, request_id, message[self.__class__.MESSAGE_HEADER.size:]
@@ -0,0 +1,24 @@
+import enum
+
+
+@enum.unique
+class DitheringEngine(str, enum.Enum):
+    """
+    The available implementations of Floyd-Steinberg dithering.
+
+    | Engine      | Description                                              |
+    | ----------- | -------------------------------------------------------- |
+    | NumPy       | In-process error diffusion on integer error buffers.     |
+    | ImageMagick | Pipes the image through ImageMagick's 'convert' command. |
+
+    Both engines quantize to the same 16 level grayscale palette, the
+    ImageMagick engine is kept as a fallback (it requires ImageMagick to be
+    installed).
+    """
+
+    NUMPY = 'NumPy'
+    IMAGEMAGICK = 'ImageMagick'
+
+    @classmethod
+    def _missing_(cls, _: object) -> str:
+        return cls.NUMPY
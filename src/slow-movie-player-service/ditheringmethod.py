@@ -0,0 +1,30 @@
+import enum
+
+
+@enum.unique
+class DitheringMethod(str, enum.Enum):
+    """
+    The available methods for reducing a grayscale image to 16 colors.
+
+    | Method         | Description                                        |
+    | -------------- | -------------------------------------------------- |
+    | FloydSteinberg | Error diffusion, best quality, slowest.            |
+    | Bayer4x4       | Ordered dithering using a 4x4 Bayer matrix.        |
+    | Bayer8x8       | Ordered dithering using an 8x8 Bayer matrix.       |
+    | BlueNoise      | Ordered dithering using a tiled 64x64 blue noise   |
+    |                | mask, avoids the cross-hatch pattern of Bayer      |
+    |                | matrices.                                          |
+
+    Ordered dithering methods compare every pixel to a threshold taken from
+    a matrix tiled over the image, so the whole image is quantized at once
+    instead of pixel by pixel.
+    """
+
+    FLOYDSTEINBERG = 'FloydSteinberg'
+    BAYER4X4 = 'Bayer4x4'
+    BAYER8X8 = 'Bayer8x8'
+    BLUENOISE = 'BlueNoise'
+
+    @classmethod
+    def _missing_(cls, _: object) -> str:
+        return cls.FLOYDSTEINBERG
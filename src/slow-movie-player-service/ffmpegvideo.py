@@ -0,0 +1,244 @@
+from grayscalemethod import GrayscaleMethod
+from grayscaleconverter import GrayscaleConverter
+from imagebufferpool import ImageBufferPool
+from fractions import Fraction
+import json
+import numpy
+import subprocess
+import tempfile
+from typing import Optional, Union
+
+
+class FFmpegVideo:
+    """
+    Drop-in replacement of Video decoding frames with an 'ffmpeg' process
+
+    Every frame is decoded by a separate 'ffmpeg' process, which seeks to
+    the requested position, scales the frame to the requested size while
+    decoding and writes it as raw pixels to its standard output. The pixels
+    are read straight into a buffer reused between frames, therefore a
+    returned frame is only valid until the next call of get_frame.
+
+    Frames are usually displayed minutes apart, often with frames skipped
+    between them, so a single 'ffmpeg' process streaming every frame of the
+    video would mostly decode frames to be thrown away, and would stay idle
+    (holding its decoder state) between refreshes. A new process only
+    decodes from the keyframe before the requested frame, which costs much
+    less than that.
+
+    For the luma grayscale methods (Rec601Luma and Rec709Luma) the frame is
+    converted to grayscale by 'ffmpeg' as well, which keeps the luma plane
+    of the video as is (the luma of the color space of the video is used).
+
+    Like OpenCV, 'ffmpeg' rotates the frames of rotated (e.g. portrait phone)
+    videos upright, so their width and height are swapped when probing.
+    """
+
+    FFMPEG_PATH = 'ffmpeg'
+    FFPROBE_PATH = 'ffprobe'
+    LUMA_GRAYSCALE_METHODS = (
+        GrayscaleMethod.REC601LUMA,
+        GrayscaleMethod.REC709LUMA,
+    )
+
+    def __init__(self, file_path: str) -> None:
+        self.__file_path = file_path
+        self.__frame_buffers = ImageBufferPool()
+
+        probe_process = subprocess.run(
+            [
+                self.__class__.FFPROBE_PATH,
+                '-v',
+                'error',
+                '-select_streams',
+                'v:0',
+                '-show_entries',
+                'stream=width,height,avg_frame_rate,nb_frames:stream_tags=rotate:stream_side_data=rotation'
+                ':format=duration',
+                '-of',
+                'json',
+                self.__file_path
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+        if probe_process.returncode != 0:
+            raise RuntimeError(
+                "Unable to probe video file '{}': '{!r}'.".format(self.__file_path, probe_process.stderr)
+            )
+
+        probe_result = json.loads(probe_process.stdout)
+
+        if not probe_result.get('streams'):
+            raise RuntimeError("No video stream found in video file '{}'.".format(self.__file_path))
+
+        stream = probe_result['streams'][0]
+        frame_rate = stream.get('avg_frame_rate', '0/0')
+
+        self.__width: int = int(stream['width'])
+        self.__height: int = int(stream['height'])
+        self.__frame_rate: float = float(Fraction(frame_rate)) if not frame_rate.endswith('/0') else 0.0
+
+        if self.__get_rotation(stream) % 180 != 0:
+            self.__width, self.__height = self.__height, self.__width
+
+        # Not every container stores the number of frames (e.g. Matroska),
+        # in that case it is estimated from the duration of the video.
+        self.__frame_count: int = int(stream.get('nb_frames', 0)) or round(
+            float(probe_result.get('format', {}).get('duration', 0.0)) * self.__frame_rate
+        )
+
+    @classmethod
+    def probe(cls, file_path: str) -> tuple[int, float]:
+        """
+        Return the frame count and duration of a video file (see get_stats).
+        Unlike an FFmpegVideo object, this method can be run in another process.
+        """
+
+        return cls(file_path).get_stats()
+
+    def get_frame_rate(self) -> float:
+        return self.__frame_rate
+
+    def get_stats(self) -> tuple[int, float]:
+        frame_rate = self.get_frame_rate()
+        frame_count = self.__frame_count
+        duration = (frame_count / frame_rate) * 1000.0
+
+        return frame_count, duration
+
+    def get_frame(
+        self,
+        position: Union[int, float],
+        minimum_size: Optional[tuple[int, int]] = None,
+        grayscale_method: Optional[GrayscaleMethod] = None
+    ) -> numpy.ndarray:
+        """
+        See Video.get_frame. If 'minimum_size' is given, the frame is scaled
+        by 'ffmpeg' exactly to the size it would have when fitted into
+        'minimum_size' keeping its aspect ratio (frames are never enlarged).
+        """
+
+        if not isinstance(position, (int, float)):
+            raise TypeError(
+                "Argument 'position' must be of type '{}' or '{}', but '{}' was provided instead.".format(
+                    int,
+                    float,
+                    type(position)
+                )
+            )
+
+        if position < 0:
+            raise ValueError(
+                "Value of argument 'position' must be a non-negative number, but {} was provided instead.".format(
+                    position
+                )
+            )
+
+        if isinstance(position, int):
+            if self.__frame_rate <= 0.0:
+                raise ValueError(
+                    "Cannot get frame {} of video file '{}' without a known frame rate.".format(
+                        position,
+                        self.__file_path
+                    )
+                )
+
+            timestamp = position / self.__frame_rate
+        else:
+            timestamp = position / 1000.0
+
+        width, height = self.__get_frame_size(minimum_size)
+
+        if grayscale_method in self.__class__.LUMA_GRAYSCALE_METHODS:
+            pixel_format = 'gray'
+            frame = self.__frame_buffers.get_buffer('frame', (height, width))
+        else:
+            pixel_format = 'bgr24'
+            frame = self.__frame_buffers.get_buffer('frame', (height, width, 3))
+
+        ffmpeg_command = [
+            self.__class__.FFMPEG_PATH,
+            '-v',
+            'error',
+            '-nostdin',
+            '-ss',
+            '{:.6f}'.format(timestamp),
+            '-i',
+            self.__file_path,
+            '-map',
+            '0:v:0',
+            '-frames:v',
+            '1',
+            '-vf',
+            'scale={}:{}:flags=area{}'.format(width, height, ':out_range=full' if pixel_format == 'gray' else ''),
+            '-f',
+            'rawvideo',
+            '-pix_fmt',
+            pixel_format,
+            '-'
+        ]
+
+        # The error output is written to a file, as 'ffmpeg' would block
+        # writing a pipe full of errors while the frame is still being read.
+        with tempfile.TemporaryFile() as error_file:
+            ffmpeg_process = subprocess.Popen(
+                ffmpeg_command,
+                stdout=subprocess.PIPE,
+                stderr=error_file
+            )
+
+            frame_data = memoryview(frame.reshape(-1))
+            read_size = 0
+
+            while read_size < len(frame_data):
+                chunk_size = ffmpeg_process.stdout.readinto(frame_data[read_size:])
+
+                if not chunk_size:
+                    break
+
+                read_size += chunk_size
+
+            ffmpeg_process.communicate()
+
+            if ffmpeg_process.returncode != 0 or read_size != len(frame_data):
+                error_file.seek(0)
+
+                raise RuntimeError("Unable to read video frame: '{!r}'.".format(error_file.read()))
+
+        if grayscale_method is not None:
+            frame = GrayscaleConverter.convert(frame, grayscale_method)
+
+        return frame
+
+    @staticmethod
+    def __get_rotation(stream: dict) -> int:
+        """
+        Return the rotation of the video stream in degrees, either from its
+        display matrix or from its (older) 'rotate' tag.
+        """
+
+        for side_data in stream.get('side_data_list', []):
+            if 'rotation' in side_data:
+                return int(float(side_data['rotation']))
+
+        return int(stream.get('tags', {}).get('rotate', 0))
+
+    def __get_frame_size(self, minimum_size: Optional[tuple[int, int]]) -> tuple[int, int]:
+        if minimum_size is None:
+            return self.__width, self.__height
+
+        max_width, max_height = minimum_size
+
+        if self.__width / self.__height <= max_width / max_height:
+            new_width = int(self.__width * (max_height / self.__height))
+            new_height = max_height
+        else:
+            new_width = max_width
+            new_height = int(self.__height * (max_width / self.__width))
+
+        if new_width >= self.__width or new_height >= self.__height:
+            return self.__width, self.__height
+
+        return new_width, new_height
@@ -0,0 +1,180 @@
+from __future__ import annotations
+from waveformmode import WaveformMode
+import mmap
+import numpy
+import os
+import struct
+from typing import Any, Optional
+
+
+class FrameBuffer:
+    """
+    Double-buffered (custom 4bpp) image data shared with 'update-display'
+    through a memory mapped file
+
+    Instead of writing every frame into an image file, which 'update-display'
+    would read into a newly allocated buffer again, frames are packed
+    straight into the back buffer of the mapped file. Swapping the buffers
+    publishes the back buffer (with the rectangles to be refreshed) to
+    'update-display', which draws it onto the display in place, while the
+    previous frame stays available in the other buffer.
+
+    The file starts with a header, followed by the two buffers at
+    'DATA_OFFSET':
+
+        +-------------------------------------------------------------+
+        | 4 bytes magic ('SMFB')                                      |
+        +-------------------------------------------------------------+
+        | 2 bytes version                                             |
+        +-------------------------------------------------------------+
+        | 2 bytes index of the front buffer (0 or 1)                  |
+        +-------------------------------------------------------------+
+        | 8 bytes sequence number, incremented by every swap          |
+        +-------------------------------------------------------------+
+        | 2 bytes image width, 2 bytes image height in pixels         |
+        +-------------------------------------------------------------+
+        | 2 bytes number of rectangles, 0xFFFF means clearing and     |
+        | refreshing the whole display                                |
+        +-------------------------------------------------------------+
+        | 2 bytes waveform mode of the rectangles                     |
+        +-------------------------------------------------------------+
+        | x, y, width and height of 'MAX_RECTANGLE_COUNT' rectangles  |
+        | in pixels (2 bytes each)                                    |
+        +-------------------------------------------------------------+
+
+    Every value is little endian. The buffers hold the image data of the
+    custom 4bpp format, (width * height) / 2 bytes each.
+    """
+
+    FILE_EXTENSION = '.fb'
+    MAGIC = b'SMFB'
+    VERSION = 1
+    # magic, version, front buffer index, sequence number, width, height,
+    # rectangle count, waveform mode
+    HEADER = struct.Struct('<4sHHQHHHH')
+    RECTANGLE = struct.Struct('<HHHH')
+    MAX_RECTANGLE_COUNT = 64
+    FULL_REFRESH_RECTANGLE_COUNT = 0xFFFF
+    DATA_OFFSET = 4096
+    BUFFER_COUNT = 2
+
+    def __init__(self, file_path: str, width: int, height: int) -> None:
+        if width <= 0 or height <= 0 or width % 2 != 0:
+            raise ValueError('Invalid frame buffer resolution ({}x{}).'.format(width, height))
+
+        self.__file_path = file_path
+        self.__width = width
+        self.__height = height
+        self.__front_buffer_index = 0
+        self.__sequence_number = 0
+
+        buffer_size = width * height // 2
+        file_descriptor = os.open(file_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        try:
+            os.ftruncate(file_descriptor, self.__class__.DATA_OFFSET + self.__class__.BUFFER_COUNT * buffer_size)
+            self.__mmap: Optional[mmap.mmap] = mmap.mmap(file_descriptor, 0)
+        finally:
+            os.close(file_descriptor)
+
+        self.__buffers = [
+            numpy.frombuffer(
+                self.__mmap,
+                numpy.uint8,
+                buffer_size,
+                self.__class__.DATA_OFFSET + buffer_number * buffer_size
+            ).reshape(height, width // 2)
+            for buffer_number in range(self.__class__.BUFFER_COUNT)
+        ]
+
+        self.__write_header(self.__class__.FULL_REFRESH_RECTANGLE_COUNT, WaveformMode.GC16)
+
+    def __enter__(self) -> FrameBuffer:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmap the file. The buffers returned before must not be used
+        anymore.
+        """
+
+        if self.__mmap is None:
+            return
+
+        self.__buffers = []
+
+        try:
+            self.__mmap.close()
+        except BufferError:
+            # Buffers still referenced elsewhere keep the mapping alive until
+            # they are released
+            pass
+
+        self.__mmap = None
+
+    def get_file_path(self) -> str:
+        return self.__file_path
+
+    def get_size(self) -> tuple[int, int]:
+        return self.__width, self.__height
+
+    def get_back_buffer(self) -> numpy.ndarray:
+        """
+        Return the buffer of the next frame, a row of bytes for every row of
+        pixels.
+        """
+
+        return self.__buffers[1 - self.__front_buffer_index]
+
+    def get_front_buffer(self) -> numpy.ndarray:
+        return self.__buffers[self.__front_buffer_index]
+
+    def swap(
+        self,
+        rectangles: Optional[list[tuple[int, int, int, int]]] = None,
+        waveform_mode: WaveformMode = WaveformMode.GC16
+    ) -> None:
+        """
+        Make the back buffer the front buffer to be drawn by 'update-display'
+        next. Only the (x, y, width, height) 'rectangles' of the display are
+        refreshed with 'waveform_mode', or the whole display is cleared and
+        refreshed if 'rectangles' is None.
+        """
+
+        if rectangles is None:
+            rectangle_count = self.__class__.FULL_REFRESH_RECTANGLE_COUNT
+        elif len(rectangles) > self.__class__.MAX_RECTANGLE_COUNT:
+            raise ValueError(
+                'Too many rectangles ({} > {}).'.format(len(rectangles), self.__class__.MAX_RECTANGLE_COUNT)
+            )
+        else:
+            rectangle_count = len(rectangles)
+
+            for rectangle_number, rectangle in enumerate(rectangles):
+                self.__class__.RECTANGLE.pack_into(
+                    self.__mmap,
+                    self.__class__.HEADER.size + rectangle_number * self.__class__.RECTANGLE.size,
+                    *rectangle
+                )
+
+        self.__front_buffer_index = 1 - self.__front_buffer_index
+        self.__sequence_number += 1
+
+        self.__write_header(rectangle_count, waveform_mode)
+
+    def __write_header(self, rectangle_count: int, waveform_mode: WaveformMode) -> None:
+        self.__class__.HEADER.pack_into(
+            self.__mmap,
+            0,
+            self.__class__.MAGIC,
+            self.__class__.VERSION,
+            self.__front_buffer_index,
+            self.__sequence_number,
+            self.__width,
+            self.__height,
+            rectangle_count,
+            waveform_mode
+        )
@@ -0,0 +1,122 @@
+from grayscalemethod import GrayscaleMethod
+import cv2
+import numpy
+
+
+class GrayscaleConverter:
+    """
+    Vectorized implementation of the formulas described in GrayscaleMethod
+
+    Images are expected in the BGR channel order used by OpenCV (e.g. video
+    frames returned by Video.get_frame). Conversions are done using the
+    following precomputed tables, so no per-pixel power or square root has
+    to be evaluated:
+
+      * SRGB_TO_LINEAR: the linear-RGB value of every 8 bit sRGB value.
+      * LINEAR_TO_SRGB_THRESHOLDS: the linear-RGB value halfway between each
+        pair of adjacent 8 bit sRGB values (followed by infinity). A linear
+        value is rounded to the sRGB value k for which it falls between
+        thresholds k - 1 and k.
+      * LINEAR_TO_SRGB_BINS: the sRGB value at the lower edge of each of the
+        uniform bins the linear-RGB range is divided into. Thresholds are
+        farther apart than the bin width, so the sRGB value of a linear value
+        is either the value of its bin or the next one, which is decided by
+        a single comparison with the corresponding threshold.
+      * SQUARES, ROOT_MEAN_SQUARES: the square of every 8 bit value and the
+        rounded square root of one third of every possible sum of three
+        squares (used by RMS).
+    """
+
+    LINEAR_TO_SRGB_BIN_COUNT = 4096
+
+    __SRGB_VALUES = numpy.arange(256, dtype=numpy.float64) / 255.0
+    __SRGB_MIDPOINTS = (numpy.arange(1, 256, dtype=numpy.float64) - 0.5) / 255.0
+
+    SRGB_TO_LINEAR = numpy.where(
+        __SRGB_VALUES <= 0.04045,
+        __SRGB_VALUES / 12.92,
+        ((__SRGB_VALUES + 0.055) / 1.055) ** 2.4
+    ).astype(numpy.float32)
+    LINEAR_TO_SRGB_THRESHOLDS = numpy.append(
+        numpy.where(
+            __SRGB_MIDPOINTS <= 0.04045,
+            __SRGB_MIDPOINTS / 12.92,
+            ((__SRGB_MIDPOINTS + 0.055) / 1.055) ** 2.4
+        ),
+        numpy.inf
+    ).astype(numpy.float32)
+    LINEAR_TO_SRGB_BINS = numpy.searchsorted(
+        LINEAR_TO_SRGB_THRESHOLDS,
+        numpy.arange(LINEAR_TO_SRGB_BIN_COUNT, dtype=numpy.float32) / LINEAR_TO_SRGB_BIN_COUNT,
+        side='right'
+    ).astype(numpy.uint8)
+    SQUARES = numpy.arange(256, dtype=numpy.int32) ** 2
+    ROOT_MEAN_SQUARES = numpy.rint(
+        numpy.sqrt(numpy.arange(3 * 255 ** 2 + 1, dtype=numpy.float64) / 3.0)
+    ).astype(numpy.uint8)
+
+    # Weights in B, G, R order for the methods which are a weighted sum of
+    # either the sRGB or the linear-RGB values.
+    SRGB_WEIGHTS = {
+        GrayscaleMethod.REC601LUMA: (0.114350, 0.586811, 0.298839),
+        GrayscaleMethod.REC709LUMA: (0.072186, 0.715158, 0.212656),
+        GrayscaleMethod.AVERAGE: (1.0 / 3.0, 1.0 / 3.0, 1.0 / 3.0),
+    }
+    LINEAR_WEIGHTS = {
+        GrayscaleMethod.REC601LUMINANCE: (0.114350, 0.586811, 0.298839),
+        GrayscaleMethod.REC709LUMINANCE: (0.072186, 0.715158, 0.212656),
+    }
+
+    @classmethod
+    def convert(cls, image: numpy.ndarray, grayscale_method: GrayscaleMethod) -> numpy.ndarray:
+        if len(image.shape) < 3:
+            return image
+
+        if image.shape[2] != 3:
+            raise ValueError(
+                'Cannot convert image with {} color channels to grayscale, '
+                'only BGR images can be converted.'.format(image.shape[2])
+            )
+
+        if grayscale_method in cls.SRGB_WEIGHTS:
+            return cv2.transform(
+                image,
+                numpy.array([cls.SRGB_WEIGHTS[grayscale_method]], dtype=numpy.float32)
+            )
+
+        if grayscale_method in cls.LINEAR_WEIGHTS:
+            return cls.__convert_linear_to_srgb(
+                cv2.transform(
+                    cv2.LUT(image, cls.SRGB_TO_LINEAR),
+                    numpy.array([cls.LINEAR_WEIGHTS[grayscale_method]], dtype=numpy.float32)
+                )
+            )
+
+        if grayscale_method == GrayscaleMethod.RMS:
+            sum_of_squares = cls.SQUARES[image[:, :, 0]]
+            sum_of_squares += cls.SQUARES[image[:, :, 1]]
+            sum_of_squares += cls.SQUARES[image[:, :, 2]]
+
+            return cls.ROOT_MEAN_SQUARES[sum_of_squares]
+
+        blue, green, red = cv2.split(image)
+        maximum = cv2.max(cv2.max(blue, green), red)
+
+        if grayscale_method == GrayscaleMethod.BRIGHTNESS:
+            return maximum
+
+        minimum = cv2.min(cv2.min(blue, green), red)
+
+        return cv2.addWeighted(minimum, 0.5, maximum, 0.5, 0.0)
+
+    @classmethod
+    def __convert_linear_to_srgb(cls, image: numpy.ndarray) -> numpy.ndarray:
+        bins = numpy.clip(
+            image * cls.LINEAR_TO_SRGB_BIN_COUNT,
+            0,
+            cls.LINEAR_TO_SRGB_BIN_COUNT - 1
+        ).astype(numpy.intp)
+        srgb_image = cls.LINEAR_TO_SRGB_BINS[bins]
+        srgb_image += image >= cls.LINEAR_TO_SRGB_THRESHOLDS[srgb_image]
+
+        return srgb_image
@@ -1,10 +1,15 @@
 from __future__ import annotations
 from grayscalemethod import GrayscaleMethod
+from grayscaleconverter import GrayscaleConverter
+from ditheringengine import DitheringEngine
+from ditheringmethod import DitheringMethod
+from imagebufferpool import ImageBufferPool
 import cv2
 import numpy
 import subprocess
 import os
 import tempfile
+from typing import Optional
 
 
 class Image:
@@ -18,16 +23,54 @@ class Image:
             '0 17 34 51 68 85 102 119 136 153 170 187 204 221 238 255\n'
         )
     )
+    BLUE_NOISE_MASK_SIZE = 64
+    BLUE_NOISE_MASK_SIGMA = 1.5
+    BLUE_NOISE_MASK_SEED = 0
 
-    def __init__(self, image: numpy.ndarray) -> None:
+    __threshold_maps: dict[DitheringMethod, numpy.ndarray] = {}
+
+    def __init__(self, image: numpy.ndarray, buffer_pool: Optional[ImageBufferPool] = None) -> None:
         if image.dtype != numpy.uint8:
             raise ValueError(
                 "Value of attribute 'dtype' of 'image' is not '{}'.".format(numpy.uint8)
             )
 
         self.__image = image
+        self.__buffer_pool = buffer_pool
 
-    def resize_keeping_aspect_ratio(self, max_width: int, max_height: int) -> Image:
+        # The part of the image which is not padding, dithering is only
+        # applied to this region. None means the whole image.
+        self.__content_region: Optional[tuple[slice, slice]] = None
+
+    def __get_buffer(self, name: str, shape: tuple[int, ...], dtype: type = numpy.uint8) -> numpy.ndarray:
+        if self.__buffer_pool is not None:
+            buffer = self.__buffer_pool.get_buffer(name, shape, dtype)
+
+            if not numpy.may_share_memory(buffer, self.__image):
+                return buffer
+
+        return numpy.empty(shape, dtype=dtype)
+
+    def __get_content(self) -> numpy.ndarray:
+        if self.__content_region is None:
+            return self.__image
+
+        return self.__image[self.__content_region]
+
+    def __set_content(self, content: numpy.ndarray) -> None:
+        if self.__content_region is None:
+            self.__image = content
+
+            return
+
+        if len(content.shape) != len(self.__image.shape):
+            canvas = self.__get_buffer('grayscale_canvas', self.__image.shape[:2])
+            canvas.fill(0)
+            self.__image = canvas
+
+        self.__image[self.__content_region] = content
+
+    def __get_size_keeping_aspect_ratio(self, max_width: int, max_height: int) -> tuple[int, int, int]:
         height, width = self.__image.shape[:2]
 
         if width / height <= max_width / max_height:
@@ -48,7 +91,18 @@ class Image:
         if new_width > width or new_height > height:
             interpolation = cv2.INTER_CUBIC
 
-        self.__image = cv2.resize(self.__image, (new_width, new_height), interpolation=interpolation)
+        return new_width, new_height, interpolation
+
+    def resize_keeping_aspect_ratio(self, max_width: int, max_height: int) -> Image:
+        new_width, new_height, interpolation = self.__get_size_keeping_aspect_ratio(max_width, max_height)
+
+        self.__image = cv2.resize(
+            self.__image,
+            (new_width, new_height),
+            dst=self.__get_buffer('resized_image', (new_height, new_width) + self.__image.shape[2:]),
+            interpolation=interpolation
+        )
+        self.__content_region = None
 
         return self
 
@@ -56,28 +110,332 @@ class Image:
         height, width = self.__image.shape[:2]
         x_offset = (padded_width - width) // 2
         y_offset = (padded_height - height) // 2
-        shape = (padded_height, padded_width) if len(self.__image.shape) < 3 else (padded_height, padded_width, 3)
 
-        padded_image = numpy.zeros(shape, dtype=numpy.uint8)
+        padded_image = self.__get_buffer('canvas', (padded_height, padded_width) + self.__image.shape[2:])
+        padded_image.fill(0)
         padded_image[y_offset:y_offset + height, x_offset:x_offset + width] = self.__image
         self.__image = padded_image
 
+        if self.__content_region is None:
+            self.__content_region = (slice(0, height), slice(0, width))
+
+        self.__content_region = (
+            slice(self.__content_region[0].start + y_offset, self.__content_region[0].stop + y_offset),
+            slice(self.__content_region[1].start + x_offset, self.__content_region[1].stop + x_offset),
+        )
+
         return self
 
     def resize_with_padding(self, width: int, height: int) -> Image:
-        return (self.resize_keeping_aspect_ratio(width, height)
-                    .add_padding(width, height))
+        """
+        Resize the image keeping its aspect ratio straight into the middle of
+        a black canvas of the given resolution
+
+        This gives the same result as resize_keeping_aspect_ratio followed by
+        add_padding, without allocating and copying an intermediate image.
+        Dithering methods applied afterwards leave the padding untouched.
+        """
+
+        new_width, new_height, interpolation = self.__get_size_keeping_aspect_ratio(width, height)
+        x_offset = (width - new_width) // 2
+        y_offset = (height - new_height) // 2
+
+        canvas = self.__get_buffer('canvas', (height, width) + self.__image.shape[2:])
+        canvas.fill(0)
+        content_region = (slice(y_offset, y_offset + new_height), slice(x_offset, x_offset + new_width))
+
+        cv2.resize(self.__image, (new_width, new_height), dst=canvas[content_region], interpolation=interpolation)
+
+        self.__image = canvas
+        self.__content_region = content_region
+
+        return self
 
     def convert_to_bgr(self) -> Image:
         self.__image = cv2.cvtColor(self.__image, cv2.COLOR_GRAY2BGR)
 
         return self
 
+    def convert_to_grayscale(self, grayscale_method: GrayscaleMethod = GrayscaleMethod.REC709LUMA) -> Image:
+        """
+        Reduce a BGR image to a single color channel using the formulas
+        described in GrayscaleMethod. Images that already have a single color
+        channel are left untouched.
+        """
+
+        self.__image = GrayscaleConverter.convert(self.__image, grayscale_method)
+
+        return self
+
     def apply_4bpp_floyd_steinberg_dithering(
         self,
+        grayscale_method: GrayscaleMethod = GrayscaleMethod.REC709LUMA,
+        dithering_engine: DitheringEngine = DitheringEngine.NUMPY
+    ) -> Image:
+
+        if dithering_engine == DitheringEngine.IMAGEMAGICK:
+            return self.__apply_4bpp_floyd_steinberg_dithering_with_imagemagick(grayscale_method)
+
+        return self.convert_to_grayscale(grayscale_method).__apply_4bpp_floyd_steinberg_dithering_with_numpy()
+
+    def apply_4bpp_dithering(
+        self,
+        dithering_method: DitheringMethod = DitheringMethod.FLOYDSTEINBERG,
+        grayscale_method: GrayscaleMethod = GrayscaleMethod.REC709LUMA,
+        dithering_engine: DitheringEngine = DitheringEngine.NUMPY
+    ) -> Image:
+
+        if dithering_method == DitheringMethod.FLOYDSTEINBERG:
+            return self.apply_4bpp_floyd_steinberg_dithering(grayscale_method, dithering_engine)
+
+        return self.apply_4bpp_ordered_dithering(dithering_method, grayscale_method)
+
+    def apply_4bpp_ordered_dithering(
+        self,
+        dithering_method: DitheringMethod = DitheringMethod.BAYER8X8,
         grayscale_method: GrayscaleMethod = GrayscaleMethod.REC709LUMA
     ) -> Image:
+        """
+        Dither the image to the 16 color grayscale palette using a threshold map
+
+        With n being the number of cells in the threshold map, a pixel with
+        value v (0-255) and threshold map rank r (0 to n - 1) is mapped to the
+        palette index floor(v / 17 + (r + 0.5) / n). The formula below is the
+        same multiplied by 34 * n, so it can be evaluated on integers.
+        """
+
+        if dithering_method == DitheringMethod.FLOYDSTEINBERG:
+            raise ValueError(
+                "Dithering method '{}' is not an ordered dithering method.".format(dithering_method.value)
+            )
+
+        self.convert_to_grayscale(grayscale_method)
+
+        threshold_map = self.__class__.__get_threshold_map(dithering_method)
+        cell_count = threshold_map.size
+        content = self.__get_content()
+        height, width = content.shape[:2]
 
+        thresholds = self.__get_tiled_threshold_map(dithering_method, threshold_map, height, width)
+
+        dithered_image = self.__get_buffer('dithering_buffer', (height, width), numpy.int32)
+        numpy.multiply(content, 2 * cell_count, out=dithered_image, dtype=numpy.int32)
+        dithered_image += thresholds
+        dithered_image //= 34 * cell_count
+        dithered_image *= 17
+
+        dithered_content = self.__get_buffer('dithered_image', (height, width))
+        numpy.copyto(dithered_content, dithered_image, casting='unsafe')
+
+        self.__set_content(dithered_content)
+
+        return self
+
+    def __get_tiled_threshold_map(
+        self,
+        dithering_method: DitheringMethod,
+        threshold_map: numpy.ndarray,
+        height: int,
+        width: int
+    ) -> numpy.ndarray:
+        """
+        Return the threshold map repeated over an area of 'width' x 'height'
+        pixels. With a buffer pool it is only tiled once per size.
+        """
+
+        threshold_map_height, threshold_map_width = threshold_map.shape
+
+        def tile(thresholds: numpy.ndarray) -> None:
+            thresholds[...] = numpy.tile(
+                threshold_map,
+                (-(-height // threshold_map_height), -(-width // threshold_map_width))
+            )[:height, :width]
+
+        if self.__buffer_pool is None:
+            thresholds = numpy.empty((height, width), dtype=numpy.int32)
+            tile(thresholds)
+
+            return thresholds
+
+        return self.__buffer_pool.get_initialized_buffer(
+            'threshold_map_{}'.format(dithering_method.name.lower()),
+            (height, width),
+            numpy.int32,
+            tile
+        )
+
+    @classmethod
+    def __get_threshold_map(cls, dithering_method: DitheringMethod) -> numpy.ndarray:
+        """
+        Return the threshold map of the dithering method with each rank r
+        already turned into the (2 * r + 1) * 17 term of the dithering formula
+        """
+
+        if dithering_method not in cls.__threshold_maps:
+            if dithering_method == DitheringMethod.BAYER4X4:
+                ranks = cls.__get_bayer_matrix(4)
+            elif dithering_method == DitheringMethod.BAYER8X8:
+                ranks = cls.__get_bayer_matrix(8)
+            else:
+                ranks = cls.__get_blue_noise_mask(
+                    cls.BLUE_NOISE_MASK_SIZE,
+                    cls.BLUE_NOISE_MASK_SIGMA,
+                    cls.BLUE_NOISE_MASK_SEED
+                )
+
+            cls.__threshold_maps[dithering_method] = (2 * ranks.astype(numpy.int32) + 1) * 17
+
+        return cls.__threshold_maps[dithering_method]
+
+    @staticmethod
+    def __get_bayer_matrix(size: int) -> numpy.ndarray:
+        bayer_matrix = numpy.zeros((1, 1), dtype=numpy.int32)
+
+        while bayer_matrix.shape[0] < size:
+            bayer_matrix = numpy.block([
+                [4 * bayer_matrix, 4 * bayer_matrix + 2],
+                [4 * bayer_matrix + 3, 4 * bayer_matrix + 1]
+            ])
+
+        return bayer_matrix
+
+    @staticmethod
+    def __get_blue_noise_mask(size: int, sigma: float, seed: int) -> numpy.ndarray:
+        """
+        Generate a tileable blue noise mask using the void-and-cluster method
+
+        See: Robert Ulichney, "The void-and-cluster method for dither array
+        generation", Proc. SPIE 1913 (1993).
+
+        The energy of each cell is the sum of a Gaussian filter centered on
+        every set cell (wrapping around the edges, so the mask can be tiled)
+        and it is updated incrementally whenever a cell is set or cleared.
+        After the initial pattern is relaxed (until moving the tightest
+        cluster does not change it, or at most once per cell, as ties of
+        floating-point energies could make it cycle), the set cells are
+        ranked by repeatedly removing the tightest cluster, then the
+        remaining cells by repeatedly filling the largest void.
+        """
+
+        cell_count = size * size
+        distances = numpy.minimum(numpy.arange(size), size - numpy.arange(size))
+        kernel = numpy.exp(
+            -(distances[:, numpy.newaxis] ** 2 + distances[numpy.newaxis, :] ** 2) / (2.0 * sigma * sigma)
+        )
+
+        def get_kernel_at(index: int) -> numpy.ndarray:
+            return numpy.roll(kernel, divmod(index, size), axis=(0, 1)).reshape(-1)
+
+        def get_tightest_cluster(pattern: numpy.ndarray, energy: numpy.ndarray) -> int:
+            return int(numpy.argmax(numpy.where(pattern, energy, -numpy.inf)))
+
+        def get_largest_void(pattern: numpy.ndarray, energy: numpy.ndarray) -> int:
+            return int(numpy.argmin(numpy.where(pattern, numpy.inf, energy)))
+
+        random_generator = numpy.random.default_rng(seed)
+        initial_pattern = numpy.zeros(cell_count, dtype=bool)
+        initial_pattern[random_generator.choice(cell_count, cell_count // 10, replace=False)] = True
+        initial_energy = numpy.zeros(cell_count)
+
+        for index in numpy.flatnonzero(initial_pattern):
+            initial_energy += get_kernel_at(index)
+
+        for _ in range(cell_count):
+            tightest_cluster = get_tightest_cluster(initial_pattern, initial_energy)
+            initial_pattern[tightest_cluster] = False
+            initial_energy -= get_kernel_at(tightest_cluster)
+
+            largest_void = get_largest_void(initial_pattern, initial_energy)
+            initial_pattern[largest_void] = True
+            initial_energy += get_kernel_at(largest_void)
+
+            if largest_void == tightest_cluster:
+                break
+
+        ranks = numpy.zeros(cell_count, dtype=numpy.int32)
+        initial_cell_count = int(numpy.count_nonzero(initial_pattern))
+
+        pattern = initial_pattern.copy()
+        energy = initial_energy.copy()
+
+        for rank in range(initial_cell_count - 1, -1, -1):
+            tightest_cluster = get_tightest_cluster(pattern, energy)
+            pattern[tightest_cluster] = False
+            energy -= get_kernel_at(tightest_cluster)
+            ranks[tightest_cluster] = rank
+
+        pattern = initial_pattern
+        energy = initial_energy
+
+        for rank in range(initial_cell_count, cell_count):
+            largest_void = get_largest_void(pattern, energy)
+            pattern[largest_void] = True
+            energy += get_kernel_at(largest_void)
+            ranks[largest_void] = rank
+
+        return ranks.reshape(size, size)
+
+    def __apply_4bpp_floyd_steinberg_dithering_with_numpy(self) -> Image:
+        """
+        Dither a single channel image to the 16 color grayscale palette
+
+        Pixel values and the diffused errors are kept in an integer buffer
+        scaled by 16 (the sum of the Floyd-Steinberg weights), so no division
+        is needed while distributing errors. The buffer is padded by one
+        column on both sides and by one row at the bottom, errors pushed out
+        of the image land in the padding and are discarded.
+
+        A pixel at (x, y) only depends on its left neighbour and on the three
+        pixels above it at (x - 1, y - 1), (x, y - 1) and (x + 1, y - 1). Thus
+        all pixels where x + 2 * y has the same value can be processed at once,
+        so the image is traversed in such wavefronts instead of pixel by pixel.
+        """
+
+        content = self.__get_content()
+        height, width = content.shape[:2]
+        stride = width + 2
+
+        error_buffer = self.__get_buffer('dithering_buffer', (height + 1, stride), numpy.int32)
+        error_buffer[:, 0] = 0
+        error_buffer[:, stride - 1] = 0
+        error_buffer[height, :] = 0
+        numpy.left_shift(content, 4, out=error_buffer[:height, 1:width + 1], dtype=numpy.int32)
+
+        dithered_image = self.__get_buffer('dithered_image', (height + 1, stride))
+
+        flat_error_buffer = error_buffer.reshape(-1)
+        flat_dithered_image = dithered_image.reshape(-1)
+        row_offsets = numpy.arange(height, dtype=numpy.intp) * width
+
+        for wavefront in range(width + 2 * (height - 1)):
+            first_row = max(0, (wavefront - width + 2) // 2)
+            last_row = min(height - 1, wavefront // 2)
+
+            # Index of (x, y) in the padded buffer: y * stride + x + 1, where
+            # x = wavefront - 2 * y, which simplifies to the following.
+            indices = row_offsets[first_row:last_row + 1] + (wavefront + 1)
+
+            values = (flat_error_buffer[indices] + 8) >> 4
+            numpy.clip(values, 0, 255, out=values)
+            quantized_values = (values + 8) // 17 * 17
+            errors = values - quantized_values
+
+            flat_dithered_image[indices] = quantized_values
+
+            # Indices are unique within each of the statements below, but the
+            # bottom left neighbour of a pixel is the right neighbour of the
+            # next pixel in the same wavefront, so the additions cannot be
+            # merged into a single fancy-indexed assignment.
+            flat_error_buffer[indices + 1] += 7 * errors
+            flat_error_buffer[indices + (stride - 1)] += 3 * errors
+            flat_error_buffer[indices + stride] += 5 * errors
+            flat_error_buffer[indices + (stride + 1)] += errors
+
+        self.__set_content(dithered_image[:height, 1:width + 1])
+
+        return self
+
+    def __apply_4bpp_floyd_steinberg_dithering_with_imagemagick(self, grayscale_method: GrayscaleMethod) -> Image:
         grayscale_palette_file = tempfile.NamedTemporaryFile(
             mode='w',
             encoding='ascii',
@@ -100,7 +458,7 @@ class Image:
             'pgm:-'
         ]
 
-        is_encoded, ppm_image = cv2.imencode('.ppm', self.__image)
+        is_encoded, ppm_image = cv2.imencode('.ppm', self.__get_content())
 
         if not is_encoded:
             raise RuntimeError('Image conversion failed! Cannot encode image into PPM format.')
@@ -120,7 +478,7 @@ class Image:
 
         pgm_image_data = numpy.asarray(bytearray(pgm_image), dtype=numpy.uint8)
 
-        self.__image = cv2.imdecode(pgm_image_data, cv2.IMREAD_GRAYSCALE)
+        self.__set_content(cv2.imdecode(pgm_image_data, cv2.IMREAD_GRAYSCALE))
 
         return self
 
@@ -172,6 +530,36 @@ class Image:
               is (width * height) / 2 + 3.
         """
 
+        height, width = self.__get_custom_4bpp_size()
+        pixel_count = width * height
+
+        image_file_header = bytearray()
+        image_file_header.extend(width.to_bytes(length=2, byteorder='little'))
+        image_file_header.extend(height.to_bytes(length=2, byteorder='little'))
+
+        image_file_contents = self.__get_buffer('image_file_contents', (len(image_file_header) + pixel_count // 2,))
+        image_file_contents[:len(image_file_header)] = numpy.frombuffer(image_file_header, dtype=numpy.uint8)
+        self.__pack_custom_4bpp_image_data(image_file_contents[len(image_file_header):])
+
+        with open(file_path, 'wb') as image_file:
+            image_file.write(image_file_contents)
+
+    def save_to_custom_4bpp_buffer(self, buffer: numpy.ndarray) -> None:
+        """
+        Save the image data of the custom 4bpp format (i.e. without the width
+        and height) straight into 'buffer', e.g. a buffer of a FrameBuffer
+        shared with 'update-display'. The buffer must hold exactly
+        (width * height) / 2 bytes.
+        """
+
+        height, width = self.__get_custom_4bpp_size()
+
+        if buffer.dtype != numpy.uint8 or buffer.size != width * height // 2:
+            raise ValueError("Size of 'buffer' does not match the size of the 4bpp image data.")
+
+        self.__pack_custom_4bpp_image_data(buffer.reshape(-1))
+
+    def __get_custom_4bpp_size(self) -> tuple[int, int]:
         if len(self.__image.shape) != 2:
             raise RuntimeError(
                 'Saving images to the custom 4 bits per pixel format can only work with '
@@ -197,24 +585,23 @@ class Image:
                 'Images with odd number of pixels cannot be saved.'
             )
 
-        image_file_header = bytearray()
-        image_file_header.extend(width.to_bytes(length=2, byteorder='little'))
-        image_file_header.extend(height.to_bytes(length=2, byteorder='little'))
+        return height, width
+
+    def __pack_custom_4bpp_image_data(self, image_data: numpy.ndarray) -> None:
+        height, width = self.__image.shape[:2]
+        pixel_count = width * height
 
-        image_file_data = bytearray()
-        top_four_bits_mask = numpy.uint8(0b11110000)
-        bottom_four_bits_mask = numpy.uint8(0b00001111)
-        flat_image = numpy.reshape(
-            numpy.fliplr(self.__image),
-            pixel_count,
+        flipped_image = self.__get_buffer('flipped_image', (height, width))
+        numpy.copyto(flipped_image, numpy.fliplr(self.__image))
+
+        # Each row of this array holds a pair of pixels, the first one goes
+        # into the upper four bits, the second one into the lower four bits.
+        pixel_pairs = numpy.reshape(
+            flipped_image,
+            (pixel_count // 2, 2),
             order='C'
         )
 
-        for i in range(0, pixel_count, 2):
-            image_file_data.append(
-                (flat_image[i] & top_four_bits_mask) | (flat_image[i + 1] & bottom_four_bits_mask)
-            )
-
-        with open(file_path, 'wb') as image_file:
-            image_file.write(image_file_header)
-            image_file.write(image_file_data)
+        numpy.bitwise_and(pixel_pairs[:, 0], 0b11110000, out=image_data)
+        numpy.bitwise_and(pixel_pairs[:, 1], 0b00001111, out=pixel_pairs[:, 1])
+        numpy.bitwise_or(image_data, pixel_pairs[:, 1], out=image_data)
@@ -0,0 +1,56 @@
+import numpy
+from typing import Callable
+
+
+class ImageBufferPool:
+    """
+    Named buffers reused by Image between frames
+
+    As long as the screen resolution (and the resolution of the videos)
+    does not change, every frame is processed in the same buffers, so the
+    memory used for processing frames stays the same over time.
+
+    A buffer returned by get_buffer is only valid until it is requested again
+    under the same name, thus an Image using a pool must be fully processed
+    (e.g. saved) before processing the next Image using the same pool.
+    """
+
+    def __init__(self) -> None:
+        self.__buffers: dict[str, numpy.ndarray] = {}
+
+    def get_buffer(self, name: str, shape: tuple[int, ...], dtype: type = numpy.uint8) -> numpy.ndarray:
+        """
+        Return the buffer stored under 'name', or allocate (and store) a new
+        one if there is none yet or its shape or data type is different. The
+        contents of the returned buffer are undefined.
+        """
+
+        buffer = self.__buffers.get(name)
+
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = numpy.empty(shape, dtype=dtype)
+            self.__buffers[name] = buffer
+
+        return buffer
+
+    def get_initialized_buffer(
+        self,
+        name: str,
+        shape: tuple[int, ...],
+        dtype: type,
+        initialize: Callable[[numpy.ndarray], None]
+    ) -> numpy.ndarray:
+        """
+        Return the buffer stored under 'name' like get_buffer, but a newly
+        allocated buffer is filled by 'initialize'. The contents of the
+        buffer are therefore kept between frames (e.g. for tiled threshold
+        maps), as long as no one writes into the buffer.
+        """
+
+        buffer = self.__buffers.get(name)
+
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self.get_buffer(name, shape, dtype)
+            initialize(buffer)
+
+        return buffer
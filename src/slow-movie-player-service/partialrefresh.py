@@ -0,0 +1,226 @@
+from waveformmode import WaveformMode
+from waveformselector import WaveformSelector
+from typing import Optional
+import numpy
+import os
+import struct
+
+
+class PartialRefresh:
+    """
+    Finds the areas of the display which have to be refreshed for displaying
+    the next image
+
+    Refreshing the whole display (after clearing it) takes two full-screen
+    waveform passes, even if only a small part of the image has changed
+    (which is usual for slowly played movies). Instead, the next (custom
+    4bpp) image is compared to the previous one tile by tile, and only the
+    rectangles covering the changed tiles are refreshed, without clearing
+    the display.
+
+    The whole display is still cleared and refreshed every
+    'full_refresh_interval' updates (for removing the ghosting left behind
+    by partial refreshes), when most of the tiles have changed (e.g. a scene
+    cut), or when the size of the image changes.
+
+    The rectangles are refreshed with GC16, or with the waveform chosen by a
+    'WaveformSelector' if there is one.
+
+    The rectangles are either saved into a file read by 'update-display', or
+    passed to it through a 'FrameBuffer'. The file looks like this:
+
+        +-------------------------------------------------------------+
+        | 2 bytes encoding the number of rectangles (little endian),  |
+        | 0xFFFF means clearing and refreshing the whole display      |
+        +-------------------------------------------------------------+
+        | 2 bytes encoding the waveform mode of the rectangles        |
+        | (little endian)                                             |
+        +-------------------------------------------------------------+
+        | x, y, width and height of every rectangle in pixels (2      |
+        | bytes each, little endian)                                  |
+        +-------------------------------------------------------------+
+    """
+
+    # The IT8951 controller needs the horizontal position and the width of
+    # 4bpp areas to be multiples of four pixels.
+    TILE_SIZE = 32  # pixels
+    MAX_RECTANGLE_COUNT = 16
+    # More changed tiles than this is considered a scene cut
+    MAX_CHANGED_TILE_RATIO = 0.5
+    FULL_REFRESH_RECTANGLE_COUNT = 0xFFFF
+    IMAGE_HEADER = struct.Struct('<HH')
+    # rectangle count, waveform mode
+    RECTANGLES_HEADER = struct.Struct('<HH')
+    RECTANGLE = struct.Struct('<HHHH')
+    TEMPORARY_FILE_EXTENSION = '.tmp'
+
+    def __init__(self, full_refresh_interval: int, waveform_selector: Optional[WaveformSelector] = None) -> None:
+        self.__full_refresh_interval = full_refresh_interval
+        self.__waveform_selector = waveform_selector
+        self.__previous_image_data: Optional[numpy.ndarray] = None
+        self.__spare_image_data: Optional[numpy.ndarray] = None
+        self.__partial_refresh_count = 0
+
+    def save_rectangles(self, image_file_path: str, rectangles_file_path: str) -> Optional[WaveformMode]:
+        """
+        Compare the image in 'image_file_path' to the previous one, and save
+        the rectangles of the display to be refreshed to
+        'rectangles_file_path'. Return the waveform mode of the rectangles,
+        or None if the whole display is refreshed.
+        """
+
+        image_data = self.__load_image_data(image_file_path)
+        rectangles, waveform_mode = (None, WaveformMode.GC16) if image_data is None else self.get_refresh(image_data)
+
+        if rectangles is None:
+            contents = self.__class__.RECTANGLES_HEADER.pack(self.__class__.FULL_REFRESH_RECTANGLE_COUNT, waveform_mode)
+        else:
+            contents = self.__class__.RECTANGLES_HEADER.pack(len(rectangles), waveform_mode) + b''.join(
+                self.__class__.RECTANGLE.pack(*rectangle) for rectangle in rectangles
+            )
+
+        temp_rectangles_file_path = '{}{}'.format(rectangles_file_path, self.__class__.TEMPORARY_FILE_EXTENSION)
+
+        with open(temp_rectangles_file_path, 'wb') as rectangles_file:
+            rectangles_file.write(contents)
+
+        os.replace(temp_rectangles_file_path, rectangles_file_path)
+
+        return None if rectangles is None else waveform_mode
+
+    def get_refresh(
+        self,
+        image_data: numpy.ndarray
+    ) -> tuple[Optional[list[tuple[int, int, int, int]]], WaveformMode]:
+        """
+        Return the rectangles of 'image_data' to be refreshed (see
+        get_rectangles) along with the waveform mode to refresh them with.
+        """
+
+        # Stays intact until the next image
+        previous_image_data = self.__previous_image_data
+        rectangles = self.get_rectangles(image_data)
+
+        if rectangles is None or self.__waveform_selector is None:
+            return rectangles, WaveformMode.GC16
+
+        return rectangles, self.__waveform_selector.select(
+            self.__waveform_selector.get_change_histogram(previous_image_data, image_data)
+        )
+
+    def get_rectangles(self, image_data: numpy.ndarray) -> Optional[list[tuple[int, int, int, int]]]:
+        """
+        Return the (x, y, width, height) rectangles covering the changed
+        tiles of 'image_data' (the packed pixels of a 4bpp image, a row of
+        bytes for every row of pixels), or None if the whole display has to
+        be refreshed.
+        """
+
+        previous_image_data = self.__previous_image_data
+
+        # The copies of the images are kept in two alternating buffers, so no
+        # memory is allocated as long as the size of the images is the same.
+        if self.__spare_image_data is None or self.__spare_image_data.shape != image_data.shape:
+            self.__previous_image_data = image_data.copy()
+        else:
+            self.__previous_image_data = self.__spare_image_data
+            numpy.copyto(self.__previous_image_data, image_data)
+
+        self.__spare_image_data = previous_image_data
+
+        if (previous_image_data is None
+                or previous_image_data.shape != image_data.shape
+                or image_data.shape[1] % 2 != 0
+                or self.__partial_refresh_count + 1 >= self.__full_refresh_interval):
+
+            self.__partial_refresh_count = 0
+
+            return None
+
+        changed_tiles = self.__get_changed_tiles(previous_image_data, image_data)
+
+        if changed_tiles.mean() > self.__class__.MAX_CHANGED_TILE_RATIO:
+            self.__partial_refresh_count = 0
+
+            return None
+
+        self.__partial_refresh_count += 1
+
+        height, row_size = image_data.shape
+        rectangles = [
+            (
+                x * self.__class__.TILE_SIZE,
+                y * self.__class__.TILE_SIZE,
+                min(width * self.__class__.TILE_SIZE, row_size * 2 - x * self.__class__.TILE_SIZE),
+                min(height_in_tiles * self.__class__.TILE_SIZE, height - y * self.__class__.TILE_SIZE),
+            )
+            for x, y, width, height_in_tiles in self.__get_tile_rectangles(changed_tiles)
+        ]
+
+        if len(rectangles) > self.__class__.MAX_RECTANGLE_COUNT:
+            left = min(x for x, _, _, _ in rectangles)
+            top = min(y for _, y, _, _ in rectangles)
+            right = max(x + width for x, _, width, _ in rectangles)
+            bottom = max(y + height for _, y, _, height in rectangles)
+            rectangles = [(left, top, right - left, bottom - top)]
+
+        return rectangles
+
+    @classmethod
+    def __load_image_data(cls, image_file_path: str) -> Optional[numpy.ndarray]:
+        """
+        Return the packed pixels of a 4bpp image, or None if its rows of
+        pixels do not start at byte boundaries (i.e. its width is odd).
+        """
+
+        with open(image_file_path, 'rb') as image_file:
+            contents = image_file.read()
+
+        width, height = cls.IMAGE_HEADER.unpack_from(contents)
+
+        if width % 2 != 0:
+            return None
+
+        return numpy.frombuffer(contents, numpy.uint8, offset=cls.IMAGE_HEADER.size).reshape(height, width // 2)
+
+    @classmethod
+    def __get_changed_tiles(cls, previous_image_data: numpy.ndarray, image_data: numpy.ndarray) -> numpy.ndarray:
+        height, row_size = image_data.shape
+        tile_row_size = cls.TILE_SIZE // 2
+        tile_row_count = -(-height // cls.TILE_SIZE)
+        tile_column_count = -(-row_size // tile_row_size)
+
+        changed_bytes = numpy.zeros((tile_row_count * cls.TILE_SIZE, tile_column_count * tile_row_size), dtype=bool)
+        numpy.not_equal(previous_image_data, image_data, out=changed_bytes[:height, :row_size])
+
+        return changed_bytes.reshape(tile_row_count, cls.TILE_SIZE, tile_column_count, tile_row_size).any(axis=(1, 3))
+
+    @staticmethod
+    def __get_tile_rectangles(changed_tiles: numpy.ndarray) -> list[list[int]]:
+        """
+        Return the (x, y, width, height) rectangles (in tiles) covering the
+        changed tiles. Runs of changed tiles in a row are merged with the
+        same runs of the previous row.
+        """
+
+        rectangles: list[list[int]] = []
+        previous_row_rectangles: dict[tuple[int, int], list[int]] = {}
+
+        for y, tile_row in enumerate(changed_tiles):
+            edges = numpy.flatnonzero(numpy.diff(numpy.concatenate(([0], tile_row.astype(numpy.int8), [0]))))
+            row_rectangles: dict[tuple[int, int], list[int]] = {}
+
+            for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+                rectangle = previous_row_rectangles.get((start, end))
+
+                if rectangle is None:
+                    rectangle = [start, y, end - start, 1]
+                    rectangles.append(rectangle)
+                else:
+                    rectangle[3] += 1
+
+                row_rectangles[(start, end)] = rectangle
+
+            previous_row_rectangles = row_rectangles
+
+        return rectangles
@@ -0,0 +1,137 @@
+import os
+import struct
+import zlib
+from typing import Optional
+
+
+class PlaybackJournal:
+    """
+    Append-only journal of playback positions written between snapshots of
+    the video library
+
+    Saving the whole video library after every frame would mean rewriting a
+    file proportional to the size of the library, instead a small fixed-size
+    record is appended to the journal (and synced to the disk) every time the
+    playback position of a video changes. The journal starts with a header
+    identifying the snapshot (the saved video library file) the records are
+    based on, so the records of an outdated journal are never applied to a
+    newer snapshot (e.g. after a crash right after saving a snapshot).
+
+    The header and every record end with the CRC-32 checksum of their
+    contents. Reading stops at the first incomplete or corrupted record,
+    which can only be the last one, written partially due to a crash or a
+    power loss.
+    """
+
+    MAGIC = b'SMPJ'
+    VERSION = 1
+    # magic, version, inode number, modification time and size of the
+    # snapshot
+    HEADER = struct.Struct('<4sIQqQ')
+    # video number (position in the snapshot), next frame, next timestamp
+    RECORD = struct.Struct('<Iqd')
+    # Video number of the records resetting the playback position of every
+    # video (i.e. playback restarted from the beginning of the library)
+    RESET_VIDEO_NUMBER = 0xFFFFFFFF
+    CHECKSUM = struct.Struct('<I')
+
+    def __init__(self, file_path: str) -> None:
+        self.__file_path = file_path
+        self.__file_descriptor = -1
+        self.__record_count = 0
+
+    def __del__(self) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of records appended since the last reset."""
+
+        return self.__record_count
+
+    def close(self) -> None:
+        if self.__file_descriptor >= 0:
+            os.close(self.__file_descriptor)
+            self.__file_descriptor = -1
+
+    def load(self, snapshot_file_path: str) -> list[tuple[int, int, float]]:
+        """
+        Return the (video number, next frame, next timestamp) records of the
+        journal in the order they were appended, or an empty list if there is
+        no journal, or it does not belong to the given snapshot.
+        """
+
+        try:
+            with open(self.__file_path, 'rb') as journal_file:
+                contents = journal_file.read()
+
+            snapshot_header = self.__get_snapshot_header(snapshot_file_path)
+        except FileNotFoundError:
+            return []
+
+        header = self.__unpack(self.__class__.HEADER, contents, 0)
+
+        if header is None or self.__class__.HEADER.pack(*header) != snapshot_header:
+            return []
+
+        records: list[tuple[int, int, float]] = []
+        offset = self.__class__.HEADER.size + self.__class__.CHECKSUM.size
+
+        while True:
+            record = self.__unpack(self.__class__.RECORD, contents, offset)
+
+            if record is None:
+                break
+
+            records.append(record)
+            offset += self.__class__.RECORD.size + self.__class__.CHECKSUM.size
+
+        return records
+
+    def reset(self, snapshot_file_path: str) -> None:
+        """
+        Discard every record, and start a new journal based on the given
+        (already saved) snapshot.
+        """
+
+        self.close()
+        self.__file_descriptor = os.open(self.__file_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC | os.O_APPEND)
+        self.__record_count = 0
+        self.__write(self.__get_snapshot_header(snapshot_file_path))
+
+    def append(self, video_number: int, next_frame: int, next_timestamp: float) -> None:
+        if self.__file_descriptor < 0:
+            raise RuntimeError("Cannot append to playback journal '{}' before resetting it.".format(self.__file_path))
+
+        self.__write(self.__class__.RECORD.pack(video_number, next_frame, next_timestamp))
+        self.__record_count += 1
+
+    def __write(self, data: bytes) -> None:
+        os.write(self.__file_descriptor, data + self.__class__.CHECKSUM.pack(zlib.crc32(data)))
+        os.fdatasync(self.__file_descriptor)
+
+    @classmethod
+    def __get_snapshot_header(cls, snapshot_file_path: str) -> bytes:
+        snapshot_stat = os.stat(snapshot_file_path)
+
+        return cls.HEADER.pack(
+            cls.MAGIC,
+            cls.VERSION,
+            snapshot_stat.st_ino,
+            snapshot_stat.st_mtime_ns,
+            snapshot_stat.st_size
+        )
+
+    @classmethod
+    def __unpack(cls, structure: struct.Struct, contents: bytes, offset: int) -> Optional[tuple]:
+        end = offset + structure.size
+
+        if len(contents) < end + cls.CHECKSUM.size:
+            return None
+
+        data = contents[offset:end]
+        (checksum,) = cls.CHECKSUM.unpack_from(contents, end)
+
+        if zlib.crc32(data) != checksum:
+            return None
+
+        return structure.unpack(data)
@@ -0,0 +1,21 @@
+import enum
+
+
+@enum.unique
+class RandomFrameSampling(str, enum.Enum):
+    """
+    The available ways of choosing the video of a random frame.
+
+    | Sampling | Description                                                 |
+    | -------- | ----------------------------------------------------------- |
+    | Video    | Every video is chosen with the same probability.            |
+    | Frame    | Every frame of every video is chosen with the same          |
+    |          | probability, i.e. videos are weighted by their frame count. |
+    """
+
+    VIDEO = 'Video'
+    FRAME = 'Frame'
+
+    @classmethod
+    def _missing_(cls, _: object) -> str:
+        return cls.VIDEO
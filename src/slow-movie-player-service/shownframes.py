@@ -0,0 +1,201 @@
+from typing import Iterable
+import numpy
+import os
+import random
+import struct
+
+
+class ShownFrames:
+    """
+    Packed per-video bitmaps of the frames already displayed in random frame
+    mode, for not displaying any frame again until every frame of the video
+    library has been displayed
+
+    Every frame takes a single bit, so the bitmaps of a library of several
+    hundred hours of videos take a few hundred kilobytes (both in memory and
+    in the file they are saved to). The file starts with a header, followed
+    by the path, frame count and bitmap of every video, so marking a frame
+    as displayed only rewrites a single byte of the file in place.
+
+    The bitmaps can be lost without much harm, thus a missing or unreadable
+    file is simply discarded.
+    """
+
+    MAGIC = b'SMPS'
+    VERSION = 1
+    # magic, version, video count
+    HEADER = struct.Struct('<4sII')
+    # length of the (UTF-8 encoded) path, frame count
+    VIDEO_HEADER = struct.Struct('<IQ')
+    TEMPORARY_FILE_EXTENSION = '.tmp'
+
+    def __init__(self, file_path: str) -> None:
+        self.__file_path = file_path
+        self.__video_paths: list[str] = []
+        self.__frame_counts: list[int] = []
+        self.__bitmaps: list[numpy.ndarray] = []
+        self.__bitmap_offsets: list[int] = []
+        self.__unshown_frame_counts: numpy.ndarray = numpy.zeros(0, dtype=numpy.int64)
+
+        try:
+            self.__load()
+        except (OSError, ValueError, struct.error):
+            self.__set_videos([], [], [])
+
+    def __load(self) -> None:
+        with open(self.__file_path, 'rb') as shown_frames_file:
+            contents = shown_frames_file.read()
+
+        magic, version, video_count = self.__class__.HEADER.unpack_from(contents, 0)
+
+        if magic != self.__class__.MAGIC or version != self.__class__.VERSION:
+            raise ValueError("Invalid shown frames file '{}'.".format(self.__file_path))
+
+        video_paths: list[str] = []
+        frame_counts: list[int] = []
+        bitmaps: list[numpy.ndarray] = []
+        offset = self.__class__.HEADER.size
+
+        for _ in range(video_count):
+            path_length, frame_count = self.__class__.VIDEO_HEADER.unpack_from(contents, offset)
+            offset += self.__class__.VIDEO_HEADER.size
+            bitmap_offset = offset + path_length
+            bitmap_end = bitmap_offset + self.__get_bitmap_size(frame_count)
+
+            if len(contents) < bitmap_end:
+                raise ValueError("Truncated shown frames file '{}'.".format(self.__file_path))
+
+            video_paths.append(contents[offset:bitmap_offset].decode('utf-8'))
+            frame_counts.append(frame_count)
+            bitmaps.append(numpy.frombuffer(contents, numpy.uint8, bitmap_end - bitmap_offset, bitmap_offset).copy())
+            offset = bitmap_end
+
+        self.__set_videos(video_paths, frame_counts, bitmaps)
+
+    def __save(self) -> None:
+        temp_file_path = '{}{}'.format(self.__file_path, self.__class__.TEMPORARY_FILE_EXTENSION)
+
+        with open(temp_file_path, 'wb') as shown_frames_file:
+            shown_frames_file.write(
+                self.__class__.HEADER.pack(self.__class__.MAGIC, self.__class__.VERSION, len(self.__video_paths))
+            )
+
+            for video_path, frame_count, bitmap in zip(self.__video_paths, self.__frame_counts, self.__bitmaps):
+                encoded_video_path = video_path.encode('utf-8')
+
+                shown_frames_file.write(self.__class__.VIDEO_HEADER.pack(len(encoded_video_path), frame_count))
+                shown_frames_file.write(encoded_video_path)
+                shown_frames_file.write(bitmap.tobytes())
+
+            shown_frames_file.flush()
+            os.fsync(shown_frames_file.fileno())
+
+        os.replace(temp_file_path, self.__file_path)
+
+    def __set_videos(self, video_paths: list[str], frame_counts: list[int], bitmaps: list[numpy.ndarray]) -> None:
+        self.__video_paths = video_paths
+        self.__frame_counts = frame_counts
+        self.__bitmaps = bitmaps
+        self.__bitmap_offsets = []
+        self.__unshown_frame_counts = numpy.zeros(len(video_paths), dtype=numpy.int64)
+
+        offset = self.__class__.HEADER.size
+
+        for video_number, (video_path, frame_count, bitmap) in enumerate(zip(video_paths, frame_counts, bitmaps)):
+            offset += self.__class__.VIDEO_HEADER.size + len(video_path.encode('utf-8'))
+            self.__bitmap_offsets.append(offset)
+            self.__unshown_frame_counts[video_number] = frame_count - int(
+                numpy.unpackbits(bitmap, count=frame_count, bitorder='little').sum()
+            )
+            offset += bitmap.size
+
+    def update(self, videos: Iterable[tuple[str, int]]) -> None:
+        """
+        Update the bitmaps to the (path, frame count) pairs of the videos in
+        the video library. Videos with an unchanged frame count keep their
+        displayed frames.
+        """
+
+        bitmaps_by_path = dict(zip(self.__video_paths, self.__bitmaps))
+        frame_counts_by_path = dict(zip(self.__video_paths, self.__frame_counts))
+        video_paths: list[str] = []
+        frame_counts: list[int] = []
+        bitmaps: list[numpy.ndarray] = []
+
+        for video_path, frame_count in videos:
+            video_paths.append(video_path)
+            frame_counts.append(frame_count)
+
+            if frame_counts_by_path.get(video_path) == frame_count:
+                bitmaps.append(bitmaps_by_path[video_path])
+            else:
+                bitmaps.append(numpy.zeros(self.__get_bitmap_size(frame_count), dtype=numpy.uint8))
+
+        if video_paths == self.__video_paths and frame_counts == self.__frame_counts:
+            return
+
+        self.__set_videos(video_paths, frame_counts, bitmaps)
+        self.__save()
+
+    def choose(self, weighted: bool = False) -> tuple[str, int]:
+        """
+        Return the path of a random video and a random frame of it which has
+        not been displayed yet, and mark the frame as displayed. Once every
+        frame has been displayed, every frame is marked as not displayed.
+
+        If 'weighted' is True, every frame not displayed yet is chosen with
+        the same probability, otherwise every video with any frame not
+        displayed yet.
+        """
+
+        if not self.__unshown_frame_counts.any():
+            if not any(self.__frame_counts):
+                raise KeyError('Cannot choose a random frame without any video frames.')
+
+            for bitmap in self.__bitmaps:
+                bitmap.fill(0)
+
+            self.__set_videos(self.__video_paths, self.__frame_counts, self.__bitmaps)
+            self.__save()
+
+        # Finding the video and the frame only takes a few vectorized passes
+        # over the unshown frame counts and the bitmap of the chosen video,
+        # independently of how many frames have been displayed already.
+        weights = self.__unshown_frame_counts if weighted else self.__unshown_frame_counts > 0
+        cumulative_weights = numpy.cumsum(weights)
+        video_number = int(
+            numpy.searchsorted(cumulative_weights, random.randrange(int(cumulative_weights[-1])), side='right')
+        )
+        bitmap = self.__bitmaps[video_number]
+        unshown_frames = numpy.flatnonzero(
+            numpy.unpackbits(bitmap, count=self.__frame_counts[video_number], bitorder='little') == 0
+        )
+        frame = int(unshown_frames[random.randrange(unshown_frames.size)])
+
+        bitmap[frame >> 3] |= 1 << (frame & 7)
+        self.__unshown_frame_counts[video_number] -= 1
+        self.__write_bitmap_byte(video_number, frame >> 3)
+
+        return self.__video_paths[video_number], frame
+
+    def __write_bitmap_byte(self, video_number: int, byte_number: int) -> None:
+        try:
+            shown_frames_file = os.open(self.__file_path, os.O_WRONLY)
+        except FileNotFoundError:
+            self.__save()
+
+            return
+
+        try:
+            os.pwrite(
+                shown_frames_file,
+                self.__bitmaps[video_number][byte_number:byte_number + 1].tobytes(),
+                self.__bitmap_offsets[video_number] + byte_number
+            )
+            os.fdatasync(shown_frames_file)
+        finally:
+            os.close(shown_frames_file)
+
+    @staticmethod
+    def __get_bitmap_size(frame_count: int) -> int:
+        return (frame_count + 7) // 8
@@ -1,53 +1,86 @@
 #!/usr/bin/env python3
 
 from videolibrary import VideoLibrary
+from directorywatcher import DirectoryWatcher
 from image import Image
+from imagebufferpool import ImageBufferPool
 from configuration import Configuration
 from display import Display
 
 import os
 import time
 import argparse
+from typing import Optional
 
 
 class SlowMoviePlayer:
     def __init__(self, config: Configuration) -> None:
         self.__config = config
-        self.__video_library = VideoLibrary(self.__config.video_directory)
+        self.__video_library = VideoLibrary(
+            self.__config.video_directory,
+            self.__config.video_backend,
+            self.__config.keyframe_tolerance,
+            self.__config.video_library_backend,
+            self.__config.random_frame_sampling,
+            self.__config.random_frame_no_repeat
+        )
+        self.__image_buffer_pool = ImageBufferPool()
+        self.__directory_watcher: Optional[DirectoryWatcher] = (
+            DirectoryWatcher(self.__config.video_directory) if self.__config.watch_video_directory else None
+        )
 
     def run(self) -> None:
-        # image_file_name = 'frame.bmp'
-        image_file_name = 'frame.4bpp'
+        image_file_name = 'frame.fb'
+
+        with Display(
+            self.__config.vcom,
+            image_file_name,
+            self.__config.full_refresh_interval,
+            self.__config.adaptive_waveform
+        ) as display:
+            show_time: Optional[float] = None
 
-        with Display(self.__config.vcom, image_file_name) as display:
             while True:
-                start_time = time.monotonic()
+                if self.__directory_watcher is not None:
+                    changed_paths = self.__directory_watcher.get_changed_paths()
+
+                    # None means that events were lost, so every file may have changed
+                    if changed_paths is None or changed_paths:
+                        self.__video_library.update(changed_paths)
+
+                screen_size = (self.__config.screen_width, self.__config.screen_height)
+                grayscale_method = self.__config.grayscale_method if self.__config.grayscale_before_resize else None
 
                 if self.__config.random_frame:
-                    image = Image(self.__video_library.get_random_frame())
+                    frame = self.__video_library.get_random_frame(screen_size, grayscale_method)
                 else:
-                    image = Image(self.__video_library.get_next_frame(self.__config.skip))
+                    frame = self.__video_library.get_next_frame(self.__config.skip, screen_size, grayscale_method)
+
+                image = Image(frame, self.__image_buffer_pool)
 
-                # (image.resize_with_padding(self.__config.screen_width, self.__config.screen_height)
-                #       .save_to_bmp(image_file_name))
+                frame_buffer = display.get_frame_buffer(self.__config.screen_width, self.__config.screen_height)
 
-                # (image.resize_keeping_aspect_ratio(self.__config.screen_width, self.__config.screen_height)
-                #       .apply_4bpp_floyd_steinberg_dithering()
-                #       .add_padding(self.__config.screen_width, self.__config.screen_height)
-                #       .convert_to_bgr()
-                #       .save_to_bmp(image_file_name))
+                (image.resize_with_padding(self.__config.screen_width, self.__config.screen_height)
+                      .apply_4bpp_dithering(
+                          self.__config.dithering_method,
+                          self.__config.grayscale_method,
+                          self.__config.dithering_engine
+                      )
+                      .save_to_custom_4bpp_buffer(frame_buffer.get_back_buffer()))
 
-                (image.resize_keeping_aspect_ratio(self.__config.screen_width, self.__config.screen_height)
-                      .apply_4bpp_floyd_steinberg_dithering(self.__config.grayscale_method)
-                      .add_padding(self.__config.screen_width, self.__config.screen_height)
-                      .save_to_custom_4bpp_image(image_file_name))
+                # The frame is transferred to the display controller while the
+                # previous one is on the screen, so only the refresh of the
+                # display is left when the next frame is due
+                display.load()
 
-                display.update()
+                if show_time is not None:
+                    remaining_time = show_time + self.__config.refresh_timeout - time.monotonic()
 
-                elapsed_time = time.monotonic() - start_time
+                    if remaining_time > 0.0:
+                        time.sleep(remaining_time)
 
-                if elapsed_time < self.__config.refresh_timeout:
-                    time.sleep(self.__config.refresh_timeout - elapsed_time)
+                show_time = time.monotonic()
+                display.show()
 
 
 if __name__ == '__main__':
@@ -1,15 +1,37 @@
+from grayscalemethod import GrayscaleMethod
+from grayscaleconverter import GrayscaleConverter
+from videoindex import VideoIndex
 import cv2
+import math
 import numpy
-from typing import Union
+from typing import Optional, Union
 
 
 class Video:
-    def __init__(self, file_path: str) -> None:
+    # Without an index, frames closer than this after the current position of
+    # the decoder are reached by decoding forward instead of seeking, which
+    # would restart decoding from the preceding keyframe (usually more than a
+    # second of video away).
+    MAX_FORWARD_DECODE_FRAME_COUNT = 32
+
+    def __init__(self, file_path: str, video_index: Optional[VideoIndex] = None) -> None:
         self.__video = cv2.VideoCapture(file_path)
+        self.__video_index = video_index
+        # Index of the frame read() returns next, None if unknown
+        self.__next_frame: Optional[int] = None
 
     def __del__(self) -> None:
         self.__video.release()
 
+    @classmethod
+    def probe(cls, file_path: str) -> tuple[int, float]:
+        """
+        Return the frame count and duration of a video file (see get_stats).
+        Unlike a Video object, this method can be run in another process.
+        """
+
+        return cls(file_path).get_stats()
+
     def get_frame_rate(self) -> float:
         return self.__video.get(cv2.CAP_PROP_FPS)
 
@@ -20,7 +42,24 @@ class Video:
 
         return frame_count, duration
 
-    def get_frame(self, position: Union[int, float]) -> numpy.ndarray:
+    def get_frame(
+        self,
+        position: Union[int, float],
+        minimum_size: Optional[tuple[int, int]] = None,
+        grayscale_method: Optional[GrayscaleMethod] = None
+    ) -> numpy.ndarray:
+        """
+        Return the frame at 'position' (frame index if int, timestamp in
+        milliseconds if float).
+
+        If 'minimum_size' (width, height) is given, the frame is shrunk right
+        after decoding by the largest integer factor which still keeps it at
+        least as large as it would be when fitted into 'minimum_size' keeping
+        its aspect ratio, so the rest of the pipeline never works on e.g. a
+        full 4K frame. If 'grayscale_method' is given, the (shrunk) frame is
+        converted to a single channel grayscale frame.
+        """
+
         if not isinstance(position, (int, float)):
             raise TypeError(
                 "Argument 'position' must be of type '{}' or '{}', but '{}' was provided instead.".format(
@@ -37,7 +76,23 @@ class Video:
                 )
             )
 
-        if isinstance(position, int):
+        # The index maps timestamps to frames exactly, even if the frame rate
+        # of the video is variable.
+        if isinstance(position, float) and self.__video_index is not None:
+            indexed_frame = self.__video_index.get_frame_at(position)
+
+            if indexed_frame is not None:
+                position = indexed_frame
+
+        forward_frame_count = self.__get_forward_frame_count(position)
+
+        if forward_frame_count is not None:
+            for _ in range(forward_frame_count):
+                if not self.__video.grab():
+                    self.__next_frame = None
+
+                    raise RuntimeError('Unable to read video frame.')
+        elif isinstance(position, int):
             self.__video.set(cv2.CAP_PROP_POS_FRAMES, position)
         else:
             self.__video.set(cv2.CAP_PROP_POS_MSEC, position)
@@ -45,6 +100,60 @@ class Video:
         is_read, frame = self.__video.read()
 
         if not is_read:
+            self.__next_frame = None
+
             raise RuntimeError('Unable to read video frame.')
 
+        self.__next_frame = int(self.__video.get(cv2.CAP_PROP_POS_FRAMES))
+
+        if minimum_size is not None:
+            frame = self.__reduce_frame(frame, *minimum_size)
+
+        if grayscale_method is not None:
+            frame = GrayscaleConverter.convert(frame, grayscale_method)
+
         return frame
+
+    def __get_forward_frame_count(self, position: Union[int, float]) -> Optional[int]:
+        """
+        Return the number of frames to skip with grab() before the frame at
+        'position' can be read, or None if seeking is necessary.
+        """
+
+        if self.__next_frame is None:
+            return None
+
+        if isinstance(position, int):
+            target_frame: float = position
+        else:
+            # Same rounding as OpenCV's FFmpeg backend uses when seeking by
+            # timestamp
+            target_frame = position * self.get_frame_rate() * 0.001 + 0.5
+
+        forward_frame_count = target_frame - self.__next_frame
+
+        if not 0 <= forward_frame_count < math.inf:
+            return None
+
+        if self.__video_index is None:
+            if forward_frame_count > self.__class__.MAX_FORWARD_DECODE_FRAME_COUNT:
+                return None
+        elif self.__video_index.get_keyframe_before(int(target_frame)) > self.__next_frame:
+            # Seeking would start decoding from a keyframe after the current
+            # position, which is closer to the target frame.
+            return None
+
+        return int(forward_frame_count)
+
+    @staticmethod
+    def __reduce_frame(frame: numpy.ndarray, minimum_width: int, minimum_height: int) -> numpy.ndarray:
+        height, width = frame.shape[:2]
+        factor = int(max(width / minimum_width, height / minimum_height))
+
+        if factor < 2:
+            return frame
+
+        # An integer scale factor (given as fx and fy instead of the
+        # destination size) makes INTER_AREA average factor x factor blocks,
+        # which is much faster than the generic area interpolation.
+        return cv2.resize(frame, None, fx=1.0 / factor, fy=1.0 / factor, interpolation=cv2.INTER_AREA)
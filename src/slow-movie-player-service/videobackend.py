@@ -0,0 +1,24 @@
+import enum
+
+
+@enum.unique
+class VideoBackend(str, enum.Enum):
+    """
+    The available implementations for decoding video frames.
+
+    | Backend | Description                                                  |
+    | ------- | ------------------------------------------------------------ |
+    | OpenCV  | Decodes full size BGR frames using OpenCV's VideoCapture.    |
+    | FFmpeg  | Runs 'ffmpeg', which seeks, scales and converts the frame to |
+    |         | grayscale while decoding and pipes the raw frame back.       |
+
+    Both backends return the same kind of frames, the FFmpeg backend
+    requires FFmpeg to be installed.
+    """
+
+    OPENCV = 'OpenCV'
+    FFMPEG = 'FFmpeg'
+
+    @classmethod
+    def _missing_(cls, _: object) -> str:
+        return cls.OPENCV
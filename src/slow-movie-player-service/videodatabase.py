@@ -0,0 +1,265 @@
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping
+from array import array
+from itertools import accumulate
+from typing import Optional
+import bisect
+import random
+import sqlite3
+
+
+class VideoDatabase(MutableMapping):
+    """
+    Video library stored in an SQLite database
+
+    Works like the OrderedDict the JSON video library is kept in (videos are
+    iterated in the order they were added, and values are the same ordered
+    dicts), but only the rows actually used are read from the database, so
+    the memory used does not grow with the size of the library.
+
+    Besides one row per video, the database stores a cursor pointing at the
+    current video: every video before the current one has been played to
+    its end, so the next video to be played is found by a single indexed
+    query starting at the cursor, instead of checking every video from the
+    beginning of the library.
+
+    Changes are only written to the database by commit. The database is in
+    WAL mode, so a commit appends the changed pages to the write-ahead log
+    instead of rewriting the database file.
+    """
+
+    COLUMN_NAMES = (
+        'file_size',
+        'modification_time',
+        'inode',
+        'frame_count',
+        'duration',
+        'next_frame',
+        'next_timestamp',
+    )
+    CURRENT_VIDEO_STATE_NAME = 'current_video'
+    MAX_RANDOM_ID_ATTEMPTS = 16
+
+    def __init__(self, file_path: str) -> None:
+        self.__connection = sqlite3.connect(file_path)
+        self.__connection.execute('PRAGMA journal_mode = WAL')
+        self.__connection.execute('PRAGMA synchronous = FULL')
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS videos ('
+            'id INTEGER PRIMARY KEY, '
+            'path TEXT NOT NULL UNIQUE, '
+            'file_size INTEGER, '
+            'modification_time INTEGER, '
+            'inode INTEGER, '
+            'frame_count INTEGER NOT NULL, '
+            'duration REAL NOT NULL, '
+            'next_frame INTEGER NOT NULL, '
+            'next_timestamp REAL NOT NULL'
+            ')'
+        )
+        self.__connection.execute('CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        self.__connection.commit()
+
+        self.__columns = ', '.join(self.__class__.COLUMN_NAMES)
+        # Ids of the videos and the total frame count of the videos before
+        # (and including) each video, built on the first frame count
+        # weighted random choice after the videos have changed
+        self.__video_ids: Optional[array] = None
+        self.__cumulative_frame_counts: Optional[array] = None
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__connection.close()
+
+    def commit(self) -> None:
+        self.__connection.commit()
+
+    def __getitem__(self, video_path: str) -> OrderedDict:
+        row = self.__connection.execute(
+            'SELECT {} FROM videos WHERE path = ?'.format(self.__columns),
+            (video_path,)
+        ).fetchone()
+
+        if row is None:
+            raise KeyError(video_path)
+
+        return OrderedDict(zip(self.__class__.COLUMN_NAMES, row))
+
+    def __setitem__(self, video_path: str, video_info: dict) -> None:
+        values = [video_info.get(column_name) for column_name in self.__class__.COLUMN_NAMES]
+
+        self.__connection.execute(
+            'INSERT INTO videos (path, {}) VALUES (?, {}) ON CONFLICT (path) DO UPDATE SET {}'.format(
+                self.__columns,
+                ', '.join('?' * len(values)),
+                ', '.join(
+                    '{0} = excluded.{0}'.format(column_name) for column_name in self.__class__.COLUMN_NAMES
+                )
+            ),
+            (video_path, *values)
+        )
+        self.__video_ids = None
+
+        # Keep every video before the current one finished
+        if (video_info['next_frame'] < video_info['frame_count']
+                and video_info['next_timestamp'] < video_info['duration']):
+            (video_id,) = self.__connection.execute(
+                'SELECT id FROM videos WHERE path = ?',
+                (video_path,)
+            ).fetchone()
+
+            if video_id < self.__get_current_video_id():
+                self.__set_current_video_id(video_id)
+
+    def __delitem__(self, video_path: str) -> None:
+        if self.__connection.execute('DELETE FROM videos WHERE path = ?', (video_path,)).rowcount == 0:
+            raise KeyError(video_path)
+
+        self.__video_ids = None
+
+    def __iter__(self) -> Iterator[str]:
+        for (video_path,) in self.__connection.execute('SELECT path FROM videos ORDER BY id'):
+            yield video_path
+
+    def __len__(self) -> int:
+        return self.__connection.execute('SELECT COUNT(*) FROM videos').fetchone()[0]
+
+    def __bool__(self) -> bool:
+        return self.__connection.execute('SELECT EXISTS (SELECT 1 FROM videos)').fetchone()[0] == 1
+
+    def __contains__(self, video_path: object) -> bool:
+        return self.__connection.execute(
+            'SELECT EXISTS (SELECT 1 FROM videos WHERE path = ?)',
+            (video_path,)
+        ).fetchone()[0] == 1
+
+    def items(self) -> Iterator[tuple[str, OrderedDict]]:
+        for video_path, *values in self.__connection.execute(
+            'SELECT path, {} FROM videos ORDER BY id'.format(self.__columns)
+        ):
+            yield video_path, OrderedDict(zip(self.__class__.COLUMN_NAMES, values))
+
+    def get_current_item(self) -> Optional[tuple[str, OrderedDict]]:
+        """
+        Return the path and info of the first video not played to its end,
+        and make it the current video, or return None if every video has
+        been played to its end.
+        """
+
+        row = self.__connection.execute(
+            'SELECT id, path, {} FROM videos '
+            'WHERE id >= ? AND next_frame < frame_count AND next_timestamp < duration '
+            'ORDER BY id LIMIT 1'.format(self.__columns),
+            (self.__get_current_video_id(),)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        video_id, video_path, *values = row
+
+        if video_id != self.__get_current_video_id():
+            self.__set_current_video_id(video_id)
+
+        return video_path, OrderedDict(zip(self.__class__.COLUMN_NAMES, values))
+
+    def get_random_item(self, weighted: bool = False) -> tuple[str, OrderedDict]:
+        """
+        Return the path and info of a uniformly chosen random video. Random
+        ids are tried first (each is a single indexed lookup), and only if
+        none of them belongs to a video with frames (because many videos
+        were deleted) is a random video chosen by its position. Videos
+        without frames are never chosen.
+
+        If 'weighted' is True, videos are chosen with a probability
+        proportional to their frame count instead: a random frame number of
+        the whole library is looked up in the cumulative frame counts of the
+        videos.
+        """
+
+        if weighted:
+            return self.__get_weighted_random_item()
+
+        min_id, max_id = self.__connection.execute('SELECT MIN(id), MAX(id) FROM videos').fetchone()
+
+        if min_id is None:
+            raise KeyError('Cannot choose a random video from an empty video database.')
+
+        for _ in range(self.__class__.MAX_RANDOM_ID_ATTEMPTS):
+            row = self.__connection.execute(
+                'SELECT path, {} FROM videos WHERE id = ? AND frame_count > 0'.format(self.__columns),
+                (random.randint(min_id, max_id),)
+            ).fetchone()
+
+            if row is not None:
+                break
+        else:
+            (video_count,) = self.__connection.execute(
+                'SELECT COUNT(*) FROM videos WHERE frame_count > 0'
+            ).fetchone()
+
+            if not video_count:
+                raise KeyError('Cannot choose a random video from a video database without video frames.')
+
+            row = self.__connection.execute(
+                'SELECT path, {} FROM videos WHERE frame_count > 0 ORDER BY id LIMIT 1 OFFSET ?'.format(
+                    self.__columns
+                ),
+                (random.randrange(video_count),)
+            ).fetchone()
+
+        video_path, *values = row
+
+        return video_path, OrderedDict(zip(self.__class__.COLUMN_NAMES, values))
+
+    def __get_weighted_random_item(self) -> tuple[str, OrderedDict]:
+        if self.__video_ids is None or self.__cumulative_frame_counts is None:
+            self.__video_ids = array('q')
+            frame_counts = array('q')
+
+            for video_id, frame_count in self.__connection.execute('SELECT id, frame_count FROM videos ORDER BY id'):
+                self.__video_ids.append(video_id)
+                frame_counts.append(frame_count)
+
+            self.__cumulative_frame_counts = array('q', accumulate(frame_counts))
+
+        if not self.__video_ids:
+            raise KeyError('Cannot choose a random video from an empty video database.')
+
+        if not self.__cumulative_frame_counts[-1]:
+            raise KeyError('Cannot choose a random video from a video database without video frames.')
+
+        frame_number = random.randrange(self.__cumulative_frame_counts[-1])
+        video_id = self.__video_ids[bisect.bisect_right(self.__cumulative_frame_counts, frame_number)]
+        video_path, *values = self.__connection.execute(
+            'SELECT path, {} FROM videos WHERE id = ?'.format(self.__columns),
+            (video_id,)
+        ).fetchone()
+
+        return video_path, OrderedDict(zip(self.__class__.COLUMN_NAMES, values))
+
+    def set_playback_position(self, video_path: str, next_frame: int, next_timestamp: float) -> None:
+        self.__connection.execute(
+            'UPDATE videos SET next_frame = ?, next_timestamp = ? WHERE path = ?',
+            (next_frame, next_timestamp, video_path)
+        )
+
+    def reset_playback_positions(self) -> None:
+        self.__connection.execute('UPDATE videos SET next_frame = 0, next_timestamp = 0.0')
+        self.__set_current_video_id(0)
+
+    def __get_current_video_id(self) -> int:
+        row = self.__connection.execute(
+            'SELECT value FROM state WHERE name = ?',
+            (self.__class__.CURRENT_VIDEO_STATE_NAME,)
+        ).fetchone()
+
+        return 0 if row is None else row[0]
+
+    def __set_current_video_id(self, video_id: int) -> None:
+        self.__connection.execute(
+            'INSERT INTO state (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = excluded.value',
+            (self.__class__.CURRENT_VIDEO_STATE_NAME, video_id)
+        )
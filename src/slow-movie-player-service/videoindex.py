@@ -0,0 +1,563 @@
+from __future__ import annotations
+import bisect
+import numpy
+import os
+import struct
+from typing import Any, BinaryIO, Iterator, Optional
+
+
+class VideoIndex:
+    """
+    Keyframe and timestamp index of a video built from container metadata
+
+    The index is read from the sample tables ('stts', 'ctts' and 'stss'
+    boxes) and the edit list ('elst' box) of the first video track of ISO
+    base media files (MP4, MOV) and from the cues of Matroska files (MKV,
+    WebM), without decoding anything.
+
+    Frames are numbered in presentation order (like OpenCV numbers them).
+    For ISO base media files the index holds the timestamp of every frame,
+    so timestamps can be mapped to frames exactly even if the frame rate of
+    the video is variable. Matroska cues only hold the timestamps of the
+    keyframes, these are mapped to frames using the frame rate of the video.
+
+    An index records the size and modification time of its video file, an
+    index is only valid as long as these are unchanged (see is_up_to_date).
+    """
+
+    ISO_BASE_MEDIA_FILE_EXTENSIONS = (
+        '.mov',
+        '.mp4',
+    )
+    MATROSKA_FILE_EXTENSIONS = (
+        '.mkv',
+        '.webm',
+    )
+
+    # ISO base media box types containing further boxes on the path from the
+    # 'moov' box to the sample tables and the edit list of a track
+    ISO_BASE_MEDIA_CONTAINER_BOXES = (b'moov', b'trak', b'edts', b'mdia', b'minf', b'stbl')
+
+    MATROSKA_SEGMENT_ID = 0x18538067
+    MATROSKA_INFO_ID = 0x1549A966
+    MATROSKA_TIMESTAMP_SCALE_ID = 0x2AD7B1
+    MATROSKA_TRACKS_ID = 0x1654AE6B
+    MATROSKA_TRACK_ENTRY_ID = 0xAE
+    MATROSKA_TRACK_NUMBER_ID = 0xD7
+    MATROSKA_TRACK_TYPE_ID = 0x83
+    MATROSKA_VIDEO_TRACK_TYPE = 1
+    MATROSKA_CUES_ID = 0x1C53BB6B
+    MATROSKA_CUE_POINT_ID = 0xBB
+    MATROSKA_CUE_TIME_ID = 0xB3
+    MATROSKA_CUE_TRACK_POSITIONS_ID = 0xB7
+    MATROSKA_CUE_TRACK_ID = 0xF7
+    MATROSKA_DEFAULT_TIMESTAMP_SCALE = 1000000  # nanoseconds
+
+    def __init__(
+        self,
+        file_size: int,
+        modification_time: int,
+        keyframes: Optional[list[int]],
+        timescale: int = 0,
+        frame_durations: Optional[list[list[int]]] = None
+    ) -> None:
+
+        self.__file_size = file_size
+        self.__modification_time = modification_time
+        # None if every frame is a keyframe
+        self.__keyframes = keyframes
+        self.__timescale = timescale
+        # Durations of the frames in presentation order, run-length encoded
+        # as [frame count, duration] pairs in 'timescale' units per second
+        self.__frame_durations = frame_durations
+        self.__frame_start_times: Optional[numpy.ndarray] = None
+
+    def is_up_to_date(self, file_path: str) -> bool:
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return False
+
+        return file_stat.st_size == self.__file_size and file_stat.st_mtime_ns == self.__modification_time
+
+    def get_keyframe_before(self, frame: int) -> int:
+        """
+        Return the last keyframe which is not after 'frame' (the frame a seek
+        to 'frame' has to start decoding from).
+        """
+
+        if self.__keyframes is None:
+            return frame
+
+        keyframe_index = bisect.bisect_right(self.__keyframes, frame) - 1
+
+        if keyframe_index < 0:
+            return 0
+
+        return self.__keyframes[keyframe_index]
+
+    def get_nearest_keyframe(self, frame: int) -> int:
+        """
+        Return the keyframe closest to 'frame' (the earlier one if there are
+        two keyframes at the same distance).
+        """
+
+        if self.__keyframes is None:
+            return frame
+
+        keyframe_index = bisect.bisect_left(self.__keyframes, frame)
+        keyframes = self.__keyframes[max(keyframe_index - 1, 0):keyframe_index + 1]
+
+        if not keyframes:
+            return frame
+
+        return min(keyframes, key=lambda keyframe: abs(keyframe - frame))
+
+    def get_frame_at(self, timestamp: float) -> Optional[int]:
+        """
+        Return the frame displayed at 'timestamp' (in milliseconds), or None
+        if the index does not know the timestamps of frames.
+        """
+
+        if self.__frame_durations is None:
+            return None
+
+        if self.__frame_start_times is None:
+            counts, durations = numpy.array(self.__frame_durations, dtype=numpy.int64).reshape(-1, 2).T
+            self.__frame_start_times = numpy.concatenate(
+                ([0], numpy.cumsum(numpy.repeat(durations, counts)))
+            ) * (1000.0 / self.__timescale)
+
+        return max(int(numpy.searchsorted(self.__frame_start_times, timestamp, side='right')) - 1, 0)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'file_size': self.__file_size,
+            'modification_time': self.__modification_time,
+            'keyframes': self.__keyframes,
+            'timescale': self.__timescale,
+            'frame_durations': self.__frame_durations,
+        }
+
+    @classmethod
+    def from_dict(cls, video_index: dict[str, Any]) -> VideoIndex:
+        return cls(
+            video_index['file_size'],
+            video_index['modification_time'],
+            video_index['keyframes'],
+            video_index['timescale'],
+            video_index['frame_durations']
+        )
+
+    @classmethod
+    def from_file(cls, file_path: str, frame_rate: float) -> Optional[VideoIndex]:
+        """
+        Build the index of the video at 'file_path', or return None if the
+        container format is not supported or the index cannot be read from
+        the container.
+        """
+
+        try:
+            file_stat = os.stat(file_path)
+
+            with open(file_path, 'rb') as video_file:
+                if file_path.lower().endswith(cls.ISO_BASE_MEDIA_FILE_EXTENSIONS):
+                    index = cls.__read_iso_base_media_index(video_file, file_stat.st_size)
+                elif file_path.lower().endswith(cls.MATROSKA_FILE_EXTENSIONS):
+                    index = cls.__read_matroska_index(video_file, file_stat.st_size, frame_rate)
+                else:
+                    return None
+        except (OSError, ValueError, struct.error):
+            return None
+
+        if index is None:
+            return None
+
+        keyframes, timescale, frame_durations = index
+
+        return cls(file_stat.st_size, file_stat.st_mtime_ns, keyframes, timescale, frame_durations)
+
+    @staticmethod
+    def __iterate_iso_base_media_boxes(data: bytes, offset: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+        """
+        Yield (type, data offset, end offset) of the boxes in data[offset:end].
+        """
+
+        while offset + 8 <= end:
+            box_size, box_type = struct.unpack_from('>I4s', data, offset)
+            header_size = 8
+
+            if box_size == 1:
+                box_size = struct.unpack_from('>Q', data, offset + 8)[0]
+                header_size = 16
+            elif box_size == 0:
+                box_size = end - offset
+
+            if box_size < header_size:
+                raise ValueError('Invalid box size.')
+
+            yield box_type, offset + header_size, min(offset + box_size, end)
+
+            offset += box_size
+
+    @classmethod
+    def __read_iso_base_media_index(
+        cls,
+        video_file: BinaryIO,
+        file_size: int
+    ) -> Optional[tuple[Optional[list[int]], int, list[list[int]]]]:
+
+        moov_box: Optional[bytes] = None
+        offset = 0
+
+        # The 'moov' box may be at the end of the file (after the media data),
+        # so only the headers of the top level boxes are read until found.
+        while offset + 8 <= file_size:
+            video_file.seek(offset)
+            header = video_file.read(16)
+            box_size, box_type = struct.unpack_from('>I4s', header)
+            header_size = 8
+
+            if box_size == 1:
+                box_size = struct.unpack_from('>Q', header, 8)[0]
+                header_size = 16
+            elif box_size == 0:
+                box_size = file_size - offset
+
+            if box_size < header_size:
+                return None
+
+            if box_type == b'moov':
+                video_file.seek(offset)
+                moov_box = video_file.read(box_size)
+                moov_header_size = header_size
+
+                break
+
+            offset += box_size
+
+        if moov_box is None:
+            return None
+
+        for track_type, track_offset, track_end in cls.__iterate_iso_base_media_boxes(moov_box, moov_header_size, len(moov_box)):
+            if track_type != b'trak':
+                continue
+
+            tables = cls.__read_iso_base_media_track_tables(moov_box, track_offset, track_end)
+
+            if tables.get(b'hdlr') is None or moov_box[tables[b'hdlr'] + 8:tables[b'hdlr'] + 12] != b'vide':
+                continue
+
+            if tables.get(b'mdhd') is None or tables.get(b'stts') is None:
+                return None
+
+            return cls.__build_iso_base_media_index(moov_box, tables)
+
+        return None
+
+    @classmethod
+    def __read_iso_base_media_track_tables(cls, data: bytes, offset: int, end: int) -> dict[bytes, int]:
+        """
+        Return the data offsets of the boxes describing the track in
+        data[offset:end] (keyed by box type).
+        """
+
+        tables: dict[bytes, int] = {}
+
+        for box_type, box_offset, box_end in cls.__iterate_iso_base_media_boxes(data, offset, end):
+            if box_type in cls.ISO_BASE_MEDIA_CONTAINER_BOXES:
+                tables.update(cls.__read_iso_base_media_track_tables(data, box_offset, box_end))
+            elif box_type in (b'hdlr', b'mdhd', b'elst', b'stts', b'ctts', b'stss'):
+                tables[box_type] = box_offset
+
+        return tables
+
+    @staticmethod
+    def __read_edit_list_media_time(data: bytes, elst_offset: int) -> int:
+        """
+        Return the media time (in the timescale of the track) the first
+        non-empty edit of the edit list starts at. Empty edits (with a media
+        time of -1) only delay the presentation of the video.
+        """
+
+        version = data[elst_offset]
+        entry_count = struct.unpack_from('>I', data, elst_offset + 4)[0]
+        entry_format = '>Qqhh' if version == 1 else '>Iihh'
+        entry_size = struct.calcsize(entry_format)
+
+        for entry_number in range(entry_count):
+            media_time = struct.unpack_from(entry_format, data, elst_offset + 8 + entry_number * entry_size)[1]
+
+            if media_time >= 0:
+                return media_time
+
+        return 0
+
+    @classmethod
+    def __build_iso_base_media_index(
+        cls,
+        data: bytes,
+        tables: dict[bytes, int]
+    ) -> Optional[tuple[Optional[list[int]], int, list[list[int]]]]:
+
+        mdhd_offset = tables[b'mdhd']
+
+        if data[mdhd_offset] == 1:
+            timescale = struct.unpack_from('>I', data, mdhd_offset + 20)[0]
+        else:
+            timescale = struct.unpack_from('>I', data, mdhd_offset + 12)[0]
+
+        def read_table(box_type: bytes, values_per_entry: int) -> numpy.ndarray:
+            table_offset = tables[box_type]
+            entry_count = struct.unpack_from('>I', data, table_offset + 4)[0]
+
+            # Sample counts and numbers fit into signed integers, composition
+            # offsets are read as signed (like most demuxers do) even in
+            # version 0 'ctts' boxes.
+            return numpy.frombuffer(
+                data,
+                dtype='>i4',
+                count=entry_count * values_per_entry,
+                offset=table_offset + 8
+            ).astype(numpy.int64).reshape(-1, values_per_entry)
+
+        time_to_sample = read_table(b'stts', 2)
+        sample_deltas = numpy.repeat(time_to_sample[:, 1], time_to_sample[:, 0])
+        sample_count = len(sample_deltas)
+
+        if timescale == 0 or sample_count == 0:
+            return None
+
+        presentation_times = numpy.concatenate(([0], numpy.cumsum(sample_deltas)[:-1]))
+
+        # Presentation times differ from decoding times if the video has
+        # B-frames
+        if b'ctts' in tables:
+            composition_offsets = read_table(b'ctts', 2)
+            presentation_offsets = numpy.repeat(composition_offsets[:, 1], composition_offsets[:, 0])[:sample_count]
+            presentation_times[:len(presentation_offsets)] += presentation_offsets
+
+        presentation_order = numpy.argsort(presentation_times, kind='stable')
+        frame_times = presentation_times[presentation_order]
+
+        # The edit list starts the video at the media time of its first
+        # non-empty edit, frames presented before it are decoded but never
+        # displayed (and not counted by OpenCV either).
+        first_frame = 0
+
+        if b'elst' in tables:
+            first_frame = int(numpy.searchsorted(frame_times, cls.__read_edit_list_media_time(data, tables[b'elst'])))
+
+        if first_frame >= sample_count:
+            return None
+
+        frames_of_samples = numpy.empty(sample_count, dtype=numpy.int64)
+        frames_of_samples[presentation_order] = numpy.arange(sample_count) - first_frame
+
+        if b'stss' in tables:
+            sync_samples = read_table(b'stss', 1)[:, 0] - 1
+            sync_frames = frames_of_samples[sync_samples[(sync_samples >= 0) & (sync_samples < sample_count)]]
+            keyframes: Optional[list[int]] = numpy.sort(sync_frames[sync_frames >= 0]).tolist()
+        else:
+            keyframes = None
+
+        frame_times = frame_times[first_frame:]
+        frame_durations = numpy.diff(frame_times, append=frame_times[-1] + sample_deltas[-1])
+
+        # Run-length encode the frame durations, which are usually constant
+        run_starts = numpy.flatnonzero(numpy.diff(frame_durations, prepend=frame_durations[0] - 1))
+        run_lengths = numpy.diff(run_starts, append=frame_times.size)
+
+        return (
+            keyframes,
+            timescale,
+            numpy.stack((run_lengths, frame_durations[run_starts]), axis=1).tolist()
+        )
+
+    @staticmethod
+    def __read_matroska_vint(video_file: BinaryIO, keep_marker: bool) -> tuple[int, int]:
+        """
+        Read a variable length integer of EBML, return its value and length.
+        Element IDs are read keeping their length marker bit, element sizes
+        without it (an unknown size is returned as -1).
+        """
+
+        first_byte = video_file.read(1)
+
+        if not first_byte:
+            raise ValueError('Unexpected end of file.')
+
+        length = 9 - first_byte[0].bit_length()
+
+        if length > 8:
+            raise ValueError('Invalid variable length integer.')
+
+        value = first_byte[0] if keep_marker else first_byte[0] & (0xFF >> length)
+        is_all_ones = value == 0xFF >> length
+
+        for byte in video_file.read(length - 1):
+            value = (value << 8) | byte
+            is_all_ones = is_all_ones and byte == 0xFF
+
+        if not keep_marker and is_all_ones:
+            return -1, length
+
+        return value, length
+
+    @classmethod
+    def __iterate_matroska_elements(cls, video_file: BinaryIO, offset: int, end: int) -> Iterator[tuple[int, int, int]]:
+        """
+        Yield (ID, data offset, data size) of the elements between the offsets
+        'offset' and 'end' of the file. The file is positioned at the data of
+        the element when it is yielded.
+        """
+
+        while offset < end:
+            video_file.seek(offset)
+            element_id, id_length = cls.__read_matroska_vint(video_file, keep_marker=True)
+            element_size, size_length = cls.__read_matroska_vint(video_file, keep_marker=False)
+            data_offset = offset + id_length + size_length
+
+            # Only master elements (e.g. the segment or live streamed
+            # clusters) may have an unknown size. They end where an element
+            # which is not their child starts, so the iteration continues
+            # with their children (and the elements following them).
+            if element_size < 0:
+                yield element_id, data_offset, end - data_offset
+
+                offset = data_offset
+
+                continue
+
+            yield element_id, data_offset, element_size
+
+            offset = data_offset + element_size
+
+    @staticmethod
+    def __read_matroska_unsigned_integer(video_file: BinaryIO, size: int) -> int:
+        return int.from_bytes(video_file.read(size), byteorder='big')
+
+    @classmethod
+    def __read_matroska_index(
+        cls,
+        video_file: BinaryIO,
+        file_size: int,
+        frame_rate: float
+    ) -> Optional[tuple[list[int], int, None]]:
+
+        if frame_rate <= 0.0:
+            return None
+
+        segment = next(
+            (
+                (offset, size)
+                for element_id, offset, size in cls.__iterate_matroska_elements(video_file, 0, file_size)
+                if element_id == cls.MATROSKA_SEGMENT_ID
+            ),
+            None
+        )
+
+        if segment is None:
+            return None
+
+        timestamp_scale = cls.MATROSKA_DEFAULT_TIMESTAMP_SCALE
+        video_track_numbers: set[int] = set()
+        cue_times: dict[int, list[int]] = {}
+        segment_offset, segment_size = segment
+
+        # Clusters (holding the actual frames) are skipped over by their
+        # sizes (or by the sizes of their children if their own size is
+        # unknown), only the Info, Tracks and Cues elements are read.
+        for element_id, offset, size in cls.__iterate_matroska_elements(
+            video_file,
+            segment_offset,
+            min(segment_offset + segment_size, file_size)
+        ):
+            if element_id == cls.MATROSKA_INFO_ID:
+                for child_id, _, child_size in cls.__iterate_matroska_elements(video_file, offset, offset + size):
+                    if child_id == cls.MATROSKA_TIMESTAMP_SCALE_ID:
+                        timestamp_scale = cls.__read_matroska_unsigned_integer(video_file, child_size)
+            elif element_id == cls.MATROSKA_TRACKS_ID:
+                video_track_numbers.update(cls.__read_matroska_video_track_numbers(video_file, offset, size))
+            elif element_id == cls.MATROSKA_CUES_ID:
+                cue_times = cls.__read_matroska_cue_times(video_file, offset, size)
+
+        keyframe_times = sorted(
+            cue_time
+            for track_number in video_track_numbers
+            for cue_time in cue_times.get(track_number, [])
+        )
+
+        if not keyframe_times:
+            return None
+
+        keyframes = sorted({round(cue_time * timestamp_scale * 1e-9 * frame_rate) for cue_time in keyframe_times})
+
+        return keyframes, 0, None
+
+    @classmethod
+    def __read_matroska_video_track_numbers(cls, video_file: BinaryIO, offset: int, size: int) -> list[int]:
+        video_track_numbers = []
+
+        for entry_id, entry_offset, entry_size in cls.__iterate_matroska_elements(video_file, offset, offset + size):
+            if entry_id != cls.MATROSKA_TRACK_ENTRY_ID:
+                continue
+
+            track_number = None
+            track_type = None
+
+            for child_id, _, child_size in cls.__iterate_matroska_elements(
+                video_file,
+                entry_offset,
+                entry_offset + entry_size
+            ):
+                if child_id == cls.MATROSKA_TRACK_NUMBER_ID:
+                    track_number = cls.__read_matroska_unsigned_integer(video_file, child_size)
+                elif child_id == cls.MATROSKA_TRACK_TYPE_ID:
+                    track_type = cls.__read_matroska_unsigned_integer(video_file, child_size)
+
+            if track_number is not None and track_type == cls.MATROSKA_VIDEO_TRACK_TYPE:
+                video_track_numbers.append(track_number)
+
+        return video_track_numbers
+
+    @classmethod
+    def __read_matroska_cue_times(cls, video_file: BinaryIO, offset: int, size: int) -> dict[int, list[int]]:
+        """
+        Return the cue times of the cue points keyed by track number.
+        """
+
+        cue_times: dict[int, list[int]] = {}
+
+        for cue_point_id, cue_point_offset, cue_point_size in cls.__iterate_matroska_elements(
+            video_file,
+            offset,
+            offset + size
+        ):
+            if cue_point_id != cls.MATROSKA_CUE_POINT_ID:
+                continue
+
+            cue_time = None
+            track_numbers = []
+
+            for child_id, child_offset, child_size in cls.__iterate_matroska_elements(
+                video_file,
+                cue_point_offset,
+                cue_point_offset + cue_point_size
+            ):
+                if child_id == cls.MATROSKA_CUE_TIME_ID:
+                    cue_time = cls.__read_matroska_unsigned_integer(video_file, child_size)
+                elif child_id == cls.MATROSKA_CUE_TRACK_POSITIONS_ID:
+                    for position_id, _, position_size in cls.__iterate_matroska_elements(
+                        video_file,
+                        child_offset,
+                        child_offset + child_size
+                    ):
+                        if position_id == cls.MATROSKA_CUE_TRACK_ID:
+                            track_numbers.append(cls.__read_matroska_unsigned_integer(video_file, position_size))
+
+            if cue_time is not None:
+                for track_number in track_numbers:
+                    cue_times.setdefault(track_number, []).append(cue_time)
+
+        return cue_times
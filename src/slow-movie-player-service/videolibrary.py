@@ -1,8 +1,21 @@
 from video import Video
+from ffmpegvideo import FFmpegVideo
+from videobackend import VideoBackend
+from videodatabase import VideoDatabase
+from videolibrarybackend import VideoLibraryBackend
+from randomframesampling import RandomFrameSampling
+from videopool import VideoPool
+from videoindex import VideoIndex
+from playbackjournal import PlaybackJournal
+from shownframes import ShownFrames
 from skip import FrameSkip, TimeSkip
+from grayscalemethod import GrayscaleMethod
 
-from typing import Union
+from typing import Iterable, Optional, Union
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+import bisect
 import json
 import numpy
 import os
@@ -11,8 +24,17 @@ import random
 
 class VideoLibrary:
     VIDEO_LIBRARY_FILE_NAME = 'videos.json'
+    VIDEO_INDEX_FILE_NAME = 'video_index.json'
+    VIDEO_DATABASE_FILE_NAME = 'videos.sqlite'
+    PLAYBACK_JOURNAL_FILE_NAME = 'videos.journal'
+    SHOWN_FRAMES_FILE_NAME = 'shown_frames.bin'
+    # The video library is saved (and the playback journal is emptied) after
+    # this many playback positions have been appended to the journal
+    PLAYBACK_JOURNAL_MAX_RECORD_COUNT = 4096
     BACKUP_FILE_EXTENSION = '.bak'
     TEMPORARY_FILE_EXTENSION = '.tmp'
+    VIDEO_POOL_SIZE = 2
+    VIDEO_POOL_MAX_IDLE_TIME = 24 * 60 * 60.0  # seconds
     VIDEO_FILE_EXTENSIONS = (
         '.avi',
         '.mkv',
@@ -21,12 +43,40 @@ class VideoLibrary:
         '.webm',
     )
 
-    def __init__(self, video_directory: str) -> None:
+    def __init__(
+        self,
+        video_directory: str,
+        video_backend: VideoBackend = VideoBackend.OPENCV,
+        keyframe_tolerance: float = 0.0,
+        video_library_backend: VideoLibraryBackend = VideoLibraryBackend.JSON,
+        random_frame_sampling: RandomFrameSampling = RandomFrameSampling.VIDEO,
+        random_frame_no_repeat: bool = False
+    ) -> None:
+
         if not os.path.exists(video_directory):
             raise FileNotFoundError("Video directory '{}' does not exist.".format(video_directory))
 
-        self.__video_library: OrderedDict = OrderedDict()
+        self.__video_library: Union[OrderedDict, VideoDatabase] = OrderedDict()
+        self.__video_database: Optional[VideoDatabase] = (
+            VideoDatabase(os.path.join(video_directory, self.__class__.VIDEO_DATABASE_FILE_NAME))
+            if video_library_backend == VideoLibraryBackend.SQLITE else None
+        )
         self.__video_directory: str = video_directory
+        self.__keyframe_tolerance: float = keyframe_tolerance
+        self.__random_frame_sampling: RandomFrameSampling = random_frame_sampling
+        self.__shown_frames: Optional[ShownFrames] = (
+            ShownFrames(os.path.join(video_directory, self.__class__.SHOWN_FRAMES_FILE_NAME))
+            if random_frame_no_repeat else None
+        )
+        self.__video_class: type[Union[Video, FFmpegVideo]] = (
+            FFmpegVideo if video_backend == VideoBackend.FFMPEG else Video
+        )
+        self.__video_indexes: Optional[dict[str, VideoIndex]] = None
+        self.__video_pool: VideoPool = VideoPool(
+            self.__open_video,
+            self.__class__.VIDEO_POOL_SIZE,
+            self.__class__.VIDEO_POOL_MAX_IDLE_TIME
+        )
 
         self.__video_library_file_path: str = os.path.join(
             self.__video_directory,
@@ -43,9 +93,49 @@ class VideoLibrary:
             self.__class__.BACKUP_FILE_EXTENSION
         )
 
-        self.__load_from_file()
+        self.__video_index_file_path: str = os.path.join(
+            self.__video_directory,
+            self.__class__.VIDEO_INDEX_FILE_NAME
+        )
+
+        self.__playback_journal: PlaybackJournal = PlaybackJournal(
+            os.path.join(self.__video_directory, self.__class__.PLAYBACK_JOURNAL_FILE_NAME)
+        )
+        # Position of each video in the last saved video library (the
+        # playback journal refers to videos by their positions)
+        self.__video_numbers: dict[str, int] = {}
+        self.__video_paths: list[str] = []
+        # Every video before the current one has been played to its end, thus
+        # the next video to be played is looked for from the current one.
+        self.__current_video_number: int = 0
+        # Videos from this number on still have the playback positions of the
+        # previous pass over the library (if any), and are reset when they
+        # become the current video, so restarting from the beginning of the
+        # library does not have to touch every video.
+        self.__reset_video_number: Optional[int] = None
+        # Total frame count of the videos before (and including) each video,
+        # for choosing the video of a random frame by its global frame number
+        self.__cumulative_frame_counts: list[int] = []
+        # Paths of the videos with frames, for choosing a random video
+        # uniformly (videos without frames, e.g. unreadable ones, are never
+        # chosen)
+        self.__video_paths_with_frames: list[str] = []
+
+        if self.__video_database is None:
+            self.__load_from_file()
+        else:
+            # Import the video library saved by the JSON backend (if any)
+            if not self.__video_database:
+                self.__load_from_file()
+
+                for video_path, video_info in self.__video_library.items():
+                    self.__video_database[video_path] = video_info
+
+            self.__video_library = self.__video_database
+
         self.__discover()
         self.__save_to_file()
+        self.__update_shown_frames()
 
     def __load_from_file(self) -> None:
         if not os.path.exists(self.__video_library_file_path):
@@ -72,6 +162,17 @@ class VideoLibrary:
                 )
             )
 
+        video_paths = list(self.__video_library.keys())
+
+        for video_number, next_frame, next_timestamp in self.__playback_journal.load(self.__video_library_file_path):
+            if video_number == PlaybackJournal.RESET_VIDEO_NUMBER:
+                for video_info in self.__video_library.values():
+                    video_info['next_frame'] = 0
+                    video_info['next_timestamp'] = 0.0
+            elif video_number < len(video_paths):
+                self.__video_library[video_paths[video_number]]['next_frame'] = next_frame
+                self.__video_library[video_paths[video_number]]['next_timestamp'] = next_timestamp
+
     def __compare_video_library_to_file(self, file_path: str) -> None:
         video_library_string = json.dumps(self.__video_library, ensure_ascii=False, indent=4)
 
@@ -93,6 +194,13 @@ class VideoLibrary:
             )
 
     def __save_to_file(self) -> None:
+        if self.__video_database is not None:
+            self.__video_database.commit()
+
+            return
+
+        self.__apply_reset()
+
         temp_video_library_file = os.open(
             self.__temp_video_library_file_path,
             os.O_CREAT | os.O_WRONLY
@@ -117,64 +225,400 @@ class VideoLibrary:
         if os.access(self.__backup_video_library_file_path, os.F_OK, follow_symlinks=False):
             os.unlink(self.__backup_video_library_file_path)
 
+        self.__playback_journal.reset(self.__video_library_file_path)
+        self.__video_paths = list(self.__video_library.keys())
+        self.__video_numbers = {video_path: video_number for video_number, video_path in enumerate(self.__video_paths)}
+        # The current video is not stored in the snapshot (its keys are the
+        # paths of the videos), it is found while the whole library is saved
+        # anyway, so neither the next frame after saving nor the first frame
+        # after restarting has to check every video from the beginning.
+        self.__current_video_number = next(
+            (
+                video_number
+                for video_number, video_path in enumerate(self.__video_paths)
+                if self.__has_frames_left(self.__video_library[video_path])
+            ),
+            len(self.__video_paths)
+        )
+        # Unreadable videos discovered by earlier versions are stored with -1
+        # frames
+        frame_counts = [max(self.__video_library[video_path]['frame_count'], 0) for video_path in self.__video_paths]
+        self.__cumulative_frame_counts = list(accumulate(frame_counts))
+        self.__video_paths_with_frames = [
+            video_path for video_path, frame_count in zip(self.__video_paths, frame_counts) if frame_count
+        ]
+
+    def __save_playback_position(self, video_path: str, video_info: dict) -> None:
+        if self.__video_database is not None:
+            self.__video_database.set_playback_position(
+                video_path,
+                video_info['next_frame'],
+                video_info['next_timestamp']
+            )
+            self.__video_database.commit()
+
+            return
+
+        if len(self.__playback_journal) >= self.__class__.PLAYBACK_JOURNAL_MAX_RECORD_COUNT:
+            self.__save_to_file()
+
+            return
+
+        self.__playback_journal.append(
+            self.__video_numbers[video_path],
+            video_info['next_frame'],
+            video_info['next_timestamp']
+        )
+
     def __reset(self) -> None:
-        for _, video_info in self.__video_library.items():
-            video_info['next_frame'] = 0
-            video_info['next_timestamp'] = 0.0
+        if self.__video_database is not None:
+            self.__video_database.reset_playback_positions()
+            self.__video_database.commit()
 
-        self.__save_to_file()
+            return
 
-    def __discover(self) -> None:
-        video_paths = list(self.__video_library.keys())
+        self.__current_video_number = 0
+        self.__reset_video_number = 0
+
+        if len(self.__playback_journal) >= self.__class__.PLAYBACK_JOURNAL_MAX_RECORD_COUNT:
+            self.__save_to_file()
+
+            return
+
+        self.__playback_journal.append(PlaybackJournal.RESET_VIDEO_NUMBER, 0, 0.0)
+
+    def __apply_reset(self) -> None:
+        """
+        Reset the playback position of every video not yet reset since
+        restarting from the beginning of the library.
+        """
+
+        if self.__reset_video_number is None:
+            return
+
+        for video_path in self.__video_paths[self.__reset_video_number:]:
+            video_info = self.__video_library.get(video_path)
+
+            if video_info is not None:
+                video_info['next_frame'] = 0
+                video_info['next_timestamp'] = 0.0
 
-        for root_directory, _, files in os.walk(self.__video_directory):
-            for file in files:
-                file_path = os.path.join(root_directory, file)
+        self.__reset_video_number = None
 
-                if (file_path.lower().endswith(self.__class__.VIDEO_FILE_EXTENSIONS)
-                        and file_path not in video_paths):
-                    video_paths.append(file_path)
+    def update(self, changed_paths: Optional[Iterable[str]] = None) -> None:
+        """
+        Update the library after files or directories in the video directory
+        have changed (e.g. as reported by DirectoryWatcher), without
+        discovering the whole video directory again. If 'changed_paths' is
+        None, then the whole video directory is discovered again.
+        """
 
-        if not video_paths:
+        if not self.__discover(changed_paths):
             return
 
-        video_paths = sorted(video_paths)
+        # Open videos may have been replaced or deleted
+        self.__video_pool.clear()
+        self.__save_to_file()
+        self.__update_shown_frames()
+
+    def __update_shown_frames(self) -> None:
+        if self.__shown_frames is None:
+            return
+
+        self.__shown_frames.update(
+            (video_path, video_info['frame_count']) for video_path, video_info in self.__video_library.items()
+        )
+
+    def __discover(self, changed_paths: Optional[Iterable[str]] = None) -> bool:
+        """
+        Add new videos to, update changed videos in, and remove deleted videos
+        from the library (only within 'changed_paths' if given). Return
+        whether the library has changed.
+        """
+
+        # Playback positions of changed videos are kept
+        self.__apply_reset()
+
+        if changed_paths is None:
+            file_identities = self.__scan_directory(self.__video_directory)
+            video_paths = set(self.__video_library.keys())
+        else:
+            file_identities = {}
+            video_paths = set()
+            # Only built if a directory has changed
+            sorted_video_paths: Optional[list[str]] = None
+
+            for changed_path in changed_paths:
+                if changed_path in self.__video_library:
+                    video_paths.add(changed_path)
+
+                if (not os.path.isdir(changed_path)
+                        and changed_path.lower().endswith(self.__class__.VIDEO_FILE_EXTENSIONS)):
+                    try:
+                        file_identities[changed_path] = self.__get_file_identity(os.stat(changed_path))
+                    except FileNotFoundError:
+                        pass
+
+                    continue
+
+                if os.path.isdir(changed_path):
+                    file_identities.update(self.__scan_directory(changed_path))
+
+                # Any other path may be a (possibly deleted) directory, the
+                # videos within it are next to each other in sorted order.
+                if sorted_video_paths is None:
+                    sorted_video_paths = sorted(self.__video_library.keys())
+
+                changed_path_prefix = os.path.join(changed_path, '')
+                index = bisect.bisect_left(sorted_video_paths, changed_path_prefix)
+
+                while index < len(sorted_video_paths) and sorted_video_paths[index].startswith(changed_path_prefix):
+                    video_paths.add(sorted_video_paths[index])
+                    index += 1
+
+        video_paths_to_probe: list[str] = []
+        library_changed = False
 
         for video_path in video_paths:
-            if video_path not in self.__video_library.keys():
-                video = Video(video_path)
-                frame_count, duration = video.get_stats()
-                self.__video_library[video_path] = OrderedDict(
-                    {
-                        'frame_count': frame_count,
-                        'duration': duration,
-                        'next_frame': 0,
-                        'next_timestamp': 0.0
-                    }
-                )
+            video_info = self.__video_library[video_path]
+            file_identity = file_identities.get(video_path)
 
-                continue
+            if file_identity is None:
+                try:
+                    file_identity = self.__get_file_identity(os.stat(video_path))
+                except FileNotFoundError:
+                    del self.__video_library[video_path]
+                    library_changed = True
+
+                    continue
+
+                file_identities[video_path] = file_identity
+
+            # An unchanged file does not have to be opened again for checking
+            # whether its frame count and duration are still the same.
+            if not all(video_info.get(key) == value for key, value in file_identity.items()):
+                video_paths_to_probe.append(video_path)
+
+        video_paths_to_probe.extend(
+            sorted(video_path for video_path in file_identities if video_path not in self.__video_library)
+        )
+
+        for video_path, (frame_count, duration) in zip(video_paths_to_probe, self.__probe(video_paths_to_probe)):
+            # OpenCV reports -1 frames for a video it cannot read, which has
+            # no frames to show (and must not skew the frame sampling).
+            frame_count = max(frame_count, 0)
+            duration = max(duration, 0.0)
+            video_info = self.__video_library.get(video_path)
+            next_frame = 0
+            next_timestamp = 0.0
+
+            if (video_info is not None
+                    and video_info['frame_count'] == frame_count
+                    and video_info['duration'] == duration):
+                next_frame = video_info['next_frame']
+                next_timestamp = video_info['next_timestamp']
+
+            self.__video_library[video_path] = OrderedDict(
+                {
+                    **file_identities[video_path],
+                    'frame_count': frame_count,
+                    'duration': duration,
+                    'next_frame': next_frame,
+                    'next_timestamp': next_timestamp
+                }
+            )
+
+        return library_changed or bool(video_paths_to_probe)
 
-            if not os.path.exists(video_path):
-                del self.__video_library[video_path]
+    def __scan_directory(self, directory_path: str) -> dict[str, dict[str, int]]:
+        """
+        Return the file identity of every video file in a directory (and its
+        subdirectories) by file path. Directory entries cache the result of
+        stat, so every file is stat'ed at most once.
+        """
 
+        file_identities: dict[str, dict[str, int]] = {}
+        directory_paths = [directory_path]
+
+        while directory_paths:
+            try:
+                directory_entries = os.scandir(directory_paths.pop())
+            except OSError:
                 continue
 
-            video = Video(video_path)
-            frame_count, duration = video.get_stats()
+            with directory_entries:
+                for directory_entry in directory_entries:
+                    if directory_entry.is_dir(follow_symlinks=False):
+                        directory_paths.append(directory_entry.path)
+                    elif directory_entry.name.lower().endswith(self.__class__.VIDEO_FILE_EXTENSIONS):
+                        try:
+                            file_identities[directory_entry.path] = self.__get_file_identity(directory_entry.stat())
+                        except FileNotFoundError:
+                            continue
+
+        return file_identities
+
+    def __probe(self, video_paths: list[str]) -> list[tuple[int, float]]:
+        """
+        Return the frame count and duration of the given videos. Opening a
+        video takes a while, so when there are several videos to probe (e.g.
+        a whole season was copied to the video directory), they are probed in
+        parallel using every CPU core.
+        """
+
+        if len(video_paths) < 2:
+            return [self.__video_class.probe(video_path) for video_path in video_paths]
+
+        with ProcessPoolExecutor() as executor:
+            return list(executor.map(self.__video_class.probe, video_paths))
+
+    @staticmethod
+    def __get_file_identity(file_stat: os.stat_result) -> dict[str, int]:
+        """
+        Return the size, modification time and inode number of a file, which
+        change whenever the file is modified or replaced.
+        """
+
+        return {
+            'file_size': file_stat.st_size,
+            'modification_time': file_stat.st_mtime_ns,
+            'inode': file_stat.st_ino,
+        }
+
+    def __load_video_indexes(self) -> dict[str, VideoIndex]:
+        if not os.path.exists(self.__video_index_file_path):
+            return {}
+
+        # Indexes can be rebuilt from the videos at any time, thus an
+        # unreadable index file is simply discarded.
+        try:
+            with open(self.__video_index_file_path) as video_index_file:
+                return {
+                    video_path: VideoIndex.from_dict(video_index)
+                    for video_path, video_index in json.load(video_index_file).items()
+                }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def __save_video_indexes(self) -> None:
+        if self.__video_indexes is None:
+            return
+
+        temp_video_index_file_path = '{}{}'.format(
+            self.__video_index_file_path,
+            self.__class__.TEMPORARY_FILE_EXTENSION
+        )
+
+        with open(temp_video_index_file_path, 'w') as video_index_file:
+            json.dump(
+                {
+                    video_path: video_index.to_dict()
+                    for video_path, video_index in self.__video_indexes.items()
+                    if video_path in self.__video_library
+                },
+                video_index_file,
+                separators=(',', ':')
+            )
+
+        os.replace(temp_video_index_file_path, self.__video_index_file_path)
+
+    def __get_video_index(self, video_path: str) -> Optional[VideoIndex]:
+        if self.__video_indexes is None:
+            self.__video_indexes = self.__load_video_indexes()
+
+        video_index = self.__video_indexes.get(video_path)
+
+        if video_index is not None and video_index.is_up_to_date(video_path):
+            return video_index
+
+        video_info = self.__video_library[video_path]
+        frame_rate = video_info['frame_count'] / video_info['duration'] * 1000.0 if video_info['duration'] else 0.0
+        video_index = VideoIndex.from_file(video_path, frame_rate)
 
-            if (self.__video_library[video_path]['frame_count'] != frame_count
-                    or self.__video_library[video_path]['duration'] != duration):
-                self.__video_library[video_path]['frame_count'] = frame_count
-                self.__video_library[video_path]['duration'] = duration
-                self.__video_library[video_path]['next_frame'] = 0
-                self.__video_library[video_path]['next_timestamp'] = 0.0
+        if video_index is None:
+            self.__video_indexes.pop(video_path, None)
+        else:
+            self.__video_indexes[video_path] = video_index
+
+        self.__save_video_indexes()
+
+        return video_index
+
+    def __open_video(self, video_path: str) -> Union[Video, FFmpegVideo]:
+        # FFmpeg seeks on its own (each frame is decoded by a new process),
+        # indexes are only used by the OpenCV backend.
+        if self.__video_class is FFmpegVideo:
+            return FFmpegVideo(video_path)
+
+        return Video(video_path, self.__get_video_index(video_path))
+
+    def __snap_to_keyframe(self, video_path: str, frame: int, frame_rate: float) -> int:
+        """
+        Return the keyframe nearest to 'frame' if it is within the keyframe
+        tolerance, otherwise 'frame'. Keyframes are decoded on their own, so
+        displaying a keyframe is much faster than displaying any other frame.
+        """
+
+        if self.__keyframe_tolerance <= 0.0:
+            return frame
+
+        video_index = self.__get_video_index(video_path)
+
+        if video_index is None:
+            return frame
+
+        keyframe = video_index.get_nearest_keyframe(frame)
+
+        if (abs(keyframe - frame) * 1000.0 > self.__keyframe_tolerance * frame_rate
+                or keyframe >= self.__video_library[video_path]['frame_count']):
+            return frame
+
+        return keyframe
+
+    @staticmethod
+    def __has_frames_left(video_info: dict) -> bool:
+        """
+        Return whether a video has not been played to its end.
+        """
+
+        return (video_info['next_frame'] < video_info['frame_count']
+                and video_info['next_timestamp'] < video_info['duration'])
+
+    def __get_current_video(self) -> Optional[tuple[str, dict]]:
+        """
+        Return the path and info of the first video not played to its end, or
+        None if every video has been played to its end.
+        """
+
+        if self.__video_database is not None:
+            return self.__video_database.get_current_item()
+
+        while self.__current_video_number < len(self.__video_paths):
+            video_path = self.__video_paths[self.__current_video_number]
+            video_info = self.__video_library[video_path]
+
+            if self.__reset_video_number is not None and self.__current_video_number >= self.__reset_video_number:
+                video_info['next_frame'] = 0
+                video_info['next_timestamp'] = 0.0
+                self.__reset_video_number = self.__current_video_number + 1
+
+            if self.__has_frames_left(video_info):
+                return video_path, video_info
+
+            self.__current_video_number += 1
+
+        return None
 
     def __raise_on_empty_video_library(self) -> None:
         if not self.__video_library:
             raise RuntimeError('Cannot get frame from empty video library!')
 
-    def get_next_frame(self, skip: Union[FrameSkip, TimeSkip] = FrameSkip(1)) -> numpy.ndarray:
+    def get_next_frame(
+        self,
+        skip: Union[FrameSkip, TimeSkip] = FrameSkip(1),
+        minimum_size: Optional[tuple[int, int]] = None,
+        grayscale_method: Optional[GrayscaleMethod] = None
+    ) -> numpy.ndarray:
         self.__raise_on_empty_video_library()
 
         if not isinstance(skip, (FrameSkip, TimeSkip)):
@@ -186,37 +630,95 @@ class VideoLibrary:
                 )
             )
 
-        last_video_path = next(reversed(self.__video_library))
+        current_video = self.__get_current_video()
 
-        for video_path, video_info in self.__video_library.items():
-            if (video_info['next_frame'] < video_info['frame_count']
-                    and video_info['next_timestamp'] < video_info['duration']):
-                video = Video(video_path)
-                frame_rate = video.get_frame_rate()
+        if current_video is None:
+            self.__reset()
+            current_video = self.__get_current_video()
 
-                if isinstance(skip, FrameSkip):
-                    frame = video.get_frame(video_info['next_frame'])
-                    video_info['next_frame'] += skip.amount
-                    video_info['next_timestamp'] = (video_info['next_frame'] / frame_rate) * 1000.0
-                else:
-                    frame = video.get_frame(video_info['next_timestamp'])
-                    video_info['next_timestamp'] += skip.amount
-                    video_info['next_frame'] = int((video_info['next_timestamp'] / 1000.0) * frame_rate)
+            # Only videos without frames are left unplayed after starting over
+            if current_video is None:
+                raise RuntimeError('Cannot get frame from empty video library!')
 
-                self.__save_to_file()
+        video_path, video_info = current_video
+        video = self.__video_pool.get_video(video_path)
+        frame_rate = video.get_frame_rate()
 
-                return frame
+        if isinstance(skip, FrameSkip):
+            position: Union[int, float] = self.__snap_to_keyframe(
+                video_path,
+                video_info['next_frame'],
+                frame_rate
+            )
+            frame = video.get_frame(position, minimum_size, grayscale_method)
+            video_info['next_frame'] += skip.amount
+            video_info['next_timestamp'] = (video_info['next_frame'] / frame_rate) * 1000.0
+        else:
+            position = video_info['next_timestamp']
+            nearest_frame = int((position / 1000.0) * frame_rate)
+            keyframe = self.__snap_to_keyframe(video_path, nearest_frame, frame_rate)
+
+            if keyframe != nearest_frame:
+                position = keyframe
+
+            frame = video.get_frame(position, minimum_size, grayscale_method)
+            video_info['next_timestamp'] += skip.amount
+            video_info['next_frame'] = int((video_info['next_timestamp'] / 1000.0) * frame_rate)
+
+        self.__save_playback_position(video_path, video_info)
+
+        return frame
+
+    def __get_random_video(self) -> tuple[str, dict]:
+        """
+        Return the path and info of a random video, chosen according to the
+        random frame sampling (by frame count, longer videos are chosen
+        more often).
+        """
+
+        weighted = self.__random_frame_sampling == RandomFrameSampling.FRAME
+
+        if self.__video_database is not None:
+            try:
+                return self.__video_database.get_random_item(weighted)
+            except KeyError as error:
+                raise RuntimeError('Cannot get frame from empty video library!') from error
+
+        # Videos without frames are never chosen, thus a library of such
+        # videos only is empty as well.
+        if not self.__video_paths_with_frames:
+            raise RuntimeError('Cannot get frame from empty video library!')
 
-            if video_path == last_video_path:
-                self.__reset()
+        if weighted:
+            frame_number = random.randrange(self.__cumulative_frame_counts[-1])
+            video_path = self.__video_paths[bisect.bisect_right(self.__cumulative_frame_counts, frame_number)]
+        else:
+            video_path = random.choice(self.__video_paths_with_frames)
 
-                return self.get_next_frame(skip=skip)
+        return video_path, self.__video_library[video_path]
 
-    def get_random_frame(self) -> numpy.ndarray:
+    def get_random_frame(
+        self,
+        minimum_size: Optional[tuple[int, int]] = None,
+        grayscale_method: Optional[GrayscaleMethod] = None
+    ) -> numpy.ndarray:
         self.__raise_on_empty_video_library()
 
-        video_path, video_info = random.choice(list(self.__video_library.items()))
+        if self.__shown_frames is not None:
+            try:
+                video_path, frame_index = self.__shown_frames.choose(
+                    self.__random_frame_sampling == RandomFrameSampling.FRAME
+                )
+            except KeyError as error:
+                raise RuntimeError('Cannot get frame from empty video library!') from error
+
+            # The chosen frame is the one marked as displayed, so it is not
+            # snapped to a keyframe, which may be displayed already.
+            return self.__video_pool.get_video(video_path).get_frame(frame_index, minimum_size, grayscale_method)
+
+        video_path, video_info = self.__get_random_video()
         frame_index = random.randint(0, video_info['frame_count'] - 1)
-        video = Video(video_path)
+        video = self.__video_pool.get_video(video_path)
+        frame_index = self.__snap_to_keyframe(video_path, frame_index, video.get_frame_rate())
 
-        return video.get_frame(frame_index)
+        return video.get_frame(frame_index, minimum_size, grayscale_method)
@@ -0,0 +1,22 @@
+import enum
+
+
+@enum.unique
+class VideoLibraryBackend(str, enum.Enum):
+    """
+    The available implementations for storing the video library.
+
+    | Backend | Description                                                  |
+    | ------- | ------------------------------------------------------------ |
+    | JSON    | Keeps the library in memory, and saves it to 'videos.json'   |
+    |         | (playback positions are appended to 'videos.journal').       |
+    | SQLite  | Keeps the library in the 'videos.sqlite' SQLite database,    |
+    |         | only the rows needed for the current frame are read.         |
+    """
+
+    JSON = 'JSON'
+    SQLITE = 'SQLite'
+
+    @classmethod
+    def _missing_(cls, _: object) -> str:
+        return cls.JSON
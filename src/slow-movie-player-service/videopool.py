@@ -0,0 +1,68 @@
+from video import Video
+from ffmpegvideo import FFmpegVideo
+from collections import OrderedDict
+import time
+from typing import Callable, Union
+
+
+class VideoPool:
+    """
+    Bounded pool of open videos (decoders) keyed by their paths
+
+    Opening a video (parsing its container and initializing its codec) is
+    done only when a video is not in the pool yet, so consecutive frames of
+    the same video are read using the same, already initialized decoder.
+
+    The pool holds at most 'max_size' videos, when a new video is opened in
+    a full pool, then the least recently used video is closed. Videos which
+    have not been used for more than 'max_idle_time' seconds are closed as
+    well.
+    """
+
+    def __init__(
+        self,
+        open_video: Callable[[str], Union[Video, FFmpegVideo]],
+        max_size: int,
+        max_idle_time: float
+    ) -> None:
+
+        self.__open_video = open_video
+        self.__max_size = max_size
+        self.__max_idle_time = max_idle_time
+        # Least recently used video first, values are (video, last use) pairs
+        self.__videos: OrderedDict[str, tuple[Union[Video, FFmpegVideo], float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__videos)
+
+    def __contains__(self, video_path: str) -> bool:
+        return video_path in self.__videos
+
+    def get_video(self, video_path: str) -> Union[Video, FFmpegVideo]:
+        current_time = time.monotonic()
+
+        self.__close_idle_videos(current_time)
+
+        if video_path in self.__videos:
+            video, _ = self.__videos.pop(video_path)
+        else:
+            while self.__videos and len(self.__videos) >= self.__max_size:
+                self.__videos.popitem(last=False)
+
+            video = self.__open_video(video_path)
+
+        self.__videos[video_path] = (video, current_time)
+
+        return video
+
+    def clear(self) -> None:
+        self.__videos.clear()
+
+    def __close_idle_videos(self, current_time: float) -> None:
+        while self.__videos:
+            _, last_use_time = next(iter(self.__videos.values()))
+
+            if current_time - last_use_time <= self.__max_idle_time:
+                break
+
+            self.__videos.popitem(last=False)
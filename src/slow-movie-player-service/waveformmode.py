@@ -0,0 +1,23 @@
+import enum
+
+
+@enum.unique
+class WaveformMode(enum.IntEnum):
+    """
+    The IT8951 display modes (waveforms) used for partial refreshes, with
+    their numbers in the look-up table of the 10.3" (M841_TFA5210) panel.
+
+    | Mode | Description                                                    |
+    | ---- | -------------------------------------------------------------- |
+    | GC16 | Flashing update of any gray level to any other, highest        |
+    |      | quality.                                                       |
+    | GL16 | Non-flashing update of any gray level to any other, leaves     |
+    |      | some ghosting behind after large changes.                      |
+    | DU   | Fast non-flashing update of any gray level to black or white.  |
+    | A2   | Fastest update from black or white to black or white.          |
+    """
+
+    DU = 1
+    GC16 = 2
+    GL16 = 3
+    A2 = 6
@@ -0,0 +1,103 @@
+from waveformmode import WaveformMode
+import numpy
+
+
+class WaveformSelector:
+    """
+    Chooses the cheapest waveform for partially refreshing the display which
+    still displays the changes between consecutive (custom 4bpp) images
+    acceptably
+
+    The choice is based on the histogram of the gray level changes of the
+    pixels (i.e. how many pixels changed from one gray level to another):
+
+      * A2 can only be used if every changed pixel goes from black or white
+        to black or white,
+      * DU can only be used if every changed pixel becomes black or white,
+      * GL16 can only be used if only a few pixels change a lot (those would
+        leave visible ghosting behind),
+      * GC16 can always be used.
+
+    Out of the usable waveforms the one with the shortest refresh time is
+    chosen. The refresh times start out as rough estimates, and are adjusted
+    to the measured ones as the display is updated. The ghosting left behind
+    by the cheaper waveforms is removed by the periodic full refreshes of the
+    display.
+    """
+
+    LEVEL_COUNT = 16
+    BLACK_AND_WHITE_LEVELS = [0, LEVEL_COUNT - 1]
+    # Level changes at least this large leave visible ghosting behind with
+    # GL16
+    LARGE_LEVEL_CHANGE = 8
+    MAX_GL16_LARGE_LEVEL_CHANGE_RATIO = 0.1
+    # Best quality first, used for choosing between waveforms with the same
+    # refresh time
+    QUALITY_ORDER = [WaveformMode.GC16, WaveformMode.GL16, WaveformMode.DU, WaveformMode.A2]
+    # In seconds
+    ESTIMATED_REFRESH_TIMES = {
+        WaveformMode.GC16: 0.45,
+        WaveformMode.GL16: 0.37,
+        WaveformMode.DU: 0.26,
+        WaveformMode.A2: 0.12,
+    }
+    # Weight of the latest measurement in the moving average of the refresh
+    # times
+    REFRESH_TIME_SMOOTHING = 0.2
+
+    def __init__(self) -> None:
+        self.__refresh_times = dict(self.__class__.ESTIMATED_REFRESH_TIMES)
+
+    @classmethod
+    def get_change_histogram(cls, previous_image_data: numpy.ndarray, image_data: numpy.ndarray) -> numpy.ndarray:
+        """
+        Return how many pixels changed from a gray level (rows) to another
+        (columns) between two images given as packed 4bpp pixels.
+        """
+
+        previous_levels = numpy.stack((previous_image_data >> 4, previous_image_data & 0x0F))
+        levels = numpy.stack((image_data >> 4, image_data & 0x0F))
+        changed_pixels = previous_levels != levels
+
+        return numpy.bincount(
+            previous_levels[changed_pixels].astype(numpy.intp) * cls.LEVEL_COUNT + levels[changed_pixels],
+            minlength=cls.LEVEL_COUNT ** 2
+        ).reshape(cls.LEVEL_COUNT, cls.LEVEL_COUNT)
+
+    def select(self, change_histogram: numpy.ndarray) -> WaveformMode:
+        """
+        Return the waveform with the shortest refresh time out of the ones
+        able to display the changes in 'change_histogram' acceptably.
+        """
+
+        return min(
+            (mode for mode in self.__class__.QUALITY_ORDER if self.__is_acceptable(mode, change_histogram)),
+            key=lambda mode: (self.__refresh_times[mode], self.__class__.QUALITY_ORDER.index(mode))
+        )
+
+    def record_refresh_time(self, mode: WaveformMode, refresh_time: float) -> None:
+        self.__refresh_times[mode] += self.__class__.REFRESH_TIME_SMOOTHING * (
+            refresh_time - self.__refresh_times[mode]
+        )
+
+    def get_refresh_time(self, mode: WaveformMode) -> float:
+        return self.__refresh_times[mode]
+
+    @classmethod
+    def __is_acceptable(cls, mode: WaveformMode, change_histogram: numpy.ndarray) -> bool:
+        black_and_white_changes = change_histogram[:, cls.BLACK_AND_WHITE_LEVELS]
+
+        if mode == WaveformMode.A2:
+            return black_and_white_changes[cls.BLACK_AND_WHITE_LEVELS].sum() == change_histogram.sum()
+
+        if mode == WaveformMode.DU:
+            return black_and_white_changes.sum() == change_histogram.sum()
+
+        if mode == WaveformMode.GL16:
+            levels = numpy.arange(cls.LEVEL_COUNT)
+            level_changes = numpy.abs(numpy.subtract.outer(levels, levels))
+            large_level_change_count = change_histogram[level_changes >= cls.LARGE_LEVEL_CHANGE].sum()
+
+            return large_level_change_count <= cls.MAX_GL16_LARGE_LEVEL_CHANGE_RATIO * change_histogram.sum()
+
+        return True
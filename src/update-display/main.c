@@ -43,13 +43,18 @@ int main(int argc, char *argv[])
     int exit_status = 0;
     int opt = 0;
     char *file_path = NULL;
+    char *rectangles_file_path = NULL;
     sigset_t signal_set;
     int received_signal = -1;
     double tmp_vcom = 0.0;
     uint16_t vcom = 0;
     bool is_daemon = false;
+    int socket_fd = -1;
+    int status = 0;
+    const char *error_message = NULL;
+    FrameBuffer frame_buffer = {NULL, 0, NULL, 0};
 
-    while ((opt = getopt(argc, argv, "df:hv:")) != -1)
+    while ((opt = getopt(argc, argv, "df:hr:s:v:")) != -1)
     {
         switch (opt)
         {
@@ -93,6 +98,25 @@ int main(int argc, char *argv[])
 
             return 0;
 
+        case 'r':
+            /* The rectangles file does not have to exist yet, it is
+             * (re)written before drawing every image. */
+            rectangles_file_path = optarg;
+
+            break;
+
+        case 's':
+            if (sscanf(optarg, "%d", &socket_fd) != 1 || socket_fd < 0)
+            {
+                fprintf(stderr, "%s\n", "Invalid socket file descriptor specified.");
+
+                return 1;
+            }
+
+            signal(SIGTERM, sigterm_handler);
+
+            break;
+
         case 'v':
             if (sscanf(optarg, "%lf", &tmp_vcom) != 1 || tmp_vcom == 0.0)
             {
@@ -114,6 +138,14 @@ int main(int argc, char *argv[])
             {
                 fprintf(stderr, "%s\n", "No VCOM value specified.");
             }
+            else if (optopt == 'r')
+            {
+                fprintf(stderr, "%s\n", "No rectangles file was specified.");
+            }
+            else if (optopt == 's')
+            {
+                fprintf(stderr, "%s\n", "No socket file descriptor specified.");
+            }
 
             print_help();
 
@@ -153,6 +185,26 @@ int main(int argc, char *argv[])
     {
         EPD_IT8951_Clear_Refresh(device_info, target_memory_address, INIT_Mode);
     }
+    else if (socket_fd >= 0)
+    {
+        if (serve_requests(
+            socket_fd,
+            device_info,
+            target_memory_address,
+            file_path,
+            rectangles_file_path,
+            &frame_buffer) != 0)
+        {
+            exit_status = 6;
+
+            fprintf(
+                stderr,
+                "%s\n",
+                "Error during communicating over the socket.");
+        }
+
+        close_frame_buffer(&frame_buffer);
+    }
     else
     {
         do
@@ -163,47 +215,22 @@ int main(int argc, char *argv[])
                 sigwait(&signal_set, &received_signal);
             }
 
-            if (str_ends_with(file_path, ".bmp") == 0)
-            {
-                if (display_bmp_image(device_info, target_memory_address, file_path) != 0)
-                {
-                    exit_status = 4;
-
-                    fprintf(
-                        stderr,
-                        "%s (%s).\n",
-                        "Error during drawing BMP image onto display",
-                        file_path);
-
-                    EPD_IT8951_Clear_Refresh(device_info, target_memory_address, INIT_Mode);
-                }
-            }
-            else if (str_ends_with(file_path, ".4bpp") == 0)
-            {
-                if (display_4bpp_image(device_info, target_memory_address, file_path) != 0)
-                {
-                    exit_status = 4;
-
-                    fprintf(
-                        stderr,
-                        "%s (%s).\n",
-                        "Error during drawing 4bpp image onto display",
-                        file_path);
-
-                    EPD_IT8951_Clear_Refresh(device_info, target_memory_address, INIT_Mode);
-                }
-            }
-            else
-            {
-                exit_status = 5;
+            status = draw_image_file(
+                device_info,
+                target_memory_address,
+                file_path,
+                rectangles_file_path,
+                &frame_buffer,
+                &error_message);
 
-                fprintf(
-                    stderr,
-                    "%s\n",
-                    "Unsupported image file format.");
+            if (status != 0)
+            {
+                exit_status = status;
             }
         }
         while (is_daemon);
+
+        close_frame_buffer(&frame_buffer);
     }
 
     EPD_IT8951_Sleep();
@@ -1,5 +1,6 @@
 #include "update_display.h"
 
+#include "../../vendor/IT8951-ePaper/Raspberry/lib/Config/DEV_Config.h"
 #include "../../vendor/IT8951-ePaper/Raspberry/lib/GUI/GUI_Paint.h"
 #include "../../vendor/IT8951-ePaper/Raspberry/lib/GUI/GUI_BMPfile.h"
 
@@ -7,11 +8,29 @@
 #include <stdlib.h>
 #include <stddef.h>
 #include <sys/stat.h>
+#include <sys/mman.h>
+#include <sys/socket.h>
+#include <fcntl.h>
+#include <unistd.h>
 #include <endian.h>
 #include <string.h>
 #include <math.h>
+#include <time.h>
+#include <errno.h>
 
 extern uint8_t INIT_Mode;
+extern uint8_t GC16_Mode;
+
+uint64_t refresh_time_us = 0;
+
+static uint64_t get_time_us(void)
+{
+    struct timespec time = {0, 0};
+
+    clock_gettime(CLOCK_MONOTONIC, &time);
+
+    return (uint64_t)time.tv_sec * 1000000 + (uint64_t)time.tv_nsec / 1000;
+}
 
 void print_help(void)
 {
@@ -20,6 +39,7 @@ void print_help(void)
 
         "%s\n\n"
 
+        "%s\n"
         "%s\n"
         "%s\n"
         "%s\n\n"
@@ -29,6 +49,23 @@ void print_help(void)
         "%s\n"
         "%s\n\n"
 
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
         "%s\n"
         "%s\n"
         "%s\n"
@@ -42,6 +79,7 @@ void print_help(void)
         "%s\n"
         "%s\n"
         "%s\n"
+        "%s\n"
         "%s\n\n"
 
         "%s\n"
@@ -49,13 +87,17 @@ void print_help(void)
         "%s\n"
         "%s\n"
         "%s\n"
+        "%s\n"
+        "%s\n"
+        "%s\n"
         "%s\n\n",
 
-        "Usage: update-display -v VOLTAGE [-d | -f <IMAGE_FILE> | -h]",
+        "Usage: update-display -v VOLTAGE [-d | -f <IMAGE_FILE> | -r <RECTANGLES_FILE> | -s <SOCKET_FD> | -h]",
 
         "Update the display of the connected 10.3 e-paper device either",
-        "by clearing it or drawing a 8bit per channel RGB BMP or a custom",
-        "4bits per pixel image on it.",
+        "by clearing it or drawing a 8bit per channel RGB BMP, a custom",
+        "4bits per pixel image or the front buffer of a frame buffer (.fb)",
+        "file shared with the Slow Movie Player Service on it.",
 
         "Mandatory option:",
         "  -v VOLTAGE  Use the VOLTAGE for the connected e-paper device.",
@@ -68,21 +110,42 @@ void print_help(void)
         "  -f IMAGE_FILE  Draw the specified image on the display of the",
         "                 connected e-paper device.",
         "  -h             Display this help and exit.",
+        "  -r RECTANGLES_FILE",
+        "                 Only refresh the rectangles of the display listed",
+        "                 in RECTANGLES_FILE (without clearing the display)",
+        "                 when drawing a 4bpp image. The file holds the",
+        "                 number of rectangles, the waveform mode to refresh",
+        "                 them with (1: DU, 2: GC16, 3: GL16, 6: A2), then",
+        "                 the x, y, width and height of every rectangle (16",
+        "                 bit little endian integers each). The whole",
+        "                 display is cleared and refreshed if the file does",
+        "                 not exist or the number of rectangles is 65535.",
+        "  -s SOCKET_FD   Serve the update requests received on the",
+        "                 connected Unix (SOCK_SEQPACKET) socket SOCKET_FD,",
+        "                 responding with the status and the timings of",
+        "                 every update. 4bpp images and frame buffers can",
+        "                 also be loaded into the controller in advance,",
+        "                 and shown later on request. (This option only has",
+        "                 an effect when used together with '-f'.)",
 
         "Exit status:",
         "  0  Success.",
         "  1  Wrong command-line arguments or command-line parsing error.",
         "  2  Failed to initialize bcm2835 device.",
         "  3  The connected device is not a 10.3 inch e-paper device.",
-        "  4  Error during drawing BMP/4BPP image onto display.",
+        "  4  Error during drawing BMP/4BPP image or frame buffer onto display.",
         "  5  Unsupported image file format.",
+        "  6  Error during communicating over the socket.",
 
         "Examples:",
         "  ./update-display -h",
         "  ./update-display -v -2.51",
         "  ./update-display -v -1.50 -f /path/to/image.bmp",
         "  ./update-display -v -1.48 -f /path/to/image.4bpp",
-        "  ./update-display -v -2.51 -d -f /path/to/image.bmp");
+        "  ./update-display -v -2.51 -d -f /path/to/image.bmp",
+        "  ./update-display -v -1.48 -d -f /path/to/image.4bpp -r /path/to/image.4bpp.rectangles",
+        "  ./update-display -v -1.48 -d -f /path/to/frame.fb",
+        "  ./update-display -v -1.48 -f /path/to/frame.fb -s 3");
 }
 
 int str_ends_with(const char *str, const char *substr)
@@ -104,6 +167,464 @@ int str_ends_with(const char *str, const char *substr)
     return 1;
 }
 
+static int is_valid_waveform_mode(uint16_t mode)
+{
+    return mode == DU_MODE || mode == GC16_MODE || mode == GL16_MODE || mode == A2_MODE;
+}
+
+int read_rectangles(
+    const char *file_path,
+    uint16_t *waveform_mode,
+    Rectangle *rectangles,
+    size_t max_rectangle_count,
+    size_t *rectangle_count)
+{
+    FILE *fp = NULL;
+    uint16_t header[2] = {0, 0};
+    uint16_t count = 0;
+    uint16_t mode = 0;
+    uint16_t values[4] = {0, 0, 0, 0};
+    size_t i = 0;
+
+    if (waveform_mode == NULL || rectangles == NULL || rectangle_count == NULL)
+    {
+        fprintf(stderr, "%s\n", "Received null pointer for rectangles.");
+
+        return -1;
+    }
+
+    /* Without rectangles the whole display is refreshed */
+    if (file_path == NULL)
+    {
+        return 1;
+    }
+
+    fp = fopen(file_path, "rb");
+
+    if (fp == NULL)
+    {
+        return 1;
+    }
+
+    if (fread(header, sizeof(header), 1, fp) != 1)
+    {
+        fclose(fp);
+
+        fprintf(
+            stderr,
+            "%s (%s).\n",
+            "Invalid rectangles file",
+            file_path);
+
+        return -2;
+    }
+
+    count = le16toh(header[0]);
+    mode = le16toh(header[1]);
+
+    if (count == FULL_REFRESH_RECTANGLE_COUNT)
+    {
+        fclose(fp);
+
+        return 1;
+    }
+
+    if (!is_valid_waveform_mode(mode))
+    {
+        fclose(fp);
+
+        fprintf(
+            stderr,
+            "%s (%u).\n",
+            "Invalid waveform mode in rectangles file",
+            mode);
+
+        return -5;
+    }
+
+    if (count > max_rectangle_count)
+    {
+        fclose(fp);
+
+        fprintf(
+            stderr,
+            "%s (%u > %zu).\n",
+            "Too many rectangles in rectangles file",
+            count,
+            max_rectangle_count);
+
+        return -3;
+    }
+
+    for (i = 0; i < count; i++)
+    {
+        if (fread(values, sizeof(values), 1, fp) != 1)
+        {
+            fclose(fp);
+
+            fprintf(
+                stderr,
+                "%s (%s).\n",
+                "Invalid rectangles file",
+                file_path);
+
+            return -4;
+        }
+
+        rectangles[i].x = le16toh(values[0]);
+        rectangles[i].y = le16toh(values[1]);
+        rectangles[i].width = le16toh(values[2]);
+        rectangles[i].height = le16toh(values[3]);
+    }
+
+    fclose(fp);
+
+    *waveform_mode = mode;
+    *rectangle_count = count;
+
+    return 0;
+}
+
+static int is_valid_rectangle(
+    Rectangle rectangle,
+    uint16_t image_width,
+    uint16_t image_height)
+{
+    /* The IT8951 controller needs the horizontal position and the width of
+     * 4bpp areas to be multiples of four pixels. */
+    return rectangle.width > 0
+        && rectangle.height > 0
+        && rectangle.x % 4 == 0
+        && rectangle.width % 4 == 0
+        && (size_t)rectangle.x + rectangle.width <= image_width
+        && (size_t)rectangle.y + rectangle.height <= image_height;
+}
+
+static size_t get_max_area_data_size(const Rectangle *rectangles, size_t rectangle_count)
+{
+    size_t max_area_data_size = 0;
+    size_t i = 0;
+
+    for (i = 0; i < rectangle_count; i++)
+    {
+        size_t area_data_size = ((size_t)rectangles[i].width * rectangles[i].height) / 2;
+
+        if (area_data_size > max_area_data_size)
+        {
+            max_area_data_size = area_data_size;
+        }
+    }
+
+    return max_area_data_size;
+}
+
+/* Copy the pixels of the rectangle row by row without the rest of the image
+ * in between, as the controller expects them. */
+static void copy_4bpp_area(
+    uint8_t *area_data,
+    const uint8_t *image_data,
+    uint16_t image_width,
+    Rectangle rectangle)
+{
+    size_t area_row_size = rectangle.width / 2;
+    size_t row = 0;
+
+    for (row = 0; row < rectangle.height; row++)
+    {
+        memcpy(
+            area_data + row * area_row_size,
+            image_data + ((size_t)(rectangle.y + row) * image_width + rectangle.x) / 2,
+            area_row_size);
+    }
+}
+
+static void refresh_4bpp_rectangles(
+    uint32_t target_memory_address,
+    uint16_t waveform_mode,
+    const uint8_t *image_data,
+    uint16_t image_width,
+    const Rectangle *rectangles,
+    size_t rectangle_count,
+    uint8_t *area_data)
+{
+    size_t i = 0;
+
+    /* The vendor library always refreshes 4bpp images with the GC16 mode it
+     * keeps in a global, so the mode is swapped for the rectangles. */
+    GC16_Mode = (uint8_t)waveform_mode;
+
+    for (i = 0; i < rectangle_count; i++)
+    {
+        copy_4bpp_area(area_data, image_data, image_width, rectangles[i]);
+
+        EPD_IT8951_4bp_Refresh(
+            area_data,
+            rectangles[i].x,
+            rectangles[i].y,
+            rectangles[i].width,
+            rectangles[i].height,
+            true,
+            target_memory_address,
+            false);
+    }
+
+    GC16_Mode = GC16_MODE;
+}
+
+static void it8951_wait_for_ready(void)
+{
+    while (DEV_Digital_Read(EPD_BUSY_PIN) == 0)
+    {
+    }
+}
+
+static void it8951_write_word(uint16_t word)
+{
+    DEV_SPI_WriteByte((uint8_t)(word >> 8));
+    DEV_SPI_WriteByte((uint8_t)(word & 0xFF));
+}
+
+/* Select the controller and send the preamble, the transfer has to be ended
+ * with it8951_end_transfer. */
+static void it8951_begin_transfer(uint16_t preamble)
+{
+    it8951_wait_for_ready();
+
+    DEV_Digital_Write(EPD_CS_PIN, 0);
+
+    it8951_write_word(preamble);
+    it8951_wait_for_ready();
+}
+
+static void it8951_end_transfer(void)
+{
+    DEV_Digital_Write(EPD_CS_PIN, 1);
+}
+
+static void it8951_write_command(uint16_t command)
+{
+    it8951_begin_transfer(IT8951_COMMAND_PREAMBLE);
+    it8951_write_word(command);
+    it8951_end_transfer();
+}
+
+static void it8951_write_data(uint16_t data)
+{
+    it8951_begin_transfer(IT8951_WRITE_DATA_PREAMBLE);
+    it8951_write_word(data);
+    it8951_end_transfer();
+}
+
+static uint16_t it8951_read_register(uint16_t address)
+{
+    uint16_t value = 0;
+
+    it8951_write_command(IT8951_READ_REGISTER_COMMAND);
+    it8951_write_data(address);
+
+    it8951_begin_transfer(IT8951_READ_DATA_PREAMBLE);
+
+    /* The first word read is a dummy one */
+    DEV_SPI_ReadByte();
+    DEV_SPI_ReadByte();
+    it8951_wait_for_ready();
+
+    value = (uint16_t)(DEV_SPI_ReadByte() << 8);
+    value |= DEV_SPI_ReadByte();
+
+    it8951_end_transfer();
+
+    return value;
+}
+
+static void it8951_write_register(uint16_t address, uint16_t value)
+{
+    it8951_write_command(IT8951_WRITE_REGISTER_COMMAND);
+    it8951_write_data(address);
+    it8951_write_data(value);
+}
+
+static void it8951_wait_for_display_ready(void)
+{
+    while (it8951_read_register(IT8951_LUTAFSR_REGISTER) != 0)
+    {
+    }
+}
+
+/* Load the pixels of the rectangle (without the rest of the image in
+ * between) into the image buffer of the controller without displaying
+ * them. */
+static void it8951_load_4bpp_area(
+    uint32_t target_memory_address,
+    const uint8_t *area_data,
+    Rectangle rectangle)
+{
+    size_t area_data_size = ((size_t)rectangle.width * rectangle.height) / 2;
+    size_t i = 0;
+
+    it8951_write_register(IT8951_LISAR_REGISTER + 2, (uint16_t)(target_memory_address >> 16));
+    it8951_write_register(IT8951_LISAR_REGISTER, (uint16_t)(target_memory_address & 0xFFFF));
+
+    it8951_write_command(IT8951_LOAD_IMAGE_AREA_COMMAND);
+    it8951_write_data(IT8951_LOAD_4BPP_IMAGE_ARGUMENT);
+    it8951_write_data(rectangle.x);
+    it8951_write_data(rectangle.y);
+    it8951_write_data(rectangle.width);
+    it8951_write_data(rectangle.height);
+
+    it8951_begin_transfer(IT8951_WRITE_DATA_PREAMBLE);
+
+    for (i = 0; i + 1 < area_data_size; i += 2)
+    {
+        it8951_write_word((uint16_t)(area_data[i] | (area_data[i + 1] << 8)));
+    }
+
+    it8951_end_transfer();
+
+    it8951_write_command(IT8951_LOAD_IMAGE_END_COMMAND);
+}
+
+static void it8951_display_area(Rectangle rectangle, uint16_t waveform_mode)
+{
+    it8951_write_command(IT8951_DISPLAY_AREA_COMMAND);
+    it8951_write_data(rectangle.x);
+    it8951_write_data(rectangle.y);
+    it8951_write_data(rectangle.width);
+    it8951_write_data(rectangle.height);
+    it8951_write_data(waveform_mode);
+}
+
+/* Load the rectangles of the image (or the whole image) into the memory of
+ * the controller, while the display keeps showing the previous image. */
+static void load_4bpp_image_data(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    const uint8_t *image_data,
+    uint16_t image_width,
+    int is_partial_refresh,
+    uint16_t waveform_mode,
+    const Rectangle *rectangles,
+    size_t rectangle_count,
+    uint8_t *area_data,
+    LoadedImage *loaded_image)
+{
+    Rectangle whole_display = {0, 0, device_info.Panel_W, device_info.Panel_H};
+    size_t i = 0;
+
+    /* The image buffer must not be overwritten while it is being
+     * displayed */
+    it8951_wait_for_display_ready();
+
+    if (is_partial_refresh)
+    {
+        for (i = 0; i < rectangle_count; i++)
+        {
+            copy_4bpp_area(area_data, image_data, image_width, rectangles[i]);
+            it8951_load_4bpp_area(target_memory_address, area_data, rectangles[i]);
+
+            loaded_image->rectangles[i] = rectangles[i];
+        }
+
+        loaded_image->rectangle_count = rectangle_count;
+        loaded_image->waveform_mode = waveform_mode;
+    }
+    else
+    {
+        it8951_load_4bpp_area(target_memory_address, image_data, whole_display);
+
+        loaded_image->rectangles[0] = whole_display;
+        loaded_image->rectangle_count = 1;
+        loaded_image->waveform_mode = GC16_MODE;
+    }
+
+    loaded_image->is_partial_refresh = is_partial_refresh;
+    loaded_image->is_loaded = 1;
+}
+
+/* Refresh the rectangles of the image if 'is_partial_refresh' is set and
+ * possible, otherwise clear and refresh the whole display. Only load them
+ * into the memory of the controller if 'loaded_image' is given. 'area_data'
+ * must hold the data of the largest rectangle. */
+static void refresh_4bpp_image(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    uint8_t *image_data,
+    uint16_t image_width,
+    uint16_t image_height,
+    int is_partial_refresh,
+    uint16_t waveform_mode,
+    const Rectangle *rectangles,
+    size_t rectangle_count,
+    uint8_t *area_data,
+    LoadedImage *loaded_image)
+{
+    size_t i = 0;
+    uint64_t start_time_us = get_time_us();
+
+    /* Partial refreshes are only possible if the image covers the whole
+     * display, and every rectangle lies within it. */
+    is_partial_refresh = is_partial_refresh
+        && image_width == device_info.Panel_W
+        && image_height == device_info.Panel_H;
+
+    for (i = 0; is_partial_refresh && i < rectangle_count; i++)
+    {
+        is_partial_refresh = is_valid_rectangle(rectangles[i], image_width, image_height);
+    }
+
+    if (loaded_image != NULL)
+    {
+        load_4bpp_image_data(
+            device_info,
+            target_memory_address,
+            image_data,
+            image_width,
+            is_partial_refresh,
+            waveform_mode,
+            rectangles,
+            rectangle_count,
+            area_data,
+            loaded_image);
+
+        return;
+    }
+
+    if (is_partial_refresh)
+    {
+        refresh_4bpp_rectangles(
+            target_memory_address,
+            waveform_mode,
+            image_data,
+            image_width,
+            rectangles,
+            rectangle_count,
+            area_data);
+
+        /* The refresh routines return without waiting for the waveform, so
+         * the refresh time would only be the transfer of the image data. */
+        it8951_wait_for_display_ready();
+
+        refresh_time_us += get_time_us() - start_time_us;
+
+        return;
+    }
+
+    EPD_IT8951_Clear_Refresh(device_info, target_memory_address, INIT_Mode);
+    EPD_IT8951_4bp_Refresh(
+        image_data,
+        0,
+        0,
+        device_info.Panel_W,
+        device_info.Panel_H,
+        true,
+        target_memory_address,
+        false);
+
+    it8951_wait_for_display_ready();
+
+    refresh_time_us += get_time_us() - start_time_us;
+}
+
 int display_bmp_image(
     IT8951_Dev_Info device_info,
     uint32_t target_memory_address,
@@ -112,6 +633,7 @@ int display_bmp_image(
     const uint8_t bits_per_pixel = 8;
     uint8_t *image = NULL;
     size_t image_size = (size_t)device_info.Panel_W * (size_t)device_info.Panel_H;
+    uint64_t start_time_us = 0;
 
     if (file_path == NULL)
     {
@@ -154,6 +676,8 @@ int display_bmp_image(
         return -3;
     }
 
+    start_time_us = get_time_us();
+
     EPD_IT8951_Clear_Refresh(device_info, target_memory_address, INIT_Mode);
 
     EPD_IT8951_8bp_Refresh(
@@ -165,6 +689,10 @@ int display_bmp_image(
         true,
         target_memory_address);
 
+    it8951_wait_for_display_ready();
+
+    refresh_time_us += get_time_us() - start_time_us;
+
     if (image != NULL)
     {
         free(image);
@@ -174,10 +702,14 @@ int display_bmp_image(
     return 0;
 }
 
-int display_4bpp_image(
+/* Draw the 4bpp image file onto the display, or only load it into the memory
+ * of the controller if 'loaded_image' is given. */
+static int process_4bpp_image(
     IT8951_Dev_Info device_info,
     uint32_t target_memory_address,
-    const char *file_path)
+    const char *file_path,
+    const char *rectangles_file_path,
+    LoadedImage *loaded_image)
 {
     struct stat file_status;
     size_t file_size = 0;
@@ -188,6 +720,11 @@ int display_4bpp_image(
     uint8_t *image_data = NULL;
     size_t image_header_size = sizeof(image_width) + sizeof(image_height);
     uint16_t maximum_resolution = (uint16_t)(pow(2.0, 16.0) - 1.0);
+    uint16_t waveform_mode = GC16_MODE;
+    Rectangle rectangles[MAX_RECTANGLE_COUNT];
+    size_t rectangle_count = 0;
+    int is_partial_refresh = 0;
+    uint8_t *area_data = NULL;
 
     if (file_path == NULL)
     {
@@ -225,7 +762,11 @@ int display_4bpp_image(
 
     if (file_size == image_header_size)
     {
-        EPD_IT8951_Clear_Refresh(device_info, target_memory_address, INIT_Mode);
+        /* Nothing is loaded, the display keeps showing the previous image */
+        if (loaded_image == NULL)
+        {
+            EPD_IT8951_Clear_Refresh(device_info, target_memory_address, INIT_Mode);
+        }
 
         fprintf(
             stderr,
@@ -341,16 +882,46 @@ int display_4bpp_image(
 
     fclose(fp);
 
-    EPD_IT8951_Clear_Refresh(device_info, target_memory_address, INIT_Mode);
-    EPD_IT8951_4bp_Refresh(
-        image_data,
-        0,
-        0,
-        device_info.Panel_W,
-        device_info.Panel_H,
-        true,
+    is_partial_refresh = read_rectangles(
+        rectangles_file_path,
+        &waveform_mode,
+        rectangles,
+        MAX_RECTANGLE_COUNT,
+        &rectangle_count) == 0;
+
+    if (is_partial_refresh && get_max_area_data_size(rectangles, rectangle_count) > 0)
+    {
+        area_data = malloc(get_max_area_data_size(rectangles, rectangle_count));
+
+        if (area_data == NULL)
+        {
+            fprintf(
+                stderr,
+                "%s\n",
+                "Cannot allocate enough memory for 4bpp area data.");
+
+            is_partial_refresh = 0;
+        }
+    }
+
+    refresh_4bpp_image(
+        device_info,
         target_memory_address,
-        false);
+        image_data,
+        image_width,
+        image_height,
+        is_partial_refresh,
+        waveform_mode,
+        rectangles,
+        rectangle_count,
+        area_data,
+        loaded_image);
+
+    if (area_data != NULL)
+    {
+        free(area_data);
+        area_data = NULL;
+    }
 
     if (image_data != NULL)
     {
@@ -360,3 +931,701 @@ int display_4bpp_image(
 
     return 0;
 }
+
+int display_4bpp_image(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    const char *file_path,
+    const char *rectangles_file_path)
+{
+    return process_4bpp_image(
+        device_info,
+        target_memory_address,
+        file_path,
+        rectangles_file_path,
+        NULL);
+}
+
+int load_4bpp_image(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    const char *file_path,
+    const char *rectangles_file_path,
+    LoadedImage *loaded_image)
+{
+    if (loaded_image == NULL)
+    {
+        fprintf(stderr, "%s\n", "Received null pointer for loaded image.");
+
+        return -1;
+    }
+
+    loaded_image->is_loaded = 0;
+    loaded_image->sequence_number = 0;
+
+    return process_4bpp_image(
+        device_info,
+        target_memory_address,
+        file_path,
+        rectangles_file_path,
+        loaded_image);
+}
+
+int open_frame_buffer(
+    IT8951_Dev_Info device_info,
+    const char *file_path,
+    FrameBuffer *frame_buffer)
+{
+    int fd = -1;
+    struct stat file_status;
+    void *data = NULL;
+    const FrameBufferHeader *header = NULL;
+    /* Rectangles cannot be larger than the display */
+    size_t area_data_size = ((size_t)device_info.Panel_W * device_info.Panel_H) / 2;
+
+    if (file_path == NULL || frame_buffer == NULL)
+    {
+        fprintf(stderr, "%s\n", "Received null pointer for frame buffer.");
+
+        return -1;
+    }
+
+    fd = open(file_path, O_RDONLY);
+
+    if (fd < 0)
+    {
+        fprintf(
+            stderr,
+            "%s (%s).\n",
+            "Cannot open file",
+            file_path);
+
+        return -2;
+    }
+
+    if (fstat(fd, &file_status) != 0
+        || (size_t)file_status.st_size < FRAME_BUFFER_DATA_OFFSET)
+    {
+        close(fd);
+
+        fprintf(
+            stderr,
+            "%s (%s).\n",
+            "Invalid frame buffer file",
+            file_path);
+
+        return -3;
+    }
+
+    data = mmap(NULL, (size_t)file_status.st_size, PROT_READ, MAP_SHARED, fd, 0);
+    close(fd);
+
+    if (data == MAP_FAILED)
+    {
+        fprintf(
+            stderr,
+            "%s (%s).\n",
+            "Cannot map frame buffer file",
+            file_path);
+
+        return -4;
+    }
+
+    header = (const FrameBufferHeader *)data;
+
+    if (memcmp(header->magic, FRAME_BUFFER_MAGIC, sizeof(header->magic)) != 0
+        || le16toh(header->version) != FRAME_BUFFER_VERSION)
+    {
+        munmap(data, (size_t)file_status.st_size);
+
+        fprintf(
+            stderr,
+            "%s (%s).\n",
+            "Invalid frame buffer file",
+            file_path);
+
+        return -5;
+    }
+
+    /* Allocated once, so drawing frames does not allocate any memory */
+    frame_buffer->area_data = malloc(area_data_size);
+
+    if (frame_buffer->area_data == NULL)
+    {
+        munmap(data, (size_t)file_status.st_size);
+
+        fprintf(
+            stderr,
+            "%s\n",
+            "Cannot allocate enough memory for 4bpp area data.");
+
+        return -6;
+    }
+
+    frame_buffer->data = (const uint8_t *)data;
+    frame_buffer->size = (size_t)file_status.st_size;
+    frame_buffer->displayed_sequence_number = 0;
+
+    return 0;
+}
+
+void close_frame_buffer(FrameBuffer *frame_buffer)
+{
+    if (frame_buffer == NULL)
+    {
+        return;
+    }
+
+    if (frame_buffer->data != NULL)
+    {
+        munmap((void *)frame_buffer->data, frame_buffer->size);
+        frame_buffer->data = NULL;
+    }
+
+    if (frame_buffer->area_data != NULL)
+    {
+        free(frame_buffer->area_data);
+        frame_buffer->area_data = NULL;
+    }
+}
+
+/* Draw the front buffer of the frame buffer onto the display, or only load
+ * it into the memory of the controller if 'loaded_image' is given. */
+static int process_frame_buffer(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    FrameBuffer *frame_buffer,
+    LoadedImage *loaded_image)
+{
+    const FrameBufferHeader *header = NULL;
+    uint64_t sequence_number = 0;
+    uint16_t front_buffer_index = 0;
+    uint16_t image_width = 0;
+    uint16_t image_height = 0;
+    size_t image_data_size = 0;
+    uint16_t rectangle_count = 0;
+    uint16_t waveform_mode = GC16_MODE;
+    Rectangle rectangles[MAX_RECTANGLE_COUNT];
+    int is_partial_refresh = 0;
+    size_t i = 0;
+
+    if (frame_buffer == NULL || frame_buffer->data == NULL)
+    {
+        fprintf(stderr, "%s\n", "Received null pointer for frame buffer.");
+
+        return -1;
+    }
+
+    header = (const FrameBufferHeader *)frame_buffer->data;
+    sequence_number = le64toh(header->sequence_number);
+
+    /* Nothing has been swapped into the front buffer since the last frame */
+    if (sequence_number == frame_buffer->displayed_sequence_number)
+    {
+        return 0;
+    }
+
+    front_buffer_index = le16toh(header->front_buffer_index);
+    image_width = le16toh(header->width);
+    image_height = le16toh(header->height);
+    image_data_size = ((size_t)image_width * image_height) / 2;
+
+    if (front_buffer_index > 1
+        || image_width != device_info.Panel_W
+        || image_height != device_info.Panel_H
+        || FRAME_BUFFER_DATA_OFFSET + 2 * image_data_size > frame_buffer->size)
+    {
+        fprintf(
+            stderr,
+            "%s (%ux%u).\n",
+            "Invalid frame buffer or resolution does not match the display",
+            image_width,
+            image_height);
+
+        return -2;
+    }
+
+    rectangle_count = le16toh(header->rectangle_count);
+    waveform_mode = le16toh(header->waveform_mode);
+    is_partial_refresh = rectangle_count != FULL_REFRESH_RECTANGLE_COUNT
+        && rectangle_count <= MAX_RECTANGLE_COUNT
+        && is_valid_waveform_mode(waveform_mode);
+
+    for (i = 0; is_partial_refresh && i < rectangle_count; i++)
+    {
+        rectangles[i].x = le16toh(header->rectangles[i].x);
+        rectangles[i].y = le16toh(header->rectangles[i].y);
+        rectangles[i].width = le16toh(header->rectangles[i].width);
+        rectangles[i].height = le16toh(header->rectangles[i].height);
+    }
+
+    /* The image is drawn straight from the front buffer */
+    refresh_4bpp_image(
+        device_info,
+        target_memory_address,
+        (uint8_t *)(frame_buffer->data + FRAME_BUFFER_DATA_OFFSET + front_buffer_index * image_data_size),
+        image_width,
+        image_height,
+        is_partial_refresh,
+        waveform_mode,
+        rectangles,
+        is_partial_refresh ? rectangle_count : 0,
+        frame_buffer->area_data,
+        loaded_image);
+
+    /* Loaded frames are displayed only once shown */
+    if (loaded_image != NULL)
+    {
+        loaded_image->sequence_number = sequence_number;
+    }
+    else
+    {
+        frame_buffer->displayed_sequence_number = sequence_number;
+    }
+
+    return 0;
+}
+
+int display_frame_buffer(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    FrameBuffer *frame_buffer)
+{
+    return process_frame_buffer(device_info, target_memory_address, frame_buffer, NULL);
+}
+
+int load_frame_buffer(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    FrameBuffer *frame_buffer,
+    LoadedImage *loaded_image)
+{
+    if (loaded_image == NULL)
+    {
+        fprintf(stderr, "%s\n", "Received null pointer for loaded image.");
+
+        return -1;
+    }
+
+    loaded_image->is_loaded = 0;
+    loaded_image->sequence_number = 0;
+
+    return process_frame_buffer(device_info, target_memory_address, frame_buffer, loaded_image);
+}
+
+/* Display the image loaded into the memory of the controller, and wait
+ * until the display is refreshed. Nothing is displayed if no (new) image
+ * was loaded. */
+int show_loaded_image(LoadedImage *loaded_image, FrameBuffer *frame_buffer)
+{
+    uint64_t start_time_us = get_time_us();
+    size_t i = 0;
+
+    if (loaded_image == NULL)
+    {
+        fprintf(stderr, "%s\n", "Received null pointer for loaded image.");
+
+        return -1;
+    }
+
+    if (!loaded_image->is_loaded)
+    {
+        return 0;
+    }
+
+    if (loaded_image->is_partial_refresh)
+    {
+        for (i = 0; i < loaded_image->rectangle_count; i++)
+        {
+            it8951_display_area(loaded_image->rectangles[i], loaded_image->waveform_mode);
+        }
+    }
+    else
+    {
+        /* Clearing the display with the INIT mode does not depend on the
+         * contents of the image buffer, so the loaded image is kept. */
+        it8951_display_area(loaded_image->rectangles[0], INIT_Mode);
+        it8951_wait_for_display_ready();
+        it8951_display_area(loaded_image->rectangles[0], loaded_image->waveform_mode);
+    }
+
+    it8951_wait_for_display_ready();
+
+    if (frame_buffer != NULL && loaded_image->sequence_number != 0)
+    {
+        frame_buffer->displayed_sequence_number = loaded_image->sequence_number;
+    }
+
+    loaded_image->is_loaded = 0;
+    refresh_time_us += get_time_us() - start_time_us;
+
+    return 0;
+}
+
+int draw_image_file(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    const char *file_path,
+    const char *rectangles_file_path,
+    FrameBuffer *frame_buffer,
+    const char **error_message)
+{
+    int result = 0;
+
+    if (file_path == NULL || frame_buffer == NULL || error_message == NULL)
+    {
+        fprintf(stderr, "%s\n", "Received null pointer for image file.");
+
+        return 1;
+    }
+
+    *error_message = NULL;
+
+    if (str_ends_with(file_path, ".bmp") == 0)
+    {
+        result = display_bmp_image(device_info, target_memory_address, file_path);
+        *error_message = "Error during drawing BMP image onto display";
+    }
+    else if (str_ends_with(file_path, ".4bpp") == 0)
+    {
+        result = display_4bpp_image(device_info, target_memory_address, file_path, rectangles_file_path);
+        *error_message = "Error during drawing 4bpp image onto display";
+    }
+    else if (str_ends_with(file_path, ".fb") == 0)
+    {
+        /* The frame buffer is only mapped once, frames are drawn from it in
+         * place. */
+        result = (frame_buffer->data == NULL
+            && open_frame_buffer(device_info, file_path, frame_buffer) != 0)
+            || display_frame_buffer(device_info, target_memory_address, frame_buffer) != 0;
+        *error_message = "Error during drawing frame buffer onto display";
+    }
+    else
+    {
+        *error_message = "Unsupported image file format";
+
+        fprintf(stderr, "%s.\n", *error_message);
+
+        return 5;
+    }
+
+    if (result != 0)
+    {
+        fprintf(
+            stderr,
+            "%s (%s).\n",
+            *error_message,
+            file_path);
+
+        EPD_IT8951_Clear_Refresh(device_info, target_memory_address, INIT_Mode);
+
+        return 4;
+    }
+
+    *error_message = NULL;
+
+    return 0;
+}
+
+/* Load the image file into the memory of the controller, to be displayed by
+ * show_loaded_image. BMP images cannot be loaded in advance. */
+int load_image_file(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    const char *file_path,
+    const char *rectangles_file_path,
+    FrameBuffer *frame_buffer,
+    LoadedImage *loaded_image,
+    const char **error_message)
+{
+    int result = 0;
+
+    if (file_path == NULL || frame_buffer == NULL || loaded_image == NULL || error_message == NULL)
+    {
+        fprintf(stderr, "%s\n", "Received null pointer for image file.");
+
+        return 1;
+    }
+
+    *error_message = NULL;
+    loaded_image->is_loaded = 0;
+
+    if (str_ends_with(file_path, ".4bpp") == 0)
+    {
+        result = load_4bpp_image(
+            device_info,
+            target_memory_address,
+            file_path,
+            rectangles_file_path,
+            loaded_image);
+        *error_message = "Error during loading 4bpp image into the controller";
+    }
+    else if (str_ends_with(file_path, ".fb") == 0)
+    {
+        result = (frame_buffer->data == NULL
+            && open_frame_buffer(device_info, file_path, frame_buffer) != 0)
+            || load_frame_buffer(device_info, target_memory_address, frame_buffer, loaded_image) != 0;
+        *error_message = "Error during loading frame buffer into the controller";
+    }
+    else
+    {
+        *error_message = "Unsupported image file format for loading in advance";
+
+        fprintf(stderr, "%s.\n", *error_message);
+
+        return 5;
+    }
+
+    /* The display keeps showing the previous image */
+    if (result != 0)
+    {
+        fprintf(
+            stderr,
+            "%s (%s).\n",
+            *error_message,
+            file_path);
+
+        loaded_image->is_loaded = 0;
+
+        return 4;
+    }
+
+    *error_message = NULL;
+
+    return 0;
+}
+
+int send_message(
+    int socket_fd,
+    uint16_t type,
+    int16_t status,
+    uint32_t request_id,
+    const void *payload,
+    size_t payload_size)
+{
+    uint8_t message[MAX_MESSAGE_SIZE];
+    size_t message_size = 0;
+    MessageHeader header;
+
+    if (payload_size > MAX_MESSAGE_SIZE - sizeof(header)
+        || (payload == NULL && payload_size > 0))
+    {
+        fprintf(stderr, "%s\n", "Invalid message payload.");
+
+        return -1;
+    }
+
+    header.type = htole16(type);
+    header.status = (int16_t)htole16((uint16_t)status);
+    header.request_id = htole32(request_id);
+    header.payload_size = htole32((uint32_t)payload_size);
+
+    memcpy(message, &header, sizeof(header));
+
+    if (payload_size > 0)
+    {
+        memcpy(message + sizeof(header), payload, payload_size);
+    }
+
+    message_size = sizeof(header) + payload_size;
+
+    if (send(socket_fd, message, message_size, MSG_NOSIGNAL) != (ssize_t)message_size)
+    {
+        fprintf(stderr, "%s (%s).\n", "Cannot send message", strerror(errno));
+
+        return -2;
+    }
+
+    return 0;
+}
+
+/* Receive the next message, its payload is ignored (requests do not have
+ * any). Returns 1 if the connection was closed. */
+int receive_message(int socket_fd, MessageHeader *header)
+{
+    uint8_t message[MAX_MESSAGE_SIZE];
+    ssize_t message_size = 0;
+
+    if (header == NULL)
+    {
+        fprintf(stderr, "%s\n", "Received null pointer for message header.");
+
+        return -1;
+    }
+
+    do
+    {
+        message_size = recv(socket_fd, message, sizeof(message), 0);
+    }
+    while (message_size < 0 && errno == EINTR);
+
+    if (message_size == 0)
+    {
+        return 1;
+    }
+
+    if (message_size < 0)
+    {
+        fprintf(stderr, "%s (%s).\n", "Cannot receive message", strerror(errno));
+
+        return -2;
+    }
+
+    if ((size_t)message_size < sizeof(*header))
+    {
+        fprintf(stderr, "%s\n", "Received invalid message.");
+
+        return -3;
+    }
+
+    memcpy(header, message, sizeof(*header));
+
+    header->type = le16toh(header->type);
+    header->status = (int16_t)le16toh((uint16_t)header->status);
+    header->request_id = le32toh(header->request_id);
+    header->payload_size = le32toh(header->payload_size);
+
+    if ((size_t)message_size != sizeof(*header) + header->payload_size)
+    {
+        fprintf(stderr, "%s\n", "Received invalid message.");
+
+        return -3;
+    }
+
+    return 0;
+}
+
+int send_panel_info(
+    int socket_fd,
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address)
+{
+    PanelInfo panel_info;
+
+    memset(&panel_info, 0, sizeof(panel_info));
+
+    panel_info.width = htole16(device_info.Panel_W);
+    panel_info.height = htole16(device_info.Panel_H);
+    panel_info.memory_address = htole32(target_memory_address);
+    memcpy(
+        panel_info.lut_version,
+        device_info.LUT_Version,
+        sizeof(panel_info.lut_version) < sizeof(device_info.LUT_Version)
+            ? sizeof(panel_info.lut_version)
+            : sizeof(device_info.LUT_Version));
+
+    return send_message(socket_fd, READY_MESSAGE, 0, 0, &panel_info, sizeof(panel_info));
+}
+
+/* Announce the panel, then serve the requests received until the connection
+ * is closed, responding with the status and the timings of every request.
+ * Update requests draw the image file, load requests only load it into the
+ * memory of the controller, and show requests display the image loaded
+ * last. */
+int serve_requests(
+    int socket_fd,
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    const char *file_path,
+    const char *rectangles_file_path,
+    FrameBuffer *frame_buffer)
+{
+    MessageHeader request;
+    int result = 0;
+    int status = 0;
+    const char *error_message = NULL;
+    uint64_t start_time_us = 0;
+    uint64_t update_time_us = 0;
+    uint8_t response[MAX_MESSAGE_SIZE - sizeof(MessageHeader)];
+    UpdateTimes update_times;
+    size_t error_message_size = 0;
+    LoadedImage loaded_image;
+
+    memset(&loaded_image, 0, sizeof(loaded_image));
+
+    if (send_panel_info(socket_fd, device_info, target_memory_address) != 0)
+    {
+        return -1;
+    }
+
+    while ((result = receive_message(socket_fd, &request)) == 0)
+    {
+        start_time_us = get_time_us();
+        refresh_time_us = 0;
+
+        if (request.type == UPDATE_MESSAGE)
+        {
+            /* The image loaded last is overwritten */
+            loaded_image.is_loaded = 0;
+
+            status = draw_image_file(
+                device_info,
+                target_memory_address,
+                file_path,
+                rectangles_file_path,
+                frame_buffer,
+                &error_message);
+        }
+        else if (request.type == LOAD_MESSAGE)
+        {
+            status = load_image_file(
+                device_info,
+                target_memory_address,
+                file_path,
+                rectangles_file_path,
+                frame_buffer,
+                &loaded_image,
+                &error_message);
+        }
+        else if (request.type == SHOW_MESSAGE)
+        {
+            status = show_loaded_image(&loaded_image, frame_buffer) == 0 ? 0 : 4;
+            error_message = "Error during showing the loaded image";
+        }
+        else
+        {
+            status = 1;
+            error_message = "Unsupported request";
+
+            fprintf(stderr, "%s (%u).\n", error_message, request.type);
+        }
+
+        update_time_us = get_time_us() - start_time_us;
+
+        if (refresh_time_us > update_time_us)
+        {
+            refresh_time_us = update_time_us;
+        }
+
+        update_times.transfer_time_us = htole32((uint32_t)(update_time_us - refresh_time_us));
+        update_times.refresh_time_us = htole32((uint32_t)refresh_time_us);
+        memcpy(response, &update_times, sizeof(update_times));
+
+        error_message_size = 0;
+
+        if (status != 0 && error_message != NULL)
+        {
+            error_message_size = strlen(error_message);
+
+            if (error_message_size > sizeof(response) - sizeof(update_times))
+            {
+                error_message_size = sizeof(response) - sizeof(update_times);
+            }
+
+            memcpy(response + sizeof(update_times), error_message, error_message_size);
+        }
+
+        if (send_message(
+            socket_fd,
+            UPDATE_MESSAGE,
+            (int16_t)status,
+            request.request_id,
+            response,
+            sizeof(update_times) + error_message_size) != 0)
+        {
+            return -1;
+        }
+    }
+
+    return result == 1 ? 0 : -1;
+}
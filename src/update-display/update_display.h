@@ -1,6 +1,132 @@
 #include "../../vendor/IT8951-ePaper/Raspberry/lib/e-Paper/EPD_IT8951.h"
 
 #include <stdint.h>
+#include <stddef.h>
+
+/* Rectangle count in rectangles files requesting a full refresh */
+#define FULL_REFRESH_RECTANGLE_COUNT 0xFFFF
+#define MAX_RECTANGLE_COUNT 64
+
+/* Waveform modes of the 10.3" (M841_TFA5210) panel usable for refreshing
+ * rectangles */
+#define DU_MODE 1
+#define GC16_MODE 2
+#define GL16_MODE 3
+#define A2_MODE 6
+
+/* Parts of the IT8951 host interface (over SPI) needed for loading images
+ * into the memory of the controller without displaying them, which the
+ * vendor library keeps private. Every transfer starts with a preamble
+ * telling whether a command or data follows. */
+#define IT8951_COMMAND_PREAMBLE 0x6000
+#define IT8951_WRITE_DATA_PREAMBLE 0x0000
+#define IT8951_READ_DATA_PREAMBLE 0x1000
+#define IT8951_READ_REGISTER_COMMAND 0x0010
+#define IT8951_WRITE_REGISTER_COMMAND 0x0011
+#define IT8951_LOAD_IMAGE_AREA_COMMAND 0x0021
+#define IT8951_LOAD_IMAGE_END_COMMAND 0x0022
+#define IT8951_DISPLAY_AREA_COMMAND 0x0034
+/* Image buffer address to load images to (low word, the high word follows
+ * it) */
+#define IT8951_LISAR_REGISTER 0x0208
+/* Status of the LUT engines, 0 once every refresh is done */
+#define IT8951_LUTAFSR_REGISTER 0x1224
+/* Little endian 4bpp pixels without rotation */
+#define IT8951_LOAD_4BPP_IMAGE_ARGUMENT ((0 << 8) | (2 << 4) | 0)
+
+typedef struct
+{
+    uint16_t x;
+    uint16_t y;
+    uint16_t width;
+    uint16_t height;
+} Rectangle;
+
+#define FRAME_BUFFER_MAGIC "SMFB"
+#define FRAME_BUFFER_VERSION 1
+/* Offset of the first buffer in frame buffer files */
+#define FRAME_BUFFER_DATA_OFFSET 4096
+
+/* Header of frame buffer files shared with the Slow Movie Player Service,
+ * every value is little endian. */
+typedef struct
+{
+    char magic[4];
+    uint16_t version;
+    uint16_t front_buffer_index;
+    uint64_t sequence_number;
+    uint16_t width;
+    uint16_t height;
+    uint16_t rectangle_count;
+    uint16_t waveform_mode;
+    Rectangle rectangles[MAX_RECTANGLE_COUNT];
+} FrameBufferHeader;
+
+typedef struct
+{
+    const uint8_t *data;
+    size_t size;
+    uint8_t *area_data;
+    uint64_t displayed_sequence_number;
+} FrameBuffer;
+
+/* Image loaded into the memory of the controller, waiting to be displayed */
+typedef struct
+{
+    int is_loaded;
+    int is_partial_refresh;
+    uint16_t waveform_mode;
+    /* The whole display if it is refreshed completely */
+    Rectangle rectangles[MAX_RECTANGLE_COUNT];
+    size_t rectangle_count;
+    /* Sequence number of the loaded frame of the frame buffer, 0 for image
+     * files */
+    uint64_t sequence_number;
+} LoadedImage;
+
+/* Messages exchanged with the Slow Movie Player Service over the socket
+ * given with '-s', one message per (SOCK_SEQPACKET) packet. Every message
+ * starts with a header followed by 'payload_size' bytes of payload, every
+ * value is little endian. */
+#define READY_MESSAGE 1
+#define UPDATE_MESSAGE 2
+/* Load the image into the memory of the controller without displaying it */
+#define LOAD_MESSAGE 3
+/* Display the image loaded last */
+#define SHOW_MESSAGE 4
+#define MAX_MESSAGE_SIZE 1024
+
+typedef struct
+{
+    uint16_t type;
+    int16_t status;
+    uint32_t request_id;
+    uint32_t payload_size;
+} MessageHeader;
+
+/* Payload of the ready message sent once before serving update requests */
+typedef struct
+{
+    uint16_t width;
+    uint16_t height;
+    uint32_t memory_address;
+    char lut_version[16];
+} PanelInfo;
+
+/* Payload of update responses, followed by the error message (without
+ * terminating null character) if the update failed */
+typedef struct
+{
+    /* Getting the image data ready for the controller */
+    uint32_t transfer_time_us;
+    /* Handing the image data over to the controller and refreshing the
+     * display until its waveform has finished */
+    uint32_t refresh_time_us;
+} UpdateTimes;
+
+/* Time spent in the refresh routines of the controller, accumulated by the
+ * display_* functions */
+extern uint64_t refresh_time_us;
 
 void print_help(void);
 
@@ -11,7 +137,82 @@ int display_bmp_image(
     uint32_t target_memory_address,
     const char *file_path);
 
+int read_rectangles(
+    const char *file_path,
+    uint16_t *waveform_mode,
+    Rectangle *rectangles,
+    size_t max_rectangle_count,
+    size_t *rectangle_count);
+
 int display_4bpp_image(
     IT8951_Dev_Info device_info,
     uint32_t target_memory_address,
-    const char *file_path);
+    const char *file_path,
+    const char *rectangles_file_path);
+
+int load_4bpp_image(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    const char *file_path,
+    const char *rectangles_file_path,
+    LoadedImage *loaded_image);
+
+int open_frame_buffer(
+    IT8951_Dev_Info device_info,
+    const char *file_path,
+    FrameBuffer *frame_buffer);
+
+void close_frame_buffer(FrameBuffer *frame_buffer);
+
+int display_frame_buffer(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    FrameBuffer *frame_buffer);
+
+int load_frame_buffer(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    FrameBuffer *frame_buffer,
+    LoadedImage *loaded_image);
+
+int show_loaded_image(LoadedImage *loaded_image, FrameBuffer *frame_buffer);
+
+int draw_image_file(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    const char *file_path,
+    const char *rectangles_file_path,
+    FrameBuffer *frame_buffer,
+    const char **error_message);
+
+int load_image_file(
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    const char *file_path,
+    const char *rectangles_file_path,
+    FrameBuffer *frame_buffer,
+    LoadedImage *loaded_image,
+    const char **error_message);
+
+int send_message(
+    int socket_fd,
+    uint16_t type,
+    int16_t status,
+    uint32_t request_id,
+    const void *payload,
+    size_t payload_size);
+
+int receive_message(int socket_fd, MessageHeader *header);
+
+int send_panel_info(
+    int socket_fd,
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address);
+
+int serve_requests(
+    int socket_fd,
+    IT8951_Dev_Info device_info,
+    uint32_t target_memory_address,
+    const char *file_path,
+    const char *rectangles_file_path,
+    FrameBuffer *frame_buffer);
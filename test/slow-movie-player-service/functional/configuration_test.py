@@ -8,6 +8,11 @@ from typing import Any
 
 skip = get_module_from_file('../../src/slow-movie-player-service/skip.py')
 grayscalemethod = get_module_from_file('../../src/slow-movie-player-service/grayscalemethod.py')
+ditheringengine = get_module_from_file('../../src/slow-movie-player-service/ditheringengine.py')
+ditheringmethod = get_module_from_file('../../src/slow-movie-player-service/ditheringmethod.py')
+videobackend = get_module_from_file('../../src/slow-movie-player-service/videobackend.py')
+videolibrarybackend = get_module_from_file('../../src/slow-movie-player-service/videolibrarybackend.py')
+randomframesampling = get_module_from_file('../../src/slow-movie-player-service/randomframesampling.py')
 configuration = get_module_from_file('../../src/slow-movie-player-service/configuration.py')
 
 
@@ -47,10 +52,21 @@ class ConfigurationTest(TestCase):
                     'screen_width': 1,
                     'screen_height': 2,
                     'refresh_timeout': 1.0,
+                    'full_refresh_interval': 1,
                     'video_directory': '/',
                     'skip': skip.FrameSkip(1),
                     'grayscale_method': grayscalemethod.GrayscaleMethod(''),
+                    'dithering_method': ditheringmethod.DitheringMethod(''),
+                    'dithering_engine': ditheringengine.DitheringEngine(''),
+                    'grayscale_before_resize': False,
+                    'video_backend': videobackend.VideoBackend(''),
+                    'video_library_backend': videolibrarybackend.VideoLibraryBackend(''),
+                    'keyframe_tolerance': 0.0,
                     'random_frame': False,
+                    'random_frame_sampling': randomframesampling.RandomFrameSampling(''),
+                    'random_frame_no_repeat': False,
+                    'watch_video_directory': False,
+                    'adaptive_waveform': False,
                 },
             },
             {
@@ -62,17 +78,39 @@ class ConfigurationTest(TestCase):
                     'video_directory=/ path / with \t/\twhitespace characters\n'
                     'frame_skip=97\n'
                     'grayscale_method=Average\n'
-                    'random_frame=true'
+                    'dithering_method=Bayer8x8\n'
+                    'dithering_engine=ImageMagick\n'
+                    'grayscale_before_resize=on\n'
+                    'video_backend=FFmpeg\n'
+                    'video_library_backend=SQLite\n'
+                    'keyframe_tolerance=250\n'
+                    'random_frame=true\n'
+                    'random_frame_sampling=Frame\n'
+                    'random_frame_no_repeat=on\n'
+                    'watch_video_directory=yes\n'
+                    'full_refresh_interval=12\n'
+                    'adaptive_waveform=true'
                 ),
                 'config_attribute_name_expected_value_pairs': {
                     'vcom': -123456.789,
                     'screen_width': 1024,
                     'screen_height': 768,
                     'refresh_timeout': 987.654321,
+                    'full_refresh_interval': 12,
                     'video_directory': '/ path / with \t/\twhitespace characters',
                     'skip': skip.FrameSkip(97),
                     'grayscale_method': grayscalemethod.GrayscaleMethod('Average'),
+                    'dithering_method': ditheringmethod.DitheringMethod('Bayer8x8'),
+                    'dithering_engine': ditheringengine.DitheringEngine('ImageMagick'),
+                    'grayscale_before_resize': True,
+                    'video_backend': videobackend.VideoBackend('FFmpeg'),
+                    'video_library_backend': videolibrarybackend.VideoLibraryBackend('SQLite'),
+                    'keyframe_tolerance': 250.0,
                     'random_frame': True,
+                    'random_frame_sampling': randomframesampling.RandomFrameSampling('Frame'),
+                    'random_frame_no_repeat': True,
+                    'watch_video_directory': True,
+                    'adaptive_waveform': True,
                 },
             },
             {
@@ -85,6 +123,9 @@ class ConfigurationTest(TestCase):
                     'time_skip = {time_skip}\n'
                     'frame_skip = {frame_skip}\n'
                     "grayscale_method = 'Rec601Luminance'\n"
+                    'dithering_method = "BlueNoise"\n'
+                    "dithering_engine = 'NumPy'\n"
+                    'video_backend = "OpenCV"\n'
                     'random_frame = off\n'
                 ).format(
                     vcom='-0.{}'.format('1' * sys.float_info.dig),
@@ -100,10 +141,21 @@ class ConfigurationTest(TestCase):
                     'screen_width': int(sys.float_info.max) // 2 - 1,
                     'screen_height': int(sys.float_info.max) // 2 + 1,
                     'refresh_timeout': float('{}.1'.format('9' * sys.float_info.dig)),
+                    'full_refresh_interval': 1,
                     'video_directory': '/directory' * 10,
                     'skip': skip.TimeSkip(float('{0}.{0}'.format('5' * (sys.float_info.dig // 2)))),
                     'grayscale_method': grayscalemethod.GrayscaleMethod('Rec601Luminance'),
+                    'dithering_method': ditheringmethod.DitheringMethod('BlueNoise'),
+                    'dithering_engine': ditheringengine.DitheringEngine('NumPy'),
+                    'grayscale_before_resize': False,
+                    'video_backend': videobackend.VideoBackend('OpenCV'),
+                    'video_library_backend': videolibrarybackend.VideoLibraryBackend(''),
+                    'keyframe_tolerance': 0.0,
                     'random_frame': False,
+                    'random_frame_sampling': randomframesampling.RandomFrameSampling(''),
+                    'random_frame_no_repeat': False,
+                    'watch_video_directory': False,
+                    'adaptive_waveform': False,
                 },
             },
             {
@@ -116,6 +168,9 @@ class ConfigurationTest(TestCase):
                     'frame_skip = 654\n'
                     'time_skip = 321\n'
                     'grayscale_method = "there is a typo in_this value but it does not matter"\n'
+                    'dithering_method = Bayer\n'
+                    'dithering_engine = "Image Magick"\n'
+                    'video_backend = ffmpeg\n'
                     'random_frame = 1\n'
                 ),
                 'config_attribute_name_expected_value_pairs': {
@@ -123,10 +178,21 @@ class ConfigurationTest(TestCase):
                     'screen_width': 456,
                     'screen_height': 789,
                     'refresh_timeout': 987.0,
+                    'full_refresh_interval': 1,
                     'video_directory': '/path/to/video/directory',
                     'skip': skip.TimeSkip(321.0),
                     'grayscale_method': grayscalemethod.GrayscaleMethod('the default will be used here anyway'),
+                    'dithering_method': ditheringmethod.DitheringMethod(''),
+                    'dithering_engine': ditheringengine.DitheringEngine(''),
+                    'grayscale_before_resize': False,
+                    'video_backend': videobackend.VideoBackend(''),
+                    'video_library_backend': videolibrarybackend.VideoLibraryBackend(''),
+                    'keyframe_tolerance': 0.0,
                     'random_frame': True,
+                    'random_frame_sampling': randomframesampling.RandomFrameSampling(''),
+                    'random_frame_no_repeat': False,
+                    'watch_video_directory': False,
+                    'adaptive_waveform': False,
                 },
             },
             {
@@ -139,6 +205,7 @@ class ConfigurationTest(TestCase):
                     'frame_skip = 555\n'
                     'time_skip = 666.666\n'
                     'grayscale_method = RMS\n'
+                    'dithering_method = Bayer4x4\n'
                     'random_frame = yes\n'
                 ),
                 'config_attribute_name_expected_value_pairs': {
@@ -146,10 +213,21 @@ class ConfigurationTest(TestCase):
                     'screen_width': 222,
                     'screen_height': 333,
                     'refresh_timeout': 444.444,
+                    'full_refresh_interval': 1,
                     'video_directory': '/another video directory path',
                     'skip': skip.TimeSkip(666.666),
                     'grayscale_method': grayscalemethod.GrayscaleMethod('RMS'),
+                    'dithering_method': ditheringmethod.DitheringMethod('Bayer4x4'),
+                    'dithering_engine': ditheringengine.DitheringEngine(''),
+                    'grayscale_before_resize': False,
+                    'video_backend': videobackend.VideoBackend(''),
+                    'video_library_backend': videolibrarybackend.VideoLibraryBackend(''),
+                    'keyframe_tolerance': 0.0,
                     'random_frame': True,
+                    'random_frame_sampling': randomframesampling.RandomFrameSampling(''),
+                    'random_frame_no_repeat': False,
+                    'watch_video_directory': False,
+                    'adaptive_waveform': False,
                 },
             },
             {
@@ -168,10 +246,21 @@ class ConfigurationTest(TestCase):
                     'screen_width': 1080,
                     'screen_height': 2400,
                     'refresh_timeout': 1.0,
+                    'full_refresh_interval': 1,
                     'video_directory': r"¯\_(ツ)_/¯",
                     'skip': skip.FrameSkip(555),
                     'grayscale_method': grayscalemethod.GrayscaleMethod('RMS'),
+                    'dithering_method': ditheringmethod.DitheringMethod(''),
+                    'dithering_engine': ditheringengine.DitheringEngine(''),
+                    'grayscale_before_resize': False,
+                    'video_backend': videobackend.VideoBackend(''),
+                    'video_library_backend': videolibrarybackend.VideoLibraryBackend(''),
+                    'keyframe_tolerance': 0.0,
                     'random_frame': False,
+                    'random_frame_sampling': randomframesampling.RandomFrameSampling(''),
+                    'random_frame_no_repeat': False,
+                    'watch_video_directory': False,
+                    'adaptive_waveform': False,
                 },
             },
             {
@@ -191,10 +280,21 @@ class ConfigurationTest(TestCase):
                     'screen_width': 878,
                     'screen_height': 898,
                     'refresh_timeout': 121.212,
+                    'full_refresh_interval': 1,
                     'video_directory': '/this/is/the/last/one',
                     'skip': skip.TimeSkip(232.323),
                     'grayscale_method': grayscalemethod.GrayscaleMethod('Brightness'),
+                    'dithering_method': ditheringmethod.DitheringMethod(''),
+                    'dithering_engine': ditheringengine.DitheringEngine(''),
+                    'grayscale_before_resize': False,
+                    'video_backend': videobackend.VideoBackend(''),
+                    'video_library_backend': videolibrarybackend.VideoLibraryBackend(''),
+                    'keyframe_tolerance': 0.0,
                     'random_frame': True,
+                    'random_frame_sampling': randomframesampling.RandomFrameSampling(''),
+                    'random_frame_no_repeat': False,
+                    'watch_video_directory': False,
+                    'adaptive_waveform': False,
                 },
             },
         ]
@@ -380,6 +480,26 @@ class ConfigurationTest(TestCase):
                     'video_directory = ""\n'
                 ),
             },
+            {
+                'description': 'Negative keyframe_tolerance',
+                'config_file_contents': (
+                    'vcom = -1.48\n'
+                    "display_resolution = 1872x1404\n"
+                    'refresh_timeout = 300.0\n'
+                    'video_directory = /videos\n'
+                    'keyframe_tolerance = -1\n'
+                ),
+            },
+            {
+                'description': 'Zero full_refresh_interval',
+                'config_file_contents': (
+                    'vcom = -1.48\n'
+                    "display_resolution = 1872x1404\n"
+                    'refresh_timeout = 300.0\n'
+                    'video_directory = /videos\n'
+                    'full_refresh_interval = 0\n'
+                ),
+            },
         ]
 
         for case in cases:
@@ -434,6 +554,37 @@ class ConfigurationTest(TestCase):
 
                 self.assertEqual(config.random_frame, expected_value)
 
+    def test_configuration_with_grayscale_before_resize_configurations(self) -> None:
+        config_string_expected_value_pairs: dict[str, bool] = {
+            '1': True,
+            'yes': True,
+            'on': True,
+            'TRUE': True,
+            '0': False,
+            'no': False,
+            'off': False,
+            'FALSE': False,
+            'ʕ •ᴥ•ʔ': False,
+            '-1': False,
+            '2': False,
+        }
+        config_file_contents_template = (
+            'video_directory = "/"\n'
+            'vcom = -1\n'
+            "display_resolution = '1x2'\n"
+            'refresh_timeout = 1\n'
+            'grayscale_before_resize = {}\n'
+        )
+
+        for config_string, expected_value in config_string_expected_value_pairs.items():
+            with self.subTest('grayscale_before_resize = {}'.format(config_string)):
+                with open(self.config_file_path, mode='w') as config_file:
+                    config_file.write(config_file_contents_template.format(config_string))
+
+                config = configuration.Configuration(self.config_directory_path)
+
+                self.assertEqual(config.grayscale_before_resize, expected_value)
+
     def test_configuration_with_invalid_random_frame_configurations(self) -> None:
         invalid_random_frame_config_strings: list[str] = [
             'ʕ •ᴥ•ʔ',
@@ -0,0 +1,80 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+import tempfile
+import shutil
+import os
+
+directorywatcher = get_module_from_file('../../src/slow-movie-player-service/directorywatcher.py')
+
+
+class DirectoryWatcherTest(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.directory_path = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.directory_path, 'subdirectory'))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory_path)
+
+        super().tearDown()
+
+    def create_file(self, *path_components: str) -> str:
+        file_path = os.path.join(self.directory_path, *path_components)
+
+        with open(file_path, 'wb') as file:
+            file.write(b'\x00' * 16)
+
+        return file_path
+
+    def test_non_existing_directory(self) -> None:
+        self.assertRaisesRegex(
+            OSError,
+            r"^\[Errno 2\] Unable to watch directory '/hopefully/this/directory/does/not/exist'\. ",
+            directorywatcher.DirectoryWatcher,
+            '/hopefully/this/directory/does/not/exist'
+        )
+
+    def test_get_changed_paths(self) -> None:
+        with directorywatcher.DirectoryWatcher(self.directory_path) as directory_watcher:
+            self.assertSetEqual(directory_watcher.get_changed_paths(), set())
+
+            file_path_1 = self.create_file('a.mkv')
+            file_path_2 = self.create_file('subdirectory', 'b.mkv')
+
+            self.assertSetEqual(directory_watcher.get_changed_paths(), {file_path_1, file_path_2})
+            self.assertSetEqual(directory_watcher.get_changed_paths(), set())
+
+            moved_file_path = os.path.join(self.directory_path, 'c.mkv')
+            os.rename(file_path_2, moved_file_path)
+            os.remove(file_path_1)
+
+            self.assertSetEqual(directory_watcher.get_changed_paths(), {file_path_1, file_path_2, moved_file_path})
+
+    def test_get_changed_paths_with_new_and_removed_directories(self) -> None:
+        with directorywatcher.DirectoryWatcher(self.directory_path) as directory_watcher:
+            new_directory_path = os.path.join(self.directory_path, 'new_directory')
+            os.mkdir(new_directory_path)
+
+            self.assertSetEqual(directory_watcher.get_changed_paths(), {new_directory_path})
+
+            # Files in new directories are reported as well
+            file_path = self.create_file('new_directory', 'a.mkv')
+
+            self.assertSetEqual(directory_watcher.get_changed_paths(), {file_path})
+
+            moved_directory_path = os.path.join(self.directory_path, 'subdirectory', 'moved_directory')
+            os.rename(new_directory_path, moved_directory_path)
+
+            self.assertSetEqual(directory_watcher.get_changed_paths(), {new_directory_path, moved_directory_path})
+
+            # Watches follow moved directories
+            moved_file_path = os.path.join(moved_directory_path, 'a.mkv')
+            os.remove(moved_file_path)
+
+            self.assertSetEqual(directory_watcher.get_changed_paths(), {moved_file_path})
+
+            subdirectory_path = os.path.join(self.directory_path, 'subdirectory')
+            shutil.rmtree(subdirectory_path)
+
+            self.assertSetEqual(directory_watcher.get_changed_paths(), {moved_directory_path, subdirectory_path})
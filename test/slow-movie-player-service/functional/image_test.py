@@ -5,6 +5,11 @@ import tempfile
 import os
 from typing import Any, Union
 
+grayscalemethod = get_module_from_file('../../src/slow-movie-player-service/grayscalemethod.py')
+grayscaleconverter = get_module_from_file('../../src/slow-movie-player-service/grayscaleconverter.py')
+ditheringengine = get_module_from_file('../../src/slow-movie-player-service/ditheringengine.py')
+ditheringmethod = get_module_from_file('../../src/slow-movie-player-service/ditheringmethod.py')
+imagebufferpool = get_module_from_file('../../src/slow-movie-player-service/imagebufferpool.py')
 image = get_module_from_file('../../src/slow-movie-player-service/image.py')
 
 
@@ -280,6 +285,125 @@ class ImageTest(TestCase):
                     case['expected_image_data'],
                 )
 
+    def test_resize_with_padding(self) -> None:
+        cases: list[dict[str, Any]] = [
+            {
+                'description': 'Shrink 16:9 image onto 4:3 canvas',
+                'input_image_shape': (90, 160, 3),
+                'resolution': (80, 60),
+            },
+            {
+                'description': 'Enlarge 9:16 grayscale image onto 4:3 canvas',
+                'input_image_shape': (32, 18),
+                'resolution': (80, 60),
+            },
+            {
+                'description': 'Shrink 4:3 image onto 4:3 canvas',
+                'input_image_shape': (120, 160, 3),
+                'resolution': (80, 60),
+            },
+        ]
+
+        for case in cases:
+            with self.subTest(case['description']):
+                input_image = numpy.random.default_rng(0).integers(
+                    0x01,
+                    0x100,
+                    case['input_image_shape'],
+                    dtype=numpy.uint8
+                )
+
+                expected_img = (image.Image(input_image)
+                                     .resize_keeping_aspect_ratio(*case['resolution'])
+                                     .add_padding(*case['resolution']))
+
+                for buffer_pool in [None, imagebufferpool.ImageBufferPool()]:
+                    img = image.Image(input_image, buffer_pool).resize_with_padding(*case['resolution'])
+
+                    self.assertListEqual(
+                        self.get_image_data(img),
+                        self.get_image_data(expected_img)
+                    )
+
+    def test_dithering_after_padding_leaves_padding_untouched(self) -> None:
+        input_image = numpy.full((30, 80, 3), 0x80, dtype=numpy.uint8)
+        buffer_pool = imagebufferpool.ImageBufferPool()
+
+        for dithering_method in ditheringmethod.DitheringMethod:
+            for resize in [True, False]:
+                with self.subTest(dithering_method=dithering_method.value, resize=resize):
+                    img = image.Image(input_image, buffer_pool)
+
+                    if resize:
+                        img.resize_with_padding(80, 60)
+                    else:
+                        img.add_padding(80, 60)
+
+                    dithered_image = numpy.array(self.get_image_data(img.apply_4bpp_dithering(dithering_method)))
+
+                    self.assertTupleEqual(dithered_image.shape, (60, 80))
+                    self.assertTrue((dithered_image[:15] == 0x00).all())
+                    self.assertTrue((dithered_image[45:] == 0x00).all())
+                    self.assertTrue(set(dithered_image[15:45].flatten().tolist()).issubset({0x77, 0x88}))
+
+    def test_image_processing_with_buffer_pool(self) -> None:
+        buffer_pool = imagebufferpool.ImageBufferPool()
+        random_generator = numpy.random.default_rng(0)
+
+        for i in range(3):
+            with self.subTest(frame=i):
+                input_image = random_generator.integers(0, 0x100, (45, 80, 3), dtype=numpy.uint8)
+
+                for dithering_method in ditheringmethod.DitheringMethod:
+                    (image.Image(input_image)
+                          .resize_keeping_aspect_ratio(64, 48)
+                          .apply_4bpp_dithering(dithering_method)
+                          .add_padding(64, 48)
+                          .save_to_custom_4bpp_image(self.four_bits_per_pixel_image_file_path))
+
+                    with open(self.four_bits_per_pixel_image_file_path, 'rb') as image_file:
+                        expected_image_file_contents = image_file.read()
+
+                    (image.Image(input_image, buffer_pool)
+                          .resize_with_padding(64, 48)
+                          .apply_4bpp_dithering(dithering_method)
+                          .save_to_custom_4bpp_image(self.four_bits_per_pixel_image_file_path))
+
+                    with open(self.four_bits_per_pixel_image_file_path, 'rb') as image_file:
+                        image_file_contents = image_file.read()
+
+                    self.assertEqual(image_file_contents, expected_image_file_contents)
+
+    def test_convert_to_grayscale(self) -> None:
+        input_image_data = [
+            [[0x00, 0x80, 0xff], [0xff, 0xff, 0xff], [0x00, 0x00, 0x00], [0x40, 0x40, 0x40]]
+        ]
+        grayscale_method_expected_image_data_pairs = {
+            grayscalemethod.GrayscaleMethod.REC601LUMA: [[151, 255, 0, 64]],
+            grayscalemethod.GrayscaleMethod.REC601LUMINANCE: [[174, 255, 0, 64]],
+            grayscalemethod.GrayscaleMethod.REC709LUMA: [[146, 255, 0, 64]],
+            grayscalemethod.GrayscaleMethod.REC709LUMINANCE: [[163, 255, 0, 64]],
+            grayscalemethod.GrayscaleMethod.BRIGHTNESS: [[255, 255, 0, 64]],
+            grayscalemethod.GrayscaleMethod.LIGHTNESS: [[128, 255, 0, 64]],
+            grayscalemethod.GrayscaleMethod.AVERAGE: [[128, 255, 0, 64]],
+            grayscalemethod.GrayscaleMethod.RMS: [[165, 255, 0, 64]],
+        }
+
+        for grayscale_method, expected_image_data in grayscale_method_expected_image_data_pairs.items():
+            with self.subTest(grayscale_method=grayscale_method.value):
+                input_image = numpy.array(input_image_data, dtype=numpy.uint8)
+
+                img = image.Image(input_image).convert_to_grayscale(grayscale_method)
+
+                self.assertListEqual(self.get_image_data(img), expected_image_data)
+
+    def test_convert_to_grayscale_with_grayscale_image(self) -> None:
+        input_image = numpy.array([[0x00, 0x7f, 0xff]], dtype=numpy.uint8)
+
+        img = image.Image(input_image).convert_to_grayscale(grayscalemethod.GrayscaleMethod.BRIGHTNESS)
+
+        self.assertListEqual(self.get_image_data(img), [[0x00, 0x7f, 0xff]])
+
     def test_apply_4bpp_floyd_steinberg_dithering(self) -> None:
         resolution = 256
         input_image = numpy.zeros((resolution, resolution, 3), dtype=numpy.uint8)
@@ -291,16 +415,100 @@ class ImageTest(TestCase):
             0x00, 0x11, 0x22, 0x33, 0x44, 0x55, 0x66, 0x77, 0x88, 0x99, 0xaa, 0xbb, 0xcc, 0xdd, 0xee, 0xff
         }
 
-        img = image.Image(input_image).apply_4bpp_floyd_steinberg_dithering()
+        for grayscale_method in grayscalemethod.GrayscaleMethod:
+            with self.subTest(grayscale_method=grayscale_method.value):
+                img = image.Image(input_image).apply_4bpp_floyd_steinberg_dithering(grayscale_method)
 
-        self.assertTupleEqual(
-            self.get_image_shape(img),
-            (resolution, resolution)
+                self.assertTupleEqual(
+                    self.get_image_shape(img),
+                    (resolution, resolution)
+                )
+
+                pixel_values = [j for i in self.get_image_data(img) for j in i]
+
+                self.assertTrue(set(pixel_values).issubset(allowed_pixel_values))
+
+    def test_apply_4bpp_floyd_steinberg_dithering_preserves_average_intensity(self) -> None:
+        for value in [0x00, 0x11, 0x3c, 0x80, 0xc7, 0xee, 0xff]:
+            with self.subTest(value=value):
+                input_image = numpy.full((64, 96), value, dtype=numpy.uint8)
+
+                img = image.Image(input_image).apply_4bpp_floyd_steinberg_dithering()
+                dithered_image = numpy.array(self.get_image_data(img))
+
+                self.assertAlmostEqual(float(dithered_image.mean()), value, delta=0.5)
+
+                if value % 0x11 == 0:
+                    self.assertTrue((dithered_image == value).all())
+
+    def test_apply_4bpp_ordered_dithering(self) -> None:
+        resolution = 100
+        input_image = numpy.zeros((resolution, resolution + 1, 3), dtype=numpy.uint8)
+        input_image[:, :, 0] = numpy.linspace(0, 255, resolution + 1)
+        input_image[:, :, 1] = numpy.linspace(0, 255, resolution).reshape(resolution, 1)
+        input_image[:, :, 2] = numpy.linspace(255, 0, resolution + 1)
+
+        allowed_pixel_values = {
+            0x00, 0x11, 0x22, 0x33, 0x44, 0x55, 0x66, 0x77, 0x88, 0x99, 0xaa, 0xbb, 0xcc, 0xdd, 0xee, 0xff
+        }
+        dithering_methods = [
+            ditheringmethod.DitheringMethod.BAYER4X4,
+            ditheringmethod.DitheringMethod.BAYER8X8,
+            ditheringmethod.DitheringMethod.BLUENOISE,
+        ]
+
+        for dithering_method in dithering_methods:
+            with self.subTest(dithering_method=dithering_method.value):
+                img = image.Image(input_image).apply_4bpp_ordered_dithering(dithering_method)
+
+                self.assertTupleEqual(
+                    self.get_image_shape(img),
+                    (resolution, resolution + 1)
+                )
+
+                pixel_values = [j for i in self.get_image_data(img) for j in i]
+
+                self.assertTrue(set(pixel_values).issubset(allowed_pixel_values))
+
+    def test_apply_4bpp_ordered_dithering_preserves_average_intensity(self) -> None:
+        dithering_methods = [
+            ditheringmethod.DitheringMethod.BAYER4X4,
+            ditheringmethod.DitheringMethod.BAYER8X8,
+            ditheringmethod.DitheringMethod.BLUENOISE,
+        ]
+
+        for dithering_method in dithering_methods:
+            for value in [0x00, 0x11, 0x3c, 0x80, 0xc7, 0xee, 0xff]:
+                with self.subTest(dithering_method=dithering_method.value, value=value):
+                    input_image = numpy.full((128, 192), value, dtype=numpy.uint8)
+
+                    img = image.Image(input_image).apply_4bpp_ordered_dithering(dithering_method)
+                    dithered_image = numpy.array(self.get_image_data(img))
+
+                    self.assertAlmostEqual(float(dithered_image.mean()), value, delta=0.5)
+
+                    if value % 0x11 == 0:
+                        self.assertTrue((dithered_image == value).all())
+
+    def test_apply_4bpp_ordered_dithering_with_floyd_steinberg_dithering_method(self) -> None:
+        img = image.Image(numpy.zeros((2, 2), dtype=numpy.uint8))
+
+        self.assertRaisesRegex(
+            ValueError,
+            r"^Dithering method 'FloydSteinberg' is not an ordered dithering method\.$",
+            img.apply_4bpp_ordered_dithering,
+            ditheringmethod.DitheringMethod.FLOYDSTEINBERG
         )
 
-        pixel_values = [j for i in self.get_image_data(img) for j in i]
+    def test_apply_4bpp_dithering(self) -> None:
+        input_image = numpy.full((16, 16), 0x80, dtype=numpy.uint8)
 
-        self.assertTrue(set(pixel_values).issubset(allowed_pixel_values))
+        for dithering_method in ditheringmethod.DitheringMethod:
+            with self.subTest(dithering_method=dithering_method.value):
+                img = image.Image(input_image).apply_4bpp_dithering(dithering_method)
+                dithered_image = numpy.array(self.get_image_data(img))
+
+                self.assertTrue(set(dithered_image.flatten().tolist()).issubset({0x77, 0x88}))
 
     def test_save_to_bmp_when_wrong_file_extension_provided(self) -> None:
         img = image.Image(numpy.ndarray((1, 1, 3), dtype=numpy.uint8))
@@ -358,6 +566,58 @@ class ImageTest(TestCase):
             expected_image_file_contents
         )
 
+    def test_save_to_custom_4bpp_image_with_pixel_pairs_spanning_rows(self) -> None:
+        input_image = numpy.array(
+            [
+                [0x11, 0x22, 0x33],
+                [0x44, 0x55, 0x66]
+            ],
+            dtype=numpy.uint8
+        )
+
+        expected_image_file_contents = (
+            b'\x03\x00'  # width (on two bytes in little endian): 3
+            b'\x02\x00'  # height (on two bytes in little endian): 2
+            b'\x32'
+            b'\x16'
+            b'\x54'
+        )
+
+        image.Image(input_image).save_to_custom_4bpp_image(
+            self.four_bits_per_pixel_image_file_path
+        )
+
+        with open(self.four_bits_per_pixel_image_file_path, 'rb') as image_file:
+            image_file_contents = image_file.read()
+
+        self.assertEqual(
+            image_file_contents,
+            expected_image_file_contents
+        )
+
+    def test_save_to_custom_4bpp_buffer(self) -> None:
+        input_image = numpy.array(
+            [
+                [0x00, 0x11, 0x22, 0x33],
+                [0xcc, 0xdd, 0xee, 0xff]
+            ],
+            dtype=numpy.uint8
+        )
+        buffer = numpy.zeros((2, 2), dtype=numpy.uint8)
+
+        image.Image(input_image).save_to_custom_4bpp_buffer(buffer)
+
+        self.assertEqual(buffer.tobytes(), b'\x32\x10\xfe\xdc')
+
+        for invalid_buffer in [numpy.zeros(3, dtype=numpy.uint8), numpy.zeros(4, dtype=numpy.uint16)]:
+            with self.subTest(invalid_buffer=invalid_buffer):
+                self.assertRaisesRegex(
+                    ValueError,
+                    r"^Size of 'buffer' does not match the size of the 4bpp image data\.$",
+                    image.Image(input_image).save_to_custom_4bpp_buffer,
+                    invalid_buffer
+                )
+
     def test_save_to_custom_4bpp_image_when_image_has_multiple_color_channels(self) -> None:
         img = image.Image(numpy.ndarray((2, 2, 3), dtype=numpy.uint8))
 
@@ -1,14 +1,29 @@
 from module_helper import get_module_from_file
 from unittest import TestCase
+from unittest.mock import call, patch
 import tempfile
+import json
 import os
 import numpy
 import cv2
 import re
+import itertools
 from typing import Any
+from collections import OrderedDict
 
+grayscalemethod = get_module_from_file('../../src/slow-movie-player-service/grayscalemethod.py')
+grayscaleconverter = get_module_from_file('../../src/slow-movie-player-service/grayscaleconverter.py')
+videoindex = get_module_from_file('../../src/slow-movie-player-service/videoindex.py')
 video = get_module_from_file('../../src/slow-movie-player-service/video.py')
 skip = get_module_from_file('../../src/slow-movie-player-service/skip.py')
+imagebufferpool = get_module_from_file('../../src/slow-movie-player-service/imagebufferpool.py')
+ffmpegvideo = get_module_from_file('../../src/slow-movie-player-service/ffmpegvideo.py')
+videobackend = get_module_from_file('../../src/slow-movie-player-service/videobackend.py')
+videolibrarybackend = get_module_from_file('../../src/slow-movie-player-service/videolibrarybackend.py')
+randomframesampling = get_module_from_file('../../src/slow-movie-player-service/randomframesampling.py')
+videodatabase = get_module_from_file('../../src/slow-movie-player-service/videodatabase.py')
+videopool = get_module_from_file('../../src/slow-movie-player-service/videopool.py')
+playbackjournal = get_module_from_file('../../src/slow-movie-player-service/playbackjournal.py')
 videolibrary = get_module_from_file('../../src/slow-movie-player-service/videolibrary.py')
 
 
@@ -18,10 +33,17 @@ class VideoLibraryTest(TestCase):
         '.mkv',
     )
     VIDEO_LIBRARY_FILE_NAME = 'videos.json'
+    VIDEO_INDEX_FILE_NAME = 'video_index.json'
+    PLAYBACK_JOURNAL_FILE_NAME = 'videos.journal'
+    VIDEO_DATABASE_FILE_NAME = 'videos.sqlite'
+    SHOWN_FRAMES_FILE_NAME = 'shown_frames.bin'
     VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE = '{{{}\n}}'
     VIDEO_LIBRARY_ENTRY_TEMPLATE = (
         '\n'
         '    "{}": {{\n'
+        '        "file_size": {},\n'
+        '        "modification_time": {},\n'
+        '        "inode": {},\n'
         '        "frame_count": {},\n'
         '        "duration": {},\n'
         '        "next_frame": {},\n'
@@ -34,6 +56,16 @@ class VideoLibraryTest(TestCase):
 
         self.video_directory_path = tempfile.mkdtemp()
         self.video_library_file_path = os.path.join(self.video_directory_path, self.__class__.VIDEO_LIBRARY_FILE_NAME)
+        self.video_index_file_path = os.path.join(self.video_directory_path, self.__class__.VIDEO_INDEX_FILE_NAME)
+        self.playback_journal_file_path = os.path.join(
+            self.video_directory_path,
+            self.__class__.PLAYBACK_JOURNAL_FILE_NAME
+        )
+        self.video_database_file_path = os.path.join(
+            self.video_directory_path,
+            self.__class__.VIDEO_DATABASE_FILE_NAME
+        )
+        self.shown_frames_file_path = os.path.join(self.video_directory_path, self.__class__.SHOWN_FRAMES_FILE_NAME)
 
     def tearDown(self) -> None:
         for directory, _, files in os.walk(self.video_directory_path):
@@ -46,6 +78,21 @@ class VideoLibraryTest(TestCase):
         if os.path.exists(self.video_library_file_path):
             os.remove(self.video_library_file_path)
 
+        if os.path.exists(self.video_index_file_path):
+            os.remove(self.video_index_file_path)
+
+        if os.path.exists(self.playback_journal_file_path):
+            os.remove(self.playback_journal_file_path)
+
+        if os.path.exists(self.shown_frames_file_path):
+            os.remove(self.shown_frames_file_path)
+
+        for file_name_suffix in ['', '-wal', '-shm']:
+            video_database_file_path = '{}{}'.format(self.video_database_file_path, file_name_suffix)
+
+            if os.path.exists(video_database_file_path):
+                os.remove(video_database_file_path)
+
         for directory in [directory_paths for directory_paths, _, _ in os.walk(self.video_directory_path)][::-1]:
             os.rmdir(directory)
 
@@ -57,6 +104,34 @@ class VideoLibraryTest(TestCase):
 
         self.assertEqual(file_contents, expected_file_contents)
 
+    def assert_video_library_equals(self, expected_video_library_file_contents: str) -> None:
+        """
+        Compare the saved video library, updated with the playback positions
+        appended to the playback journal since saving it, to the expected
+        video library file contents.
+        """
+
+        with open(self.video_library_file_path, mode='r') as video_library_file:
+            video_library = json.load(video_library_file, object_pairs_hook=OrderedDict)
+
+        video_paths = list(video_library.keys())
+        playback_journal = playbackjournal.PlaybackJournal(self.playback_journal_file_path)
+
+        for video_number, next_frame, next_timestamp in playback_journal.load(self.video_library_file_path):
+            if video_number == playbackjournal.PlaybackJournal.RESET_VIDEO_NUMBER:
+                video_paths_to_update = video_paths
+            else:
+                video_paths_to_update = [video_paths[video_number]]
+
+            for video_path in video_paths_to_update:
+                video_library[video_path]['next_frame'] = next_frame
+                video_library[video_path]['next_timestamp'] = next_timestamp
+
+        self.assertEqual(
+            json.dumps(video_library, ensure_ascii=False, indent=4),
+            expected_video_library_file_contents
+        )
+
     def create_video_in_video_directory(
         self,
         name: str,
@@ -84,8 +159,13 @@ class VideoLibraryTest(TestCase):
 
         vid.release()
 
+        video_file_stat = os.stat(video_file_path)
+
         return {
             'file_path': video_file_path,
+            'file_size': video_file_stat.st_size,
+            'modification_time': video_file_stat.st_mtime_ns,
+            'inode': video_file_stat.st_ino,
             'frame_count': frame_count,
             'duration': frame_count / fps * 1000.0 if frame_count and fps else 0.0
         }
@@ -292,6 +372,119 @@ class VideoLibraryTest(TestCase):
             )
         )
 
+    def test_video_discovery_does_not_open_unchanged_video_files(self):
+        video_file_properties = self.create_video_in_video_directory('video.mkv')
+        expected_video_library_file_contents = self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
+            self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties.values(), 1, 1000.0)
+        )
+
+        videolibrary.VideoLibrary(self.video_directory_path).get_next_frame()
+
+        with patch.object(videolibrary, 'Video', wraps=video.Video) as video_class_mock:
+            videolibrary.VideoLibrary(self.video_directory_path)
+
+            self.assertListEqual(video_class_mock.mock_calls, [])
+            self.assert_file_contents_equals(self.video_library_file_path, expected_video_library_file_contents)
+
+            # A touched file is probed again, but its playback position is
+            # kept as long as its frame count and duration are the same
+            os.utime(video_file_properties['file_path'], ns=(0, 0))
+            video_file_properties['modification_time'] = 0
+
+            videolibrary.VideoLibrary(self.video_directory_path)
+
+            self.assertListEqual(video_class_mock.mock_calls, [call.probe(video_file_properties['file_path'])])
+            self.assert_file_contents_equals(
+                self.video_library_file_path,
+                self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
+                    self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties.values(), 1, 1000.0)
+                )
+            )
+
+    def test_video_discovery_with_video_library_file_without_file_identities(self):
+        video_file_properties = self.create_video_in_video_directory('video.mkv')
+
+        with open(self.video_library_file_path, mode='w') as video_library_file:
+            json.dump(
+                {
+                    video_file_properties['file_path']: {
+                        'frame_count': video_file_properties['frame_count'],
+                        'duration': video_file_properties['duration'],
+                        'next_frame': 2,
+                        'next_timestamp': 2000.0,
+                    },
+                },
+                video_library_file
+            )
+
+        videolibrary.VideoLibrary(self.video_directory_path)
+
+        self.assert_file_contents_equals(
+            self.video_library_file_path,
+            self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
+                self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties.values(), 2, 2000.0)
+            )
+        )
+
+    def test_update(self):
+        video_file_properties_1 = self.create_video_in_video_directory('b_video.mkv')
+        video_file_properties_2 = self.create_video_in_video_directory('c_video.mkv')
+
+        video_library = videolibrary.VideoLibrary(self.video_directory_path)
+        video_library.get_next_frame()
+
+        modification_time = os.stat(self.video_library_file_path).st_mtime_ns
+
+        # Paths of other files do not change the library
+        video_library.update([os.path.join(self.video_directory_path, 'notes.txt')])
+
+        self.assertEqual(os.stat(self.video_library_file_path).st_mtime_ns, modification_time)
+
+        os.remove(video_file_properties_2['file_path'])
+        os.mkdir(os.path.join(self.video_directory_path, 'subdirectory'))
+        video_file_properties_3 = self.create_video_in_video_directory(os.path.join('subdirectory', 'a_video.avi'))
+        video_file_properties_4 = self.create_video_in_video_directory('a_video.mkv')
+
+        video_library.update(
+            [
+                video_file_properties_2['file_path'],
+                os.path.join(self.video_directory_path, 'subdirectory'),
+                video_file_properties_4['file_path'],
+            ]
+        )
+
+        self.assert_file_contents_equals(
+            self.video_library_file_path,
+            self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
+                '{},{},{}'.format(
+                    self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_1.values(), 1, 1000.0),
+                    self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_4.values(), 0, 0.0),
+                    self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_3.values(), 0, 0.0)
+                )
+            )
+        )
+
+        # Playback continues where it was before the update
+        video_frame = video_library.get_next_frame()
+
+        self.assertTrue(numpy.allclose(video_frame, [0, 255, 0], rtol=0, atol=5))
+
+        # Videos in deleted directories are removed
+        os.remove(video_file_properties_3['file_path'])
+        os.rmdir(os.path.join(self.video_directory_path, 'subdirectory'))
+
+        video_library.update([os.path.join(self.video_directory_path, 'subdirectory')])
+
+        self.assert_file_contents_equals(
+            self.video_library_file_path,
+            self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
+                '{},{}'.format(
+                    self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_1.values(), 2, 2000.0),
+                    self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_4.values(), 0, 0.0)
+                )
+            )
+        )
+
     def test_get_next_frame(self):
         self.create_video_in_video_directory('video.mkv')
 
@@ -308,6 +501,140 @@ class VideoLibraryTest(TestCase):
             # to check whether the color values are within a small tolerance.
             self.assertTrue(numpy.allclose(video_frame, expected_video_frame, rtol=0, atol=5))
 
+    def test_get_next_frame_builds_video_index(self):
+        video_file_properties = self.create_video_in_video_directory('video.mkv')
+
+        self.assertFalse(os.path.exists(self.video_index_file_path))
+
+        video_library = videolibrary.VideoLibrary(self.video_directory_path)
+
+        self.assertFalse(os.path.exists(self.video_index_file_path))
+
+        video_library.get_next_frame()
+
+        with open(self.video_index_file_path) as video_index_file:
+            video_indexes = json.load(video_index_file)
+
+        self.assertListEqual(list(video_indexes.keys()), [video_file_properties['file_path']])
+        self.assertTrue(
+            videoindex.VideoIndex.from_dict(video_indexes[video_file_properties['file_path']])
+                                 .is_up_to_date(video_file_properties['file_path'])
+        )
+
+        # The index is reused by another library if the video is unchanged
+        with open(self.video_index_file_path, 'w') as video_index_file:
+            json.dump(video_indexes, video_index_file)
+
+        modification_time = os.stat(self.video_index_file_path).st_mtime_ns
+
+        for expected_color in [[0, 255, 0], [255, 0, 0]]:
+            video_frame = videolibrary.VideoLibrary(self.video_directory_path).get_next_frame()
+
+            self.assertTrue(numpy.allclose(video_frame, expected_color, rtol=0, atol=5))
+
+        self.assertEqual(os.stat(self.video_index_file_path).st_mtime_ns, modification_time)
+
+    def test_get_next_frame_with_keyframe_tolerance(self):
+        video_file_properties = self.create_video_in_video_directory('video.mkv', frame_count=5)
+        video_file_stat = os.stat(video_file_properties['file_path'])
+
+        with open(self.video_index_file_path, 'w') as video_index_file:
+            json.dump(
+                {
+                    video_file_properties['file_path']: videoindex.VideoIndex(
+                        video_file_stat.st_size,
+                        video_file_stat.st_mtime_ns,
+                        [0, 2]
+                    ).to_dict(),
+                },
+                video_index_file
+            )
+
+        video_library = videolibrary.VideoLibrary(self.video_directory_path, keyframe_tolerance=1000.0)
+
+        # Frames 1 and 3 are snapped to keyframes 0 and 2, frame 4 is too far
+        # from keyframe 2
+        for expected_color in [[0, 0, 255], [0, 0, 255], [255, 0, 0], [255, 0, 0], [0, 255, 0]]:
+            video_frame = video_library.get_next_frame(skip.FrameSkip(1))
+
+            self.assertTrue(numpy.allclose(video_frame, expected_color, rtol=0, atol=5))
+
+    def test_get_next_frame_with_minimum_size_and_grayscale_method(self):
+        self.create_video_in_video_directory('video.mkv')
+
+        video_library = videolibrary.VideoLibrary(self.video_directory_path)
+
+        # Rec. 709 luma of pure red, green and blue
+        for expected_gray_level in [54, 182, 18]:
+            video_frame = video_library.get_next_frame(
+                skip.FrameSkip(1),
+                (100, 100),
+                grayscalemethod.GrayscaleMethod.REC709LUMA
+            )
+
+            self.assertTupleEqual(video_frame.shape, (80, 107))
+            self.assertTrue(numpy.allclose(video_frame, expected_gray_level, rtol=0, atol=5))
+
+    def test_get_next_frame_appends_to_playback_journal(self):
+        video_file_properties = self.create_video_in_video_directory('video.mkv', frame_count=6)
+        video_library = videolibrary.VideoLibrary(self.video_directory_path)
+
+        with open(self.video_library_file_path) as video_library_file:
+            video_library_file_contents = video_library_file.read()
+
+        video_library.get_next_frame()
+        video_library.get_next_frame()
+
+        # The video library is not saved after every frame
+        self.assert_file_contents_equals(self.video_library_file_path, video_library_file_contents)
+
+        # A partially written record (e.g. due to a power loss) is ignored
+        with open(self.playback_journal_file_path, 'ab') as playback_journal_file:
+            playback_journal_file.write(b'\x00\x00\x00')
+
+        expected_video_library_file_contents = self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
+            self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties.values(), 2, 2000.0)
+        )
+
+        video_library = videolibrary.VideoLibrary(self.video_directory_path)
+
+        self.assert_file_contents_equals(self.video_library_file_path, expected_video_library_file_contents)
+        self.assertTrue(numpy.allclose(video_library.get_next_frame(), [255, 0, 0], rtol=0, atol=5))
+
+        # The video library is saved once the playback journal is full
+        with patch.object(videolibrary.VideoLibrary, 'PLAYBACK_JOURNAL_MAX_RECORD_COUNT', 2):
+            video_library.get_next_frame()
+            video_library.get_next_frame()
+
+        self.assert_file_contents_equals(
+            self.video_library_file_path,
+            self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
+                self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties.values(), 5, 5000.0)
+            )
+        )
+
+    def test_get_next_frame_keeps_current_video(self):
+        self.create_video_in_video_directory('video_1.mkv')
+        self.create_video_in_video_directory('video_2.mkv')
+        video_library = videolibrary.VideoLibrary(self.video_directory_path)
+
+        for _ in range(4):
+            video_library.get_next_frame()
+
+        self.assertEqual(video_library._VideoLibrary__current_video_number, 1)
+
+        # The current video is kept after saving the video library
+        with patch.object(videolibrary.VideoLibrary, 'PLAYBACK_JOURNAL_MAX_RECORD_COUNT', 0):
+            self.assertTrue(numpy.allclose(video_library.get_next_frame(), [0, 255, 0], rtol=0, atol=5))
+
+        self.assertEqual(video_library._VideoLibrary__current_video_number, 1)
+
+        # and after restarting
+        video_library = videolibrary.VideoLibrary(self.video_directory_path)
+
+        self.assertEqual(video_library._VideoLibrary__current_video_number, 1)
+        self.assertTrue(numpy.allclose(video_library.get_next_frame(), [255, 0, 0], rtol=0, atol=5))
+
     def test_get_next_frame_with_frame_skip(self):
         video_file_properties = self.create_video_in_video_directory('video.mkv')
 
@@ -315,8 +642,7 @@ class VideoLibraryTest(TestCase):
 
         videolibrary.VideoLibrary(self.video_directory_path).get_next_frame(skip.FrameSkip(2))
 
-        self.assert_file_contents_equals(
-            self.video_library_file_path,
+        self.assert_video_library_equals(
             self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
                 self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties.values(), 2, 2000.0)
             )
@@ -329,8 +655,7 @@ class VideoLibraryTest(TestCase):
 
         videolibrary.VideoLibrary(self.video_directory_path).get_next_frame(skip.TimeSkip(500.0))
 
-        self.assert_file_contents_equals(
-            self.video_library_file_path,
+        self.assert_video_library_equals(
             self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
                 self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties.values(), 0, 500.0)
             )
@@ -390,8 +715,7 @@ class VideoLibraryTest(TestCase):
 
         video_library = videolibrary.VideoLibrary(self.video_directory_path)
 
-        self.assert_file_contents_equals(
-            self.video_library_file_path,
+        self.assert_video_library_equals(
             self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
                 '{},{}'.format(
                     self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_1.values(), 0, 0.0),
@@ -402,8 +726,7 @@ class VideoLibraryTest(TestCase):
 
         video_library.get_next_frame(skip.FrameSkip(3))
 
-        self.assert_file_contents_equals(
-            self.video_library_file_path,
+        self.assert_video_library_equals(
             self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
                 '{},{}'.format(
                     self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_1.values(), 3, 3000.0),
@@ -414,8 +737,7 @@ class VideoLibraryTest(TestCase):
 
         video_library.get_next_frame(skip.TimeSkip(3000.0))
 
-        self.assert_file_contents_equals(
-            self.video_library_file_path,
+        self.assert_video_library_equals(
             self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
                 '{},{}'.format(
                     self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_1.values(), 3, 3000.0),
@@ -426,8 +748,7 @@ class VideoLibraryTest(TestCase):
 
         video_library.get_next_frame(skip.TimeSkip(0.001))
 
-        self.assert_file_contents_equals(
-            self.video_library_file_path,
+        self.assert_video_library_equals(
             self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
                 '{},{}'.format(
                     self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_1.values(), 0, 0.001),
@@ -436,6 +757,113 @@ class VideoLibraryTest(TestCase):
             )
         )
 
+    def test_restart_from_beginning_does_not_save_video_library(self):
+        video_file_properties_1 = self.create_video_in_video_directory('video_1.mkv', frame_count=2)
+        video_file_properties_2 = self.create_video_in_video_directory('video_2.mkv', frame_count=2)
+        video_library = videolibrary.VideoLibrary(self.video_directory_path)
+
+        for _ in range(4):
+            video_library.get_next_frame()
+
+        with open(self.video_library_file_path) as video_library_file:
+            video_library_file_contents = video_library_file.read()
+
+        self.assertTrue(numpy.allclose(video_library.get_next_frame(), [0, 0, 255], rtol=0, atol=5))
+        self.assert_file_contents_equals(self.video_library_file_path, video_library_file_contents)
+        self.assert_video_library_equals(
+            self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
+                '{},{}'.format(
+                    self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_1.values(), 1, 1000.0),
+                    self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_2.values(), 0, 0.0)
+                )
+            )
+        )
+
+        # Videos not yet played again keep their previous playback positions
+        # in memory until they become the current video, but playback
+        # continues the same way after restarting.
+        for expected_color in [[0, 255, 0], [0, 0, 255]]:
+            self.assertTrue(numpy.allclose(video_library.get_next_frame(), expected_color, rtol=0, atol=5))
+
+        video_library = videolibrary.VideoLibrary(self.video_directory_path)
+
+        self.assert_file_contents_equals(
+            self.video_library_file_path,
+            self.__class__.VIDEO_LIBRARY_FILE_CONTENTS_TEMPLATE.format(
+                '{},{}'.format(
+                    self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_1.values(), 2, 2000.0),
+                    self.__class__.VIDEO_LIBRARY_ENTRY_TEMPLATE.format(*video_file_properties_2.values(), 1, 1000.0)
+                )
+            )
+        )
+        self.assertTrue(numpy.allclose(video_library.get_next_frame(), [0, 255, 0], rtol=0, atol=5))
+
+    def test_get_next_frame_with_sqlite_backend(self):
+        self.create_video_in_video_directory('video_1.mkv', frame_count=2)
+        self.create_video_in_video_directory('video_2.mkv', frame_count=2)
+
+        video_library = videolibrary.VideoLibrary(
+            self.video_directory_path,
+            video_library_backend=videolibrarybackend.VideoLibraryBackend.SQLITE
+        )
+
+        self.assertFalse(os.path.exists(self.video_library_file_path))
+        self.assertTrue(os.path.exists(self.video_database_file_path))
+
+        for expected_color in [[0, 0, 255], [0, 255, 0], [0, 0, 255]]:
+            video_frame = video_library.get_next_frame()
+
+            self.assertTrue(numpy.allclose(video_frame, expected_color, rtol=0, atol=5))
+
+        # Playback continues where it was (also after restarting from the
+        # beginning of the video library)
+        video_library = videolibrary.VideoLibrary(
+            self.video_directory_path,
+            video_library_backend=videolibrarybackend.VideoLibraryBackend.SQLITE
+        )
+
+        for expected_color in [[0, 255, 0], [0, 0, 255], [0, 255, 0], [0, 0, 255]]:
+            video_frame = video_library.get_next_frame()
+
+            self.assertTrue(numpy.allclose(video_frame, expected_color, rtol=0, atol=5))
+
+        random_video_frame = video_library.get_random_frame()
+
+        self.assertTrue(
+            numpy.allclose(random_video_frame, [0, 0, 255], rtol=0, atol=5)
+            or numpy.allclose(random_video_frame, [0, 255, 0], rtol=0, atol=5)
+        )
+
+    def test_sqlite_backend_imports_video_library_file(self):
+        video_file_properties_1 = self.create_video_in_video_directory('video_1.mkv')
+        video_file_properties_2 = self.create_video_in_video_directory('video_2.mkv')
+
+        video_library = videolibrary.VideoLibrary(self.video_directory_path)
+        video_library.get_next_frame(skip.FrameSkip(3))
+        video_library.get_next_frame(skip.FrameSkip(2))
+
+        del video_library
+
+        video_library = videolibrary.VideoLibrary(
+            self.video_directory_path,
+            video_library_backend=videolibrarybackend.VideoLibraryBackend.SQLITE
+        )
+
+        self.assertListEqual(
+            list(videodatabase.VideoDatabase(self.video_database_file_path).items()),
+            [
+                (
+                    video_file_properties_1['file_path'],
+                    OrderedDict(list(video_file_properties_1.items())[1:] + [('next_frame', 3), ('next_timestamp', 3000.0)])
+                ),
+                (
+                    video_file_properties_2['file_path'],
+                    OrderedDict(list(video_file_properties_2.items())[1:] + [('next_frame', 2), ('next_timestamp', 2000.0)])
+                ),
+            ]
+        )
+        self.assertTrue(numpy.allclose(video_library.get_next_frame(), [255, 0, 0], rtol=0, atol=5))
+
     def test_get_random_frame(self) -> None:
         video_file_properties_1 = self.create_video_in_video_directory('video_1.mkv')
         video_file_properties_2 = self.create_video_in_video_directory('video_2.avi')
@@ -476,23 +904,104 @@ class VideoLibraryTest(TestCase):
 
         video_library = videolibrary.VideoLibrary(self.video_directory_path)
 
-        self.assert_file_contents_equals(self.video_library_file_path, initial_video_library_file_contents)
+        self.assert_video_library_equals(initial_video_library_file_contents)
 
         random_video_frame_1 = video_library.get_random_frame()
 
         assert_random_video_frame_in_expected_frames(random_video_frame_1)
 
-        self.assert_file_contents_equals(self.video_library_file_path, initial_video_library_file_contents)
+        self.assert_video_library_equals(initial_video_library_file_contents)
 
         video_library.get_next_frame(skip.TimeSkip(2000.0))
 
-        self.assert_file_contents_equals(self.video_library_file_path, video_library_file_contents_after_second_frame)
+        self.assert_video_library_equals(video_library_file_contents_after_second_frame)
 
         random_video_frame_2 = video_library.get_random_frame()
 
         assert_random_video_frame_in_expected_frames(random_video_frame_2)
 
-        self.assert_file_contents_equals(self.video_library_file_path, video_library_file_contents_after_second_frame)
+        self.assert_video_library_equals(video_library_file_contents_after_second_frame)
+
+    def test_get_random_frame_with_frame_sampling(self) -> None:
+        self.create_video_in_video_directory('video_1.mkv', frame_count=1)
+        self.create_video_in_video_directory('video_2.mkv', frame_count=3)
+
+        for video_library_backend in videolibrarybackend.VideoLibraryBackend:
+            with self.subTest(video_library_backend=video_library_backend):
+                video_library = videolibrary.VideoLibrary(
+                    self.video_directory_path,
+                    video_library_backend=video_library_backend,
+                    random_frame_sampling=randomframesampling.RandomFrameSampling.FRAME
+                )
+
+                # Frame 0 of the library is the only frame of the first
+                # video, frames 1-3 are the frames of the second video
+                with patch('random.randrange', side_effect=[0, 1, 3]) as randrange_function_mock, \
+                        patch('random.randint', side_effect=[0, 1, 2]) as randint_function_mock:
+
+                    for expected_color in [[0, 0, 255], [0, 255, 0], [255, 0, 0]]:
+                        video_frame = video_library.get_random_frame()
+
+                        self.assertTrue(numpy.allclose(video_frame, expected_color, rtol=0, atol=5))
+
+                self.assertListEqual(randrange_function_mock.mock_calls, [call(4)] * 3)
+                self.assertListEqual(randint_function_mock.mock_calls, [call(0, 0), call(0, 2), call(0, 2)])
+
+    def test_get_random_frame_without_repeating_frames(self) -> None:
+        self.create_video_in_video_directory('video.mkv')
+
+        video_library = videolibrary.VideoLibrary(self.video_directory_path, random_frame_no_repeat=True)
+
+        self.assertTrue(os.path.exists(self.shown_frames_file_path))
+
+        first_random_video_frame = video_library.get_random_frame()
+
+        # Displayed frames are remembered after restarting
+        video_library = videolibrary.VideoLibrary(self.video_directory_path, random_frame_no_repeat=True)
+        random_video_frames = [first_random_video_frame] + [video_library.get_random_frame() for _ in range(2)]
+
+        for expected_color in [[0, 0, 255], [0, 255, 0], [255, 0, 0]]:
+            self.assertEqual(
+                sum(
+                    numpy.allclose(random_video_frame, expected_color, rtol=0, atol=5)
+                    for random_video_frame in random_video_frames
+                ),
+                1
+            )
+
+    def test_get_random_frame_without_repeating_frames_with_keyframe_tolerance(self) -> None:
+        video_file_properties = self.create_video_in_video_directory('video.mkv')
+        video_file_stat = os.stat(video_file_properties['file_path'])
+
+        with open(self.video_index_file_path, 'w') as video_index_file:
+            json.dump(
+                {
+                    video_file_properties['file_path']: videoindex.VideoIndex(
+                        video_file_stat.st_size,
+                        video_file_stat.st_mtime_ns,
+                        [0]
+                    ).to_dict(),
+                },
+                video_index_file
+            )
+
+        video_library = videolibrary.VideoLibrary(
+            self.video_directory_path,
+            keyframe_tolerance=10000.0,
+            random_frame_no_repeat=True
+        )
+
+        # Every frame would be snapped to keyframe 0 without repeating frames
+        random_video_frames = [video_library.get_random_frame() for _ in range(3)]
+
+        for expected_color in [[0, 0, 255], [0, 255, 0], [255, 0, 0]]:
+            self.assertEqual(
+                sum(
+                    numpy.allclose(random_video_frame, expected_color, rtol=0, atol=5)
+                    for random_video_frame in random_video_frames
+                ),
+                1
+            )
 
     def test_get_random_frame_with_empty_video_library(self) -> None:
         expected_video_library_file_contents = '{}'
@@ -508,3 +1017,53 @@ class VideoLibraryTest(TestCase):
             video_library.get_random_frame
         )
         self.assert_file_contents_equals(self.video_library_file_path, expected_video_library_file_contents)
+
+    def test_get_frame_with_video_library_without_frames(self) -> None:
+        self.create_video_in_video_directory('video.mkv', frame_count=0)
+
+        for video_library_backend, random_frame_sampling, random_frame_no_repeat in itertools.product(
+            videolibrarybackend.VideoLibraryBackend,
+            randomframesampling.RandomFrameSampling,
+            [False, True]
+        ):
+            with self.subTest(
+                video_library_backend=video_library_backend,
+                random_frame_sampling=random_frame_sampling,
+                random_frame_no_repeat=random_frame_no_repeat
+            ):
+                video_library = videolibrary.VideoLibrary(
+                    self.video_directory_path,
+                    video_library_backend=video_library_backend,
+                    random_frame_sampling=random_frame_sampling,
+                    random_frame_no_repeat=random_frame_no_repeat
+                )
+
+                for get_frame in [video_library.get_next_frame, video_library.get_random_frame]:
+                    self.assertRaisesRegex(
+                        RuntimeError,
+                        r"^Cannot get frame from empty video library!$",
+                        get_frame
+                    )
+
+    def test_get_random_frame_with_video_without_frames(self) -> None:
+        self.create_video_in_video_directory('video_1.mkv', frame_count=0)
+        self.create_video_in_video_directory('video_2.mkv')
+
+        for video_library_backend in videolibrarybackend.VideoLibraryBackend:
+            with self.subTest(video_library_backend=video_library_backend):
+                video_library = videolibrary.VideoLibrary(
+                    self.video_directory_path,
+                    video_library_backend=video_library_backend,
+                    random_frame_sampling=randomframesampling.RandomFrameSampling.VIDEO
+                )
+
+                # The first video would be chosen half of the time
+                for _ in range(10):
+                    video_frame = video_library.get_random_frame()
+
+                    self.assertTrue(
+                        any(
+                            numpy.allclose(video_frame, expected_color, rtol=0, atol=5)
+                            for expected_color in [[0, 0, 255], [0, 255, 0], [255, 0, 0]]
+                        )
+                    )
@@ -2,13 +2,31 @@
 
 from unit import configuration_test as configuration_unit_test
 from unit import display_test as display_unit_test
+from unit import displayconnection_test as displayconnection_unit_test
+from unit import ditheringengine_test as ditheringengine_unit_test
+from unit import ditheringmethod_test as ditheringmethod_unit_test
+from unit import ffmpegvideo_test as ffmpegvideo_unit_test
+from unit import framebuffer_test as framebuffer_unit_test
+from unit import grayscaleconverter_test as grayscaleconverter_unit_test
 from unit import grayscalemethod_test as grayscalemethod_unit_test
 from unit import image_test as image_unit_test
+from unit import imagebufferpool_test as imagebufferpool_unit_test
+from unit import partialrefresh_test as partialrefresh_unit_test
+from unit import playbackjournal_test as playbackjournal_unit_test
 from unit import processinfo_test as processinfo_unit_test
+from unit import randomframesampling_test as randomframesampling_unit_test
+from unit import shownframes_test as shownframes_unit_test
 from unit import skip_test as skip_unit_test
 from unit import video_test as video_unit_test
+from unit import videobackend_test as videobackend_unit_test
+from unit import videodatabase_test as videodatabase_unit_test
+from unit import videoindex_test as videoindex_unit_test
 from unit import videolibrary_test as videolibrary_unit_test
+from unit import videolibrarybackend_test as videolibrarybackend_unit_test
+from unit import videopool_test as videopool_unit_test
+from unit import waveformselector_test as waveformselector_unit_test
 from functional import configuration_test as configuration_functional_test
+from functional import directorywatcher_test as directorywatcher_functional_test
 from functional import image_test as image_functional_test
 from functional import videolibrary_test as videolibrary_functional_test
 from types import ModuleType
@@ -41,15 +59,33 @@ if __name__ == '__main__':
     unit_test_modules = [
         configuration_unit_test,
         display_unit_test,
+        displayconnection_unit_test,
+        ditheringengine_unit_test,
+        ditheringmethod_unit_test,
+        ffmpegvideo_unit_test,
+        framebuffer_unit_test,
+        grayscaleconverter_unit_test,
         grayscalemethod_unit_test,
         image_unit_test,
+        imagebufferpool_unit_test,
+        partialrefresh_unit_test,
+        playbackjournal_unit_test,
         processinfo_unit_test,
+        randomframesampling_unit_test,
+        shownframes_unit_test,
         skip_unit_test,
         video_unit_test,
+        videobackend_unit_test,
+        videodatabase_unit_test,
+        videoindex_unit_test,
         videolibrary_unit_test,
+        videolibrarybackend_unit_test,
+        videopool_unit_test,
+        waveformselector_unit_test,
     ]
     functional_test_modules = [
         configuration_functional_test,
+        directorywatcher_functional_test,
         image_functional_test,
         videolibrary_functional_test,
     ]
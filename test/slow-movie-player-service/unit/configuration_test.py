@@ -5,6 +5,11 @@ from unittest.mock import call, Mock, mock_open, patch
 
 skip = get_module_from_file('../../src/slow-movie-player-service/skip.py')
 grayscalemethod = get_module_from_file('../../src/slow-movie-player-service/grayscalemethod.py')
+ditheringengine = get_module_from_file('../../src/slow-movie-player-service/ditheringengine.py')
+ditheringmethod = get_module_from_file('../../src/slow-movie-player-service/ditheringmethod.py')
+videobackend = get_module_from_file('../../src/slow-movie-player-service/videobackend.py')
+videolibrarybackend = get_module_from_file('../../src/slow-movie-player-service/videolibrarybackend.py')
+randomframesampling = get_module_from_file('../../src/slow-movie-player-service/randomframesampling.py')
 configuration = get_module_from_file('../../src/slow-movie-player-service/configuration.py')
 
 
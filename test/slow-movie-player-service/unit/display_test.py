@@ -2,17 +2,60 @@ from module_helper import get_module_from_file
 from unittest import TestCase
 from unittest.mock import call, Mock, patch
 import re
+import tempfile
+import shutil
+import struct
+import os
 import subprocess
 import signal
-from typing import Any
+import socket
+from typing import Any, Optional
 
 processinfo = get_module_from_file('../../src/slow-movie-player-service/processinfo.py')
+waveformmode = get_module_from_file('../../src/slow-movie-player-service/waveformmode.py')
+waveformselector = get_module_from_file('../../src/slow-movie-player-service/waveformselector.py')
+partialrefresh = get_module_from_file('../../src/slow-movie-player-service/partialrefresh.py')
+framebuffer = get_module_from_file('../../src/slow-movie-player-service/framebuffer.py')
+displayconnection = get_module_from_file('../../src/slow-movie-player-service/displayconnection.py')
 display = get_module_from_file('../../src/slow-movie-player-service/display.py')
 
 
 class DisplayTest(TestCase):
     TEST_VCOM_VALUE = -1.48
     TEST_PATH_TO_IMAGE_FILE = '/path/to/image/file'
+    TEST_SOCKET_FD = 42
+    TEST_PANEL_INFO = displayconnection.PanelInfo(1872, 1404, 0x00123456, 'M841_TFA5210')
+
+    def set_up_connection(
+        self,
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock,
+        update_results: Optional[list[tuple[int, float, str]]] = None
+    ) -> tuple[Mock, Mock, Mock]:
+        """
+        Let update-display respond with the (status, refresh time, error
+        message) 'update_results' in order, then with successful updates.
+        """
+
+        connection_socket_mock = Mock(spec=socket.socket)
+        update_display_socket_mock = Mock(spec=socket.socket)
+        update_display_socket_mock.fileno.return_value = self.__class__.TEST_SOCKET_FD
+        socketpair_function_mock.return_value = connection_socket_mock, update_display_socket_mock
+
+        remaining_update_results = list(update_results or [])
+
+        def receive_update_result(request_id: int) -> Any:
+            status, refresh_time, error_message = (
+                remaining_update_results.pop(0) if remaining_update_results else (0, 0.25, '')
+            )
+
+            return displayconnection.UpdateResult(request_id, status, 0.125, refresh_time, error_message)
+
+        connection_mock = display_connection_mock.return_value
+        connection_mock.receive_panel_info.return_value = self.__class__.TEST_PANEL_INFO
+        connection_mock.receive_update_result.side_effect = receive_update_result
+
+        return connection_socket_mock, update_display_socket_mock, connection_mock
 
     @patch('subprocess.STDOUT')
     @patch('subprocess.PIPE')
@@ -243,9 +286,9 @@ class DisplayTest(TestCase):
                     ]
                 )
 
-    @patch('signal.SIGUSR1')
+    @patch('display.DisplayConnection', autospec=True)
+    @patch('socket.socketpair', spec=socket.socketpair)
     @patch('signal.SIGTERM')
-    @patch('signal.sigtimedwait', spec=signal.sigtimedwait)
     @patch('signal.getsignal', spec=signal.getsignal)
     @patch('signal.signal', spec=signal.signal)
     @patch('subprocess.STDOUT')
@@ -258,296 +301,562 @@ class DisplayTest(TestCase):
         stderr_mock: Mock,
         signal_function_mock: Mock,
         getsignal_function_mock: Mock,
-        sigtimedwait_function_mock: Mock,
         sigterm_mock: Mock,
-        sigusr1_mock: Mock
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock
     ) -> None:
         popen_command = [
             display.Display.UPDATE_DISPLAY_PATH,
-            '-d',
             '-v',
             str(self.__class__.TEST_VCOM_VALUE),
             '-f',
-            self.__class__.TEST_PATH_TO_IMAGE_FILE
+            self.__class__.TEST_PATH_TO_IMAGE_FILE,
+            '-s',
+            str(self.__class__.TEST_SOCKET_FD)
         ]
-
-        update_display_process_mock = popen_mock(
+        popen_call = call(
             popen_command,
             stdout=stdout_mock,
             stderr=stderr_mock,
-            text=True
+            text=True,
+            pass_fds=(self.__class__.TEST_SOCKET_FD,)
         )
-        update_display_process_mock.returncode = 0
-        update_display_process_mock.communicate.return_value = 'dummy output', None
 
-        popen_mock.reset_mock()
+        connection_socket_mock, update_display_socket_mock, connection_mock = self.set_up_connection(
+            socketpair_function_mock,
+            display_connection_mock
+        )
 
-        self.assertListEqual(popen_mock.mock_calls, [])
-        self.assertListEqual(stdout_mock.mock_calls, [])
-        self.assertListEqual(stderr_mock.mock_calls, [])
-        self.assertListEqual(signal_function_mock.mock_calls, [])
-        self.assertListEqual(getsignal_function_mock.mock_calls, [])
-        self.assertListEqual(sigtimedwait_function_mock.mock_calls, [])
-        self.assertListEqual(sigterm_mock.mock_calls, [])
-        self.assertListEqual(sigusr1_mock.mock_calls, [])
-        self.assertListEqual(update_display_process_mock.mock_calls, [])
+        update_display_process_mock = popen_mock.return_value
+        update_display_process_mock.returncode = 0
+        update_display_process_mock.communicate.return_value = 'dummy output', None
 
         with display.Display(self.__class__.TEST_VCOM_VALUE, self.__class__.TEST_PATH_TO_IMAGE_FILE) as dsp:
             self.assertListEqual(popen_mock.mock_calls, [])
-            self.assertListEqual(stdout_mock.mock_calls, [])
-            self.assertListEqual(stderr_mock.mock_calls, [])
-            self.assertListEqual(signal_function_mock.mock_calls, [])
+            self.assertListEqual(socketpair_function_mock.mock_calls, [])
+            self.assertListEqual(display_connection_mock.mock_calls, [])
             self.assertListEqual(
                 getsignal_function_mock.mock_calls,
                 [
                     call(sigterm_mock),  # Save original SIGTERM signal handler in __init__
                 ]
             )
-            self.assertListEqual(sigtimedwait_function_mock.mock_calls, [])
-            self.assertListEqual(sigterm_mock.mock_calls, [])
-            self.assertListEqual(sigusr1_mock.mock_calls, [])
-            self.assertListEqual(update_display_process_mock.mock_calls, [])
+            self.assertIsNone(dsp.get_panel_info())
+            self.assertIsNone(dsp.get_last_update_result())
 
             dsp.update()
 
             self.assertListEqual(
                 popen_mock.mock_calls,
                 [
-                    call(popen_command, stdout=stdout_mock, stderr=stderr_mock, text=True),  # Start update-display
-                    call().send_signal(sigusr1_mock),  # Send SIGUSR1 to update-display to draw image on screen
+                    popen_call,  # Start update-display with one end of the socket pair
                 ]
             )
-            self.assertListEqual(stdout_mock.mock_calls, [])
-            self.assertListEqual(stderr_mock.mock_calls, [])
             self.assertListEqual(
                 signal_function_mock.mock_calls,
                 [
                     call(sigterm_mock, dsp._Display__sigterm_handler),  # Set SIGTERM handler function in __start
-                    call(sigusr1_mock, display.Display._Display__noop_signal_handler),  # Set SIGUSR1 handler function in __start
                 ]
             )
-            self.assertListEqual(getsignal_function_mock.mock_calls, [call(sigterm_mock)])
             self.assertListEqual(
-                sigtimedwait_function_mock.mock_calls,
+                socketpair_function_mock.mock_calls,
                 [
-                    call([sigusr1_mock], display.Display.TIMEOUT),  # Wait for update-display to get ready
-                    call([sigusr1_mock], display.Display.TIMEOUT),  # Wait until image was drawn on display
+                    call(socket.AF_UNIX, socket.SOCK_SEQPACKET),
                 ]
             )
-            self.assertListEqual(sigterm_mock.mock_calls, [])
-            self.assertListEqual(sigusr1_mock.mock_calls, [])
             self.assertListEqual(
-                update_display_process_mock.mock_calls,
+                update_display_socket_mock.mock_calls,
                 [
-                    call.send_signal(sigusr1_mock),  # Send SIGUSR1 to update-display to draw image on screen
+                    call.fileno(),
+                    call.fileno(),
+                    call.close(),  # The end of update-display is only kept open by update-display
                 ]
             )
-
-            dsp.update()
-
+            self.assertListEqual(connection_socket_mock.mock_calls, [])
             self.assertListEqual(
-                popen_mock.mock_calls,
+                display_connection_mock.mock_calls,
                 [
-                    call(popen_command, stdout=stdout_mock, stderr=stderr_mock, text=True),
-                    call().send_signal(sigusr1_mock),
-                    call().send_signal(sigusr1_mock),  # Send SIGUSR1 to update-display to draw image on screen again
+                    call(connection_socket_mock, display.Display.TIMEOUT),
+                    call().receive_panel_info(),  # Wait for update-display to get ready
+                    call().send_update(1),  # Request update-display to draw image on screen
+                    call().receive_update_result(1),  # Wait until image was drawn on display
                 ]
             )
-            self.assertListEqual(stdout_mock.mock_calls, [])
-            self.assertListEqual(stderr_mock.mock_calls, [])
-            self.assertListEqual(
-                signal_function_mock.mock_calls,
-                [
-                    call(sigterm_mock, dsp._Display__sigterm_handler),
-                    call(sigusr1_mock, dsp._Display__noop_signal_handler),
-                ]
-            )
-            self.assertListEqual(
-                getsignal_function_mock.mock_calls,
-                [
-                    call(sigterm_mock),
-                ]
-            )
-            self.assertListEqual(
-                sigtimedwait_function_mock.mock_calls,
-                [
-                    call([sigusr1_mock], display.Display.TIMEOUT),
-                    call([sigusr1_mock], display.Display.TIMEOUT),
-                    call([sigusr1_mock], display.Display.TIMEOUT),  # Wait until image was drawn on display again
-                ]
+            self.assertEqual(dsp.get_panel_info(), self.__class__.TEST_PANEL_INFO)
+            self.assertEqual(
+                dsp.get_last_update_result(),
+                displayconnection.UpdateResult(1, 0, 0.125, 0.25, '')
             )
-            self.assertListEqual(sigterm_mock.mock_calls, [])
-            self.assertListEqual(sigusr1_mock.mock_calls, [])
+
+            dsp.update()
+
+            self.assertListEqual(popen_mock.mock_calls, [popen_call])
             self.assertListEqual(
-                update_display_process_mock.mock_calls,
+                connection_mock.mock_calls,
                 [
-                    call.send_signal(sigusr1_mock),
-                    call.send_signal(sigusr1_mock),  # Send SIGUSR1 to update-display to draw image on screen again
+                    call.receive_panel_info(),
+                    call.send_update(1),
+                    call.receive_update_result(1),
+                    call.send_update(2),  # Request update-display to draw image on screen again
+                    call.receive_update_result(2),
                 ]
             )
+            self.assertEqual(dsp.get_last_update_result().request_id, 2)
 
         self.assertListEqual(
             popen_mock.mock_calls,
             [
-                call(popen_command, stdout=stdout_mock, stderr=stderr_mock, text=True),
-                call().send_signal(sigusr1_mock),
-                call().send_signal(sigusr1_mock),
+                popen_call,
                 call().send_signal(sigterm_mock),  # Send SIGTERM to update-display to stop
                 call().communicate(timeout=display.Display.TIMEOUT),  # Wait for update-display to stop, etc.
             ]
         )
         self.assertListEqual(stdout_mock.mock_calls, [])
         self.assertListEqual(stderr_mock.mock_calls, [])
-        self.assertListEqual(
-            signal_function_mock.mock_calls,
-            [
-                call(sigterm_mock, dsp._Display__sigterm_handler),
-                call(sigusr1_mock, dsp._Display__noop_signal_handler),
-            ]
-        )
-        self.assertListEqual(
-            getsignal_function_mock.mock_calls,
-            [
-                call(sigterm_mock),
-            ]
-        )
-        self.assertListEqual(
-            sigtimedwait_function_mock.mock_calls,
-            [
-                call([sigusr1_mock], display.Display.TIMEOUT),
-                call([sigusr1_mock], display.Display.TIMEOUT),
-                call([sigusr1_mock], display.Display.TIMEOUT),
-            ]
-        )
+        self.assertListEqual(signal_function_mock.mock_calls, [call(sigterm_mock, dsp._Display__sigterm_handler)])
+        self.assertListEqual(getsignal_function_mock.mock_calls, [call(sigterm_mock)])
         self.assertListEqual(sigterm_mock.mock_calls, [])
-        self.assertListEqual(sigusr1_mock.mock_calls, [])
         self.assertListEqual(
-            update_display_process_mock.mock_calls,
+            connection_mock.mock_calls,
             [
-                call.send_signal(sigusr1_mock),
-                call.send_signal(sigusr1_mock),
-                call.send_signal(sigterm_mock),  # Send SIGTERM to update-display to stop
-                call.communicate(timeout=display.Display.TIMEOUT),  # Wait for update-display to stop, etc.
+                call.receive_panel_info(),
+                call.send_update(1),
+                call.receive_update_result(1),
+                call.send_update(2),
+                call.receive_update_result(2),
+                call.close(),  # Close the connection after update-display stopped
             ]
         )
 
-    @patch('signal.SIGUSR1')
+    @patch.object(partialrefresh.PartialRefresh, 'save_rectangles', autospec=True)
+    @patch('display.DisplayConnection', autospec=True)
+    @patch('socket.socketpair', spec=socket.socketpair)
     @patch('signal.SIGTERM')
-    @patch('signal.raise_signal', spec=signal.raise_signal)
-    @patch('signal.sigtimedwait', spec=signal.sigtimedwait)
     @patch('signal.getsignal', spec=signal.getsignal)
     @patch('signal.signal', spec=signal.signal)
     @patch('subprocess.STDOUT')
     @patch('subprocess.PIPE')
     @patch('subprocess.Popen', spec=subprocess.Popen)
-    def test_sigterm_handling(
+    def test_update_with_partial_refresh(
         self,
         popen_mock: Mock,
         stdout_mock: Mock,
         stderr_mock: Mock,
         signal_function_mock: Mock,
         getsignal_function_mock: Mock,
-        sigtimedwait_function_mock: Mock,
-        raise_signal_function_mock: Mock,
         sigterm_mock: Mock,
-        sigusr1_mock: Mock
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock,
+        save_rectangles_function_mock: Mock
+    ) -> None:
+        image_file_path = '/path/to/image.4bpp'
+        rectangles_file_path = '/path/to/image.4bpp{}'.format(display.Display.RECTANGLES_FILE_EXTENSION)
+        popen_command = [
+            display.Display.UPDATE_DISPLAY_PATH,
+            '-v',
+            str(self.__class__.TEST_VCOM_VALUE),
+            '-f',
+            image_file_path,
+            '-s',
+            str(self.__class__.TEST_SOCKET_FD),
+            '-r',
+            rectangles_file_path
+        ]
+
+        self.set_up_connection(socketpair_function_mock, display_connection_mock)
+
+        update_display_process_mock = popen_mock.return_value
+        update_display_process_mock.returncode = 0
+        update_display_process_mock.communicate.return_value = 'dummy output', None
+
+        with display.Display(self.__class__.TEST_VCOM_VALUE, image_file_path, 10) as dsp:
+            dsp.update()
+            dsp.update()
+
+            partial_refresh = dsp._Display__partial_refresh
+
+            self.assertListEqual(
+                popen_mock.mock_calls,
+                [
+                    call(
+                        popen_command,
+                        stdout=stdout_mock,
+                        stderr=stderr_mock,
+                        text=True,
+                        pass_fds=(self.__class__.TEST_SOCKET_FD,)
+                    ),
+                ]
+            )
+            # The rectangles to refresh are saved before every update
+            self.assertListEqual(
+                save_rectangles_function_mock.mock_calls,
+                [
+                    call(partial_refresh, image_file_path, rectangles_file_path),
+                    call(partial_refresh, image_file_path, rectangles_file_path),
+                ]
+            )
+
+        # Images are always refreshed completely with a full refresh interval
+        # of one, or if they are not custom 4bpp images.
+        for file_path, full_refresh_interval in [(image_file_path, 1), ('/path/to/image.bmp', 10)]:
+            with self.subTest(file_path=file_path, full_refresh_interval=full_refresh_interval):
+                popen_mock.reset_mock()
+                save_rectangles_function_mock.reset_mock()
+
+                with display.Display(self.__class__.TEST_VCOM_VALUE, file_path, full_refresh_interval) as dsp:
+                    dsp.update()
+
+                self.assertEqual(
+                    popen_mock.mock_calls[0],
+                    call(
+                        [
+                            display.Display.UPDATE_DISPLAY_PATH,
+                            '-v',
+                            str(self.__class__.TEST_VCOM_VALUE),
+                            '-f',
+                            file_path,
+                            '-s',
+                            str(self.__class__.TEST_SOCKET_FD)
+                        ],
+                        stdout=stdout_mock,
+                        stderr=stderr_mock,
+                        text=True,
+                        pass_fds=(self.__class__.TEST_SOCKET_FD,)
+                    )
+                )
+                self.assertListEqual(save_rectangles_function_mock.mock_calls, [])
+
+    @patch.object(
+        partialrefresh.PartialRefresh,
+        'save_rectangles',
+        autospec=True,
+        side_effect=[waveformmode.WaveformMode.DU, None]
+    )
+    @patch('display.DisplayConnection', autospec=True)
+    @patch('socket.socketpair', spec=socket.socketpair)
+    @patch('signal.getsignal', spec=signal.getsignal)
+    @patch('signal.signal', spec=signal.signal)
+    @patch('subprocess.Popen', spec=subprocess.Popen)
+    def test_update_with_adaptive_waveform(
+        self,
+        popen_mock: Mock,
+        signal_function_mock: Mock,
+        getsignal_function_mock: Mock,
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock,
+        save_rectangles_function_mock: Mock
     ) -> None:
+        self.set_up_connection(socketpair_function_mock, display_connection_mock, [(0, 0.5, ''), (0, 0.75, '')])
+
+        update_display_process_mock = popen_mock.return_value
+        update_display_process_mock.returncode = 0
+        update_display_process_mock.communicate.return_value = 'dummy output', None
+
+        with display.Display(self.__class__.TEST_VCOM_VALUE, '/path/to/image.4bpp', 10, True) as dsp:
+            waveform_selector = dsp._Display__waveform_selector
+
+            self.assertIs(dsp._Display__partial_refresh._PartialRefresh__waveform_selector, waveform_selector)
+
+            dsp.update()
+            dsp.update()
+
+        # Only the refresh times (reported by update-display) of partial
+        # refreshes are recorded
+        self.assertAlmostEqual(
+            waveform_selector.get_refresh_time(waveformmode.WaveformMode.DU),
+            0.8 * waveformselector.WaveformSelector.ESTIMATED_REFRESH_TIMES[waveformmode.WaveformMode.DU] + 0.2 * 0.5
+        )
+
+        for mode in [waveformmode.WaveformMode.GC16, waveformmode.WaveformMode.GL16, waveformmode.WaveformMode.A2]:
+            self.assertEqual(
+                waveform_selector.get_refresh_time(mode),
+                waveformselector.WaveformSelector.ESTIMATED_REFRESH_TIMES[mode]
+            )
 
+    @patch('display.DisplayConnection', autospec=True)
+    @patch('socket.socketpair', spec=socket.socketpair)
+    @patch('signal.SIGTERM')
+    @patch('signal.getsignal', spec=signal.getsignal)
+    @patch('signal.signal', spec=signal.signal)
+    @patch('subprocess.STDOUT')
+    @patch('subprocess.PIPE')
+    @patch('subprocess.Popen', spec=subprocess.Popen)
+    def test_update_with_frame_buffer(
+        self,
+        popen_mock: Mock,
+        stdout_mock: Mock,
+        stderr_mock: Mock,
+        signal_function_mock: Mock,
+        getsignal_function_mock: Mock,
+        sigterm_mock: Mock,
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock
+    ) -> None:
+        directory_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory_path)
+        frame_buffer_file_path = os.path.join(directory_path, 'frame{}'.format(framebuffer.FrameBuffer.FILE_EXTENSION))
         popen_command = [
             display.Display.UPDATE_DISPLAY_PATH,
-            '-d',
             '-v',
             str(self.__class__.TEST_VCOM_VALUE),
             '-f',
-            self.__class__.TEST_PATH_TO_IMAGE_FILE
+            frame_buffer_file_path,
+            '-s',
+            str(self.__class__.TEST_SOCKET_FD)
         ]
 
-        update_display_process_mock = popen_mock(
-            popen_command,
-            stdout=stdout_mock,
-            stderr=stderr_mock,
-            text=True
+        _, _, connection_mock = self.set_up_connection(socketpair_function_mock, display_connection_mock)
+
+        update_display_process_mock = popen_mock.return_value
+        update_display_process_mock.returncode = 0
+        update_display_process_mock.communicate.return_value = 'dummy output', None
+
+        with display.Display(self.__class__.TEST_VCOM_VALUE, frame_buffer_file_path, 10) as dsp:
+            self.assertRaises(RuntimeError, dsp.update)
+            self.assertListEqual(popen_mock.mock_calls, [])
+
+            frame_buffer = dsp.get_frame_buffer(64, 32)
+            frame_buffer.get_back_buffer().fill(0x11)
+            dsp.update()
+
+            # The frame is drawn in the background, while the next one is
+            # saved into the back buffer
+            self.assertListEqual(
+                connection_mock.mock_calls,
+                [
+                    call.receive_panel_info(),
+                    call.send_update(1),
+                ]
+            )
+            self.assertIsNone(dsp.get_last_update_result())
+            self.assertIs(dsp.get_frame_buffer(64, 32), frame_buffer)
+
+            frame_buffer.get_back_buffer().fill(0x11)
+            frame_buffer.get_back_buffer()[0, 0] = 0xFF
+            dsp.update()
+
+            # Buffers are swapped only after the previous frame was drawn
+            self.assertListEqual(
+                connection_mock.mock_calls,
+                [
+                    call.receive_panel_info(),
+                    call.send_update(1),
+                    call.receive_update_result(1),
+                    call.send_update(2),
+                ]
+            )
+            self.assertEqual(dsp.get_last_update_result().request_id, 1)
+
+            dsp.wait()
+            dsp.wait()
+
+            self.assertListEqual(
+                connection_mock.mock_calls,
+                [
+                    call.receive_panel_info(),
+                    call.send_update(1),
+                    call.receive_update_result(1),
+                    call.send_update(2),
+                    call.receive_update_result(2),
+                ]
+            )
+            self.assertEqual(dsp.get_last_update_result().request_id, 2)
+
+            # Frames are drawn from the frame buffer, without a rectangles
+            # file
+            self.assertListEqual(
+                popen_mock.mock_calls,
+                [
+                    call(
+                        popen_command,
+                        stdout=stdout_mock,
+                        stderr=stderr_mock,
+                        text=True,
+                        pass_fds=(self.__class__.TEST_SOCKET_FD,)
+                    ),
+                ]
+            )
+
+            with open(frame_buffer_file_path, 'rb') as frame_buffer_file:
+                contents = frame_buffer_file.read()
+
+            self.assertTupleEqual(
+                struct.unpack_from('<4sHHQHHHH', contents),
+                (b'SMFB', 1, 0, 2, 64, 32, 1, waveformmode.WaveformMode.GC16)
+            )
+            self.assertTupleEqual(struct.unpack_from('<HHHH', contents, 24), (0, 0, 32, 32))
+
+            # A frame buffer of another resolution needs a new update-display
+            # process
+            popen_mock.reset_mock()
+
+            self.assertTupleEqual(dsp.get_frame_buffer(32, 32).get_size(), (32, 32))
+            self.assertListEqual(
+                popen_mock.mock_calls,
+                [
+                    call().send_signal(sigterm_mock),
+                    call().communicate(timeout=display.Display.TIMEOUT),
+                ]
+            )
+            self.assertEqual(connection_mock.mock_calls[-1], call.close())
+
+        with display.Display(self.__class__.TEST_VCOM_VALUE, '/path/to/image.4bpp') as dsp:
+            self.assertRaises(RuntimeError, dsp.get_frame_buffer, 64, 32)
+
+    @patch.object(
+        partialrefresh.PartialRefresh,
+        'get_refresh',
+        autospec=True,
+        side_effect=[(None, waveformmode.WaveformMode.GC16), ([(0, 0, 32, 32)], waveformmode.WaveformMode.DU)]
+    )
+    @patch('display.DisplayConnection', autospec=True)
+    @patch('socket.socketpair', spec=socket.socketpair)
+    @patch('signal.getsignal', spec=signal.getsignal)
+    @patch('signal.signal', spec=signal.signal)
+    @patch('subprocess.Popen', spec=subprocess.Popen)
+    def test_load_and_show(
+        self,
+        popen_mock: Mock,
+        signal_function_mock: Mock,
+        getsignal_function_mock: Mock,
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock,
+        get_refresh_function_mock: Mock
+    ) -> None:
+        directory_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory_path)
+        frame_buffer_file_path = os.path.join(directory_path, 'frame{}'.format(framebuffer.FrameBuffer.FILE_EXTENSION))
+
+        _, _, connection_mock = self.set_up_connection(
+            socketpair_function_mock,
+            display_connection_mock,
+            [(0, 0.0, ''), (0, 0.5, ''), (0, 0.0, ''), (0, 0.75, '')]
         )
+
+        update_display_process_mock = popen_mock.return_value
         update_display_process_mock.returncode = 0
         update_display_process_mock.communicate.return_value = None, None
 
-        original_sigterm_handler_mock = getsignal_function_mock(sigterm_mock)
+        with display.Display(self.__class__.TEST_VCOM_VALUE, frame_buffer_file_path, 10, True) as dsp:
+            self.assertRaises(RuntimeError, dsp.show)
 
-        popen_mock.reset_mock()
-        getsignal_function_mock.reset_mock()
+            waveform_selector = dsp._Display__waveform_selector
+            dsp.get_frame_buffer(64, 32)
 
-        self.assertListEqual(popen_mock.mock_calls, [])
-        self.assertListEqual(stdout_mock.mock_calls, [])
-        self.assertListEqual(stderr_mock.mock_calls, [])
-        self.assertListEqual(signal_function_mock.mock_calls, [])
-        self.assertListEqual(getsignal_function_mock.mock_calls, [])
-        self.assertListEqual(sigtimedwait_function_mock.mock_calls, [])
-        self.assertListEqual(raise_signal_function_mock.mock_calls, [])
-        self.assertListEqual(sigterm_mock.mock_calls, [])
-        self.assertListEqual(sigusr1_mock.mock_calls, [])
-        self.assertListEqual(update_display_process_mock.mock_calls, [])
-        self.assertListEqual(original_sigterm_handler_mock.mock_calls, [])
+            dsp.load()
 
-        dsp = display.Display(self.__class__.TEST_VCOM_VALUE, self.__class__.TEST_PATH_TO_IMAGE_FILE)
+            # The frame is transferred in the background
+            self.assertListEqual(
+                connection_mock.mock_calls,
+                [
+                    call.receive_panel_info(),
+                    call.send_load(1),
+                ]
+            )
 
-        self.assertListEqual(popen_mock.mock_calls, [])
-        self.assertListEqual(stdout_mock.mock_calls, [])
-        self.assertListEqual(stderr_mock.mock_calls, [])
-        self.assertListEqual(signal_function_mock.mock_calls, [])
-        self.assertListEqual(
-            getsignal_function_mock.mock_calls,
+            dsp.show()
+
+            # Only the refresh of the display is left after loading the frame
+            self.assertListEqual(
+                connection_mock.mock_calls,
+                [
+                    call.receive_panel_info(),
+                    call.send_load(1),
+                    call.receive_update_result(1),
+                    call.send_show(2),
+                ]
+            )
+
+            dsp.load()
+            dsp.show()
+            dsp.wait()
+
+            self.assertListEqual(
+                connection_mock.mock_calls,
+                [
+                    call.receive_panel_info(),
+                    call.send_load(1),
+                    call.receive_update_result(1),
+                    call.send_show(2),
+                    call.receive_update_result(2),
+                    call.send_load(3),
+                    call.receive_update_result(3),
+                    call.send_show(4),
+                    call.receive_update_result(4),
+                ]
+            )
+            self.assertEqual(get_refresh_function_mock.call_count, 2)
+
+        # Only the refresh time of the shown partial refresh is recorded
+        self.assertAlmostEqual(
+            waveform_selector.get_refresh_time(waveformmode.WaveformMode.DU),
+            0.8 * waveformselector.WaveformSelector.ESTIMATED_REFRESH_TIMES[waveformmode.WaveformMode.DU] + 0.2 * 0.75
+        )
+        self.assertEqual(
+            waveform_selector.get_refresh_time(waveformmode.WaveformMode.GC16),
+            waveformselector.WaveformSelector.ESTIMATED_REFRESH_TIMES[waveformmode.WaveformMode.GC16]
+        )
+
+    @patch('display.DisplayConnection', autospec=True)
+    @patch('socket.socketpair', spec=socket.socketpair)
+    @patch('signal.SIGTERM')
+    @patch('signal.raise_signal', spec=signal.raise_signal)
+    @patch('signal.getsignal', spec=signal.getsignal)
+    @patch('signal.signal', spec=signal.signal)
+    @patch('subprocess.STDOUT')
+    @patch('subprocess.PIPE')
+    @patch('subprocess.Popen', spec=subprocess.Popen)
+    def test_sigterm_handling(
+        self,
+        popen_mock: Mock,
+        stdout_mock: Mock,
+        stderr_mock: Mock,
+        signal_function_mock: Mock,
+        getsignal_function_mock: Mock,
+        raise_signal_function_mock: Mock,
+        sigterm_mock: Mock,
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock
+    ) -> None:
+        popen_call = call(
             [
-                call(sigterm_mock),
-            ]
+                display.Display.UPDATE_DISPLAY_PATH,
+                '-v',
+                str(self.__class__.TEST_VCOM_VALUE),
+                '-f',
+                self.__class__.TEST_PATH_TO_IMAGE_FILE,
+                '-s',
+                str(self.__class__.TEST_SOCKET_FD)
+            ],
+            stdout=stdout_mock,
+            stderr=stderr_mock,
+            text=True,
+            pass_fds=(self.__class__.TEST_SOCKET_FD,)
         )
-        self.assertListEqual(sigtimedwait_function_mock.mock_calls, [])
-        self.assertListEqual(raise_signal_function_mock.mock_calls, [])
-        self.assertListEqual(sigterm_mock.mock_calls, [])
-        self.assertListEqual(sigusr1_mock.mock_calls, [])
-        self.assertListEqual(update_display_process_mock.mock_calls, [])
-        self.assertListEqual(original_sigterm_handler_mock.mock_calls, [])
+
+        _, _, connection_mock = self.set_up_connection(socketpair_function_mock, display_connection_mock)
+
+        update_display_process_mock = popen_mock.return_value
+        update_display_process_mock.returncode = 0
+        update_display_process_mock.communicate.return_value = None, None
+
+        original_sigterm_handler_mock = getsignal_function_mock.return_value
+
+        dsp = display.Display(self.__class__.TEST_VCOM_VALUE, self.__class__.TEST_PATH_TO_IMAGE_FILE)
+
+        self.assertListEqual(signal_function_mock.mock_calls, [])
+        self.assertListEqual(getsignal_function_mock.mock_calls, [call(sigterm_mock)])
 
         dsp.update()
 
-        self.assertListEqual(
-            popen_mock.mock_calls,
-            [
-                call(popen_command, stdout=stdout_mock, stderr=stderr_mock, text=True),
-                call().send_signal(sigusr1_mock),
-            ]
-        )
-        self.assertListEqual(stdout_mock.mock_calls, [])
-        self.assertListEqual(stderr_mock.mock_calls, [])
+        self.assertListEqual(popen_mock.mock_calls, [popen_call])
         self.assertListEqual(
             signal_function_mock.mock_calls,
             [
                 call(sigterm_mock, dsp._Display__sigterm_handler),
-                call(sigusr1_mock, display.Display._Display__noop_signal_handler),
-            ]
-        )
-        self.assertListEqual(
-            getsignal_function_mock.mock_calls,
-            [
-                call(sigterm_mock),
-            ]
-        )
-        self.assertListEqual(
-            sigtimedwait_function_mock.mock_calls,
-            [
-                call([sigusr1_mock], display.Display.TIMEOUT),
-                call([sigusr1_mock], display.Display.TIMEOUT),
             ]
         )
         self.assertListEqual(raise_signal_function_mock.mock_calls, [])
-        self.assertListEqual(sigterm_mock.mock_calls, [])
-        self.assertListEqual(sigusr1_mock.mock_calls, [])
-        self.assertListEqual(
-            update_display_process_mock.mock_calls,
-            [
-                call.send_signal(sigusr1_mock),
-            ]
-        )
-        self.assertListEqual(original_sigterm_handler_mock.mock_calls, [])
 
         # Manually call Display's SIGTERM handler (not nice, but it gets the work done)
         dsp._Display__sigterm_handler()
@@ -555,8 +864,7 @@ class DisplayTest(TestCase):
         self.assertListEqual(
             popen_mock.mock_calls,
             [
-                call(popen_command, stdout=stdout_mock, stderr=stderr_mock, text=True),
-                call().send_signal(sigusr1_mock),
+                popen_call,
                 call().send_signal(sigterm_mock),  # Send SIGTERM to update-display to stop
                 call().communicate(timeout=display.Display.TIMEOUT),  # Wait for update-display to stop, etc.
             ]
@@ -567,23 +875,10 @@ class DisplayTest(TestCase):
             signal_function_mock.mock_calls,
             [
                 call(sigterm_mock, dsp._Display__sigterm_handler),
-                call(sigusr1_mock, display.Display._Display__noop_signal_handler),
                 call(sigterm_mock, original_sigterm_handler_mock),  # Reset back to the original SIGTERM handler after stopping update-display
             ]
         )
-        self.assertListEqual(
-            getsignal_function_mock.mock_calls,
-            [
-                call(sigterm_mock),
-            ]
-        )
-        self.assertListEqual(
-            sigtimedwait_function_mock.mock_calls,
-            [
-                call([sigusr1_mock], display.Display.TIMEOUT),
-                call([sigusr1_mock], display.Display.TIMEOUT),
-            ]
-        )
+        self.assertListEqual(getsignal_function_mock.mock_calls, [call(sigterm_mock)])
         self.assertListEqual(
             raise_signal_function_mock.mock_calls,
             [
@@ -591,22 +886,72 @@ class DisplayTest(TestCase):
             ]
         )
         self.assertListEqual(sigterm_mock.mock_calls, [])
-        self.assertListEqual(sigusr1_mock.mock_calls, [])
+        self.assertEqual(connection_mock.mock_calls[-1], call.close())
+        self.assertListEqual(original_sigterm_handler_mock.mock_calls, [])
+
+    @patch('display.DisplayConnection', autospec=True)
+    @patch('socket.socketpair', spec=socket.socketpair)
+    @patch('signal.getsignal', spec=signal.getsignal)
+    @patch('signal.signal', spec=signal.signal)
+    @patch('signal.SIGTERM')
+    @patch('subprocess.Popen', spec=subprocess.Popen)
+    def test_update_with_failed_update(
+        self,
+        popen_mock: Mock,
+        sigterm_mock: Mock,
+        signal_function_mock: Mock,
+        getsignal_function_mock: Mock,
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock
+    ) -> None:
+        error_message = 'Error during drawing 4bpp image onto display'
+
+        _, _, connection_mock = self.set_up_connection(
+            socketpair_function_mock,
+            display_connection_mock,
+            [(0, 0.25, ''), (4, 0.0, error_message)]
+        )
+
+        update_display_process_mock = popen_mock.return_value
+        update_display_process_mock.returncode = 0
+        update_display_process_mock.communicate.return_value = None, None
+
+        with display.Display(self.__class__.TEST_VCOM_VALUE, self.__class__.TEST_PATH_TO_IMAGE_FILE) as dsp:
+            dsp.update()
+
+            # Failures are reported right after the update
+            self.assertRaisesRegex(
+                RuntimeError,
+                r"^Error during updating display \(4\): '{}'\.$".format(re.escape(error_message)),
+                dsp.update
+            )
+            self.assertEqual(dsp.get_last_update_result(), displayconnection.UpdateResult(2, 4, 0.125, 0.0, error_message))
+
+            # update-display keeps serving requests
+            dsp.update()
+
+            self.assertListEqual(popen_mock.return_value.send_signal.mock_calls, [])
+
         self.assertListEqual(
-            update_display_process_mock.mock_calls,
+            connection_mock.mock_calls,
             [
-                call.send_signal(sigusr1_mock),
-                call.send_signal(sigterm_mock),  # Send SIGTERM to update-display to stop
-                call.communicate(timeout=display.Display.TIMEOUT),  # Wait for update-display to stop, etc.
+                call.receive_panel_info(),
+                call.send_update(1),
+                call.receive_update_result(1),
+                call.send_update(2),
+                call.receive_update_result(2),
+                call.send_update(3),
+                call.receive_update_result(3),
+                call.close(),
             ]
         )
-        self.assertListEqual(original_sigterm_handler_mock.mock_calls, [])
+        self.assertListEqual(popen_mock.return_value.send_signal.mock_calls, [call(sigterm_mock)])
 
-    @patch('signal.sigtimedwait', spec=signal.sigtimedwait)
+    @patch('display.DisplayConnection', autospec=True)
+    @patch('socket.socketpair', spec=socket.socketpair)
     @patch('signal.getsignal', spec=signal.getsignal)
     @patch('signal.signal', spec=signal.signal)
     @patch('signal.SIGTERM')
-    @patch('signal.SIGUSR1')
     @patch('subprocess.STDOUT')
     @patch('subprocess.PIPE')
     @patch('subprocess.Popen', spec=subprocess.Popen)
@@ -615,77 +960,78 @@ class DisplayTest(TestCase):
         popen_mock: Mock,
         stdout_mock: Mock,
         stderr_mock: Mock,
-        sigusr1_mock: Mock,
         sigterm_mock: Mock,
-        *_: Mock
+        signal_function_mock: Mock,
+        getsignal_function_mock: Mock,
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock
     ) -> None:
-        popen_command = [
-            display.Display.UPDATE_DISPLAY_PATH,
-            '-d',
-            '-v',
-            str(self.__class__.TEST_VCOM_VALUE),
-            '-f',
-            self.__class__.TEST_PATH_TO_IMAGE_FILE
-        ]
+        popen_call = call(
+            [
+                display.Display.UPDATE_DISPLAY_PATH,
+                '-v',
+                str(self.__class__.TEST_VCOM_VALUE),
+                '-f',
+                self.__class__.TEST_PATH_TO_IMAGE_FILE,
+                '-s',
+                str(self.__class__.TEST_SOCKET_FD)
+            ],
+            stdout=stdout_mock,
+            stderr=stderr_mock,
+            text=True,
+            pass_fds=(self.__class__.TEST_SOCKET_FD,)
+        )
 
         cases: list[dict[str, Any]] = [
             {
                 'description': 'No process output',
                 'update_display_process_output': None,
                 'update_display_process_exit_status': 1,
+                'receive_update_result_error': None,
                 'expected_exception_message': 'Error during updating display (1).',
             },
             {
                 'description': 'With output',
                 'update_display_process_output': 'dummy process output',
                 'update_display_process_exit_status': -1,
+                'receive_update_result_error': None,
                 'expected_exception_message': "Error during updating display (-1): 'dummy process output'.",
             },
+            {
+                'description': 'Connection closed by update-display',
+                'update_display_process_output': 'dummy process output',
+                'update_display_process_exit_status': 6,
+                'receive_update_result_error': ConnectionError('Connection closed by update-display.'),
+                'expected_exception_message': "Error during updating display (6): 'dummy process output'.",
+            },
+            {
+                'description': 'Connection closed by update-display without error',
+                'update_display_process_output': None,
+                'update_display_process_exit_status': 0,
+                'receive_update_result_error': ConnectionError('Connection closed by update-display.'),
+                'expected_exception_message': 'Lost connection to update-display: Connection closed by update-display.',
+            },
         ]
 
         for case in cases:
             with self.subTest(case['description']):
-                update_display_process_mock = popen_mock(
-                    popen_command,
-                    stdout=stdout_mock,
-                    stderr=stderr_mock,
-                    text=True
-                )
-                update_display_process_mock.returncode = case['update_display_process_exit_status']
-                update_display_process_mock.communicate.return_value = case['update_display_process_output'], None
-
                 popen_mock.reset_mock()
+                display_connection_mock.reset_mock()
 
-                self.assertListEqual(popen_mock.mock_calls, [])
-                self.assertListEqual(stdout_mock.mock_calls, [])
-                self.assertListEqual(stderr_mock.mock_calls, [])
-                self.assertListEqual(update_display_process_mock.mock_calls, [])
+                _, _, connection_mock = self.set_up_connection(socketpair_function_mock, display_connection_mock)
 
-                try:
-                    with display.Display(self.__class__.TEST_VCOM_VALUE, self.__class__.TEST_PATH_TO_IMAGE_FILE) as dsp:
+                if case['receive_update_result_error'] is not None:
+                    connection_mock.receive_update_result.side_effect = case['receive_update_result_error']
 
-                        self.assertListEqual(popen_mock.mock_calls, [])
-                        self.assertListEqual(stdout_mock.mock_calls, [])
-                        self.assertListEqual(stderr_mock.mock_calls, [])
-                        self.assertListEqual(update_display_process_mock.mock_calls, [])
+                update_display_process_mock = popen_mock.return_value
+                update_display_process_mock.returncode = case['update_display_process_exit_status']
+                update_display_process_mock.communicate.return_value = case['update_display_process_output'], None
 
+                try:
+                    with display.Display(self.__class__.TEST_VCOM_VALUE, self.__class__.TEST_PATH_TO_IMAGE_FILE) as dsp:
                         dsp.update()
 
-                        self.assertListEqual(
-                            popen_mock.mock_calls,
-                            [
-                                call(popen_command, stdout=stdout_mock, stderr=stderr_mock, text=True),
-                                call().send_signal(sigusr1_mock),
-                            ]
-                        )
-                        self.assertListEqual(stdout_mock.mock_calls, [])
-                        self.assertListEqual(stderr_mock.mock_calls, [])
-                        self.assertListEqual(
-                            update_display_process_mock.mock_calls,
-                            [
-                                call.send_signal(sigusr1_mock),
-                            ]
-                        )
+                        self.assertListEqual(popen_mock.mock_calls, [popen_call])
 
                 except RuntimeError as error:
                     self.assertEqual(
@@ -693,35 +1039,28 @@ class DisplayTest(TestCase):
                         str(error)
                     )
 
+                    # update-display is only stopped once
                     self.assertListEqual(
                         popen_mock.mock_calls,
                         [
-                            call(popen_command, stdout=stdout_mock, stderr=stderr_mock, text=True),
-                            call().send_signal(sigusr1_mock),
+                            popen_call,
                             call().send_signal(sigterm_mock),
                             call().communicate(timeout=display.Display.TIMEOUT),
                         ]
                     )
                     self.assertListEqual(stdout_mock.mock_calls, [])
                     self.assertListEqual(stderr_mock.mock_calls, [])
-                    self.assertListEqual(
-                        update_display_process_mock.mock_calls,
-                        [
-                            call.send_signal(sigusr1_mock),
-                            call.send_signal(sigterm_mock),
-                            call.communicate(timeout=display.Display.TIMEOUT),
-                        ]
-                    )
+                    self.assertEqual(connection_mock.mock_calls[-1], call.close())
 
                     continue
 
                 self.fail('The expected exception was not raised.')
 
-    @patch('signal.sigtimedwait', spec=signal.sigtimedwait)
+    @patch('display.DisplayConnection', autospec=True)
+    @patch('socket.socketpair', spec=socket.socketpair)
     @patch('signal.getsignal', spec=signal.getsignal)
     @patch('signal.signal', spec=signal.signal)
     @patch('signal.SIGTERM')
-    @patch('signal.SIGUSR1')
     @patch('processinfo.ProcessInfo.get_process_info', spec=processinfo.ProcessInfo.get_process_info)
     @patch('subprocess.STDOUT')
     @patch('subprocess.PIPE')
@@ -732,25 +1071,31 @@ class DisplayTest(TestCase):
         stdout_mock: Mock,
         stderr_mock: Mock,
         get_process_info_function_mock: Mock,
-        sigusr1_mock: Mock,
         sigterm_mock: Mock,
-        *_: Mock
+        signal_function_mock: Mock,
+        getsignal_function_mock: Mock,
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock
     ) -> None:
         popen_command = [
             display.Display.UPDATE_DISPLAY_PATH,
-            '-d',
             '-v',
             str(self.__class__.TEST_VCOM_VALUE),
             '-f',
-            self.__class__.TEST_PATH_TO_IMAGE_FILE
+            self.__class__.TEST_PATH_TO_IMAGE_FILE,
+            '-s',
+            str(self.__class__.TEST_SOCKET_FD)
         ]
-        update_display_process_output = 'dummy process output'
-        update_display_process_mock = popen_mock(
+        popen_call = call(
             popen_command,
             stdout=stdout_mock,
             stderr=stderr_mock,
-            text=True
+            text=True,
+            pass_fds=(self.__class__.TEST_SOCKET_FD,)
         )
+        update_display_process_output = 'dummy process output'
+        update_display_process_mock = popen_mock.return_value
+        update_display_process_mock.returncode = 0
         process_info_output = 'dummy process info output'
         get_process_info_function_mock.return_value = process_info_output
 
@@ -794,37 +1139,13 @@ class DisplayTest(TestCase):
                 get_process_info_function_mock.reset_mock()
                 update_display_process_mock.reset_mock()
 
-                self.assertListEqual(popen_mock.mock_calls, [])
-                self.assertListEqual(stdout_mock.mock_calls, [])
-                self.assertListEqual(stderr_mock.mock_calls, [])
-                self.assertListEqual(update_display_process_mock.mock_calls, [])
-                self.assertListEqual(get_process_info_function_mock.mock_calls, [])
+                self.set_up_connection(socketpair_function_mock, display_connection_mock)
 
                 try:
                     with display.Display(self.__class__.TEST_VCOM_VALUE, self.__class__.TEST_PATH_TO_IMAGE_FILE) as dsp:
-                        self.assertListEqual(popen_mock.mock_calls, [])
-                        self.assertListEqual(stdout_mock.mock_calls, [])
-                        self.assertListEqual(stderr_mock.mock_calls, [])
-                        self.assertListEqual(update_display_process_mock.mock_calls, [])
-                        self.assertListEqual(get_process_info_function_mock.mock_calls, [])
-
                         dsp.update()
 
-                        self.assertListEqual(
-                            popen_mock.mock_calls,
-                            [
-                                call(popen_command, stdout=stdout_mock, stderr=stderr_mock, text=True),
-                                call().send_signal(sigusr1_mock),
-                            ]
-                        )
-                        self.assertListEqual(stdout_mock.mock_calls, [])
-                        self.assertListEqual(stderr_mock.mock_calls, [])
-                        self.assertListEqual(
-                            update_display_process_mock.mock_calls,
-                            [
-                                call.send_signal(sigusr1_mock),
-                            ]
-                        )
+                        self.assertListEqual(popen_mock.mock_calls, [popen_call])
                         self.assertListEqual(get_process_info_function_mock.mock_calls, [])
 
                 except RuntimeError as error:
@@ -836,8 +1157,7 @@ class DisplayTest(TestCase):
                     self.assertListEqual(
                         popen_mock.mock_calls,
                         [
-                            call(popen_command, stdout=stdout_mock, stderr=stderr_mock, text=True),
-                            call().send_signal(sigusr1_mock),
+                            popen_call,
                             call().send_signal(sigterm_mock),
                             call().communicate(timeout=display.Display.TIMEOUT),
                             call().kill(),
@@ -846,16 +1166,6 @@ class DisplayTest(TestCase):
                     )
                     self.assertListEqual(stdout_mock.mock_calls, [])
                     self.assertListEqual(stderr_mock.mock_calls, [])
-                    self.assertListEqual(
-                        update_display_process_mock.mock_calls,
-                        [
-                            call.send_signal(sigusr1_mock),
-                            call.send_signal(sigterm_mock),
-                            call.communicate(timeout=display.Display.TIMEOUT),
-                            call.kill(),
-                            call.communicate(),
-                        ]
-                    )
                     self.assertListEqual(
                         get_process_info_function_mock.mock_calls,
                         [call(update_display_process_mock)]
@@ -864,3 +1174,55 @@ class DisplayTest(TestCase):
                     continue
 
                 self.fail('The expected exception was not raised.')
+
+    @patch('display.DisplayConnection', autospec=True)
+    @patch('socket.socketpair', spec=socket.socketpair)
+    @patch('signal.getsignal', spec=signal.getsignal)
+    @patch('signal.signal', spec=signal.signal)
+    @patch('signal.SIGTERM')
+    @patch('processinfo.ProcessInfo.get_process_info', spec=processinfo.ProcessInfo.get_process_info)
+    @patch('subprocess.Popen', spec=subprocess.Popen)
+    def test_update_with_response_timeout(
+        self,
+        popen_mock: Mock,
+        get_process_info_function_mock: Mock,
+        sigterm_mock: Mock,
+        signal_function_mock: Mock,
+        getsignal_function_mock: Mock,
+        socketpair_function_mock: Mock,
+        display_connection_mock: Mock
+    ) -> None:
+        process_info_output = 'dummy process info output'
+        get_process_info_function_mock.return_value = process_info_output
+
+        _, _, connection_mock = self.set_up_connection(socketpair_function_mock, display_connection_mock)
+        connection_mock.receive_update_result.side_effect = socket.timeout('timed out')
+
+        update_display_process_mock = popen_mock.return_value
+        update_display_process_mock.returncode = 0
+        update_display_process_mock.communicate.return_value = None, None
+
+        with display.Display(self.__class__.TEST_VCOM_VALUE, self.__class__.TEST_PATH_TO_IMAGE_FILE) as dsp:
+            self.assertRaisesRegex(
+                RuntimeError,
+                r'^Timeout during updating display\.\nProcess info:\n{}$'.format(re.escape(process_info_output)),
+                dsp.update
+            )
+
+            # update-display is stopped, and started again by the next update
+            self.assertListEqual(
+                update_display_process_mock.mock_calls,
+                [
+                    call.send_signal(sigterm_mock),
+                    call.communicate(timeout=display.Display.TIMEOUT),
+                ]
+            )
+            self.assertListEqual(get_process_info_function_mock.mock_calls, [call(update_display_process_mock)])
+            self.assertEqual(connection_mock.mock_calls[-1], call.close())
+
+            connection_mock.receive_update_result.side_effect = None
+            connection_mock.receive_update_result.return_value = displayconnection.UpdateResult(2, 0, 0.0, 0.0, '')
+
+            dsp.update()
+
+            self.assertEqual(len(popen_mock.call_args_list), 2)
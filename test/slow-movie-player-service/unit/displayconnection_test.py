@@ -0,0 +1,141 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+import socket
+import struct
+
+displayconnection = get_module_from_file('../../src/slow-movie-player-service/displayconnection.py')
+
+
+class DisplayConnectionTest(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        connection_socket, self.update_display_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        self.connection = displayconnection.DisplayConnection(connection_socket, 1.0)
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self.update_display_socket.close()
+
+        super().tearDown()
+
+    def send_message(self, message_type: int, status: int, request_id: int, payload: bytes) -> None:
+        self.update_display_socket.send(
+            displayconnection.DisplayConnection.MESSAGE_HEADER.pack(message_type, status, request_id, len(payload))
+            + payload
+        )
+
+    def test_receive_panel_info(self) -> None:
+        self.send_message(
+            displayconnection.DisplayConnection.READY_MESSAGE,
+            0,
+            0,
+            struct.pack('<HHI16s', 1872, 1404, 0x001236E0, b'M841_TFA5210')
+        )
+
+        self.assertEqual(
+            self.connection.receive_panel_info(),
+            displayconnection.PanelInfo(1872, 1404, 0x001236E0, 'M841_TFA5210')
+        )
+
+    def test_receive_panel_info_with_invalid_message(self) -> None:
+        cases: list[tuple[str, bytes]] = [
+            ('Too short message', b'\x01\x00'),
+            (
+                'Wrong message type',
+                displayconnection.DisplayConnection.MESSAGE_HEADER.pack(
+                    displayconnection.DisplayConnection.UPDATE_MESSAGE,
+                    0,
+                    0,
+                    0
+                )
+            ),
+            (
+                'Wrong payload size',
+                displayconnection.DisplayConnection.MESSAGE_HEADER.pack(
+                    displayconnection.DisplayConnection.READY_MESSAGE,
+                    0,
+                    0,
+                    24
+                )
+            ),
+            (
+                'Too short payload',
+                displayconnection.DisplayConnection.MESSAGE_HEADER.pack(
+                    displayconnection.DisplayConnection.READY_MESSAGE,
+                    0,
+                    0,
+                    4
+                ) + bytes(4)
+            ),
+        ]
+
+        for description, message in cases:
+            with self.subTest(description):
+                self.update_display_socket.send(message)
+
+                self.assertRaises(ConnectionError, self.connection.receive_panel_info)
+
+    def test_send_update(self) -> None:
+        self.connection.send_update(7)
+        self.connection.send_load(8)
+        self.connection.send_show(9)
+
+        for message_type, request_id in [
+            (displayconnection.DisplayConnection.UPDATE_MESSAGE, 7),
+            (displayconnection.DisplayConnection.LOAD_MESSAGE, 8),
+            (displayconnection.DisplayConnection.SHOW_MESSAGE, 9),
+        ]:
+            self.assertEqual(
+                self.update_display_socket.recv(displayconnection.DisplayConnection.MAX_MESSAGE_SIZE),
+                struct.pack('<HhII', message_type, 0, request_id, 0)
+            )
+
+    def test_receive_update_result(self) -> None:
+        self.send_message(displayconnection.DisplayConnection.UPDATE_MESSAGE, 0, 1, struct.pack('<II', 125000, 1500000))
+        self.send_message(
+            displayconnection.DisplayConnection.UPDATE_MESSAGE,
+            4,
+            2,
+            struct.pack('<II', 2000, 0) + b'Error during drawing 4bpp image onto display'
+        )
+
+        self.assertEqual(
+            self.connection.receive_update_result(1),
+            displayconnection.UpdateResult(1, 0, 0.125, 1.5, '')
+        )
+        self.assertEqual(
+            self.connection.receive_update_result(2),
+            displayconnection.UpdateResult(2, 4, 0.002, 0.0, 'Error during drawing 4bpp image onto display')
+        )
+
+    def test_receive_update_result_with_invalid_message(self) -> None:
+        # Response to another request
+        self.send_message(displayconnection.DisplayConnection.UPDATE_MESSAGE, 0, 2, struct.pack('<II', 0, 0))
+
+        self.assertRaisesRegex(ConnectionError, r'\(request 2 instead of 1\)', self.connection.receive_update_result, 1)
+
+        # Response without update times
+        self.send_message(displayconnection.DisplayConnection.UPDATE_MESSAGE, 0, 1, b'')
+
+        self.assertRaises(ConnectionError, self.connection.receive_update_result, 1)
+
+    def test_receive_with_closed_connection(self) -> None:
+        self.update_display_socket.close()
+
+        self.assertRaisesRegex(
+            ConnectionError,
+            '^Connection closed by update-display.$',
+            self.connection.receive_update_result,
+            1
+        )
+
+    def test_receive_with_timeout(self) -> None:
+        connection_socket, update_display_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+
+        with displayconnection.DisplayConnection(connection_socket, 0.01) as connection:
+            self.assertRaises(socket.timeout, connection.receive_panel_info)
+
+        update_display_socket.close()
+
+        self.assertEqual(connection_socket.fileno(), -1)
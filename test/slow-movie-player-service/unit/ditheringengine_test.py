@@ -0,0 +1,26 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+
+ditheringengine = get_module_from_file('../../src/slow-movie-player-service/ditheringengine.py')
+
+
+class DitheringEngineTest(TestCase):
+    def test_dithering_engine_value(self) -> None:
+        test_input_expected_value_pairs = {
+            'NumPy': 'NumPy',
+            'ImageMagick': 'ImageMagick',
+            '': 'NumPy',
+            'None': 'NumPy',
+            'numpy': 'NumPy',
+            'imagemagick': 'NumPy',
+            'True': 'NumPy',
+            '0': 'NumPy',
+            '-inf': 'NumPy',
+            r"¯\_(ツ)_/¯": 'NumPy',
+        }
+
+        for test_input, expected_value in test_input_expected_value_pairs.items():
+            with self.subTest(test_input=test_input):
+                dithering_engine = ditheringengine.DitheringEngine(test_input)
+
+                self.assertEqual(dithering_engine.value, expected_value)
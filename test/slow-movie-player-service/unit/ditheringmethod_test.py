@@ -0,0 +1,28 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+
+ditheringmethod = get_module_from_file('../../src/slow-movie-player-service/ditheringmethod.py')
+
+
+class DitheringMethodTest(TestCase):
+    def test_dithering_method_value(self) -> None:
+        test_input_expected_value_pairs = {
+            'FloydSteinberg': 'FloydSteinberg',
+            'Bayer4x4': 'Bayer4x4',
+            'Bayer8x8': 'Bayer8x8',
+            'BlueNoise': 'BlueNoise',
+            '': 'FloydSteinberg',
+            'None': 'FloydSteinberg',
+            'bayer4x4': 'FloydSteinberg',
+            'Bayer16x16': 'FloydSteinberg',
+            'True': 'FloydSteinberg',
+            '0': 'FloydSteinberg',
+            'inf': 'FloydSteinberg',
+            r"¯\_(ツ)_/¯": 'FloydSteinberg',
+        }
+
+        for test_input, expected_value in test_input_expected_value_pairs.items():
+            with self.subTest(test_input=test_input):
+                dithering_method = ditheringmethod.DitheringMethod(test_input)
+
+                self.assertEqual(dithering_method.value, expected_value)
@@ -0,0 +1,362 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+from unittest.mock import ANY, call, Mock, patch
+import json
+import numpy
+import re
+import subprocess
+import sys
+from typing import Any
+
+grayscalemethod = get_module_from_file('../../src/slow-movie-player-service/grayscalemethod.py')
+grayscaleconverter = get_module_from_file('../../src/slow-movie-player-service/grayscaleconverter.py')
+imagebufferpool = get_module_from_file('../../src/slow-movie-player-service/imagebufferpool.py')
+ffmpegvideo = get_module_from_file('../../src/slow-movie-player-service/ffmpegvideo.py')
+
+
+class FFmpegVideoTest(TestCase):
+    VIDEO_FILE_PATH = '/path/to/video/file'
+    FFPROBE_COMMAND = [
+        'ffprobe',
+        '-v',
+        'error',
+        '-select_streams',
+        'v:0',
+        '-show_entries',
+        'stream=width,height,avg_frame_rate,nb_frames:stream_tags=rotate:stream_side_data=rotation:format=duration',
+        '-of',
+        'json',
+        VIDEO_FILE_PATH
+    ]
+
+    @staticmethod
+    def get_probe_result(stream: dict[str, Any], duration: str = '1000.000000') -> Mock:
+        return Mock(
+            returncode=0,
+            stdout=json.dumps({'streams': [stream], 'format': {'duration': duration}}).encode('utf-8'),
+            stderr=b''
+        )
+
+    @staticmethod
+    def get_ffmpeg_process_mock(frame_data: bytes, returncode: int = 0) -> Mock:
+        remaining_frame_data = [frame_data]
+
+        def readinto(buffer: memoryview) -> int:
+            chunk = remaining_frame_data[0][:min(len(buffer), 1000)]
+            buffer[:len(chunk)] = chunk
+            remaining_frame_data[0] = remaining_frame_data[0][len(chunk):]
+
+            return len(chunk)
+
+        ffmpeg_process_mock = Mock()
+        ffmpeg_process_mock.stdout.readinto.side_effect = readinto
+        ffmpeg_process_mock.communicate.return_value = (b'', b'')
+        ffmpeg_process_mock.returncode = returncode
+
+        return ffmpeg_process_mock
+
+    @staticmethod
+    def get_ffmpeg_command(timestamp: str, scale: str, pixel_format: str) -> list[str]:
+        return [
+            'ffmpeg',
+            '-v',
+            'error',
+            '-nostdin',
+            '-ss',
+            timestamp,
+            '-i',
+            FFmpegVideoTest.VIDEO_FILE_PATH,
+            '-map',
+            '0:v:0',
+            '-frames:v',
+            '1',
+            '-vf',
+            scale,
+            '-f',
+            'rawvideo',
+            '-pix_fmt',
+            pixel_format,
+            '-'
+        ]
+
+    @patch('subprocess.run', spec=subprocess.run)
+    def test_get_stats(self, run_mock: Mock) -> None:
+        cases: list[dict[str, Any]] = [
+            {
+                'description': 'Video with frame count',
+                'stream': {'width': 320, 'height': 240, 'avg_frame_rate': '25/1', 'nb_frames': '25000'},
+                'duration': '999.990000',
+                'expected_frame_rate': 25.0,
+                'expected_stats': (25000, 1000000.0),
+            },
+            {
+                'description': 'Video without frame count',
+                'stream': {'width': 320, 'height': 240, 'avg_frame_rate': '24000/1001'},
+                'duration': '1001.000000',
+                'expected_frame_rate': 24000 / 1001,
+                'expected_stats': (24000, 1001000.0),
+            },
+            {
+                'description': 'Video without frame rate',
+                'stream': {'width': 320, 'height': 240, 'avg_frame_rate': '0/0'},
+                'duration': '1.000000',
+                'expected_frame_rate': 0.0,
+                'expected_stats': None,
+            },
+        ]
+
+        for case in cases:
+            with self.subTest(case['description']):
+                run_mock.reset_mock()
+                run_mock.return_value = self.get_probe_result(case['stream'], case['duration'])
+
+                video = ffmpegvideo.FFmpegVideo(self.__class__.VIDEO_FILE_PATH)
+
+                self.assertAlmostEqual(video.get_frame_rate(), case['expected_frame_rate'])
+
+                if case['expected_stats'] is None:
+                    self.assertRaises(ZeroDivisionError, video.get_stats)
+                else:
+                    frame_count, duration = video.get_stats()
+
+                    self.assertEqual(frame_count, case['expected_stats'][0])
+                    self.assertAlmostEqual(duration, case['expected_stats'][1])
+
+                self.assertListEqual(
+                    run_mock.mock_calls,
+                    [call(self.__class__.FFPROBE_COMMAND, stdout=subprocess.PIPE, stderr=subprocess.PIPE)]
+                )
+
+    @patch('subprocess.run', spec=subprocess.run)
+    def test_probe_failures(self, run_mock: Mock) -> None:
+        run_mock.return_value = Mock(returncode=1, stdout=b'', stderr=b'No such file or directory')
+
+        self.assertRaisesRegex(
+            RuntimeError,
+            r"^Unable to probe video file '{}': 'b'No such file or directory''\.$".format(
+                self.__class__.VIDEO_FILE_PATH
+            ),
+            ffmpegvideo.FFmpegVideo,
+            self.__class__.VIDEO_FILE_PATH
+        )
+
+        run_mock.return_value = Mock(returncode=0, stdout=b'{"streams": []}', stderr=b'')
+
+        self.assertRaisesRegex(
+            RuntimeError,
+            r"^No video stream found in video file '{}'\.$".format(self.__class__.VIDEO_FILE_PATH),
+            ffmpegvideo.FFmpegVideo,
+            self.__class__.VIDEO_FILE_PATH
+        )
+
+    @patch('subprocess.Popen', spec=subprocess.Popen)
+    @patch('subprocess.run', spec=subprocess.run)
+    def test_get_frame(self, run_mock: Mock, popen_mock: Mock) -> None:
+        cases: list[dict[str, Any]] = [
+            {
+                'description': 'Full size frame by frame index',
+                'position': 50,
+                'minimum_size': None,
+                'grayscale_method': None,
+                'expected_command': self.get_ffmpeg_command('2.000000', 'scale=320:240:flags=area', 'bgr24'),
+                'expected_shape': (240, 320, 3),
+            },
+            {
+                'description': 'Shrunk frame by timestamp',
+                'position': 1500.0,
+                'minimum_size': (100, 100),
+                'grayscale_method': None,
+                'expected_command': self.get_ffmpeg_command('1.500000', 'scale=100:75:flags=area', 'bgr24'),
+                'expected_shape': (75, 100, 3),
+            },
+            {
+                'description': 'Frame is never enlarged',
+                'position': 0,
+                'minimum_size': (640, 640),
+                'grayscale_method': None,
+                'expected_command': self.get_ffmpeg_command('0.000000', 'scale=320:240:flags=area', 'bgr24'),
+                'expected_shape': (240, 320, 3),
+            },
+            {
+                'description': 'Shrunk luma frame',
+                'position': 0.0,
+                'minimum_size': (160, 160),
+                'grayscale_method': grayscalemethod.GrayscaleMethod.REC709LUMA,
+                'expected_command': self.get_ffmpeg_command(
+                    '0.000000',
+                    'scale=160:120:flags=area:out_range=full',
+                    'gray'
+                ),
+                'expected_shape': (120, 160),
+            },
+            {
+                'description': 'Shrunk frame converted to grayscale after decoding',
+                'position': 0.0,
+                'minimum_size': (160, 160),
+                'grayscale_method': grayscalemethod.GrayscaleMethod.AVERAGE,
+                'expected_command': self.get_ffmpeg_command('0.000000', 'scale=160:120:flags=area', 'bgr24'),
+                'expected_shape': (120, 160),
+            },
+            {
+                'description': 'Shrunk frame of video rotated by display matrix',
+                'stream': {
+                    'width': 320,
+                    'height': 240,
+                    'avg_frame_rate': '25/1',
+                    'nb_frames': '25000',
+                    'side_data_list': [{'side_data_type': 'Display Matrix', 'rotation': -90}],
+                },
+                'position': 0.0,
+                'minimum_size': (160, 160),
+                'grayscale_method': None,
+                'expected_command': self.get_ffmpeg_command('0.000000', 'scale=120:160:flags=area', 'bgr24'),
+                'expected_shape': (160, 120, 3),
+            },
+            {
+                'description': 'Full size frame of video rotated by tag',
+                'stream': {
+                    'width': 320,
+                    'height': 240,
+                    'avg_frame_rate': '25/1',
+                    'nb_frames': '25000',
+                    'tags': {'rotate': '270'},
+                },
+                'position': 0.0,
+                'minimum_size': None,
+                'grayscale_method': None,
+                'expected_command': self.get_ffmpeg_command('0.000000', 'scale=240:320:flags=area', 'bgr24'),
+                'expected_shape': (320, 240, 3),
+            },
+            {
+                'description': 'Frame of upside down video',
+                'stream': {
+                    'width': 320,
+                    'height': 240,
+                    'avg_frame_rate': '25/1',
+                    'nb_frames': '25000',
+                    'side_data_list': [{'side_data_type': 'Display Matrix', 'rotation': 180}],
+                },
+                'position': 0.0,
+                'minimum_size': None,
+                'grayscale_method': None,
+                'expected_command': self.get_ffmpeg_command('0.000000', 'scale=320:240:flags=area', 'bgr24'),
+                'expected_shape': (240, 320, 3),
+            },
+        ]
+
+        for case in cases:
+            with self.subTest(case['description']):
+                run_mock.return_value = self.get_probe_result(
+                    case.get('stream', {'width': 320, 'height': 240, 'avg_frame_rate': '25/1', 'nb_frames': '25000'})
+                )
+
+                frame_size = int(numpy.prod(case['expected_shape'][:2])) * (
+                    1 if case['expected_command'][-2] == 'gray' else 3
+                )
+
+                popen_mock.reset_mock()
+                popen_mock.return_value = self.get_ffmpeg_process_mock(b'\x80' * frame_size)
+
+                frame = ffmpegvideo.FFmpegVideo(self.__class__.VIDEO_FILE_PATH).get_frame(
+                    case['position'],
+                    case['minimum_size'],
+                    case['grayscale_method']
+                )
+
+                self.assertTupleEqual(frame.shape, case['expected_shape'])
+                self.assertTrue((frame == 0x80).all())
+                self.assertListEqual(
+                    popen_mock.mock_calls[:1],
+                    [call(case['expected_command'], stdout=subprocess.PIPE, stderr=ANY)]
+                )
+
+    @patch('subprocess.Popen', spec=subprocess.Popen)
+    @patch('subprocess.run', spec=subprocess.run)
+    def test_get_frame_when_read_fails(self, run_mock: Mock, popen_mock: Mock) -> None:
+        cases: list[dict[str, Any]] = [
+            {
+                'description': 'ffmpeg fails',
+                'frame_data': b'',
+                'returncode': 1,
+                'error_output': b'/path/to/video/file: Invalid data found when processing input',
+            },
+            {
+                'description': 'Position after the end of the video',
+                'frame_data': b'',
+                'returncode': 0,
+                'error_output': b'',
+            },
+            {
+                'description': 'Partial frame',
+                'frame_data': b'\x00' * (320 * 240 * 3 - 1),
+                'returncode': 0,
+                'error_output': b'',
+            },
+        ]
+
+        run_mock.return_value = self.get_probe_result(
+            {'width': 320, 'height': 240, 'avg_frame_rate': '25/1', 'nb_frames': '25000'}
+        )
+
+        for case in cases:
+            with self.subTest(case['description']):
+                ffmpeg_process_mock = self.get_ffmpeg_process_mock(case['frame_data'], case['returncode'])
+
+                def popen(command: list[str], stdout: int, stderr: Any) -> Mock:
+                    stderr.write(case['error_output'])
+
+                    return ffmpeg_process_mock
+
+                popen_mock.side_effect = popen
+
+                self.assertRaisesRegex(
+                    RuntimeError,
+                    r"^Unable to read video frame: '{}'\.$".format(re.escape(repr(case['error_output']))),
+                    ffmpegvideo.FFmpegVideo(self.__class__.VIDEO_FILE_PATH).get_frame,
+                    0
+                )
+
+    @patch('subprocess.Popen', spec=subprocess.Popen)
+    @patch('subprocess.run', spec=subprocess.run)
+    def test_get_frame_with_wrong_arguments(self, run_mock: Mock, popen_mock: Mock) -> None:
+        run_mock.return_value = self.get_probe_result(
+            {'width': 320, 'height': 240, 'avg_frame_rate': '25/1', 'nb_frames': '25000'}
+        )
+
+        for wrong_type_input in [None, 1j, '', '0', b'0', [0], (0,), {0: 'foo'}, {0}]:
+            with self.subTest(wrong_type_input):
+                self.assertRaisesRegex(
+                    TypeError,
+                    (
+                        r"^Argument 'position' must be of type '<class 'int'>' or '<class 'float'>', "
+                        r"but '{}' was provided instead\.$"
+                    ).format(type(wrong_type_input)),
+                    ffmpegvideo.FFmpegVideo(self.__class__.VIDEO_FILE_PATH).get_frame,
+                    wrong_type_input
+                )
+
+        for negative_number in [-1, -1 * int(sys.float_info.max), -0.1, -1 * sys.float_info.min, float('-inf')]:
+            with self.subTest(negative_number):
+                self.assertRaisesRegex(
+                    ValueError,
+                    (
+                        r"^Value of argument 'position' must be a non-negative number, "
+                        r"but {} was provided instead\.$"
+                    ).format(re.escape(str(negative_number))),
+                    ffmpegvideo.FFmpegVideo(self.__class__.VIDEO_FILE_PATH).get_frame,
+                    negative_number
+                )
+
+        # Frame indexes cannot be converted to timestamps without a frame rate
+        run_mock.return_value = self.get_probe_result({'width': 320, 'height': 240, 'avg_frame_rate': '0/0'})
+
+        self.assertRaisesRegex(
+            ValueError,
+            r"^Cannot get frame 1 of video file '{}' without a known frame rate\.$".format(
+                re.escape(self.__class__.VIDEO_FILE_PATH)
+            ),
+            ffmpegvideo.FFmpegVideo(self.__class__.VIDEO_FILE_PATH).get_frame,
+            1
+        )
+
+        self.assertListEqual(popen_mock.mock_calls, [])
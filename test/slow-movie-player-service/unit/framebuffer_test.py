@@ -0,0 +1,95 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+import tempfile
+import shutil
+import struct
+import numpy
+import os
+
+waveformmode = get_module_from_file('../../src/slow-movie-player-service/waveformmode.py')
+framebuffer = get_module_from_file('../../src/slow-movie-player-service/framebuffer.py')
+
+
+class FrameBufferTest(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.directory_path = tempfile.mkdtemp()
+        self.frame_buffer_file_path = os.path.join(self.directory_path, 'frame.fb')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory_path)
+
+        super().tearDown()
+
+    def read_file(self) -> bytes:
+        with open(self.frame_buffer_file_path, 'rb') as frame_buffer_file:
+            return frame_buffer_file.read()
+
+    def test_frame_buffer(self) -> None:
+        with framebuffer.FrameBuffer(self.frame_buffer_file_path, 8, 3) as frame_buffer:
+            contents = self.read_file()
+
+            self.assertEqual(len(contents), framebuffer.FrameBuffer.DATA_OFFSET + 2 * 12)
+            self.assertTupleEqual(
+                struct.unpack_from('<4sHHQHHHH', contents),
+                (b'SMFB', 1, 0, 0, 8, 3, 0xFFFF, waveformmode.WaveformMode.GC16)
+            )
+            self.assertTupleEqual(frame_buffer.get_size(), (8, 3))
+            self.assertTupleEqual(frame_buffer.get_back_buffer().shape, (3, 4))
+
+            frame_buffer.get_back_buffer().fill(0x12)
+            frame_buffer.swap()
+
+            contents = self.read_file()
+
+            # The back buffer is written straight into the file
+            self.assertTupleEqual(
+                struct.unpack_from('<4sHHQHHHH', contents),
+                (b'SMFB', 1, 1, 1, 8, 3, 0xFFFF, waveformmode.WaveformMode.GC16)
+            )
+            self.assertEqual(contents[framebuffer.FrameBuffer.DATA_OFFSET + 12:], b'\x12' * 12)
+            self.assertTrue((frame_buffer.get_front_buffer() == 0x12).all())
+
+            frame_buffer.get_back_buffer().fill(0x34)
+            frame_buffer.swap([(0, 0, 4, 1), (4, 1, 4, 2)], waveformmode.WaveformMode.DU)
+
+            contents = self.read_file()
+
+            self.assertTupleEqual(
+                struct.unpack_from('<4sHHQHHHH', contents),
+                (b'SMFB', 1, 0, 2, 8, 3, 2, waveformmode.WaveformMode.DU)
+            )
+            self.assertListEqual(
+                [struct.unpack_from('<HHHH', contents, 24 + i * 8) for i in range(2)],
+                [(0, 0, 4, 1), (4, 1, 4, 2)]
+            )
+            self.assertEqual(
+                contents[framebuffer.FrameBuffer.DATA_OFFSET:],
+                b'\x34' * 12 + b'\x12' * 12
+            )
+
+    def test_swap_with_too_many_rectangles(self) -> None:
+        with framebuffer.FrameBuffer(self.frame_buffer_file_path, 8, 3) as frame_buffer:
+            self.assertRaises(
+                ValueError,
+                frame_buffer.swap,
+                [(0, 0, 4, 1)] * (framebuffer.FrameBuffer.MAX_RECTANGLE_COUNT + 1)
+            )
+
+            # Nothing is published
+            self.assertEqual(struct.unpack_from('<Q', self.read_file(), 8)[0], 0)
+
+    def test_invalid_resolution(self) -> None:
+        for width, height in [(0, 2), (2, 0), (3, 2), (-2, 2)]:
+            with self.subTest(width=width, height=height):
+                self.assertRaises(ValueError, framebuffer.FrameBuffer, self.frame_buffer_file_path, width, height)
+
+    def test_close_with_referenced_buffer(self) -> None:
+        frame_buffer = framebuffer.FrameBuffer(self.frame_buffer_file_path, 2, 2)
+        back_buffer = frame_buffer.get_back_buffer()
+
+        frame_buffer.close()
+        frame_buffer.close()
+
+        self.assertTrue(numpy.array_equal(back_buffer, numpy.zeros((2, 1), dtype=numpy.uint8)))
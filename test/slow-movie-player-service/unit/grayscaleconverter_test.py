@@ -0,0 +1,70 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+import numpy
+
+grayscalemethod = get_module_from_file('../../src/slow-movie-player-service/grayscalemethod.py')
+grayscaleconverter = get_module_from_file('../../src/slow-movie-player-service/grayscaleconverter.py')
+
+
+class GrayscaleConverterTest(TestCase):
+    @staticmethod
+    def srgb_to_linear(value: numpy.ndarray) -> numpy.ndarray:
+        return numpy.where(value <= 0.04045, value / 12.92, ((value + 0.055) / 1.055) ** 2.4)
+
+    @staticmethod
+    def linear_to_srgb(value: numpy.ndarray) -> numpy.ndarray:
+        return numpy.where(value <= 0.0031308, value * 12.92, 1.055 * value ** (1.0 / 2.4) - 0.055)
+
+    def test_srgb_to_linear_table(self) -> None:
+        srgb_values = numpy.arange(256) / 255.0
+
+        self.assertTupleEqual(grayscaleconverter.GrayscaleConverter.SRGB_TO_LINEAR.shape, (256,))
+        self.assertEqual(grayscaleconverter.GrayscaleConverter.SRGB_TO_LINEAR[0], 0.0)
+        self.assertEqual(grayscaleconverter.GrayscaleConverter.SRGB_TO_LINEAR[255], 1.0)
+        self.assertTrue(
+            numpy.allclose(
+                grayscaleconverter.GrayscaleConverter.SRGB_TO_LINEAR,
+                self.srgb_to_linear(srgb_values)
+            )
+        )
+
+    def test_linear_to_srgb_conversion_rounds_to_nearest_value(self) -> None:
+        linear_values = numpy.linspace(0.0, 1.0, 100001, dtype=numpy.float32)
+        expected_values = numpy.rint(self.linear_to_srgb(linear_values.astype(numpy.float64)) * 255.0)
+
+        converted_values = grayscaleconverter.GrayscaleConverter._GrayscaleConverter__convert_linear_to_srgb(
+            linear_values.reshape(1, -1)
+        )[0]
+
+        self.assertLessEqual(int(numpy.abs(converted_values - expected_values).max()), 1)
+        self.assertLess(numpy.count_nonzero(converted_values != expected_values), 10)
+
+    def test_convert_with_srgb_values_round_trip(self) -> None:
+        srgb_values = numpy.arange(256, dtype=numpy.uint8)
+        input_image = numpy.stack([srgb_values] * 3, axis=-1).reshape(16, 16, 3)
+
+        for grayscale_method in grayscalemethod.GrayscaleMethod:
+            with self.subTest(grayscale_method=grayscale_method.value):
+                grayscale_image = grayscaleconverter.GrayscaleConverter.convert(input_image, grayscale_method)
+
+                self.assertEqual(grayscale_image.dtype, numpy.uint8)
+                self.assertListEqual(grayscale_image.flatten().tolist(), srgb_values.tolist())
+
+    def test_convert_with_grayscale_image(self) -> None:
+        input_image = numpy.array([[0x00, 0x11], [0xee, 0xff]], dtype=numpy.uint8)
+
+        grayscale_image = grayscaleconverter.GrayscaleConverter.convert(
+            input_image,
+            grayscalemethod.GrayscaleMethod.RMS
+        )
+
+        self.assertIs(grayscale_image, input_image)
+
+    def test_convert_with_wrong_number_of_color_channels(self) -> None:
+        self.assertRaisesRegex(
+            ValueError,
+            r"^Cannot convert image with 4 color channels to grayscale, only BGR images can be converted\.$",
+            grayscaleconverter.GrayscaleConverter.convert,
+            numpy.zeros((2, 2, 4), dtype=numpy.uint8),
+            grayscalemethod.GrayscaleMethod.REC709LUMA
+        )
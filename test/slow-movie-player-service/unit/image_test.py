@@ -7,6 +7,10 @@ import tempfile
 import subprocess
 
 grayscalemethod = get_module_from_file('../../src/slow-movie-player-service/grayscalemethod.py')
+grayscaleconverter = get_module_from_file('../../src/slow-movie-player-service/grayscaleconverter.py')
+ditheringengine = get_module_from_file('../../src/slow-movie-player-service/ditheringengine.py')
+ditheringmethod = get_module_from_file('../../src/slow-movie-player-service/ditheringmethod.py')
+imagebufferpool = get_module_from_file('../../src/slow-movie-player-service/imagebufferpool.py')
 image = get_module_from_file('../../src/slow-movie-player-service/image.py')
 
 
@@ -149,7 +153,10 @@ class ImageTest(TestCase):
         self.assertListEqual(grayscale_palette_file_mock.mock_calls, [])
         self.assertListEqual(convert_process_mock.mock_calls, [])
 
-        image.Image(input_image_mock).apply_4bpp_floyd_steinberg_dithering(grayscale_method_mock)
+        image.Image(input_image_mock).apply_4bpp_floyd_steinberg_dithering(
+            grayscale_method_mock,
+            ditheringengine.DitheringEngine.IMAGEMAGICK
+        )
 
         self.assertListEqual(numpy_ndarray_mock.mock_calls, expected_numpy_ndarray_mock_calls)
         self.assertListEqual(numpy_asarray_function_mock.mock_calls, expected_numpy_asarray_function_mock_calls)
@@ -0,0 +1,55 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+from unittest.mock import Mock
+import numpy
+
+imagebufferpool = get_module_from_file('../../src/slow-movie-player-service/imagebufferpool.py')
+
+
+class ImageBufferPoolTest(TestCase):
+    def test_get_buffer(self) -> None:
+        buffer_pool = imagebufferpool.ImageBufferPool()
+
+        buffer = buffer_pool.get_buffer('buffer', (3, 4))
+
+        self.assertTupleEqual(buffer.shape, (3, 4))
+        self.assertEqual(buffer.dtype, numpy.uint8)
+
+    def test_get_buffer_reuses_buffer_with_same_name_shape_and_data_type(self) -> None:
+        buffer_pool = imagebufferpool.ImageBufferPool()
+
+        buffer = buffer_pool.get_buffer('buffer', (3, 4), numpy.int32)
+
+        self.assertIs(buffer_pool.get_buffer('buffer', (3, 4), numpy.int32), buffer)
+        self.assertIsNot(buffer_pool.get_buffer('other_buffer', (3, 4), numpy.int32), buffer)
+
+    def test_get_buffer_replaces_buffer_with_different_shape_or_data_type(self) -> None:
+        buffer_pool = imagebufferpool.ImageBufferPool()
+
+        buffer = buffer_pool.get_buffer('buffer', (3, 4))
+        reshaped_buffer = buffer_pool.get_buffer('buffer', (4, 3))
+
+        self.assertIsNot(reshaped_buffer, buffer)
+        self.assertTupleEqual(reshaped_buffer.shape, (4, 3))
+        self.assertIs(buffer_pool.get_buffer('buffer', (4, 3)), reshaped_buffer)
+
+        retyped_buffer = buffer_pool.get_buffer('buffer', (4, 3), numpy.int32)
+
+        self.assertIsNot(retyped_buffer, reshaped_buffer)
+        self.assertEqual(retyped_buffer.dtype, numpy.int32)
+
+    def test_get_initialized_buffer(self) -> None:
+        buffer_pool = imagebufferpool.ImageBufferPool()
+        initialize_mock = Mock(side_effect=lambda buffer: buffer.fill(7))
+
+        buffer = buffer_pool.get_initialized_buffer('buffer', (3, 4), numpy.int32, initialize_mock)
+
+        self.assertTrue((buffer == 7).all())
+        self.assertIs(buffer_pool.get_initialized_buffer('buffer', (3, 4), numpy.int32, initialize_mock), buffer)
+        self.assertEqual(initialize_mock.call_count, 1)
+
+        reshaped_buffer = buffer_pool.get_initialized_buffer('buffer', (4, 3), numpy.int32, initialize_mock)
+
+        self.assertIsNot(reshaped_buffer, buffer)
+        self.assertTrue((reshaped_buffer == 7).all())
+        self.assertEqual(initialize_mock.call_count, 2)
@@ -0,0 +1,177 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+from unittest.mock import patch
+from typing import Optional
+import tempfile
+import shutil
+import struct
+import numpy
+import os
+
+waveformmode = get_module_from_file('../../src/slow-movie-player-service/waveformmode.py')
+waveformselector = get_module_from_file('../../src/slow-movie-player-service/waveformselector.py')
+partialrefresh = get_module_from_file('../../src/slow-movie-player-service/partialrefresh.py')
+
+
+class PartialRefreshTest(TestCase):
+    WIDTH = 200
+    HEIGHT = 100
+
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.directory_path = tempfile.mkdtemp()
+        self.image_file_path = os.path.join(self.directory_path, 'frame.4bpp')
+        self.rectangles_file_path = os.path.join(self.directory_path, 'frame.4bpp.rectangles')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory_path)
+
+        super().tearDown()
+
+    def get_image_data(self, *changed_pixels: tuple[int, int]) -> numpy.ndarray:
+        image_data = numpy.zeros((self.__class__.HEIGHT, self.__class__.WIDTH // 2), dtype=numpy.uint8)
+
+        for x, y in changed_pixels:
+            image_data[y, x // 2] = 0xFF
+
+        return image_data
+
+    def save_image(self, image_data: numpy.ndarray) -> None:
+        with open(self.image_file_path, 'wb') as image_file:
+            image_file.write(struct.pack('<HH', image_data.shape[1] * 2, image_data.shape[0]))
+            image_file.write(image_data.tobytes())
+
+    def load_rectangles(self) -> tuple[Optional[list[tuple[int, int, int, int]]], int]:
+        with open(self.rectangles_file_path, 'rb') as rectangles_file:
+            contents = rectangles_file.read()
+
+        rectangle_count, waveform_mode = struct.unpack_from('<HH', contents)
+
+        if rectangle_count == partialrefresh.PartialRefresh.FULL_REFRESH_RECTANGLE_COUNT:
+            self.assertEqual(len(contents), 4)
+
+            return None, waveform_mode
+
+        self.assertEqual(len(contents), 4 + rectangle_count * 8)
+
+        return [struct.unpack_from('<HHHH', contents, 4 + i * 8) for i in range(rectangle_count)], waveform_mode
+
+    def test_get_rectangles(self) -> None:
+        partial_refresh = partialrefresh.PartialRefresh(10)
+
+        # The first image is always refreshed completely
+        self.assertIsNone(partial_refresh.get_rectangles(self.get_image_data()))
+        self.assertListEqual(partial_refresh.get_rectangles(self.get_image_data()), [])
+
+        # Changed tiles are merged into rectangles, which are clipped to the
+        # size of the image.
+        self.assertListEqual(
+            partial_refresh.get_rectangles(self.get_image_data((0, 0), (33, 31), (40, 40), (199, 99), (195, 64))),
+            [(0, 0, 64, 32), (32, 32, 32, 32), (192, 64, 8, 36)]
+        )
+        self.assertListEqual(
+            partial_refresh.get_rectangles(self.get_image_data((0, 0), (33, 31), (40, 40), (199, 99), (195, 64))),
+            []
+        )
+
+    def test_get_rectangles_with_full_refresh(self) -> None:
+        partial_refresh = partialrefresh.PartialRefresh(3)
+
+        self.assertIsNone(partial_refresh.get_rectangles(self.get_image_data()))
+        self.assertListEqual(partial_refresh.get_rectangles(self.get_image_data((0, 0))), [(0, 0, 32, 32)])
+        self.assertListEqual(partial_refresh.get_rectangles(self.get_image_data()), [(0, 0, 32, 32)])
+
+        # Every third image
+        self.assertIsNone(partial_refresh.get_rectangles(self.get_image_data()))
+        self.assertListEqual(partial_refresh.get_rectangles(self.get_image_data()), [])
+
+        # Scene cut
+        self.assertIsNone(partial_refresh.get_rectangles(self.get_image_data() + 1))
+        self.assertListEqual(partial_refresh.get_rectangles(self.get_image_data() + 1), [])
+
+        # Changed image size
+        self.assertIsNone(partial_refresh.get_rectangles(numpy.ones((10, 10), dtype=numpy.uint8)))
+
+        # A full refresh interval of one refreshes every image completely
+        partial_refresh = partialrefresh.PartialRefresh(1)
+
+        for _ in range(3):
+            self.assertIsNone(partial_refresh.get_rectangles(self.get_image_data()))
+
+    def test_get_rectangles_with_too_many_rectangles(self) -> None:
+        partial_refresh = partialrefresh.PartialRefresh(10)
+        partial_refresh.get_rectangles(self.get_image_data())
+
+        with patch.object(partialrefresh.PartialRefresh, 'MAX_RECTANGLE_COUNT', 2):
+            self.assertListEqual(
+                partial_refresh.get_rectangles(self.get_image_data((40, 0), (0, 40), (100, 70))),
+                [(0, 0, 128, 96)]
+            )
+
+    def test_get_refresh(self) -> None:
+        partial_refresh = partialrefresh.PartialRefresh(10, waveformselector.WaveformSelector())
+
+        self.assertTupleEqual(partial_refresh.get_refresh(self.get_image_data()), (None, waveformmode.WaveformMode.GC16))
+        self.assertTupleEqual(
+            partial_refresh.get_refresh(self.get_image_data((100, 50))),
+            ([(96, 32, 32, 32)], waveformmode.WaveformMode.A2)
+        )
+
+        # The images are copied, so they can be changed in place (e.g. in a
+        # frame buffer)
+        image_data = self.get_image_data((100, 50))
+
+        self.assertTupleEqual(partial_refresh.get_refresh(image_data), ([], waveformmode.WaveformMode.A2))
+
+        image_data[50, 50] = 0x77
+
+        self.assertTupleEqual(
+            partial_refresh.get_refresh(image_data),
+            ([(96, 32, 32, 32)], waveformmode.WaveformMode.GC16)
+        )
+        self.assertTupleEqual(partial_refresh.get_refresh(image_data), ([], waveformmode.WaveformMode.A2))
+
+    def test_save_rectangles(self) -> None:
+        partial_refresh = partialrefresh.PartialRefresh(10)
+
+        self.save_image(self.get_image_data())
+
+        self.assertIsNone(partial_refresh.save_rectangles(self.image_file_path, self.rectangles_file_path))
+        self.assertTupleEqual(self.load_rectangles(), (None, waveformmode.WaveformMode.GC16))
+
+        self.save_image(self.get_image_data((100, 50), (150, 50)))
+
+        self.assertEqual(
+            partial_refresh.save_rectangles(self.image_file_path, self.rectangles_file_path),
+            waveformmode.WaveformMode.GC16
+        )
+        self.assertTupleEqual(self.load_rectangles(), ([(96, 32, 64, 32)], waveformmode.WaveformMode.GC16))
+        self.assertListEqual(sorted(os.listdir(self.directory_path)), ['frame.4bpp', 'frame.4bpp.rectangles'])
+
+    def test_save_rectangles_with_waveform_selector(self) -> None:
+        partial_refresh = partialrefresh.PartialRefresh(10, waveformselector.WaveformSelector())
+
+        self.save_image(self.get_image_data())
+
+        self.assertIsNone(partial_refresh.save_rectangles(self.image_file_path, self.rectangles_file_path))
+        self.assertTupleEqual(self.load_rectangles(), (None, waveformmode.WaveformMode.GC16))
+
+        # The changed pixels switch from black to white
+        self.save_image(self.get_image_data((100, 50)))
+
+        self.assertEqual(
+            partial_refresh.save_rectangles(self.image_file_path, self.rectangles_file_path),
+            waveformmode.WaveformMode.A2
+        )
+        self.assertTupleEqual(self.load_rectangles(), ([(96, 32, 32, 32)], waveformmode.WaveformMode.A2))
+
+        # The changed pixels switch from white to a gray level
+        image_data = self.get_image_data((100, 50))
+        image_data[50, 50] = 0x77
+        self.save_image(image_data)
+
+        self.assertEqual(
+            partial_refresh.save_rectangles(self.image_file_path, self.rectangles_file_path),
+            waveformmode.WaveformMode.GC16
+        )
@@ -0,0 +1,114 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+import tempfile
+import shutil
+import os
+
+playbackjournal = get_module_from_file('../../src/slow-movie-player-service/playbackjournal.py')
+
+
+class PlaybackJournalTest(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.directory_path = tempfile.mkdtemp()
+        self.journal_file_path = os.path.join(self.directory_path, 'videos.journal')
+        self.snapshot_file_path = os.path.join(self.directory_path, 'videos.json')
+
+        self.write_snapshot('{}')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory_path)
+
+        super().tearDown()
+
+    def write_snapshot(self, contents: str) -> None:
+        temp_snapshot_file_path = '{}.tmp'.format(self.snapshot_file_path)
+
+        with open(temp_snapshot_file_path, 'w') as snapshot_file:
+            snapshot_file.write(contents)
+
+        os.rename(temp_snapshot_file_path, self.snapshot_file_path)
+
+    def test_load_without_journal(self) -> None:
+        playback_journal = playbackjournal.PlaybackJournal(self.journal_file_path)
+
+        self.assertListEqual(playback_journal.load(self.snapshot_file_path), [])
+        self.assertEqual(len(playback_journal), 0)
+
+    def test_append_and_load(self) -> None:
+        records = [(0, 1, 1000.0), (1, 25, 1000.0), (0, 2, 2000.0)]
+        playback_journal = playbackjournal.PlaybackJournal(self.journal_file_path)
+        playback_journal.reset(self.snapshot_file_path)
+
+        for record in records:
+            playback_journal.append(*record)
+
+        self.assertEqual(len(playback_journal), 3)
+        self.assertEqual(
+            os.path.getsize(self.journal_file_path),
+            (playbackjournal.PlaybackJournal.HEADER.size + playbackjournal.PlaybackJournal.CHECKSUM.size)
+            + len(records) * (playbackjournal.PlaybackJournal.RECORD.size + playbackjournal.PlaybackJournal.CHECKSUM.size)
+        )
+        self.assertListEqual(
+            playbackjournal.PlaybackJournal(self.journal_file_path).load(self.snapshot_file_path),
+            records
+        )
+
+        playback_journal.reset(self.snapshot_file_path)
+
+        self.assertEqual(len(playback_journal), 0)
+        self.assertListEqual(
+            playbackjournal.PlaybackJournal(self.journal_file_path).load(self.snapshot_file_path),
+            []
+        )
+
+    def test_load_with_torn_or_corrupted_tail(self) -> None:
+        playback_journal = playbackjournal.PlaybackJournal(self.journal_file_path)
+        playback_journal.reset(self.snapshot_file_path)
+        playback_journal.append(0, 1, 1000.0)
+        playback_journal.append(0, 2, 2000.0)
+        playback_journal.close()
+
+        journal_size = os.path.getsize(self.journal_file_path)
+
+        with open(self.journal_file_path, 'r+b') as journal_file:
+            journal_file.truncate(journal_size - 1)
+
+        self.assertListEqual(
+            playbackjournal.PlaybackJournal(self.journal_file_path).load(self.snapshot_file_path),
+            [(0, 1, 1000.0)]
+        )
+
+        with open(self.journal_file_path, 'r+b') as journal_file:
+            journal_file.seek(journal_size - 8)
+            journal_file.write(b'\xff')
+
+        self.assertListEqual(
+            playbackjournal.PlaybackJournal(self.journal_file_path).load(self.snapshot_file_path),
+            [(0, 1, 1000.0)]
+        )
+
+    def test_load_with_journal_of_other_snapshot(self) -> None:
+        playback_journal = playbackjournal.PlaybackJournal(self.journal_file_path)
+        playback_journal.reset(self.snapshot_file_path)
+        playback_journal.append(0, 1, 1000.0)
+        playback_journal.close()
+
+        # E.g. a crash right after saving a new snapshot
+        self.write_snapshot('{"video.mkv": {}}')
+
+        self.assertListEqual(
+            playbackjournal.PlaybackJournal(self.journal_file_path).load(self.snapshot_file_path),
+            []
+        )
+
+    def test_append_before_reset(self) -> None:
+        self.assertRaisesRegex(
+            RuntimeError,
+            r"^Cannot append to playback journal '{}' before resetting it\.$".format(self.journal_file_path),
+            playbackjournal.PlaybackJournal(self.journal_file_path).append,
+            0,
+            1,
+            1000.0
+        )
@@ -0,0 +1,27 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+
+randomframesampling = get_module_from_file('../../src/slow-movie-player-service/randomframesampling.py')
+
+
+class RandomFrameSamplingTest(TestCase):
+    def test_random_frame_sampling_value(self) -> None:
+        test_input_expected_value_pairs = {
+            'Video': 'Video',
+            'Frame': 'Frame',
+            '': 'Video',
+            'None': 'Video',
+            'video': 'Video',
+            'frame': 'Video',
+            'FRAME': 'Video',
+            'True': 'Video',
+            '0': 'Video',
+            '-inf': 'Video',
+            r"¯\_(ツ)_/¯": 'Video',
+        }
+
+        for test_input, expected_value in test_input_expected_value_pairs.items():
+            with self.subTest(test_input=test_input):
+                random_frame_sampling = randomframesampling.RandomFrameSampling(test_input)
+
+                self.assertEqual(random_frame_sampling.value, expected_value)
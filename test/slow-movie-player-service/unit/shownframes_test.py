@@ -0,0 +1,97 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+from unittest.mock import patch
+from typing import Any
+import tempfile
+import shutil
+import os
+
+shownframes = get_module_from_file('../../src/slow-movie-player-service/shownframes.py')
+
+
+class ShownFramesTest(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.directory_path = tempfile.mkdtemp()
+        self.shown_frames_file_path = os.path.join(self.directory_path, 'shown_frames.bin')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory_path)
+
+        super().tearDown()
+
+    def choose_every_frame(self, shown_frames: Any, weighted: bool) -> list[tuple[str, int]]:
+        return sorted(shown_frames.choose(weighted) for _ in range(13))
+
+    def test_choose_without_repeating(self) -> None:
+        videos = [('/videos/a.mkv', 3), ('/videos/b.mkv', 0), ('/videos/c.mkv', 10)]
+        every_frame = sorted(
+            (video_path, frame) for video_path, frame_count in videos for frame in range(frame_count)
+        )
+
+        for weighted in [False, True]:
+            with self.subTest(weighted=weighted):
+                shown_frames = shownframes.ShownFrames(self.shown_frames_file_path)
+                shown_frames.update(videos)
+
+                self.assertListEqual(self.choose_every_frame(shown_frames, weighted), every_frame)
+
+                # Every frame is displayed again once all of them have been
+                # displayed
+                self.assertListEqual(self.choose_every_frame(shown_frames, weighted), every_frame)
+
+                os.remove(self.shown_frames_file_path)
+
+    def test_choose_with_weights(self) -> None:
+        shown_frames = shownframes.ShownFrames(self.shown_frames_file_path)
+        shown_frames.update([('/videos/a.mkv', 1), ('/videos/b.mkv', 3)])
+
+        with patch('random.randrange', side_effect=[1, 0, 0, 0]) as randrange_function_mock:
+            self.assertTupleEqual(shown_frames.choose(False), ('/videos/b.mkv', 0))
+            self.assertTupleEqual(shown_frames.choose(True), ('/videos/a.mkv', 0))
+
+        self.assertListEqual(randrange_function_mock.call_args_list, [((2,),), ((3,),), ((3,),), ((1,),)])
+
+    def test_shown_frames_are_persisted(self) -> None:
+        shown_frames = shownframes.ShownFrames(self.shown_frames_file_path)
+        shown_frames.update([('/videos/a.mkv', 9), ('/videos/b.mkv', 2)])
+        shown_frame = shown_frames.choose()
+        file_size = os.path.getsize(self.shown_frames_file_path)
+
+        # Only the byte of the chosen frame is written
+        shown_frames.choose()
+
+        self.assertEqual(os.path.getsize(self.shown_frames_file_path), file_size)
+
+        shown_frames = shownframes.ShownFrames(self.shown_frames_file_path)
+        shown_frames.update([('/videos/a.mkv', 9), ('/videos/b.mkv', 2)])
+        other_frames = [shown_frames.choose() for _ in range(9)]
+
+        self.assertNotIn(shown_frame, other_frames)
+        self.assertEqual(len(set(other_frames)), 9)
+
+        # Frames of changed and new videos are displayed again
+        shown_frames.update([('/videos/b.mkv', 3), ('/videos/c.mkv', 1)])
+
+        self.assertListEqual(
+            sorted(shown_frames.choose() for _ in range(4)),
+            [('/videos/b.mkv', 0), ('/videos/b.mkv', 1), ('/videos/b.mkv', 2), ('/videos/c.mkv', 0)]
+        )
+
+    def test_unreadable_file_is_discarded(self) -> None:
+        for file_contents in [b'', b'SMPS', b'SMPS\x01\x00\x00\x00\x01\x00\x00\x00\x10\x00\x00\x00']:
+            with self.subTest(file_contents=file_contents):
+                with open(self.shown_frames_file_path, 'wb') as shown_frames_file:
+                    shown_frames_file.write(file_contents)
+
+                shown_frames = shownframes.ShownFrames(self.shown_frames_file_path)
+                shown_frames.update([('/videos/a.mkv', 1)])
+
+                self.assertTupleEqual(shown_frames.choose(), ('/videos/a.mkv', 0))
+
+    def test_choose_without_frames(self) -> None:
+        shown_frames = shownframes.ShownFrames(self.shown_frames_file_path)
+        shown_frames.update([('/videos/a.mkv', 0)])
+
+        self.assertRaises(KeyError, shown_frames.choose)
@@ -2,10 +2,14 @@ from module_helper import get_module_from_file
 from unittest import TestCase
 from unittest.mock import call, Mock, patch
 import cv2
+import numpy
 import sys
 import re
 from typing import Any
 
+grayscalemethod = get_module_from_file('../../src/slow-movie-player-service/grayscalemethod.py')
+grayscaleconverter = get_module_from_file('../../src/slow-movie-player-service/grayscaleconverter.py')
+videoindex = get_module_from_file('../../src/slow-movie-player-service/videoindex.py')
 video = get_module_from_file('../../src/slow-movie-player-service/video.py')
 
 
@@ -145,6 +149,7 @@ class VideoTest(TestCase):
             with self.subTest(case['description']):
                 video_mock = video_capture_mock(self.__class__.VIDEO_FILE_PATH)
                 video_mock.read.return_value = (True, case['frame_data'])
+                video_mock.get.return_value = 1.0
                 video_capture_mock.reset_mock()
 
                 if isinstance(case['position'], int):
@@ -156,12 +161,14 @@ class VideoTest(TestCase):
                     call(self.__class__.VIDEO_FILE_PATH),
                     call().set(position_mock, case['position']),
                     call().read(),
+                    call().get(frame_based_position_mock),
                     call().release(),
                 ]
 
                 expected_video_mock_calls = [
                     call.set(position_mock, case['position']),
                     call.read(),
+                    call.get(frame_based_position_mock),
                     call.release(),
                 ]
 
@@ -176,6 +183,321 @@ class VideoTest(TestCase):
                 self.assertListEqual(video_capture_mock.mock_calls, expected_video_capture_mock_calls)
                 self.assertListEqual(video_mock.mock_calls, expected_video_mock_calls)
 
+    @patch('cv2.CAP_PROP_POS_FRAMES')
+    @patch('cv2.VideoCapture', spec=cv2.VideoCapture)
+    def test_get_frame_with_minimum_size_and_grayscale_method(
+        self,
+        video_capture_mock: Mock,
+        frame_based_position_mock: Mock
+    ) -> None:
+
+        cases: list[dict[str, Any]] = [
+            {
+                'description': '4K frame fitted into 1872x1404',
+                'frame_shape': (2160, 3840, 3),
+                'minimum_size': (1872, 1404),
+                'grayscale_method': None,
+                'expected_shape': (1080, 1920, 3),
+            },
+            {
+                'description': '4K frame fitted into 1872x1404 in grayscale',
+                'frame_shape': (2160, 3840, 3),
+                'minimum_size': (1872, 1404),
+                'grayscale_method': grayscalemethod.GrayscaleMethod.REC709LUMA,
+                'expected_shape': (1080, 1920),
+            },
+            {
+                'description': 'Portrait frame fitted into 800x600',
+                'frame_shape': (1920, 1080, 3),
+                'minimum_size': (800, 600),
+                'grayscale_method': None,
+                'expected_shape': (640, 360, 3),
+            },
+            {
+                'description': 'Frame less than twice as large as the screen',
+                'frame_shape': (1080, 1920, 3),
+                'minimum_size': (1872, 1404),
+                'grayscale_method': None,
+                'expected_shape': (1080, 1920, 3),
+            },
+            {
+                'description': 'Frame smaller than the screen in grayscale',
+                'frame_shape': (480, 640, 3),
+                'minimum_size': (1872, 1404),
+                'grayscale_method': grayscalemethod.GrayscaleMethod.AVERAGE,
+                'expected_shape': (480, 640),
+            },
+            {
+                'description': 'Full size frame in grayscale',
+                'frame_shape': (2160, 3840, 3),
+                'minimum_size': None,
+                'grayscale_method': grayscalemethod.GrayscaleMethod.RMS,
+                'expected_shape': (2160, 3840),
+            },
+        ]
+
+        for case in cases:
+            with self.subTest(case['description']):
+                video_mock = video_capture_mock(self.__class__.VIDEO_FILE_PATH)
+                video_mock.read.return_value = (True, numpy.full(case['frame_shape'], 0x80, dtype=numpy.uint8))
+                video_mock.get.return_value = 1.0
+                video_capture_mock.reset_mock()
+
+                frame = video.Video(self.__class__.VIDEO_FILE_PATH).get_frame(
+                    0,
+                    case['minimum_size'],
+                    case['grayscale_method']
+                )
+
+                self.assertTupleEqual(frame.shape, case['expected_shape'])
+                self.assertTrue((frame == 0x80).all())
+                self.assertListEqual(
+                    video_mock.mock_calls,
+                    [
+                        call.set(frame_based_position_mock, 0),
+                        call.read(),
+                        call.get(frame_based_position_mock),
+                        call.release(),
+                    ]
+                )
+
+    @patch('cv2.CAP_PROP_FPS')
+    @patch('cv2.CAP_PROP_POS_FRAMES')
+    @patch('cv2.CAP_PROP_POS_MSEC')
+    @patch('cv2.VideoCapture', spec=cv2.VideoCapture)
+    def test_get_frame_decodes_forward_to_nearby_frames(
+        self,
+        video_capture_mock: Mock,
+        time_based_position_mock: Mock,
+        frame_based_position_mock: Mock,
+        fps_property_mock: Mock
+    ) -> None:
+
+        frame_rate = 25.0
+        max_forward_decode_frame_count = video.Video.MAX_FORWARD_DECODE_FRAME_COUNT
+        next_frame = 0
+        video_mock = video_capture_mock(self.__class__.VIDEO_FILE_PATH)
+
+        def grab() -> bool:
+            nonlocal next_frame
+            next_frame += 1
+
+            return True
+
+        def read() -> tuple[bool, str]:
+            nonlocal next_frame
+            next_frame += 1
+
+            return True, 'frame #{}'.format(next_frame - 1)
+
+        def set_position(position_property: Mock, position: float) -> bool:
+            nonlocal next_frame
+
+            if position_property == frame_based_position_mock:
+                next_frame = position
+            else:
+                next_frame = int(position * frame_rate * 0.001 + 0.5)
+
+            return True
+
+        video_mock.grab.side_effect = grab
+        video_mock.read.side_effect = read
+        video_mock.set.side_effect = set_position
+        video_mock.get.side_effect = lambda property: {
+            fps_property_mock: frame_rate,
+            frame_based_position_mock: float(next_frame),
+        }[property]
+
+        cases: list[dict[str, Any]] = [
+            {
+                'description': 'First frame is always sought',
+                'position': 100,
+                'expected_video_mock_calls': [
+                    call.set(frame_based_position_mock, 100),
+                    call.read(),
+                    call.get(frame_based_position_mock),
+                ],
+            },
+            {
+                'description': 'Next frame is read without seeking',
+                'position': 101,
+                'expected_video_mock_calls': [
+                    call.read(),
+                    call.get(frame_based_position_mock),
+                ],
+            },
+            {
+                'description': 'Nearby frame is reached by decoding forward',
+                'position': 104,
+                'expected_video_mock_calls': [
+                    call.grab(),
+                    call.grab(),
+                    call.read(),
+                    call.get(frame_based_position_mock),
+                ],
+            },
+            {
+                'description': 'Nearby frame by timestamp is reached by decoding forward',
+                'position': 4240.0,  # milliseconds, frame #106
+                'expected_video_mock_calls': [
+                    call.get(fps_property_mock),
+                    call.grab(),
+                    call.read(),
+                    call.get(frame_based_position_mock),
+                ],
+            },
+            {
+                'description': 'Frame at the limit of decoding forward',
+                'position': 107 + max_forward_decode_frame_count,
+                'expected_video_mock_calls': (
+                    [call.grab()] * max_forward_decode_frame_count
+                    + [
+                        call.read(),
+                        call.get(frame_based_position_mock),
+                    ]
+                ),
+            },
+            {
+                'description': 'Frame beyond the limit of decoding forward is sought',
+                'position': 109 + 2 * max_forward_decode_frame_count,
+                'expected_video_mock_calls': [
+                    call.set(frame_based_position_mock, 109 + 2 * max_forward_decode_frame_count),
+                    call.read(),
+                    call.get(frame_based_position_mock),
+                ],
+            },
+            {
+                'description': 'Previous frame is sought',
+                'position': 0,
+                'expected_video_mock_calls': [
+                    call.set(frame_based_position_mock, 0),
+                    call.read(),
+                    call.get(frame_based_position_mock),
+                ],
+            },
+            {
+                'description': 'Previous frame by timestamp is sought',
+                'position': 0.0,  # milliseconds
+                'expected_video_mock_calls': [
+                    call.get(fps_property_mock),
+                    call.set(time_based_position_mock, 0.0),
+                    call.read(),
+                    call.get(frame_based_position_mock),
+                ],
+            },
+        ]
+
+        test_video = video.Video(self.__class__.VIDEO_FILE_PATH)
+
+        for case in cases:
+            with self.subTest(case['description']):
+                video_mock.reset_mock()
+
+                expected_frame_index = (
+                    case['position']
+                    if isinstance(case['position'], int)
+                    else int(case['position'] * frame_rate * 0.001 + 0.5)
+                )
+
+                self.assertEqual(test_video.get_frame(case['position']), 'frame #{}'.format(expected_frame_index))
+                self.assertListEqual(video_mock.mock_calls, case['expected_video_mock_calls'])
+
+    @patch('cv2.CAP_PROP_POS_FRAMES')
+    @patch('cv2.CAP_PROP_POS_MSEC')
+    @patch('cv2.VideoCapture', spec=cv2.VideoCapture)
+    def test_get_frame_with_video_index(
+        self,
+        video_capture_mock: Mock,
+        time_based_position_mock: Mock,
+        frame_based_position_mock: Mock
+    ) -> None:
+
+        # Keyframes every 250 frames, 25 frames per second
+        video_index_mock = Mock(spec=videoindex.VideoIndex)
+        video_index_mock.get_keyframe_before.side_effect = lambda frame: frame - frame % 250
+        video_index_mock.get_frame_at.side_effect = lambda timestamp: int(timestamp / 40.0)
+
+        next_frame = 0
+        video_mock = video_capture_mock(self.__class__.VIDEO_FILE_PATH)
+
+        def grab() -> bool:
+            nonlocal next_frame
+            next_frame += 1
+
+            return True
+
+        def read() -> tuple[bool, str]:
+            nonlocal next_frame
+            next_frame += 1
+
+            return True, 'frame #{}'.format(next_frame - 1)
+
+        def set_position(_: Mock, position: int) -> bool:
+            nonlocal next_frame
+            next_frame = position
+
+            return True
+
+        video_mock.grab.side_effect = grab
+        video_mock.read.side_effect = read
+        video_mock.set.side_effect = set_position
+        video_mock.get.side_effect = lambda _: float(next_frame)
+
+        cases: list[dict[str, Any]] = [
+            {
+                'description': 'First frame by timestamp is sought by frame index',
+                'position': 4000.0,  # milliseconds
+                'expected_frame': 100,
+                'expected_grab_count': 0,
+                'expected_seek': True,
+            },
+            {
+                'description': 'Frame before the next keyframe is reached by decoding forward',
+                'position': 249,
+                'expected_frame': 249,
+                'expected_grab_count': 148,
+                'expected_seek': False,
+            },
+            {
+                'description': 'Frame after the next keyframe is sought',
+                'position': 520,
+                'expected_frame': 520,
+                'expected_grab_count': 0,
+                'expected_seek': True,
+            },
+            {
+                'description': 'Frame by timestamp before the next keyframe is reached by decoding forward',
+                'position': 22000.0,  # milliseconds
+                'expected_frame': 550,
+                'expected_grab_count': 29,
+                'expected_seek': False,
+            },
+            {
+                'description': 'Previous frame by timestamp is sought by frame index',
+                'position': 10400.0,  # milliseconds
+                'expected_frame': 260,
+                'expected_grab_count': 0,
+                'expected_seek': True,
+            },
+        ]
+
+        test_video = video.Video(self.__class__.VIDEO_FILE_PATH, video_index_mock)
+
+        for case in cases:
+            with self.subTest(case['description']):
+                video_mock.reset_mock()
+
+                self.assertEqual(test_video.get_frame(case['position']), 'frame #{}'.format(case['expected_frame']))
+                self.assertEqual(video_mock.grab.call_count, case['expected_grab_count'])
+
+                if case['expected_seek']:
+                    self.assertListEqual(
+                        video_mock.set.mock_calls,
+                        [call(frame_based_position_mock, case['expected_frame'])]
+                    )
+                else:
+                    self.assertListEqual(video_mock.set.mock_calls, [])
+
     @patch('cv2.VideoCapture', spec=cv2.VideoCapture)
     def test_get_frame_with_wrong_types(self, video_capture_mock: Mock) -> None:
         wrong_type_inputs: list[Any] = [
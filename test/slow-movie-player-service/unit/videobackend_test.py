@@ -0,0 +1,27 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+
+videobackend = get_module_from_file('../../src/slow-movie-player-service/videobackend.py')
+
+
+class VideoBackendTest(TestCase):
+    def test_video_backend_value(self) -> None:
+        test_input_expected_value_pairs = {
+            'OpenCV': 'OpenCV',
+            'FFmpeg': 'FFmpeg',
+            '': 'OpenCV',
+            'None': 'OpenCV',
+            'opencv': 'OpenCV',
+            'ffmpeg': 'OpenCV',
+            'FFMPEG': 'OpenCV',
+            'True': 'OpenCV',
+            '0': 'OpenCV',
+            '-inf': 'OpenCV',
+            r"¯\_(ツ)_/¯": 'OpenCV',
+        }
+
+        for test_input, expected_value in test_input_expected_value_pairs.items():
+            with self.subTest(test_input=test_input):
+                video_backend = videobackend.VideoBackend(test_input)
+
+                self.assertEqual(video_backend.value, expected_value)
@@ -0,0 +1,184 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+from unittest.mock import patch
+from collections import OrderedDict
+import tempfile
+import shutil
+import sqlite3
+import os
+
+videodatabase = get_module_from_file('../../src/slow-movie-player-service/videodatabase.py')
+
+
+def get_video_info(frame_count: int, next_frame: int = 0, file_size: int = 1) -> OrderedDict:
+    return OrderedDict(
+        {
+            'file_size': file_size,
+            'modification_time': 2,
+            'inode': 3,
+            'frame_count': frame_count,
+            'duration': frame_count * 1000.0,
+            'next_frame': next_frame,
+            'next_timestamp': next_frame * 1000.0,
+        }
+    )
+
+
+class VideoDatabaseTest(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.directory_path = tempfile.mkdtemp()
+        self.database_file_path = os.path.join(self.directory_path, 'videos.sqlite')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory_path)
+
+        super().tearDown()
+
+    def test_mapping(self) -> None:
+        video_database = videodatabase.VideoDatabase(self.database_file_path)
+
+        self.assertFalse(video_database)
+        self.assertEqual(len(video_database), 0)
+
+        video_database['/videos/b.mkv'] = get_video_info(3)
+        video_database['/videos/a.mkv'] = get_video_info(5)
+        video_database['/videos/c.mkv'] = get_video_info(7)
+
+        self.assertTrue(video_database)
+        self.assertEqual(len(video_database), 3)
+        self.assertIn('/videos/a.mkv', video_database)
+        self.assertNotIn('/videos/d.mkv', video_database)
+        self.assertEqual(video_database['/videos/a.mkv'], get_video_info(5))
+        self.assertListEqual(list(video_database.keys()), ['/videos/b.mkv', '/videos/a.mkv', '/videos/c.mkv'])
+
+        # Replaced videos keep their position in the library
+        video_database['/videos/b.mkv'] = get_video_info(4, file_size=10)
+        del video_database['/videos/a.mkv']
+
+        self.assertRaises(KeyError, video_database.__getitem__, '/videos/a.mkv')
+        self.assertRaises(KeyError, video_database.__delitem__, '/videos/a.mkv')
+        self.assertListEqual(
+            list(video_database.items()),
+            [
+                ('/videos/b.mkv', get_video_info(4, file_size=10)),
+                ('/videos/c.mkv', get_video_info(7)),
+            ]
+        )
+
+        # Changes are only persisted by commit
+        video_database.commit()
+        video_database['/videos/d.mkv'] = get_video_info(1)
+        video_database.close()
+
+        video_database = videodatabase.VideoDatabase(self.database_file_path)
+
+        self.assertListEqual(list(video_database.keys()), ['/videos/b.mkv', '/videos/c.mkv'])
+
+        video_database.close()
+
+        with sqlite3.connect(self.database_file_path) as connection:
+            self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+    def test_current_item(self) -> None:
+        video_database = videodatabase.VideoDatabase(self.database_file_path)
+
+        self.assertIsNone(video_database.get_current_item())
+
+        video_database['/videos/a.mkv'] = get_video_info(2)
+        video_database['/videos/b.mkv'] = get_video_info(2)
+        video_database['/videos/c.mkv'] = get_video_info(2)
+
+        self.assertEqual(video_database.get_current_item(), ('/videos/a.mkv', get_video_info(2)))
+
+        video_database.set_playback_position('/videos/a.mkv', 2, 2000.0)
+        video_database.set_playback_position('/videos/b.mkv', 2, 2000.0)
+
+        self.assertEqual(video_database.get_current_item(), ('/videos/c.mkv', get_video_info(2)))
+
+        video_database.commit()
+        video_database.close()
+
+        # The cursor is persisted, and moved back if a video before it has
+        # to be played again (e.g. because it was replaced)
+        video_database = videodatabase.VideoDatabase(self.database_file_path)
+
+        self.assertEqual(video_database.get_current_item(), ('/videos/c.mkv', get_video_info(2)))
+
+        video_database['/videos/b.mkv'] = get_video_info(3)
+
+        self.assertEqual(video_database.get_current_item(), ('/videos/b.mkv', get_video_info(3)))
+
+        video_database.set_playback_position('/videos/b.mkv', 3, 3000.0)
+        video_database.set_playback_position('/videos/c.mkv', 2, 2000.0)
+
+        self.assertIsNone(video_database.get_current_item())
+
+        video_database.reset_playback_positions()
+
+        self.assertEqual(video_database.get_current_item(), ('/videos/a.mkv', get_video_info(2)))
+        self.assertListEqual(
+            [video_info['next_frame'] for video_info in video_database.values()],
+            [0, 0, 0]
+        )
+
+    def test_random_item(self) -> None:
+        video_database = videodatabase.VideoDatabase(self.database_file_path)
+
+        self.assertRaises(KeyError, video_database.get_random_item)
+
+        for i in range(10):
+            video_database['/videos/{}.mkv'.format(i)] = get_video_info(i + 1)
+
+        for i in range(9):
+            del video_database['/videos/{}.mkv'.format(i)]
+
+        # Most of the ids do not belong to a video anymore
+        for _ in range(20):
+            self.assertEqual(video_database.get_random_item(), ('/videos/9.mkv', get_video_info(10)))
+
+        video_database['/videos/10.mkv'] = get_video_info(11)
+
+        with patch('random.randint', side_effect=[1, 10]) as randint_function_mock:
+            self.assertEqual(video_database.get_random_item(), ('/videos/9.mkv', get_video_info(10)))
+            self.assertEqual(randint_function_mock.call_count, 2)
+
+        # A video without frames is never chosen
+        video_database['/videos/11.mkv'] = get_video_info(0)
+
+        with patch('random.randint', side_effect=[12, 10]) as randint_function_mock:
+            self.assertEqual(video_database.get_random_item(), ('/videos/9.mkv', get_video_info(10)))
+            self.assertEqual(randint_function_mock.call_count, 2)
+
+        del video_database['/videos/9.mkv']
+        del video_database['/videos/10.mkv']
+
+        self.assertRaises(KeyError, video_database.get_random_item)
+
+    def test_weighted_random_item(self) -> None:
+        video_database = videodatabase.VideoDatabase(self.database_file_path)
+
+        self.assertRaises(KeyError, video_database.get_random_item, True)
+
+        # A video without frames is never chosen
+        video_database['/videos/b.mkv'] = get_video_info(0)
+
+        self.assertRaises(KeyError, video_database.get_random_item, True)
+
+        video_database['/videos/a.mkv'] = get_video_info(2)
+        video_database['/videos/c.mkv'] = get_video_info(3)
+
+        # Frames 0-1 belong to the first, frames 2-4 to the last video
+        with patch('random.randrange', side_effect=[0, 1, 2, 4]) as randrange_function_mock:
+            self.assertListEqual(
+                [video_database.get_random_item(True)[0] for _ in range(4)],
+                ['/videos/a.mkv', '/videos/a.mkv', '/videos/c.mkv', '/videos/c.mkv']
+            )
+            self.assertListEqual(randrange_function_mock.call_args_list, [((5,),)] * 4)
+
+        # The cumulative frame counts are rebuilt after the videos change
+        del video_database['/videos/a.mkv']
+
+        with patch('random.randrange', return_value=0):
+            self.assertEqual(video_database.get_random_item(True), ('/videos/c.mkv', get_video_info(3)))
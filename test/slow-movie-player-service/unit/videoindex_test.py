@@ -0,0 +1,345 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+import os
+import struct
+import tempfile
+from typing import Any, Optional
+
+videoindex = get_module_from_file('../../src/slow-movie-player-service/videoindex.py')
+
+
+def get_box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def get_full_box(box_type: bytes, payload: bytes, version: int = 0) -> bytes:
+    return get_box(box_type, struct.pack('>I', version << 24) + payload)
+
+
+def get_table_box(box_type: bytes, entries: list[tuple[int, ...]]) -> bytes:
+    return get_full_box(
+        box_type,
+        struct.pack('>I', len(entries)) + b''.join(struct.pack('>{}i'.format(len(entry)), *entry) for entry in entries)
+    )
+
+
+def get_track_box(
+    handler_type: bytes,
+    timescale: int,
+    time_to_sample: list[tuple[int, int]],
+    composition_offsets: Optional[list[tuple[int, int]]] = None,
+    sync_samples: Optional[list[int]] = None,
+    edit_list: Optional[list[tuple[int, int]]] = None
+) -> bytes:
+
+    sample_table = get_table_box(b'stts', time_to_sample)
+
+    if composition_offsets is not None:
+        sample_table += get_table_box(b'ctts', composition_offsets)
+
+    if sync_samples is not None:
+        sample_table += get_table_box(b'stss', [(sync_sample,) for sync_sample in sync_samples])
+
+    # Edits are (segment duration, media time) pairs played at normal rate
+    edit_box = b'' if edit_list is None else get_box(
+        b'edts',
+        get_table_box(
+            b'elst',
+            [(segment_duration, media_time, 0x00010000) for segment_duration, media_time in edit_list]
+        )
+    )
+
+    return get_box(
+        b'trak',
+        edit_box + get_box(
+            b'mdia',
+            get_full_box(b'mdhd', struct.pack('>IIIIHH', 0, 0, timescale, 0, 0, 0))
+            + get_full_box(b'hdlr', struct.pack('>I4s12sB', 0, handler_type, b'', 0))
+            + get_box(b'minf', get_box(b'stbl', sample_table))
+        )
+    )
+
+
+def get_ebml_element(element_id: int, data: bytes, unknown_size: bool = False) -> bytes:
+    element_size = b'\x01\xff\xff\xff\xff\xff\xff\xff' if unknown_size else b'\x01' + len(data).to_bytes(7, 'big')
+
+    return element_id.to_bytes((element_id.bit_length() + 7) // 8, 'big') + element_size + data
+
+
+def get_ebml_unsigned_integer(element_id: int, value: int) -> bytes:
+    return get_ebml_element(element_id, value.to_bytes(max((value.bit_length() + 7) // 8, 1), 'big'))
+
+
+def get_cue_point(cue_time: int, track_numbers: list[int]) -> bytes:
+    return get_ebml_element(
+        0xBB,
+        get_ebml_unsigned_integer(0xB3, cue_time)
+        + b''.join(
+            get_ebml_element(0xB7, get_ebml_unsigned_integer(0xF7, track_number) + get_ebml_unsigned_integer(0xF1, 0))
+            for track_number in track_numbers
+        )
+    )
+
+
+def get_matroska_file_contents(
+    cue_points: list[bytes],
+    timestamp_scale: Optional[int] = None,
+    unknown_segment_size: bool = False,
+    unknown_cluster_size: bool = False
+) -> bytes:
+
+    info = get_ebml_element(
+        0x1549A966,
+        get_ebml_unsigned_integer(0x2AD7B1, timestamp_scale) if timestamp_scale is not None else b''
+    )
+    tracks = get_ebml_element(
+        0x1654AE6B,
+        get_ebml_element(0xAE, get_ebml_unsigned_integer(0xD7, 1) + get_ebml_unsigned_integer(0x83, 2))
+        + get_ebml_element(0xAE, get_ebml_unsigned_integer(0xD7, 2) + get_ebml_unsigned_integer(0x83, 1))
+    )
+    cluster = get_ebml_element(
+        0x1F43B675,
+        get_ebml_unsigned_integer(0xE7, 0) + get_ebml_element(0xA3, b'\x00' * 1000),
+        unknown_size=unknown_cluster_size
+    )
+    cues = get_ebml_element(0x1C53BB6B, b''.join(cue_points))
+
+    return get_ebml_element(0x1A45DFA3, b'') + get_ebml_element(
+        0x18538067,
+        info + tracks + cluster + cluster + cues,
+        unknown_size=unknown_segment_size
+    )
+
+
+class VideoIndexTest(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.video_directory_path = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        for file_name in os.listdir(self.video_directory_path):
+            os.remove(os.path.join(self.video_directory_path, file_name))
+
+        os.rmdir(self.video_directory_path)
+
+        super().tearDown()
+
+    def create_video_file(self, name: str, contents: bytes) -> str:
+        video_file_path = os.path.join(self.video_directory_path, name)
+
+        with open(video_file_path, 'wb') as video_file:
+            video_file.write(contents)
+
+        return video_file_path
+
+    def test_iso_base_media_index(self) -> None:
+        # Decoding order: I P B B I P B B, presentation order: I B B P I B B P
+        video_track = get_track_box(
+            b'vide',
+            1000,
+            [(8, 40)],
+            [(1, 40), (1, 120), (2, 0), (1, 40), (1, 120), (2, 0)],
+            [1, 5]
+        )
+        sound_track = get_track_box(b'soun', 44100, [(100, 1024)])
+        video_file_path = self.create_video_file(
+            'video.mp4',
+            get_box(b'ftyp', b'isom\x00\x00\x02\x00')
+            + get_box(b'mdat', b'\x00' * 1000)
+            + get_box(b'moov', get_full_box(b'mvhd', b'\x00' * 96) + sound_track + video_track)
+        )
+
+        video_index = videoindex.VideoIndex.from_file(video_file_path, 25.0)
+
+        self.assertIsNotNone(video_index)
+        self.assertDictEqual(
+            video_index.to_dict(),
+            {
+                'file_size': os.stat(video_file_path).st_size,
+                'modification_time': os.stat(video_file_path).st_mtime_ns,
+                'keyframes': [0, 4],
+                'timescale': 1000,
+                'frame_durations': [[8, 40]],
+            }
+        )
+
+        for frame, expected_keyframe in [(0, 0), (1, 0), (3, 0), (4, 4), (7, 4), (100, 4)]:
+            with self.subTest(frame=frame):
+                self.assertEqual(video_index.get_keyframe_before(frame), expected_keyframe)
+
+        for timestamp, expected_frame in [(0.0, 0), (39.9, 0), (40.0, 1), (200.0, 5), (319.9, 7), (320.0, 8)]:
+            with self.subTest(timestamp=timestamp):
+                self.assertEqual(video_index.get_frame_at(timestamp), expected_frame)
+
+    def test_iso_base_media_index_with_edit_list(self) -> None:
+        # Presentation order: I B B P I B B P, the edit list starts the video
+        # at the first B-frame after an empty edit
+        video_file_path = self.create_video_file(
+            'video.mp4',
+            get_box(
+                b'moov',
+                get_track_box(
+                    b'vide',
+                    1000,
+                    [(8, 40)],
+                    [(1, 40), (1, 120), (2, 0), (1, 40), (1, 120), (2, 0)],
+                    [1, 5],
+                    [(100, -1), (280, 80)]
+                )
+            )
+        )
+
+        video_index = videoindex.VideoIndex.from_file(video_file_path, 25.0)
+
+        self.assertIsNotNone(video_index)
+        self.assertListEqual(video_index.to_dict()['keyframes'], [3])
+        self.assertListEqual(video_index.to_dict()['frame_durations'], [[7, 40]])
+
+        for timestamp, expected_frame in [(0.0, 0), (39.9, 0), (120.0, 3), (279.9, 6)]:
+            with self.subTest(timestamp=timestamp):
+                self.assertEqual(video_index.get_frame_at(timestamp), expected_frame)
+
+    def test_iso_base_media_index_with_variable_frame_rate(self) -> None:
+        video_file_path = self.create_video_file(
+            'video.mov',
+            get_box(b'moov', get_track_box(b'vide', 1000, [(2, 40), (2, 80)]))
+            + get_box(b'mdat', b'\x00' * 1000)
+        )
+
+        video_index = videoindex.VideoIndex.from_file(video_file_path, 30.0)
+
+        self.assertIsNotNone(video_index)
+        self.assertListEqual(video_index.to_dict()['frame_durations'], [[2, 40], [2, 80]])
+
+        for frame in range(4):
+            with self.subTest(frame=frame):
+                self.assertEqual(video_index.get_keyframe_before(frame), frame)
+
+        for timestamp, expected_frame in [(0.0, 0), (79.0, 1), (80.0, 2), (159.0, 2), (160.0, 3), (240.0, 4)]:
+            with self.subTest(timestamp=timestamp):
+                self.assertEqual(video_index.get_frame_at(timestamp), expected_frame)
+
+    def test_matroska_index(self) -> None:
+        cases: list[dict[str, Any]] = [
+            {
+                'description': 'Default timestamp scale',
+                'contents': get_matroska_file_contents(
+                    [get_cue_point(0, [2]), get_cue_point(1000, [1]), get_cue_point(2000, [1, 2])]
+                ),
+                'expected_keyframes': [0, 50],
+            },
+            {
+                'description': 'Custom timestamp scale',
+                'contents': get_matroska_file_contents(
+                    [get_cue_point(0, [2]), get_cue_point(2000, [2]), get_cue_point(4000, [2])],
+                    timestamp_scale=500000
+                ),
+                'expected_keyframes': [0, 25, 50],
+            },
+            {
+                'description': 'Segment of unknown size',
+                'contents': get_matroska_file_contents(
+                    [get_cue_point(0, [2]), get_cue_point(4000, [2])],
+                    unknown_segment_size=True
+                ),
+                'expected_keyframes': [0, 100],
+            },
+            {
+                'description': 'Clusters of unknown size',
+                'contents': get_matroska_file_contents(
+                    [get_cue_point(0, [2]), get_cue_point(4000, [2])],
+                    unknown_cluster_size=True
+                ),
+                'expected_keyframes': [0, 100],
+            },
+        ]
+
+        for case in cases:
+            with self.subTest(case['description']):
+                video_file_path = self.create_video_file('video.mkv', case['contents'])
+                video_index = videoindex.VideoIndex.from_file(video_file_path, 25.0)
+
+                self.assertIsNotNone(video_index)
+                self.assertListEqual(video_index.to_dict()['keyframes'], case['expected_keyframes'])
+                self.assertIsNone(video_index.get_frame_at(0.0))
+                self.assertEqual(video_index.get_keyframe_before(case['expected_keyframes'][-1] - 1),
+                                 case['expected_keyframes'][-2])
+
+    def test_unsupported_or_invalid_videos(self) -> None:
+        cases: list[dict[str, Any]] = [
+            {
+                'description': 'Unsupported container',
+                'name': 'video.avi',
+                'contents': b'RIFF\x00\x00\x00\x00AVI ',
+            },
+            {
+                'description': 'ISO base media file without moov box',
+                'name': 'video.mp4',
+                'contents': get_box(b'ftyp', b'isom') + get_box(b'mdat', b'\x00' * 100),
+            },
+            {
+                'description': 'ISO base media file without video track',
+                'name': 'video.mp4',
+                'contents': get_box(b'moov', get_track_box(b'soun', 44100, [(100, 1024)])),
+            },
+            {
+                'description': 'Truncated ISO base media file',
+                'name': 'video.mp4',
+                'contents': get_box(b'moov', get_track_box(b'vide', 1000, [(8, 40)]))[:-6],
+            },
+            {
+                'description': 'Matroska file without cues',
+                'name': 'video.mkv',
+                'contents': get_matroska_file_contents([]),
+            },
+            {
+                'description': 'Garbage',
+                'name': 'video.webm',
+                'contents': b'\x00' * 100,
+            },
+            {
+                'description': 'Empty file',
+                'name': 'video.mkv',
+                'contents': b'',
+            },
+        ]
+
+        for case in cases:
+            with self.subTest(case['description']):
+                video_file_path = self.create_video_file(case['name'], case['contents'])
+
+                self.assertIsNone(videoindex.VideoIndex.from_file(video_file_path, 25.0))
+
+        self.assertIsNone(videoindex.VideoIndex.from_file('/hopefully/this/file/does/not/exist.mp4', 25.0))
+
+    def test_is_up_to_date(self) -> None:
+        video_file_path = self.create_video_file(
+            'video.mp4',
+            get_box(b'moov', get_track_box(b'vide', 1000, [(8, 40)]))
+        )
+        video_index = videoindex.VideoIndex.from_file(video_file_path, 25.0)
+        restored_video_index = videoindex.VideoIndex.from_dict(video_index.to_dict())
+
+        self.assertTrue(video_index.is_up_to_date(video_file_path))
+        self.assertTrue(restored_video_index.is_up_to_date(video_file_path))
+
+        with open(video_file_path, 'ab') as video_file:
+            video_file.write(get_box(b'free', b''))
+
+        self.assertFalse(video_index.is_up_to_date(video_file_path))
+        self.assertFalse(restored_video_index.is_up_to_date(video_file_path))
+
+        os.remove(video_file_path)
+
+        self.assertFalse(video_index.is_up_to_date(video_file_path))
+
+    def test_get_nearest_keyframe(self) -> None:
+        video_index = videoindex.VideoIndex(0, 0, [0, 10, 30])
+
+        for frame, expected_keyframe in [(0, 0), (4, 0), (5, 0), (6, 10), (10, 10), (20, 10), (21, 30), (100, 30)]:
+            with self.subTest(frame=frame):
+                self.assertEqual(video_index.get_nearest_keyframe(frame), expected_keyframe)
+
+        # Every frame is a keyframe
+        self.assertEqual(videoindex.VideoIndex(0, 0, None).get_nearest_keyframe(7), 7)
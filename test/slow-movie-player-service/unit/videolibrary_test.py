@@ -5,10 +5,23 @@ from collections import OrderedDict
 import os
 import json
 
+grayscalemethod = get_module_from_file('../../src/slow-movie-player-service/grayscalemethod.py')
+grayscaleconverter = get_module_from_file('../../src/slow-movie-player-service/grayscaleconverter.py')
+videoindex = get_module_from_file('../../src/slow-movie-player-service/videoindex.py')
+video = get_module_from_file('../../src/slow-movie-player-service/video.py')
+imagebufferpool = get_module_from_file('../../src/slow-movie-player-service/imagebufferpool.py')
+ffmpegvideo = get_module_from_file('../../src/slow-movie-player-service/ffmpegvideo.py')
+videobackend = get_module_from_file('../../src/slow-movie-player-service/videobackend.py')
+videolibrarybackend = get_module_from_file('../../src/slow-movie-player-service/videolibrarybackend.py')
+randomframesampling = get_module_from_file('../../src/slow-movie-player-service/randomframesampling.py')
+videodatabase = get_module_from_file('../../src/slow-movie-player-service/videodatabase.py')
+videopool = get_module_from_file('../../src/slow-movie-player-service/videopool.py')
+playbackjournal = get_module_from_file('../../src/slow-movie-player-service/playbackjournal.py')
 videolibrary = get_module_from_file('../../src/slow-movie-player-service/videolibrary.py')
 
 
 class VideoLibraryTest(TestCase):
+    @patch.object(videolibrary, 'PlaybackJournal')
     @patch("builtins.open", new_callable=mock_open)
     @patch('os.unlink', spec=os.unlink)
     @patch('os.rename', spec=os.rename)
@@ -21,14 +34,14 @@ class VideoLibraryTest(TestCase):
     @patch('os.O_WRONLY')
     @patch('os.O_CREAT')
     @patch('os.open', spec=os.open)
-    @patch('os.walk', spec=os.walk)
+    @patch('os.scandir', spec=os.scandir)
     @patch('os.path.join', spec=os.path.join)
     @patch('os.path.exists', spec=os.path.exists)
     def test_save_to_file(
         self,
         os_path_exists_function_mock: Mock,
         os_path_join_function_mock: Mock,
-        os_walk_function_mock: Mock,
+        os_scandir_function_mock: Mock,
         os_open_function_mock: Mock,
         os_create_file_flag_mock: Mock,
         os_write_only_flag_mock: Mock,
@@ -40,7 +53,8 @@ class VideoLibraryTest(TestCase):
         os_access_function_mock: Mock,
         os_rename_function_mock: Mock,
         os_unlink_function_mock: Mock,
-        builtins_open_function_mock: Mock
+        builtins_open_function_mock: Mock,
+        playback_journal_class_mock: Mock
     ) -> None:
 
         video_directory_path = '/path/to/video/directory'
@@ -56,13 +70,17 @@ class VideoLibraryTest(TestCase):
             video_library_file_path,
             videolibrary.VideoLibrary.BACKUP_FILE_EXTENSION
         )
+        playback_journal_file_path = '{}/{}'.format(
+            video_directory_path,
+            videolibrary.VideoLibrary.PLAYBACK_JOURNAL_FILE_NAME
+        )
 
         os_path_exists_function_mock.side_effect = {
             video_directory_path: True,
             video_library_file_path: False
         }.get
         os_path_join_function_mock.side_effect = lambda str1, str2: '{}/{}'.format(str1, str2)
-        os_walk_function_mock.return_value = []
+        os_scandir_function_mock.return_value.__iter__.return_value = iter([])
 
         os_open_flag_mock = os_create_file_flag_mock | os_write_only_flag_mock
         temp_video_library_file_mock = os_open_function_mock(temp_video_library_file_path, os_open_flag_mock)
@@ -76,8 +94,11 @@ class VideoLibraryTest(TestCase):
             call(video_directory_path),
             call(video_library_file_path),
         ]
-        expected_os_walk_function_mock_calls = [
+        expected_os_scandir_function_mock_calls = [
             call(video_directory_path),
+            call().__enter__(),
+            call().__iter__(),
+            call().__exit__(None, None, None),
         ]
         expected_os_open_function_mock_calls = [
             call(temp_video_library_file_path, os_open_flag_mock),
@@ -93,7 +114,7 @@ class VideoLibraryTest(TestCase):
         json_string_mock.__ne__.side_effect = [True]
 
         self.assertListEqual(os_path_exists_function_mock.mock_calls, [])
-        self.assertListEqual(os_walk_function_mock.mock_calls, [])
+        self.assertListEqual(os_scandir_function_mock.mock_calls, [])
         self.assertListEqual(os_open_function_mock.mock_calls, [])
         self.assertListEqual(os_write_function_mock.mock_calls, [])
         self.assertListEqual(json_dumps_function_mock.mock_calls, [])
@@ -103,6 +124,7 @@ class VideoLibraryTest(TestCase):
         self.assertListEqual(os_rename_function_mock.mock_calls, [])
         self.assertListEqual(os_unlink_function_mock.mock_calls, [])
         self.assertListEqual(builtins_open_function_mock.mock_calls, [])
+        self.assertListEqual(playback_journal_class_mock.mock_calls, [])
 
         self.assertRaisesRegex(
             ValueError,
@@ -120,7 +142,7 @@ class VideoLibraryTest(TestCase):
         )
 
         self.assertListEqual(os_path_exists_function_mock.mock_calls, expected_os_path_exists_function_mock_calls)
-        self.assertListEqual(os_walk_function_mock.mock_calls, expected_os_walk_function_mock_calls)
+        self.assertListEqual(os_scandir_function_mock.mock_calls, expected_os_scandir_function_mock_calls)
         self.assertListEqual(os_open_function_mock.mock_calls, expected_os_open_function_mock_calls)
         self.assertListEqual(os_write_function_mock.mock_calls, expected_os_write_function_mock_calls)
         self.assertListEqual(
@@ -146,10 +168,11 @@ class VideoLibraryTest(TestCase):
                 call().__exit__(None, None, None),
             ]
         )
+        self.assertListEqual(playback_journal_class_mock.mock_calls, [call(playback_journal_file_path)])
 
         os_path_exists_function_mock.reset_mock()
         os_path_join_function_mock.reset_mock()
-        os_walk_function_mock.reset_mock()
+        os_scandir_function_mock.reset_mock()
         os_open_function_mock.reset_mock()
         os_create_file_flag_mock.reset_mock()
         os_write_only_flag_mock.reset_mock()
@@ -162,11 +185,12 @@ class VideoLibraryTest(TestCase):
         os_rename_function_mock.reset_mock()
         os_unlink_function_mock.reset_mock()
         builtins_open_function_mock.reset_mock()
+        playback_journal_class_mock.reset_mock()
 
         json_string_mock.__ne__.side_effect = [False, True]
 
         self.assertListEqual(os_path_exists_function_mock.mock_calls, [])
-        self.assertListEqual(os_walk_function_mock.mock_calls, [])
+        self.assertListEqual(os_scandir_function_mock.mock_calls, [])
         self.assertListEqual(os_open_function_mock.mock_calls, [])
         self.assertListEqual(os_write_function_mock.mock_calls, [])
         self.assertListEqual(json_dumps_function_mock.mock_calls, [])
@@ -176,6 +200,7 @@ class VideoLibraryTest(TestCase):
         self.assertListEqual(os_rename_function_mock.mock_calls, [])
         self.assertListEqual(os_unlink_function_mock.mock_calls, [])
         self.assertListEqual(builtins_open_function_mock.mock_calls, [])
+        self.assertListEqual(playback_journal_class_mock.mock_calls, [])
 
         self.assertRaisesRegex(
             ValueError,
@@ -193,7 +218,7 @@ class VideoLibraryTest(TestCase):
         )
 
         self.assertListEqual(os_path_exists_function_mock.mock_calls, expected_os_path_exists_function_mock_calls)
-        self.assertListEqual(os_walk_function_mock.mock_calls, expected_os_walk_function_mock_calls)
+        self.assertListEqual(os_scandir_function_mock.mock_calls, expected_os_scandir_function_mock_calls)
         self.assertListEqual(os_open_function_mock.mock_calls, expected_os_open_function_mock_calls)
         self.assertListEqual(os_write_function_mock.mock_calls, expected_os_write_function_mock_calls)
         self.assertListEqual(
@@ -237,10 +262,11 @@ class VideoLibraryTest(TestCase):
                 call().__exit__(None, None, None),
             ]
         )
+        self.assertListEqual(playback_journal_class_mock.mock_calls, [call(playback_journal_file_path)])
 
         os_path_exists_function_mock.reset_mock()
         os_path_join_function_mock.reset_mock()
-        os_walk_function_mock.reset_mock()
+        os_scandir_function_mock.reset_mock()
         os_open_function_mock.reset_mock()
         os_create_file_flag_mock.reset_mock()
         os_write_only_flag_mock.reset_mock()
@@ -253,11 +279,12 @@ class VideoLibraryTest(TestCase):
         os_rename_function_mock.reset_mock()
         os_unlink_function_mock.reset_mock()
         builtins_open_function_mock.reset_mock()
+        playback_journal_class_mock.reset_mock()
 
         json_string_mock.__ne__.side_effect = [False, False]
 
         self.assertListEqual(os_path_exists_function_mock.mock_calls, [])
-        self.assertListEqual(os_walk_function_mock.mock_calls, [])
+        self.assertListEqual(os_scandir_function_mock.mock_calls, [])
         self.assertListEqual(os_open_function_mock.mock_calls, [])
         self.assertListEqual(os_write_function_mock.mock_calls, [])
         self.assertListEqual(json_dumps_function_mock.mock_calls, [])
@@ -267,6 +294,7 @@ class VideoLibraryTest(TestCase):
         self.assertListEqual(os_rename_function_mock.mock_calls, [])
         self.assertListEqual(os_unlink_function_mock.mock_calls, [])
         self.assertListEqual(builtins_open_function_mock.mock_calls, [])
+        self.assertListEqual(playback_journal_class_mock.mock_calls, [])
 
         try:
             videolibrary.VideoLibrary(video_directory_path)
@@ -274,7 +302,7 @@ class VideoLibraryTest(TestCase):
             self.fail('ValueError was raised unexpectedly!')
 
         self.assertListEqual(os_path_exists_function_mock.mock_calls, expected_os_path_exists_function_mock_calls)
-        self.assertListEqual(os_walk_function_mock.mock_calls, expected_os_walk_function_mock_calls)
+        self.assertListEqual(os_scandir_function_mock.mock_calls, expected_os_scandir_function_mock_calls)
         self.assertListEqual(os_open_function_mock.mock_calls, expected_os_open_function_mock_calls)
         self.assertListEqual(os_write_function_mock.mock_calls, expected_os_write_function_mock_calls)
         self.assertListEqual(
@@ -325,3 +353,10 @@ class VideoLibraryTest(TestCase):
                 call().__exit__(None, None, None),
             ]
         )
+        self.assertListEqual(
+            playback_journal_class_mock.mock_calls,
+            [
+                call(playback_journal_file_path),
+                call().reset(video_library_file_path),
+            ]
+        )
@@ -0,0 +1,27 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+
+videolibrarybackend = get_module_from_file('../../src/slow-movie-player-service/videolibrarybackend.py')
+
+
+class VideoLibraryBackendTest(TestCase):
+    def test_video_library_backend_value(self) -> None:
+        test_input_expected_value_pairs = {
+            'JSON': 'JSON',
+            'SQLite': 'SQLite',
+            '': 'JSON',
+            'None': 'JSON',
+            'json': 'JSON',
+            'sqlite': 'JSON',
+            'SQLITE': 'JSON',
+            'True': 'JSON',
+            '0': 'JSON',
+            '-inf': 'JSON',
+            r"¯\_(ツ)_/¯": 'JSON',
+        }
+
+        for test_input, expected_value in test_input_expected_value_pairs.items():
+            with self.subTest(test_input=test_input):
+                video_library_backend = videolibrarybackend.VideoLibraryBackend(test_input)
+
+                self.assertEqual(video_library_backend.value, expected_value)
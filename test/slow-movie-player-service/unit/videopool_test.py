@@ -0,0 +1,94 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+from unittest.mock import call, Mock, patch
+import time
+
+grayscalemethod = get_module_from_file('../../src/slow-movie-player-service/grayscalemethod.py')
+grayscaleconverter = get_module_from_file('../../src/slow-movie-player-service/grayscaleconverter.py')
+imagebufferpool = get_module_from_file('../../src/slow-movie-player-service/imagebufferpool.py')
+videoindex = get_module_from_file('../../src/slow-movie-player-service/videoindex.py')
+video = get_module_from_file('../../src/slow-movie-player-service/video.py')
+ffmpegvideo = get_module_from_file('../../src/slow-movie-player-service/ffmpegvideo.py')
+videopool = get_module_from_file('../../src/slow-movie-player-service/videopool.py')
+
+
+class VideoPoolTest(TestCase):
+    MAX_SIZE = 2
+    MAX_IDLE_TIME = 60.0
+
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.video_class_mock = Mock(side_effect=lambda video_path: Mock(name=video_path))
+        self.video_pool = videopool.VideoPool(
+            self.video_class_mock,
+            self.__class__.MAX_SIZE,
+            self.__class__.MAX_IDLE_TIME
+        )
+
+    @patch('time.monotonic', spec=time.monotonic)
+    def test_get_video_reuses_open_video(self, monotonic_mock: Mock) -> None:
+        monotonic_mock.return_value = 0.0
+
+        first_video = self.video_pool.get_video('a.mkv')
+
+        for current_time in [1.0, 60.0, 120.0, 180.0]:
+            with self.subTest(current_time=current_time):
+                monotonic_mock.return_value = current_time
+
+                self.assertIs(self.video_pool.get_video('a.mkv'), first_video)
+
+        self.assertListEqual(self.video_class_mock.mock_calls, [call('a.mkv')])
+        self.assertEqual(len(self.video_pool), 1)
+
+    @patch('time.monotonic', spec=time.monotonic)
+    def test_get_video_closes_least_recently_used_video(self, monotonic_mock: Mock) -> None:
+        monotonic_mock.return_value = 0.0
+
+        video_a = self.video_pool.get_video('a.mkv')
+        self.video_pool.get_video('b.mkv')
+        self.assertIs(self.video_pool.get_video('a.mkv'), video_a)
+        self.video_pool.get_video('c.mkv')
+
+        self.assertEqual(len(self.video_pool), self.__class__.MAX_SIZE)
+        self.assertIn('a.mkv', self.video_pool)
+        self.assertNotIn('b.mkv', self.video_pool)
+        self.assertIn('c.mkv', self.video_pool)
+
+        self.video_pool.get_video('b.mkv')
+
+        self.assertListEqual(
+            self.video_class_mock.mock_calls,
+            [call('a.mkv'), call('b.mkv'), call('c.mkv'), call('b.mkv')]
+        )
+        self.assertNotIn('a.mkv', self.video_pool)
+
+    @patch('time.monotonic', spec=time.monotonic)
+    def test_get_video_closes_idle_videos(self, monotonic_mock: Mock) -> None:
+        monotonic_mock.return_value = 0.0
+
+        video_a = self.video_pool.get_video('a.mkv')
+
+        monotonic_mock.return_value = 30.0
+
+        self.video_pool.get_video('b.mkv')
+
+        monotonic_mock.return_value = 60.0 + 1.0
+
+        self.video_pool.get_video('b.mkv')
+
+        self.assertNotIn('a.mkv', self.video_pool)
+        self.assertIn('b.mkv', self.video_pool)
+        self.assertIsNot(self.video_pool.get_video('a.mkv'), video_a)
+        self.assertListEqual(
+            self.video_class_mock.mock_calls,
+            [call('a.mkv'), call('b.mkv'), call('a.mkv')]
+        )
+
+    def test_clear(self) -> None:
+        self.video_pool.get_video('a.mkv')
+        self.video_pool.get_video('b.mkv')
+        self.video_pool.clear()
+
+        self.assertEqual(len(self.video_pool), 0)
+        self.assertNotIn('a.mkv', self.video_pool)
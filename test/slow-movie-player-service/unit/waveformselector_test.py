@@ -0,0 +1,71 @@
+from module_helper import get_module_from_file
+from unittest import TestCase
+from unittest.mock import patch
+import numpy
+
+waveformmode = get_module_from_file('../../src/slow-movie-player-service/waveformmode.py')
+waveformselector = get_module_from_file('../../src/slow-movie-player-service/waveformselector.py')
+
+
+class WaveformSelectorTest(TestCase):
+    def get_change_histogram(self, *level_changes: tuple[int, int, int]) -> numpy.ndarray:
+        change_histogram = numpy.zeros((16, 16), dtype=numpy.int64)
+
+        for previous_level, level, pixel_count in level_changes:
+            change_histogram[previous_level, level] = pixel_count
+
+        return change_histogram
+
+    def test_get_change_histogram(self) -> None:
+        previous_image_data = numpy.array([[0x00, 0xF0], [0x37, 0xFF]], dtype=numpy.uint8)
+        image_data = numpy.array([[0x0F, 0xF0], [0x73, 0xFF]], dtype=numpy.uint8)
+
+        change_histogram = waveformselector.WaveformSelector.get_change_histogram(previous_image_data, image_data)
+
+        self.assertTupleEqual(change_histogram.shape, (16, 16))
+        self.assertEqual(change_histogram.sum(), 3)
+        self.assertEqual(change_histogram[0, 15], 1)
+        self.assertEqual(change_histogram[3, 7], 1)
+        self.assertEqual(change_histogram[7, 3], 1)
+
+    def test_select(self) -> None:
+        test_input_expected_value_pairs = [
+            (self.get_change_histogram(), waveformmode.WaveformMode.A2),
+            (self.get_change_histogram((0, 15, 10), (15, 0, 5)), waveformmode.WaveformMode.A2),
+            (self.get_change_histogram((0, 15, 10), (7, 0, 5)), waveformmode.WaveformMode.DU),
+            (self.get_change_histogram((1, 2, 10), (7, 8, 5)), waveformmode.WaveformMode.GL16),
+            (self.get_change_histogram((2, 9, 1), (7, 8, 9)), waveformmode.WaveformMode.GL16),
+            (self.get_change_histogram((2, 10, 2), (7, 8, 9)), waveformmode.WaveformMode.GC16),
+            (self.get_change_histogram((15, 7, 1)), waveformmode.WaveformMode.GC16),
+        ]
+
+        waveform_selector = waveformselector.WaveformSelector()
+
+        for change_histogram, expected_value in test_input_expected_value_pairs:
+            with self.subTest(change_histogram=change_histogram.nonzero()):
+                self.assertEqual(waveform_selector.select(change_histogram), expected_value)
+
+    def test_select_with_measured_refresh_times(self) -> None:
+        waveform_selector = waveformselector.WaveformSelector()
+        change_histogram = self.get_change_histogram((1, 0, 10), (14, 15, 5))
+
+        self.assertEqual(waveform_selector.select(change_histogram), waveformmode.WaveformMode.DU)
+
+        # DU turns out to be slower than GC16
+        for _ in range(20):
+            waveform_selector.record_refresh_time(waveformmode.WaveformMode.DU, 1.0)
+
+        self.assertGreater(waveform_selector.get_refresh_time(waveformmode.WaveformMode.DU), 0.9)
+        self.assertEqual(waveform_selector.select(change_histogram), waveformmode.WaveformMode.GL16)
+
+        # GC16 is chosen over waveforms with the same refresh time
+        with patch.dict(
+            waveformselector.WaveformSelector.ESTIMATED_REFRESH_TIMES,
+            {waveformmode.WaveformMode.GL16: 0.45, waveformmode.WaveformMode.GC16: 0.45}
+        ):
+            waveform_selector = waveformselector.WaveformSelector()
+
+        self.assertEqual(
+            waveform_selector.select(self.get_change_histogram((1, 2, 10), (7, 8, 5))),
+            waveformmode.WaveformMode.GC16
+        )
@@ -27,5 +27,26 @@ int main(void)
     test_display_4bpp_image_when_malloc_fails();
     test_display_4bpp_image_when_reading_image_data_fails();
 
+    test_read_rectangles_with_null_parameters();
+    test_read_rectangles_when_file_open_fails();
+    test_read_rectangles_with_invalid_header();
+    test_read_rectangles_with_full_refresh_rectangle_count();
+    test_read_rectangles_with_invalid_waveform_mode();
+    test_read_rectangles();
+
+    test_display_frame_buffer_with_rectangles();
+    test_display_frame_buffer_with_invalid_rectangle();
+
+    test_send_panel_info();
+    test_receive_message();
+    test_serve_requests();
+    test_serve_requests_when_drawing_fails();
+
+    test_load_4bpp_image_with_no_image_data_in_file();
+    test_load_frame_buffer();
+    test_show_loaded_image();
+    test_load_image_file_with_unsupported_image_file_format();
+    test_serve_requests_with_loading_in_advance();
+
     return 0;
 }
@@ -10,6 +10,7 @@
     assert(!"Mock is not initialized for (further) use!");
 
 uint8_t INIT_Mode = 0;
+uint8_t GC16_Mode = 2;
 
 // fclose
 size_t fclose_mock_call_count = 0;
@@ -25,6 +26,8 @@ size_t fread_mock_call_count = 0;
 fread_mock_read_value_type_t *fread_mock_read_value_types = NULL;
 size_t *fread_mock_return_values = NULL;
 uint16_t *fread_mock_read_values = NULL;
+uint8_t *fread_mock_read_bytes = NULL;
+size_t fread_mock_read_byte_count = 0;
 
 // free
 size_t free_mock_call_count = 0;
@@ -50,8 +53,20 @@ size_t strlen_mock_return_value_count = 0;
 size_t strlen_mock_call_count = 0;
 size_t *strlen_mock_return_values = NULL;
 
+// DEV_Digital_Write
+size_t dev_digital_write_mock_call_count = 0;
+
+// DEV_SPI_ReadByte
+size_t dev_spi_read_byte_mock_call_count = 0;
+
+// DEV_SPI_WriteByte
+size_t dev_spi_write_byte_mock_call_count = 0;
+uint8_t dev_spi_write_byte_mock_values[DEV_SPI_WRITE_BYTE_MOCK_MAX_VALUE_COUNT];
+
 // EPD_IT8951_4bp_Refresh
 size_t epd_it8951_4bp_refresh_mock_call_count = 0;
+bool epd_it8951_4bp_refresh_mock_records_data = false;
+epd_it8951_4bp_refresh_mock_call_t epd_it8951_4bp_refresh_mock_calls[EPD_IT8951_4BP_REFRESH_MOCK_MAX_CALL_COUNT];
 
 // EPD_IT8951_8bp_Refresh
 size_t epd_it8951_8bp_refresh_mock_call_count = 0;
@@ -101,6 +116,13 @@ void reset_fread_mock(void)
         fread_mock_read_values = NULL;
     }
 
+    if (NULL != fread_mock_read_bytes)
+    {
+        __real_free(fread_mock_read_bytes);
+        fread_mock_read_bytes = NULL;
+    }
+
+    fread_mock_read_byte_count = 0;
     fread_mock_return_value_count = 0;
     fread_mock_call_count = 0;
 }
@@ -164,9 +186,27 @@ void reset_strlen_mock(void)
     strlen_mock_call_count = 0;
 }
 
+void reset_dev_digital_write_mock(void)
+{
+    dev_digital_write_mock_call_count = 0;
+}
+
+void reset_dev_spi_read_byte_mock(void)
+{
+    dev_spi_read_byte_mock_call_count = 0;
+}
+
+void reset_dev_spi_write_byte_mock(void)
+{
+    memset(dev_spi_write_byte_mock_values, 0, sizeof(dev_spi_write_byte_mock_values));
+    dev_spi_write_byte_mock_call_count = 0;
+}
+
 void reset_epd_it8951_4bp_refresh_mock(void)
 {
     epd_it8951_4bp_refresh_mock_call_count = 0;
+    epd_it8951_4bp_refresh_mock_records_data = false;
+    memset(epd_it8951_4bp_refresh_mock_calls, 0, sizeof(epd_it8951_4bp_refresh_mock_calls));
 }
 
 void reset_epd_it8951_8bp_refresh_mock(void)
@@ -201,6 +241,9 @@ void reset_mocks(void)
     reset_stat_mock();
     reset_strcmp_mock();
     reset_strlen_mock();
+    reset_dev_digital_write_mock();
+    reset_dev_spi_read_byte_mock();
+    reset_dev_spi_write_byte_mock();
     reset_epd_it8951_4bp_refresh_mock();
     reset_epd_it8951_8bp_refresh_mock();
     reset_epd_it8951_clear_refresh_mock();
@@ -232,8 +275,6 @@ FILE *__wrap_fopen(const char *path, const char *mode)
 
 size_t __wrap_fread(void *ptr, size_t size, size_t count, FILE *stream)
 {
-    UNUSED(size);
-    UNUSED(count);
     UNUSED(stream);
 
     if (NULL != fread_mock_return_values
@@ -251,6 +292,12 @@ size_t __wrap_fread(void *ptr, size_t size, size_t count, FILE *stream)
             *(uint16_t *)ptr = fread_mock_read_values[fread_mock_call_count];
             break;
 
+        /* The next 'size * count' bytes of 'fread_mock_read_bytes' are read */
+        case BYTES_TYPE:
+            memcpy(ptr, fread_mock_read_bytes + fread_mock_read_byte_count, size * count);
+            fread_mock_read_byte_count += size * count;
+            break;
+
         default:
             ABORT();
             break;
@@ -335,6 +382,44 @@ size_t __wrap_strlen(const char *str)
     ABORT();
 }
 
+/* The controller is always ready (HRDY is high) */
+uint8_t __wrap_DEV_Digital_Read(uint16_t pin)
+{
+    UNUSED(pin);
+
+    return 1;
+}
+
+void __wrap_DEV_Digital_Write(uint16_t pin, uint8_t value)
+{
+    UNUSED(pin);
+    UNUSED(value);
+
+    ++dev_digital_write_mock_call_count;
+
+    return;
+}
+
+/* Every register reads 0, i.e. every refresh is done */
+uint8_t __wrap_DEV_SPI_ReadByte(void)
+{
+    ++dev_spi_read_byte_mock_call_count;
+
+    return 0;
+}
+
+void __wrap_DEV_SPI_WriteByte(uint8_t value)
+{
+    if (dev_spi_write_byte_mock_call_count < DEV_SPI_WRITE_BYTE_MOCK_MAX_VALUE_COUNT)
+    {
+        dev_spi_write_byte_mock_values[dev_spi_write_byte_mock_call_count] = value;
+    }
+
+    ++dev_spi_write_byte_mock_call_count;
+
+    return;
+}
+
 void __wrap_EPD_IT8951_4bp_Refresh(
     uint8_t *frame_buffer,
     uint16_t x,
@@ -345,15 +430,32 @@ void __wrap_EPD_IT8951_4bp_Refresh(
     uint32_t target_memory_address,
     bool packed_write)
 {
-    UNUSED(frame_buffer);
-    UNUSED(x);
-    UNUSED(y);
-    UNUSED(width);
-    UNUSED(height);
     UNUSED(hold);
     UNUSED(target_memory_address);
     UNUSED(packed_write);
 
+    if (epd_it8951_4bp_refresh_mock_call_count < EPD_IT8951_4BP_REFRESH_MOCK_MAX_CALL_COUNT)
+    {
+        epd_it8951_4bp_refresh_mock_call_t *call =
+            &epd_it8951_4bp_refresh_mock_calls[epd_it8951_4bp_refresh_mock_call_count];
+        size_t data_size = ((size_t)width * height) / 2;
+
+        call->x = x;
+        call->y = y;
+        call->width = width;
+        call->height = height;
+        call->gc16_mode = GC16_Mode;
+
+        /* The image data is only readable if the test provides real memory */
+        if (epd_it8951_4bp_refresh_mock_records_data)
+        {
+            memcpy(
+                call->data,
+                frame_buffer,
+                data_size < sizeof(call->data) ? data_size : sizeof(call->data));
+        }
+    }
+
     ++epd_it8951_4bp_refresh_mock_call_count;
 
     return;
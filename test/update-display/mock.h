@@ -8,11 +8,29 @@
 #include <stdbool.h>
 #include <string.h>
 
+/* Bytes written over SPI beyond this count are only counted */
+#define DEV_SPI_WRITE_BYTE_MOCK_MAX_VALUE_COUNT 4096
+
+/* Only the arguments of this many 4bpp refreshes are recorded */
+#define EPD_IT8951_4BP_REFRESH_MOCK_MAX_CALL_COUNT 8
+/* Only this many bytes of the image data of 4bpp refreshes are recorded */
+#define EPD_IT8951_4BP_REFRESH_MOCK_MAX_DATA_SIZE 16
+
 typedef enum fread_mock_read_value_type_t {
     UINT8_T_TYPE,
-    UINT16_T_TYPE
+    UINT16_T_TYPE,
+    BYTES_TYPE
 } fread_mock_read_value_type_t;
 
+typedef struct epd_it8951_4bp_refresh_mock_call_t {
+    uint16_t x;
+    uint16_t y;
+    uint16_t width;
+    uint16_t height;
+    uint8_t gc16_mode;
+    uint8_t data[EPD_IT8951_4BP_REFRESH_MOCK_MAX_DATA_SIZE];
+} epd_it8951_4bp_refresh_mock_call_t;
+
 void __real_free(void *ptr);
 int __real_strcmp(const char *s1, const char *s2);
 size_t __real_strlen(const char *s);
@@ -25,6 +43,9 @@ void reset_malloc_mock(void);
 void reset_stat_mock(void);
 void reset_strcmp_mock(void);
 void reset_strlen_mock(void);
+void reset_dev_digital_write_mock(void);
+void reset_dev_spi_read_byte_mock(void);
+void reset_dev_spi_write_byte_mock(void);
 void reset_epd_it8951_4bp_refresh_mock(void);
 void reset_epd_it8951_8bp_refresh_mock(void);
 void reset_epd_it8951_clear_refresh_mock(void);
@@ -47,6 +68,14 @@ int __wrap_strcmp(const char *str1, const char *str2);
 
 size_t __wrap_strlen(const char *s);
 
+uint8_t __wrap_DEV_Digital_Read(uint16_t pin);
+
+void __wrap_DEV_Digital_Write(uint16_t pin, uint8_t value);
+
+uint8_t __wrap_DEV_SPI_ReadByte(void);
+
+void __wrap_DEV_SPI_WriteByte(uint8_t value);
+
 void __wrap_EPD_IT8951_4bp_Refresh(
     uint8_t *frame_buffer,
     uint16_t x,
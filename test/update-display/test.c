@@ -6,6 +6,7 @@
 #include <fcntl.h>
 #include <unistd.h>
 #include <stdio.h>
+#include <sys/socket.h>
 
 #define COMMA ,
 
@@ -89,6 +90,8 @@ void name(void)                                                          \
     fprintf(stdout, "ok\n");                                             \
 }
 
+extern uint8_t GC16_Mode;
+
 // fclose
 extern size_t fclose_mock_call_count;
 
@@ -103,6 +106,7 @@ extern size_t fread_mock_call_count;
 extern size_t *fread_mock_return_values;
 extern fread_mock_read_value_type_t *fread_mock_read_value_types;
 extern uint16_t *fread_mock_read_values;
+extern uint8_t *fread_mock_read_bytes;
 
 // free
 extern size_t free_mock_call_count;
@@ -128,8 +132,20 @@ extern size_t strlen_mock_return_value_count;
 extern size_t strlen_mock_call_count;
 extern size_t *strlen_mock_return_values;
 
+// DEV_Digital_Write
+extern size_t dev_digital_write_mock_call_count;
+
+// DEV_SPI_ReadByte
+extern size_t dev_spi_read_byte_mock_call_count;
+
+// DEV_SPI_WriteByte
+extern size_t dev_spi_write_byte_mock_call_count;
+extern uint8_t dev_spi_write_byte_mock_values[DEV_SPI_WRITE_BYTE_MOCK_MAX_VALUE_COUNT];
+
 // EPD_IT8951_4bp_Refresh
 extern size_t epd_it8951_4bp_refresh_mock_call_count;
+extern bool epd_it8951_4bp_refresh_mock_records_data;
+extern epd_it8951_4bp_refresh_mock_call_t epd_it8951_4bp_refresh_mock_calls[EPD_IT8951_4BP_REFRESH_MOCK_MAX_CALL_COUNT];
 
 // EPD_IT8951_8bp_Refresh
 extern size_t epd_it8951_8bp_refresh_mock_call_count;
@@ -142,6 +158,149 @@ extern size_t gui_read_bmp_return_value_count;
 extern size_t gui_read_bmp_call_count;
 extern uint8_t *gui_read_bmp_return_values;
 
+static size_t receive_test_message(int socket_fd, MessageHeader *header, uint8_t *payload)
+{
+    uint8_t message[MAX_MESSAGE_SIZE];
+    ssize_t message_size = recv(socket_fd, message, sizeof(message), MSG_DONTWAIT);
+
+    assert(message_size >= (ssize_t)sizeof(MessageHeader));
+
+    memcpy(header, message, sizeof(MessageHeader));
+    memcpy(payload, message + sizeof(MessageHeader), message_size - sizeof(MessageHeader));
+
+    assert(header->payload_size == message_size - sizeof(MessageHeader));
+
+    return message_size - sizeof(MessageHeader);
+}
+
+static size_t add_test_word(uint8_t *bytes, size_t size, uint16_t word)
+{
+    bytes[size] = (uint8_t)(word >> 8);
+    bytes[size + 1] = (uint8_t)(word & 0xFF);
+
+    return size + 2;
+}
+
+/* Add the bytes written over SPI for sending the command and its data */
+static size_t add_test_command(
+    uint8_t *bytes,
+    size_t size,
+    uint16_t command,
+    const uint16_t *data,
+    size_t data_count)
+{
+    size_t i = 0;
+
+    size = add_test_word(bytes, size, IT8951_COMMAND_PREAMBLE);
+    size = add_test_word(bytes, size, command);
+
+    for (i = 0; i < data_count; i++)
+    {
+        size = add_test_word(bytes, size, IT8951_WRITE_DATA_PREAMBLE);
+        size = add_test_word(bytes, size, data[i]);
+    }
+
+    return size;
+}
+
+static size_t add_test_wait_for_display_ready(uint8_t *bytes, size_t size)
+{
+    uint16_t address = IT8951_LUTAFSR_REGISTER;
+
+    size = add_test_command(bytes, size, IT8951_READ_REGISTER_COMMAND, &address, 1);
+
+    return add_test_word(bytes, size, IT8951_READ_DATA_PREAMBLE);
+}
+
+/* Add the bytes written over SPI for loading the whole 4bpp image */
+static size_t add_test_load_image(
+    uint8_t *bytes,
+    size_t size,
+    uint32_t target_memory_address,
+    const uint8_t *image_data,
+    uint16_t width,
+    uint16_t height)
+{
+    uint16_t high_address[] = {IT8951_LISAR_REGISTER + 2, (uint16_t)(target_memory_address >> 16)};
+    uint16_t low_address[] = {IT8951_LISAR_REGISTER, (uint16_t)(target_memory_address & 0xFFFF)};
+    uint16_t load_image_area[] = {IT8951_LOAD_4BPP_IMAGE_ARGUMENT, 0, 0, width, height};
+    size_t i = 0;
+
+    size = add_test_wait_for_display_ready(bytes, size);
+    size = add_test_command(bytes, size, IT8951_WRITE_REGISTER_COMMAND, high_address, 2);
+    size = add_test_command(bytes, size, IT8951_WRITE_REGISTER_COMMAND, low_address, 2);
+    size = add_test_command(bytes, size, IT8951_LOAD_IMAGE_AREA_COMMAND, load_image_area, 5);
+    size = add_test_word(bytes, size, IT8951_WRITE_DATA_PREAMBLE);
+
+    for (i = 0; i < ((size_t)width * height) / 2; i += 2)
+    {
+        size = add_test_word(bytes, size, (uint16_t)(image_data[i] | (image_data[i + 1] << 8)));
+    }
+
+    return add_test_command(bytes, size, IT8951_LOAD_IMAGE_END_COMMAND, NULL, 0);
+}
+
+/* Add the bytes written over SPI for clearing and refreshing the whole
+ * display */
+static size_t add_test_show_image(uint8_t *bytes, size_t size, uint16_t width, uint16_t height)
+{
+    uint16_t clear_area[] = {0, 0, width, height, 0};
+    uint16_t display_area[] = {0, 0, width, height, GC16_MODE};
+
+    size = add_test_command(bytes, size, IT8951_DISPLAY_AREA_COMMAND, clear_area, 5);
+    size = add_test_wait_for_display_ready(bytes, size);
+    size = add_test_command(bytes, size, IT8951_DISPLAY_AREA_COMMAND, display_area, 5);
+
+    return add_test_wait_for_display_ready(bytes, size);
+}
+
+/* Create a frame buffer file with the image in its front buffer and the
+ * rectangles to refresh, the whole display is refreshed without them */
+static void create_test_frame_buffer(
+    char *file_path,
+    uint16_t width,
+    uint16_t height,
+    uint64_t sequence_number,
+    const uint8_t *image_data,
+    uint16_t waveform_mode,
+    const Rectangle *rectangles,
+    size_t rectangle_count)
+{
+    uint8_t data[FRAME_BUFFER_DATA_OFFSET + 2 * 8];
+    FrameBufferHeader header;
+    int fd = mkstemps(file_path, 3);
+    size_t i = 0;
+
+    assert(fd >= 0);
+    assert(sizeof(data) >= FRAME_BUFFER_DATA_OFFSET + (size_t)width * height);
+
+    memset(data, 0, sizeof(data));
+    memset(&header, 0, sizeof(header));
+
+    memcpy(header.magic, FRAME_BUFFER_MAGIC, sizeof(header.magic));
+    header.version = htole16(FRAME_BUFFER_VERSION);
+    header.sequence_number = htole64(sequence_number);
+    header.width = htole16(width);
+    header.height = htole16(height);
+    header.rectangle_count = htole16(rectangles == NULL ? FULL_REFRESH_RECTANGLE_COUNT : rectangle_count);
+    header.waveform_mode = htole16(waveform_mode);
+
+    for (i = 0; rectangles != NULL && i < rectangle_count; i++)
+    {
+        header.rectangles[i].x = htole16(rectangles[i].x);
+        header.rectangles[i].y = htole16(rectangles[i].y);
+        header.rectangles[i].width = htole16(rectangles[i].width);
+        header.rectangles[i].height = htole16(rectangles[i].height);
+    }
+
+    memcpy(data, &header, sizeof(header));
+    memcpy(data + FRAME_BUFFER_DATA_OFFSET, image_data, ((size_t)width * height) / 2);
+
+    assert(sizeof(data) == write(fd, data, sizeof(data)));
+
+    close(fd);
+}
+
 TEST_CASE(
     test_str_ends_with_without_mocks,
     NULL,
@@ -234,11 +393,12 @@ TEST_CASE(
 
 TEST_CASE(
     test_print_help,
-    "Usage: update-display -v VOLTAGE [-d | -f <IMAGE_FILE> | -h]\n"
+    "Usage: update-display -v VOLTAGE [-d | -f <IMAGE_FILE> | -r <RECTANGLES_FILE> | -s <SOCKET_FD> | -h]\n"
     "\n"
     "Update the display of the connected 10.3 e-paper device either\n"
-    "by clearing it or drawing a 8bit per channel RGB BMP or a custom\n"
-    "4bits per pixel image on it.\n"
+    "by clearing it or drawing a 8bit per channel RGB BMP, a custom\n"
+    "4bits per pixel image or the front buffer of a frame buffer (.fb)\n"
+    "file shared with the Slow Movie Player Service on it.\n"
     "\n"
     "Mandatory option:\n"
     "  -v VOLTAGE  Use the VOLTAGE for the connected e-paper device.\n"
@@ -251,14 +411,32 @@ TEST_CASE(
     "  -f IMAGE_FILE  Draw the specified image on the display of the\n"
     "                 connected e-paper device.\n"
     "  -h             Display this help and exit.\n"
+    "  -r RECTANGLES_FILE\n"
+    "                 Only refresh the rectangles of the display listed\n"
+    "                 in RECTANGLES_FILE (without clearing the display)\n"
+    "                 when drawing a 4bpp image. The file holds the\n"
+    "                 number of rectangles, the waveform mode to refresh\n"
+    "                 them with (1: DU, 2: GC16, 3: GL16, 6: A2), then\n"
+    "                 the x, y, width and height of every rectangle (16\n"
+    "                 bit little endian integers each). The whole\n"
+    "                 display is cleared and refreshed if the file does\n"
+    "                 not exist or the number of rectangles is 65535.\n"
+    "  -s SOCKET_FD   Serve the update requests received on the\n"
+    "                 connected Unix (SOCK_SEQPACKET) socket SOCKET_FD,\n"
+    "                 responding with the status and the timings of\n"
+    "                 every update. 4bpp images and frame buffers can\n"
+    "                 also be loaded into the controller in advance,\n"
+    "                 and shown later on request. (This option only has\n"
+    "                 an effect when used together with '-f'.)\n"
     "\n"
     "Exit status:\n"
     "  0  Success.\n"
     "  1  Wrong command-line arguments or command-line parsing error.\n"
     "  2  Failed to initialize bcm2835 device.\n"
     "  3  The connected device is not a 10.3 inch e-paper device.\n"
-    "  4  Error during drawing BMP/4BPP image onto display.\n"
+    "  4  Error during drawing BMP/4BPP image or frame buffer onto display.\n"
     "  5  Unsupported image file format.\n"
+    "  6  Error during communicating over the socket.\n"
     "\n"
     "Examples:\n"
     "  ./update-display -h\n"
@@ -266,6 +444,9 @@ TEST_CASE(
     "  ./update-display -v -1.50 -f /path/to/image.bmp\n"
     "  ./update-display -v -1.48 -f /path/to/image.4bpp\n"
     "  ./update-display -v -2.51 -d -f /path/to/image.bmp\n"
+    "  ./update-display -v -1.48 -d -f /path/to/image.4bpp -r /path/to/image.4bpp.rectangles\n"
+    "  ./update-display -v -1.48 -d -f /path/to/frame.fb\n"
+    "  ./update-display -v -1.48 -f /path/to/frame.fb -s 3\n"
     "\n",
     NULL,
 
@@ -405,7 +586,7 @@ TEST_CASE(
     assert(0 == epd_it8951_clear_refresh_mock_call_count);
     assert(0 == epd_it8951_4bp_refresh_mock_call_count);
 
-    assert(0 == display_4bpp_image(device_info, 0, "/dummy/file/path"));
+    assert(0 == display_4bpp_image(device_info, 0, "/dummy/file/path", NULL));
 
     assert(1 == fclose_mock_call_count);
     assert(1 == malloc_mock_call_count);
@@ -425,7 +606,7 @@ TEST_CASE(
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-1 == display_4bpp_image(device_info, 0, NULL));
+    assert(-1 == display_4bpp_image(device_info, 0, NULL, NULL));
 
     assert(0 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
@@ -449,7 +630,7 @@ TEST_CASE(
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-2 == display_4bpp_image(device_info, 0, "/dummy/file/path"));
+    assert(-2 == display_4bpp_image(device_info, 0, "/dummy/file/path", NULL));
 
     assert(0 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
@@ -472,7 +653,7 @@ TEST_CASE(
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-3 == display_4bpp_image(device_info, 0, "/dummy/file/path"));
+    assert(-3 == display_4bpp_image(device_info, 0, "/dummy/file/path", NULL));
 
     assert(0 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
@@ -496,7 +677,7 @@ TEST_CASE(
     assert(0 == free_mock_call_count);
     assert(0 == epd_it8951_clear_refresh_mock_call_count);
 
-    assert(0 == display_4bpp_image(device_info, 0, "/dummy/file/path"));
+    assert(0 == display_4bpp_image(device_info, 0, "/dummy/file/path", NULL));
 
     assert(0 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
@@ -523,7 +704,7 @@ TEST_CASE(
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-4 == display_4bpp_image(device_info, 0, "/dummy/file/path"));
+    assert(-4 == display_4bpp_image(device_info, 0, "/dummy/file/path", NULL));
 
     assert(0 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
@@ -567,13 +748,13 @@ TEST_CASE(
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-5 == display_4bpp_image(device_info, 0, "/dummy/file/path/1"));
+    assert(-5 == display_4bpp_image(device_info, 0, "/dummy/file/path/1", NULL));
 
     assert(1 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-5 == display_4bpp_image(device_info, 0, "/dummy/file/path/2"));
+    assert(-5 == display_4bpp_image(device_info, 0, "/dummy/file/path/2", NULL));
 
     assert(2 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
@@ -611,7 +792,7 @@ TEST_CASE(
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-6 == display_4bpp_image(device_info, 0, "/dummy/file/path"));
+    assert(-6 == display_4bpp_image(device_info, 0, "/dummy/file/path", NULL));
 
     assert(1 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
@@ -649,7 +830,7 @@ TEST_CASE(
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-7 == display_4bpp_image(device_info, 0, "/dummy/file/path"));
+    assert(-7 == display_4bpp_image(device_info, 0, "/dummy/file/path", NULL));
 
     assert(1 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
@@ -705,19 +886,19 @@ TEST_CASE(
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-8 == display_4bpp_image(device_info, 0, "/dummy/file/path/1"));
+    assert(-8 == display_4bpp_image(device_info, 0, "/dummy/file/path/1", NULL));
 
     assert(1 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-8 == display_4bpp_image(device_info, 0, "/dummy/file/path/2"));
+    assert(-8 == display_4bpp_image(device_info, 0, "/dummy/file/path/2", NULL));
 
     assert(2 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-8 == display_4bpp_image(device_info, 0, "/dummy/file/path/3"));
+    assert(-8 == display_4bpp_image(device_info, 0, "/dummy/file/path/3", NULL));
 
     assert(3 == fclose_mock_call_count);
     assert(0 == malloc_mock_call_count);
@@ -758,7 +939,7 @@ TEST_CASE(
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-9 == display_4bpp_image(device_info, 0, "/dummy/file/path"));
+    assert(-9 == display_4bpp_image(device_info, 0, "/dummy/file/path", NULL));
 
     assert(1 == fclose_mock_call_count);
     assert(1 == malloc_mock_call_count);
@@ -802,9 +983,708 @@ TEST_CASE(
     assert(0 == malloc_mock_call_count);
     assert(0 == free_mock_call_count);
 
-    assert(-10 == display_4bpp_image(device_info, 0, "/dummy/file/path"));
+    assert(-10 == display_4bpp_image(device_info, 0, "/dummy/file/path", NULL));
 
     assert(1 == fclose_mock_call_count);
     assert(1 == malloc_mock_call_count);
     assert(1 == free_mock_call_count);
 )
+
+TEST_CASE(
+    test_read_rectangles_with_null_parameters,
+    NULL,
+    "Received null pointer for rectangles.\n",
+
+    uint16_t waveform_mode = 0;
+    Rectangle rectangles[1];
+    size_t rectangle_count = 0;
+
+    assert(0 == fopen_mock_call_count);
+
+    assert(-1 == read_rectangles("/dummy/file/path", NULL, rectangles, 1, &rectangle_count));
+    assert(1 == read_rectangles(NULL, &waveform_mode, rectangles, 1, &rectangle_count));
+
+    assert(0 == fopen_mock_call_count);
+    assert(0 == waveform_mode);
+    assert(0 == rectangle_count);
+)
+
+TEST_CASE(
+    test_read_rectangles_when_file_open_fails,
+    NULL,
+    NULL,
+
+    uint16_t waveform_mode = 0;
+    Rectangle rectangles[1];
+    size_t rectangle_count = 0;
+
+    fopen_mock_return_value_count = 1;
+    fopen_mock_return_values = calloc(fopen_mock_return_value_count, sizeof(uint8_t));
+
+    assert(1 == read_rectangles("/dummy/file/path", &waveform_mode, rectangles, 1, &rectangle_count));
+
+    assert(1 == fopen_mock_call_count);
+    assert(0 == fclose_mock_call_count);
+)
+
+TEST_CASE(
+    test_read_rectangles_with_invalid_header,
+    NULL,
+    "Invalid rectangles file (/dummy/file/path).\n",
+
+    uint16_t waveform_mode = 0;
+    Rectangle rectangles[1];
+    size_t rectangle_count = 0;
+
+    fopen_mock_return_value_count = 1;
+    fopen_mock_return_values = calloc(fopen_mock_return_value_count, sizeof(uint8_t));
+    fopen_mock_return_values[0] = 1;
+
+    fread_mock_return_value_count = 1;
+    fread_mock_return_values = calloc(fread_mock_return_value_count, sizeof(size_t));
+    fread_mock_read_value_types = calloc(fread_mock_return_value_count, sizeof(fread_mock_read_value_type_t));
+    fread_mock_read_values = calloc(fread_mock_return_value_count, sizeof(uint16_t));
+    fread_mock_read_value_types[0] = UINT16_T_TYPE;
+
+    assert(-2 == read_rectangles("/dummy/file/path", &waveform_mode, rectangles, 1, &rectangle_count));
+
+    assert(1 == fclose_mock_call_count);
+)
+
+TEST_CASE(
+    test_read_rectangles_with_full_refresh_rectangle_count,
+    NULL,
+    NULL,
+
+    uint16_t waveform_mode = 0;
+    Rectangle rectangles[1];
+    size_t rectangle_count = 0;
+
+    fopen_mock_return_value_count = 1;
+    fopen_mock_return_values = calloc(fopen_mock_return_value_count, sizeof(uint8_t));
+    fopen_mock_return_values[0] = 1;
+
+    fread_mock_return_value_count = 1;
+    fread_mock_return_values = calloc(fread_mock_return_value_count, sizeof(size_t));
+    fread_mock_read_value_types = calloc(fread_mock_return_value_count, sizeof(fread_mock_read_value_type_t));
+    fread_mock_read_values = calloc(fread_mock_return_value_count, sizeof(uint16_t));
+    fread_mock_return_values[0] = 1;
+    fread_mock_read_value_types[0] = UINT16_T_TYPE;
+    fread_mock_read_values[0] = FULL_REFRESH_RECTANGLE_COUNT;
+
+    assert(1 == read_rectangles("/dummy/file/path", &waveform_mode, rectangles, 1, &rectangle_count));
+
+    assert(1 == fclose_mock_call_count);
+    assert(0 == waveform_mode);
+    assert(0 == rectangle_count);
+)
+
+TEST_CASE(
+    test_read_rectangles_with_invalid_waveform_mode,
+    NULL,
+    "Invalid waveform mode in rectangles file (0).\n",
+
+    uint16_t waveform_mode = 0;
+    Rectangle rectangles[1];
+    size_t rectangle_count = 0;
+
+    fopen_mock_return_value_count = 1;
+    fopen_mock_return_values = calloc(fopen_mock_return_value_count, sizeof(uint8_t));
+    fopen_mock_return_values[0] = 1;
+
+    fread_mock_return_value_count = 1;
+    fread_mock_return_values = calloc(fread_mock_return_value_count, sizeof(size_t));
+    fread_mock_read_value_types = calloc(fread_mock_return_value_count, sizeof(fread_mock_read_value_type_t));
+    fread_mock_read_values = calloc(fread_mock_return_value_count, sizeof(uint16_t));
+    fread_mock_return_values[0] = 1;
+    fread_mock_read_value_types[0] = UINT16_T_TYPE;
+    fread_mock_read_values[0] = 1;
+
+    assert(-5 == read_rectangles("/dummy/file/path", &waveform_mode, rectangles, 1, &rectangle_count));
+
+    assert(1 == fclose_mock_call_count);
+    assert(0 == rectangle_count);
+)
+
+TEST_CASE(
+    test_read_rectangles,
+    NULL,
+    NULL,
+
+    uint16_t waveform_mode = 0;
+    Rectangle rectangles[2];
+    size_t rectangle_count = 0;
+    uint16_t header[] = {htole16(2) COMMA htole16(DU_MODE)};
+    uint16_t values[] = {
+        htole16(4) COMMA htole16(0) COMMA htole16(4) COMMA htole16(2) COMMA
+        htole16(0) COMMA htole16(1) COMMA htole16(4) COMMA htole16(1)};
+
+    fopen_mock_return_value_count = 1;
+    fopen_mock_return_values = calloc(fopen_mock_return_value_count, sizeof(uint8_t));
+    fopen_mock_return_values[0] = 1;
+
+    fread_mock_return_value_count = 3;
+    fread_mock_return_values = calloc(fread_mock_return_value_count, sizeof(size_t));
+    fread_mock_read_value_types = calloc(fread_mock_return_value_count, sizeof(fread_mock_read_value_type_t));
+    fread_mock_read_values = calloc(fread_mock_return_value_count, sizeof(uint16_t));
+    fread_mock_read_bytes = calloc(sizeof(header) + sizeof(values), sizeof(uint8_t));
+    fread_mock_return_values[0] = 1;
+    fread_mock_return_values[1] = 1;
+    fread_mock_return_values[2] = 1;
+    fread_mock_read_value_types[0] = BYTES_TYPE;
+    fread_mock_read_value_types[1] = BYTES_TYPE;
+    fread_mock_read_value_types[2] = BYTES_TYPE;
+    memcpy(fread_mock_read_bytes, header, sizeof(header));
+    memcpy(fread_mock_read_bytes + sizeof(header), values, sizeof(values));
+
+    assert(0 == read_rectangles("/dummy/file/path", &waveform_mode, rectangles, 2, &rectangle_count));
+
+    assert(3 == fread_mock_call_count);
+    assert(1 == fclose_mock_call_count);
+    assert(DU_MODE == waveform_mode);
+    assert(2 == rectangle_count);
+    assert(4 == rectangles[0].x);
+    assert(0 == rectangles[0].y);
+    assert(4 == rectangles[0].width);
+    assert(2 == rectangles[0].height);
+    assert(0 == rectangles[1].x);
+    assert(1 == rectangles[1].y);
+    assert(4 == rectangles[1].width);
+    assert(1 == rectangles[1].height);
+)
+
+TEST_CASE(
+    test_display_frame_buffer_with_rectangles,
+    NULL,
+    NULL,
+
+    IT8951_Dev_Info device_info;
+    FrameBuffer frame_buffer = {NULL COMMA 0 COMMA NULL COMMA 0};
+    char file_path[] = "/tmp/test-update-display-XXXXXX.fb";
+    uint8_t image_data[] = {0x01 COMMA 0x23 COMMA 0x45 COMMA 0x67 COMMA 0x89 COMMA 0xAB COMMA 0xCD COMMA 0xEF};
+    uint8_t area_data[8];
+    Rectangle rectangles[] = {{4 COMMA 0 COMMA 4 COMMA 2} COMMA {0 COMMA 1 COMMA 4 COMMA 1}};
+    uint8_t first_area_data[] = {0x45 COMMA 0x67 COMMA 0xCD COMMA 0xEF};
+    uint8_t second_area_data[] = {0x89 COMMA 0xAB};
+    uint8_t expected_bytes[DEV_SPI_WRITE_BYTE_MOCK_MAX_VALUE_COUNT];
+    size_t expected_byte_count = 0;
+
+    memset(&device_info, 0, sizeof(device_info));
+    device_info.Panel_W = 8;
+    device_info.Panel_H = 2;
+
+    malloc_mock_return_value_count = 1;
+    malloc_mock_return_values = calloc(malloc_mock_return_value_count, sizeof(uint8_t));
+    malloc_mock_return_values[0] = 1;
+
+    epd_it8951_4bp_refresh_mock_records_data = true;
+
+    create_test_frame_buffer(file_path, 8, 2, 1, image_data, DU_MODE, rectangles, 2);
+
+    assert(0 == open_frame_buffer(device_info, file_path, &frame_buffer));
+
+    /* The area data is copied, so it needs real memory */
+    frame_buffer.area_data = area_data;
+
+    assert(0 == display_frame_buffer(device_info, 0x001236E0, &frame_buffer));
+
+    /* Only the rectangles are refreshed, one by one, with the waveform mode of
+     * the frame buffer */
+    assert(0 == epd_it8951_clear_refresh_mock_call_count);
+    assert(2 == epd_it8951_4bp_refresh_mock_call_count);
+
+    assert(4 == epd_it8951_4bp_refresh_mock_calls[0].x);
+    assert(0 == epd_it8951_4bp_refresh_mock_calls[0].y);
+    assert(4 == epd_it8951_4bp_refresh_mock_calls[0].width);
+    assert(2 == epd_it8951_4bp_refresh_mock_calls[0].height);
+    assert(DU_MODE == epd_it8951_4bp_refresh_mock_calls[0].gc16_mode);
+    assert(0 == memcmp(first_area_data, epd_it8951_4bp_refresh_mock_calls[0].data, sizeof(first_area_data)));
+
+    assert(0 == epd_it8951_4bp_refresh_mock_calls[1].x);
+    assert(1 == epd_it8951_4bp_refresh_mock_calls[1].y);
+    assert(4 == epd_it8951_4bp_refresh_mock_calls[1].width);
+    assert(1 == epd_it8951_4bp_refresh_mock_calls[1].height);
+    assert(DU_MODE == epd_it8951_4bp_refresh_mock_calls[1].gc16_mode);
+    assert(0 == memcmp(second_area_data, epd_it8951_4bp_refresh_mock_calls[1].data, sizeof(second_area_data)));
+
+    /* The GC16 mode of the vendor library is restored */
+    assert(GC16_MODE == GC16_Mode);
+    assert(1 == frame_buffer.displayed_sequence_number);
+
+    /* The refresh is timed until the display is ready again */
+    expected_byte_count = add_test_wait_for_display_ready(expected_bytes, 0);
+
+    assert(expected_byte_count == dev_spi_write_byte_mock_call_count);
+    assert(0 == memcmp(expected_bytes, dev_spi_write_byte_mock_values, expected_byte_count));
+
+    close_frame_buffer(&frame_buffer);
+    unlink(file_path);
+)
+
+TEST_CASE(
+    test_display_frame_buffer_with_invalid_rectangle,
+    NULL,
+    NULL,
+
+    IT8951_Dev_Info device_info;
+    FrameBuffer frame_buffer = {NULL COMMA 0 COMMA NULL COMMA 0};
+    char file_path[] = "/tmp/test-update-display-XXXXXX.fb";
+    uint8_t image_data[] = {0x01 COMMA 0x23 COMMA 0x45 COMMA 0x67 COMMA 0x89 COMMA 0xAB COMMA 0xCD COMMA 0xEF};
+    uint8_t area_data[8];
+    /* The horizontal position is not a multiple of four pixels */
+    Rectangle rectangles[] = {{2 COMMA 0 COMMA 4 COMMA 2}};
+
+    memset(&device_info, 0, sizeof(device_info));
+    device_info.Panel_W = 8;
+    device_info.Panel_H = 2;
+
+    malloc_mock_return_value_count = 1;
+    malloc_mock_return_values = calloc(malloc_mock_return_value_count, sizeof(uint8_t));
+    malloc_mock_return_values[0] = 1;
+
+    epd_it8951_4bp_refresh_mock_records_data = true;
+
+    create_test_frame_buffer(file_path, 8, 2, 1, image_data, DU_MODE, rectangles, 1);
+
+    assert(0 == open_frame_buffer(device_info, file_path, &frame_buffer));
+
+    frame_buffer.area_data = area_data;
+
+    assert(0 == display_frame_buffer(device_info, 0x001236E0, &frame_buffer));
+
+    /* The whole display is cleared and refreshed with the GC16 mode instead */
+    assert(1 == epd_it8951_clear_refresh_mock_call_count);
+    assert(1 == epd_it8951_4bp_refresh_mock_call_count);
+
+    assert(0 == epd_it8951_4bp_refresh_mock_calls[0].x);
+    assert(0 == epd_it8951_4bp_refresh_mock_calls[0].y);
+    assert(8 == epd_it8951_4bp_refresh_mock_calls[0].width);
+    assert(2 == epd_it8951_4bp_refresh_mock_calls[0].height);
+    assert(GC16_MODE == epd_it8951_4bp_refresh_mock_calls[0].gc16_mode);
+    assert(0 == memcmp(image_data, epd_it8951_4bp_refresh_mock_calls[0].data, sizeof(image_data)));
+
+    close_frame_buffer(&frame_buffer);
+    unlink(file_path);
+)
+
+TEST_CASE(
+    test_send_panel_info,
+    NULL,
+    NULL,
+
+    IT8951_Dev_Info device_info;
+    int socket_fds[2];
+    MessageHeader header;
+    uint8_t payload[MAX_MESSAGE_SIZE];
+    PanelInfo panel_info;
+
+    memset(&device_info, 0, sizeof(device_info));
+    device_info.Panel_W = 1872;
+    device_info.Panel_H = 1404;
+    memcpy(device_info.LUT_Version, "M841_TFA5210", sizeof("M841_TFA5210"));
+
+    assert(0 == socketpair(AF_UNIX, SOCK_SEQPACKET, 0, socket_fds));
+
+    assert(0 == send_panel_info(socket_fds[0], device_info, 0x00123456));
+
+    assert(sizeof(PanelInfo) == receive_test_message(socket_fds[1], &header, payload));
+    assert(READY_MESSAGE == header.type);
+    assert(0 == header.status);
+    assert(0 == header.request_id);
+
+    memcpy(&panel_info, payload, sizeof(panel_info));
+
+    assert(1872 == panel_info.width);
+    assert(1404 == panel_info.height);
+    assert(0x00123456 == panel_info.memory_address);
+    assert(0 == __real_strcmp("M841_TFA5210", panel_info.lut_version));
+
+    close(socket_fds[0]);
+    close(socket_fds[1]);
+)
+
+TEST_CASE(
+    test_receive_message,
+    NULL,
+    "Received invalid message.\n",
+
+    int socket_fds[2];
+    MessageHeader request;
+    MessageHeader header;
+
+    assert(0 == socketpair(AF_UNIX, SOCK_SEQPACKET, 0, socket_fds));
+
+    assert(0 == send_message(socket_fds[1], UPDATE_MESSAGE, 0, 42, NULL, 0));
+    assert(3 == send(socket_fds[1], "abc", 3, 0));
+
+    close(socket_fds[1]);
+
+    assert(0 == receive_message(socket_fds[0], &header));
+    assert(UPDATE_MESSAGE == header.type);
+    assert(0 == header.status);
+    assert(42 == header.request_id);
+    assert(0 == header.payload_size);
+
+    assert(-3 == receive_message(socket_fds[0], &request));
+
+    /* The connection is closed */
+    assert(1 == receive_message(socket_fds[0], &request));
+
+    close(socket_fds[0]);
+)
+
+TEST_CASE(
+    test_serve_requests,
+    NULL,
+    "Unsupported request (9).\n",
+
+    IT8951_Dev_Info device_info;
+    FrameBuffer frame_buffer = {NULL COMMA 0 COMMA NULL COMMA 0};
+    int socket_fds[2];
+    MessageHeader header;
+    uint8_t payload[MAX_MESSAGE_SIZE];
+    UpdateTimes update_times;
+
+    memset(&device_info, 0, sizeof(device_info));
+
+    malloc_mock_return_value_count = 1;
+    malloc_mock_return_values = calloc(malloc_mock_return_value_count, sizeof(uint8_t));
+    malloc_mock_return_values[0] = 1;
+
+    gui_read_bmp_return_value_count = 1;
+    gui_read_bmp_return_values = calloc(gui_read_bmp_return_value_count, sizeof(uint8_t));
+
+    assert(0 == socketpair(AF_UNIX, SOCK_SEQPACKET, 0, socket_fds));
+
+    assert(0 == send_message(socket_fds[1], UPDATE_MESSAGE, 0, 7, NULL, 0));
+    assert(0 == send_message(socket_fds[1], 9, 0, 8, NULL, 0));
+
+    /* Requests are served until the connection is closed */
+    shutdown(socket_fds[1], SHUT_WR);
+
+    assert(0 == serve_requests(socket_fds[0], device_info, 0, "/dummy/file/path.bmp", NULL, &frame_buffer));
+
+    assert(1 == malloc_mock_call_count);
+    assert(1 == free_mock_call_count);
+    assert(1 == epd_it8951_clear_refresh_mock_call_count);
+    assert(1 == epd_it8951_8bp_refresh_mock_call_count);
+
+    assert(sizeof(PanelInfo) == receive_test_message(socket_fds[1], &header, payload));
+    assert(READY_MESSAGE == header.type);
+
+    assert(sizeof(UpdateTimes) == receive_test_message(socket_fds[1], &header, payload));
+    assert(UPDATE_MESSAGE == header.type);
+    assert(0 == header.status);
+    assert(7 == header.request_id);
+
+    memcpy(&update_times, payload, sizeof(update_times));
+
+    assert(1000000 > update_times.transfer_time_us);
+    assert(1000000 > update_times.refresh_time_us);
+
+    assert(sizeof(UpdateTimes) + 19 == receive_test_message(socket_fds[1], &header, payload));
+    assert(UPDATE_MESSAGE == header.type);
+    assert(1 == header.status);
+    assert(8 == header.request_id);
+    assert(0 == memcmp("Unsupported request", payload + sizeof(UpdateTimes), 19));
+
+    close(socket_fds[0]);
+    close(socket_fds[1]);
+)
+
+TEST_CASE(
+    test_serve_requests_when_drawing_fails,
+    NULL,
+    "Cannot process BMP image or allocate enough memory.\n"
+    "Error during drawing BMP image onto display (/dummy/file/path.bmp).\n",
+
+    IT8951_Dev_Info device_info;
+    FrameBuffer frame_buffer = {NULL COMMA 0 COMMA NULL COMMA 0};
+    int socket_fds[2];
+    MessageHeader header;
+    uint8_t payload[MAX_MESSAGE_SIZE];
+    const char *error_message = "Error during drawing BMP image onto display";
+
+    memset(&device_info, 0, sizeof(device_info));
+
+    malloc_mock_return_value_count = 1;
+    malloc_mock_return_values = calloc(malloc_mock_return_value_count, sizeof(uint8_t));
+    malloc_mock_return_values[0] = 1;
+
+    gui_read_bmp_return_value_count = 1;
+    gui_read_bmp_return_values = calloc(gui_read_bmp_return_value_count, sizeof(uint8_t));
+    gui_read_bmp_return_values[0] = 1;
+
+    assert(0 == socketpair(AF_UNIX, SOCK_SEQPACKET, 0, socket_fds));
+
+    assert(0 == send_message(socket_fds[1], UPDATE_MESSAGE, 0, 1, NULL, 0));
+
+    shutdown(socket_fds[1], SHUT_WR);
+
+    assert(0 == serve_requests(socket_fds[0], device_info, 0, "/dummy/file/path.bmp", NULL, &frame_buffer));
+
+    /* The display is cleared after the failure */
+    assert(1 == epd_it8951_clear_refresh_mock_call_count);
+    assert(0 == epd_it8951_8bp_refresh_mock_call_count);
+
+    assert(sizeof(PanelInfo) == receive_test_message(socket_fds[1], &header, payload));
+
+    assert(sizeof(UpdateTimes) + __real_strlen(error_message) == receive_test_message(socket_fds[1], &header, payload));
+    assert(UPDATE_MESSAGE == header.type);
+    assert(4 == header.status);
+    assert(1 == header.request_id);
+    assert(0 == memcmp(error_message, payload + sizeof(UpdateTimes), __real_strlen(error_message)));
+
+    close(socket_fds[0]);
+    close(socket_fds[1]);
+)
+
+TEST_CASE(
+    test_load_4bpp_image_with_no_image_data_in_file,
+    NULL,
+    "No image data in file, not drawing anything to display (/dummy/file/path).\n",
+
+    IT8951_Dev_Info device_info;
+    LoadedImage loaded_image;
+
+    memset(&loaded_image, 0, sizeof(loaded_image));
+    loaded_image.is_loaded = 1;
+
+    stat_mock_return_value_count = 1;
+    stat_mock_return_values = calloc(stat_mock_return_value_count, sizeof(int));
+    stat_mock_st_size_values = calloc(stat_mock_return_value_count, sizeof(off_t));
+    stat_mock_st_size_values[0] = 2 * sizeof(uint16_t);
+
+    assert(0 == load_4bpp_image(device_info, 0, "/dummy/file/path", NULL, &loaded_image));
+
+    /* The display keeps showing the previous image */
+    assert(0 == loaded_image.is_loaded);
+    assert(0 == epd_it8951_clear_refresh_mock_call_count);
+    assert(0 == dev_spi_write_byte_mock_call_count);
+)
+
+TEST_CASE(
+    test_load_frame_buffer,
+    NULL,
+    NULL,
+
+    IT8951_Dev_Info device_info;
+    FrameBuffer frame_buffer = {NULL COMMA 0 COMMA NULL COMMA 0};
+    LoadedImage loaded_image;
+    char file_path[] = "/tmp/test-update-display-XXXXXX.fb";
+    uint8_t image_data[] = {0x01 COMMA 0x23 COMMA 0x45 COMMA 0x67 COMMA 0x89 COMMA 0xAB COMMA 0xCD COMMA 0xEF};
+    uint8_t expected_bytes[DEV_SPI_WRITE_BYTE_MOCK_MAX_VALUE_COUNT];
+    size_t expected_byte_count = 0;
+
+    memset(&device_info, 0, sizeof(device_info));
+    device_info.Panel_W = 8;
+    device_info.Panel_H = 2;
+
+    malloc_mock_return_value_count = 1;
+    malloc_mock_return_values = calloc(malloc_mock_return_value_count, sizeof(uint8_t));
+    malloc_mock_return_values[0] = 1;
+
+    create_test_frame_buffer(file_path, 8, 2, 1, image_data, GC16_MODE, NULL, 0);
+
+    assert(0 == open_frame_buffer(device_info, file_path, &frame_buffer));
+    assert(0 == load_frame_buffer(device_info, 0x001236E0, &frame_buffer, &loaded_image));
+
+    /* Only the pixels are transferred, the display is not refreshed */
+    expected_byte_count = add_test_load_image(expected_bytes, 0, 0x001236E0, image_data, 8, 2);
+
+    assert(expected_byte_count == dev_spi_write_byte_mock_call_count);
+    assert(0 == memcmp(expected_bytes, dev_spi_write_byte_mock_values, expected_byte_count));
+    assert(0 == epd_it8951_clear_refresh_mock_call_count);
+    assert(0 == epd_it8951_4bp_refresh_mock_call_count);
+
+    assert(1 == loaded_image.is_loaded);
+    assert(0 == loaded_image.is_partial_refresh);
+    assert(GC16_MODE == loaded_image.waveform_mode);
+    assert(1 == loaded_image.rectangle_count);
+    assert(0 == loaded_image.rectangles[0].x);
+    assert(0 == loaded_image.rectangles[0].y);
+    assert(8 == loaded_image.rectangles[0].width);
+    assert(2 == loaded_image.rectangles[0].height);
+    assert(1 == loaded_image.sequence_number);
+
+    /* The frame is displayed only once shown */
+    assert(0 == frame_buffer.displayed_sequence_number);
+    assert(0 == show_loaded_image(&loaded_image, &frame_buffer));
+    assert(1 == frame_buffer.displayed_sequence_number);
+
+    /* The frame is not loaded again until a new one is swapped in */
+    reset_dev_spi_write_byte_mock();
+
+    assert(0 == load_frame_buffer(device_info, 0x001236E0, &frame_buffer, &loaded_image));
+
+    assert(0 == loaded_image.is_loaded);
+    assert(0 == dev_spi_write_byte_mock_call_count);
+
+    close_frame_buffer(&frame_buffer);
+    unlink(file_path);
+)
+
+TEST_CASE(
+    test_show_loaded_image,
+    NULL,
+    "Received null pointer for loaded image.\n",
+
+    FrameBuffer frame_buffer = {NULL COMMA 0 COMMA NULL COMMA 0};
+    LoadedImage loaded_image;
+    uint16_t first_area[] = {0 COMMA 0 COMMA 4 COMMA 1 COMMA DU_MODE};
+    uint16_t second_area[] = {4 COMMA 1 COMMA 4 COMMA 1 COMMA DU_MODE};
+    uint8_t expected_bytes[DEV_SPI_WRITE_BYTE_MOCK_MAX_VALUE_COUNT];
+    size_t expected_byte_count = 0;
+
+    assert(-1 == show_loaded_image(NULL, &frame_buffer));
+
+    /* The whole display is cleared, then refreshed */
+    memset(&loaded_image, 0, sizeof(loaded_image));
+    loaded_image.is_loaded = 1;
+    loaded_image.waveform_mode = GC16_MODE;
+    loaded_image.rectangles[0].width = 8;
+    loaded_image.rectangles[0].height = 2;
+    loaded_image.rectangle_count = 1;
+
+    assert(0 == show_loaded_image(&loaded_image, &frame_buffer));
+
+    expected_byte_count = add_test_show_image(expected_bytes, 0, 8, 2);
+
+    assert(expected_byte_count == dev_spi_write_byte_mock_call_count);
+    assert(0 == memcmp(expected_bytes, dev_spi_write_byte_mock_values, expected_byte_count));
+    assert(0 == loaded_image.is_loaded);
+    assert(0 == frame_buffer.displayed_sequence_number);
+
+    /* Nothing is shown twice */
+    reset_dev_spi_write_byte_mock();
+
+    assert(0 == show_loaded_image(&loaded_image, &frame_buffer));
+    assert(0 == dev_spi_write_byte_mock_call_count);
+
+    /* Only the rectangles are refreshed */
+    loaded_image.is_loaded = 1;
+    loaded_image.is_partial_refresh = 1;
+    loaded_image.waveform_mode = DU_MODE;
+    loaded_image.rectangles[0].width = 4;
+    loaded_image.rectangles[0].height = 1;
+    loaded_image.rectangles[1].x = 4;
+    loaded_image.rectangles[1].y = 1;
+    loaded_image.rectangles[1].width = 4;
+    loaded_image.rectangles[1].height = 1;
+    loaded_image.rectangle_count = 2;
+    loaded_image.sequence_number = 5;
+
+    assert(0 == show_loaded_image(&loaded_image, &frame_buffer));
+
+    expected_byte_count = add_test_command(expected_bytes, 0, IT8951_DISPLAY_AREA_COMMAND, first_area, 5);
+    expected_byte_count = add_test_command(
+        expected_bytes,
+        expected_byte_count,
+        IT8951_DISPLAY_AREA_COMMAND,
+        second_area,
+        5);
+    expected_byte_count = add_test_wait_for_display_ready(expected_bytes, expected_byte_count);
+
+    assert(expected_byte_count == dev_spi_write_byte_mock_call_count);
+    assert(0 == memcmp(expected_bytes, dev_spi_write_byte_mock_values, expected_byte_count));
+    assert(5 == frame_buffer.displayed_sequence_number);
+    assert(0 == epd_it8951_clear_refresh_mock_call_count);
+    assert(0 == epd_it8951_4bp_refresh_mock_call_count);
+)
+
+TEST_CASE(
+    test_load_image_file_with_unsupported_image_file_format,
+    NULL,
+    "Unsupported image file format for loading in advance.\n",
+
+    IT8951_Dev_Info device_info;
+    FrameBuffer frame_buffer = {NULL COMMA 0 COMMA NULL COMMA 0};
+    LoadedImage loaded_image;
+    const char *error_message = NULL;
+
+    memset(&device_info, 0, sizeof(device_info));
+
+    assert(5 == load_image_file(
+        device_info COMMA
+        0 COMMA
+        "/dummy/file/path.bmp" COMMA
+        NULL COMMA
+        &frame_buffer COMMA
+        &loaded_image COMMA
+        &error_message));
+
+    assert(0 == __real_strcmp("Unsupported image file format for loading in advance", error_message));
+    assert(0 == loaded_image.is_loaded);
+    assert(0 == gui_read_bmp_call_count);
+)
+
+TEST_CASE(
+    test_serve_requests_with_loading_in_advance,
+    NULL,
+    NULL,
+
+    IT8951_Dev_Info device_info;
+    FrameBuffer frame_buffer = {NULL COMMA 0 COMMA NULL COMMA 0};
+    char file_path[] = "/tmp/test-update-display-XXXXXX.fb";
+    uint8_t image_data[] = {0x01 COMMA 0x23 COMMA 0x45 COMMA 0x67 COMMA 0x89 COMMA 0xAB COMMA 0xCD COMMA 0xEF};
+    uint8_t expected_bytes[DEV_SPI_WRITE_BYTE_MOCK_MAX_VALUE_COUNT];
+    size_t expected_byte_count = 0;
+    int socket_fds[2];
+    MessageHeader header;
+    uint8_t payload[MAX_MESSAGE_SIZE];
+    UpdateTimes update_times;
+    uint32_t request_id = 0;
+
+    memset(&device_info, 0, sizeof(device_info));
+    device_info.Panel_W = 8;
+    device_info.Panel_H = 2;
+
+    malloc_mock_return_value_count = 1;
+    malloc_mock_return_values = calloc(malloc_mock_return_value_count, sizeof(uint8_t));
+    malloc_mock_return_values[0] = 1;
+
+    create_test_frame_buffer(file_path, 8, 2, 1, image_data, GC16_MODE, NULL, 0);
+
+    assert(0 == socketpair(AF_UNIX, SOCK_SEQPACKET, 0, socket_fds));
+
+    assert(0 == send_message(socket_fds[1], LOAD_MESSAGE, 0, 1, NULL, 0));
+    assert(0 == send_message(socket_fds[1], SHOW_MESSAGE, 0, 2, NULL, 0));
+    /* Nothing new was loaded */
+    assert(0 == send_message(socket_fds[1], SHOW_MESSAGE, 0, 3, NULL, 0));
+
+    shutdown(socket_fds[1], SHUT_WR);
+
+    assert(0 == serve_requests(socket_fds[0], device_info, 0, file_path, NULL, &frame_buffer));
+
+    /* The frame is loaded, then shown only once */
+    expected_byte_count = add_test_load_image(expected_bytes, 0, 0, image_data, 8, 2);
+    expected_byte_count = add_test_show_image(expected_bytes, expected_byte_count, 8, 2);
+
+    assert(expected_byte_count == dev_spi_write_byte_mock_call_count);
+    assert(0 == memcmp(expected_bytes, dev_spi_write_byte_mock_values, expected_byte_count));
+    assert(0 == epd_it8951_clear_refresh_mock_call_count);
+    assert(0 == epd_it8951_4bp_refresh_mock_call_count);
+    assert(1 == frame_buffer.displayed_sequence_number);
+
+    assert(sizeof(PanelInfo) == receive_test_message(socket_fds[1], &header, payload));
+    assert(READY_MESSAGE == header.type);
+
+    for (request_id = 1; request_id <= 3; request_id++)
+    {
+        assert(sizeof(UpdateTimes) == receive_test_message(socket_fds[1], &header, payload));
+        assert(UPDATE_MESSAGE == header.type);
+        assert(0 == header.status);
+        assert(request_id == header.request_id);
+
+        memcpy(&update_times, payload, sizeof(update_times));
+
+        assert(1000000 > update_times.transfer_time_us);
+        assert(1000000 > update_times.refresh_time_us);
+    }
+
+    close(socket_fds[0]);
+    close(socket_fds[1]);
+
+    close_frame_buffer(&frame_buffer);
+    unlink(file_path);
+)
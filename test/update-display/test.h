@@ -22,3 +22,24 @@ void test_display_4bpp_image_using_image_with_odd_number_of_total_pixels(void);
 void test_display_4bpp_image_with_wrong_file_size_and_resolutions(void);
 void test_display_4bpp_image_when_malloc_fails(void);
 void test_display_4bpp_image_when_reading_image_data_fails(void);
+
+void test_read_rectangles_with_null_parameters(void);
+void test_read_rectangles_when_file_open_fails(void);
+void test_read_rectangles_with_invalid_header(void);
+void test_read_rectangles_with_full_refresh_rectangle_count(void);
+void test_read_rectangles_with_invalid_waveform_mode(void);
+void test_read_rectangles(void);
+
+void test_display_frame_buffer_with_rectangles(void);
+void test_display_frame_buffer_with_invalid_rectangle(void);
+
+void test_send_panel_info(void);
+void test_receive_message(void);
+void test_serve_requests(void);
+void test_serve_requests_when_drawing_fails(void);
+
+void test_load_4bpp_image_with_no_image_data_in_file(void);
+void test_load_frame_buffer(void);
+void test_show_loaded_image(void);
+void test_load_image_file_with_unsupported_image_file_format(void);
+void test_serve_requests_with_loading_in_advance(void);